@@ -0,0 +1,277 @@
+# Copyright OpenSearch Contributors
+# SPDX-License-Identifier: Apache-2.0
+
+"""Concurrency scaling, client churn and soak benchmark for the client layer.
+
+Every tool call creates an OpenSearch client with ``get_opensearch_client`` and closes
+it when the call ends. This benchmark runs a tool in-process against a
+``FakeOpenSearch`` in a separate process, so only the client side is measured:
+
+1. Scaling: for 1, 2, 4, ... up to ``--max-concurrency`` concurrent calls, the
+   throughput and p50/p99 latency of tool calls (a new client per call) and of the
+   same requests sent through one shared client. The difference is the cost of
+   creating and closing a client per call.
+2. Soak: ``--soak-concurrency`` concurrent calls for ``--soak-seconds``, sampling
+   open file descriptors, sockets and RSS every ``--sample-interval`` seconds.
+
+The exit status is 1 when descriptors or RSS keep growing during the soak (more than
+``--max-fd-growth`` descriptors or ``--max-rss-growth-mb`` MB between the peaks of
+the two halves of the run, after a warm-up fifth) or when aiohttp reports an unclosed
+client session.
+File descriptors, sockets and RSS are read from ``/proc`` on Linux.
+
+Usage:
+    uv run python benchmarks/bench_clients.py [--tool SearchIndexTool]
+        [--max-concurrency 512] [--soak-seconds 120] [--soak-concurrency 64]
+"""
+
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from fake_opensearch import serve_fake
+from typing import Any, Awaitable, Callable, List, Optional
+
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+# Arguments of the tools the benchmark can call
+TOOL_ARGUMENTS = {
+    'SearchIndexTool': {'index': 'logs-1', 'query': {'query': {'match_all': {}}}},
+    'ListIndexTool': {},
+    'GetClusterStateTool': {},
+}
+# Part of the soak after which descriptors and memory must stop growing
+SOAK_WARMUP_FRACTION = 0.2
+
+
+def open_descriptors() -> tuple[Optional[int], Optional[int]]:
+    """Return the number of open file descriptors and sockets of this process."""
+    fd_dir = '/proc/self/fd'
+    if not os.path.isdir(fd_dir):
+        return None, None
+    fds = sockets = 0
+    for fd in os.listdir(fd_dir):
+        try:
+            target = os.readlink(os.path.join(fd_dir, fd))
+        except OSError:
+            continue
+        fds += 1
+        sockets += target.startswith('socket:')
+    return fds, sockets
+
+
+def rss_mb() -> Optional[float]:
+    """Return the resident set size of this process in MB."""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Return the q-quantile of values, using the nearest-rank method."""
+    ordered = sorted(values)
+    return ordered[max(int(q * len(ordered) + 0.999999) - 1, 0)]
+
+
+async def run_calls(
+    call: Callable[[], Awaitable[Any]], calls: int, concurrency: int
+) -> tuple[float, List[float]]:
+    """Run calls calls from concurrency concurrent callers, return elapsed and latencies."""
+    latencies: List[float] = []
+    remaining = calls
+
+    async def caller() -> None:
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            await call()
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(caller() for _ in range(concurrency)))
+    return time.perf_counter() - start, latencies
+
+
+async def scaling(tool: dict, tool_args: Any, max_concurrency: int, calls: int) -> None:
+    """Measure tool calls and shared-client requests at increasing concurrency."""
+    from opensearch.client import initialize_client
+
+    async def tool_call() -> None:
+        await tool['function'](tool_args)
+
+    shared_client = initialize_client(tool_args)
+    search_body = TOOL_ARGUMENTS['SearchIndexTool']['query']
+
+    async def shared_call() -> None:
+        await shared_client.search(index='logs-1', body=search_body)
+
+    print(
+        f'{"concurrency":>11}{"mode":>10}{"calls/s":>10}{"p50 ms":>9}{"p99 ms":>9}'
+        f'{"fds":>6}{"sockets":>9}{"rss MB":>9}'
+    )
+    try:
+        concurrency = 1
+        while concurrency <= max_concurrency:
+            for mode, call in (('per-call', tool_call), ('shared', shared_call)):
+                elapsed, latencies = await run_calls(
+                    call, max(calls, 4 * concurrency), concurrency
+                )
+                fds, sockets = open_descriptors()
+                rss = rss_mb()
+                print(
+                    f'{concurrency:>11}{mode:>10}{len(latencies) / elapsed:>10.1f}'
+                    f'{percentile(latencies, 0.5) * 1000:>9.2f}'
+                    f'{percentile(latencies, 0.99) * 1000:>9.2f}'
+                    f'{fds if fds is not None else "-":>6}'
+                    f'{sockets if sockets is not None else "-":>9}'
+                    f'{f"{rss:.1f}" if rss is not None else "-":>9}',
+                    flush=True,
+                )
+            concurrency *= 2
+    finally:
+        await shared_client.close()
+
+
+async def soak(
+    tool: dict, tool_args: Any, concurrency: int, seconds: float, interval: float
+) -> List[tuple]:
+    """Run tool calls for seconds and sample descriptors and memory every interval."""
+    samples: List[tuple] = []
+    calls = 0
+    deadline = time.monotonic() + seconds
+
+    async def caller() -> None:
+        nonlocal calls
+        while time.monotonic() < deadline:
+            await tool['function'](tool_args)
+            calls += 1
+
+    async def sampler() -> None:
+        start = time.monotonic()
+        while time.monotonic() < deadline:
+            await asyncio.sleep(interval)
+            fds, sockets = open_descriptors()
+            sample = (round(time.monotonic() - start), calls, fds, sockets, rss_mb())
+            samples.append(sample)
+            print(
+                f'{sample[0]:>6}s {sample[1]:>9} calls  fds {sample[2]}  '
+                f'sockets {sample[3]}  rss {sample[4] or 0:.1f} MB',
+                flush=True,
+            )
+
+    await asyncio.gather(sampler(), *(caller() for _ in range(concurrency)))
+    return samples
+
+
+def check_growth(samples: List[tuple], max_fd_growth: int, max_rss_growth_mb: float) -> List[str]:
+    """Return the resources that kept growing after the warm-up part of the soak.
+
+    Descriptors go up and down with the calls in flight, so the peak of the second
+    half of the samples taken after the warm-up is compared with the peak of the
+    first half.
+    """
+    settled = samples[int(len(samples) * SOAK_WARMUP_FRACTION) :]
+    if len(settled) < 2:
+        return []
+    first, second = settled[: len(settled) // 2], settled[len(settled) // 2 :]
+    failures = []
+    for index, name in ((2, 'file descriptors'), (3, 'sockets')):
+        if first[0][index] is None:
+            continue
+        before = max(sample[index] for sample in first)
+        after = max(sample[index] for sample in second)
+        if after - before > max_fd_growth:
+            failures.append(f'{name} grew from {before} to {after}')
+    if first[0][4] is not None:
+        before = max(sample[4] for sample in first)
+        after = max(sample[4] for sample in second)
+        if after - before > max_rss_growth_mb:
+            failures.append(f'RSS grew from {before:.1f} MB to {after:.1f} MB')
+    return failures
+
+
+async def run(args: argparse.Namespace, port: int) -> List[str]:
+    """Run both phases and return the failures."""
+    os.environ['OPENSEARCH_URL'] = f'http://127.0.0.1:{port}'
+    os.environ['OPENSEARCH_NO_AUTH'] = 'true'
+    from tools.tools import TOOL_REGISTRY
+
+    tool = TOOL_REGISTRY[args.tool]
+    tool_args = tool['args_model'](opensearch_cluster_name='', **TOOL_ARGUMENTS[args.tool])
+
+    unclosed: List[str] = []
+
+    def exception_handler(loop: asyncio.AbstractEventLoop, context: dict) -> None:
+        # aiohttp reports clients that were never closed when they are collected
+        if 'Unclosed' in context.get('message', ''):
+            unclosed.append(context['message'])
+        loop.default_exception_handler(context)
+
+    asyncio.get_running_loop().set_exception_handler(exception_handler)
+
+    await scaling(tool, tool_args, args.max_concurrency, args.calls)
+    failures: List[str] = []
+    if args.soak_seconds > 0:
+        print(f'\nSoak: {args.soak_concurrency} concurrent calls for {args.soak_seconds}s')
+        samples = await soak(
+            tool, tool_args, args.soak_concurrency, args.soak_seconds, args.sample_interval
+        )
+        failures.extend(check_growth(samples, args.max_fd_growth, args.max_rss_growth_mb))
+    if unclosed:
+        failures.append(f'{len(unclosed)} unclosed aiohttp client sessions or connectors')
+    return failures
+
+
+def main() -> None:
+    """Start the fake cluster, run the benchmark and fail on unbounded growth."""
+    parser = argparse.ArgumentParser(description='Client layer scaling and soak benchmark')
+    parser.add_argument('--tool', choices=list(TOOL_ARGUMENTS), default='SearchIndexTool')
+    parser.add_argument('--max-concurrency', type=int, default=512)
+    parser.add_argument(
+        '--calls', type=int, default=500, help='Minimum calls per concurrency level'
+    )
+    parser.add_argument(
+        '--latency-ms', type=float, default=1, help='Latency of every OpenSearch response'
+    )
+    parser.add_argument('--rows', type=int, default=10, help='Search hits per response')
+    parser.add_argument('--doc-bytes', type=int, default=200, help='Size of every search hit')
+    parser.add_argument('--soak-seconds', type=float, default=120, help='0 skips the soak')
+    parser.add_argument('--soak-concurrency', type=int, default=64)
+    parser.add_argument('--sample-interval', type=float, default=5)
+    parser.add_argument('--max-fd-growth', type=int, default=32)
+    parser.add_argument('--max-rss-growth-mb', type=float, default=64)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    parent_pipe, child_pipe = multiprocessing.Pipe()
+    server = multiprocessing.get_context('spawn').Process(
+        target=serve_fake,
+        args=(child_pipe, args.latency_ms / 1000, args.rows, args.doc_bytes),
+        daemon=True,
+    )
+    server.start()
+    try:
+        port = parent_pipe.recv()
+        failures = asyncio.run(run(args, port))
+    finally:
+        server.terminate()
+        server.join()
+
+    for failure in failures:
+        print(f'FAIL: {failure}')
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,216 @@
+# Copyright OpenSearch Contributors
+# SPDX-License-Identifier: Apache-2.0
+
+"""Memory benchmark of the tools that return large OpenSearch responses.
+
+``GetClusterStateTool``, ``SearchIndexTool`` (JSON and CSV) and ``GetSegmentsTool``
+hold the response several times while they format it: the raw body, the parsed
+objects, the formatted text and the message it is wrapped in. For every tool and
+response size (``--sizes``, in MB), the benchmark calls the tool in-process against
+a ``FakeOpenSearch`` in another process, under tracemalloc, and reports:
+
+- the peak memory allocated by the tool call
+- the peak while the result is encoded to JSON as the server sends it, the result
+  included
+- both peaks per MB of OpenSearch response, and the size of the encoded result
+
+The exit status is 1 when the peak per MB of a case grows by more than
+``--tolerance`` against ``benchmarks/baseline_memory.json``. Allocations do not depend
+on the machine, but they do on the Python version, which is stored in the baseline.
+
+Usage:
+    uv run python benchmarks/bench_memory.py [--sizes 1,4,16] [--cases CASE,...]
+        [--baseline FILE] [--write-baseline]
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import multiprocessing
+import os
+import sys
+import tracemalloc
+from fake_opensearch import FakeOpenSearch, serve_fake
+from typing import Any, Dict, List, Optional
+
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), 'baseline_memory.json')
+MB = 1024 * 1024
+# Hits of the search responses; their size is set by doc_bytes instead
+SEARCH_HITS = 100
+
+SEARCH = {'index': 'logs-1', 'query': {'query': {'match_all': {}}}, 'size': SEARCH_HITS}
+# Key: case name, Value: tool, arguments and the FakeOpenSearch response it reads
+CASES = {
+    'GetClusterStateTool': ('GetClusterStateTool', {}, 'cluster_state'),
+    'SearchIndexTool-json': ('SearchIndexTool', SEARCH, 'search'),
+    'SearchIndexTool-csv': ('SearchIndexTool', {**SEARCH, 'format': 'csv'}, 'search'),
+    'GetSegmentsTool': ('GetSegmentsTool', {}, 'cat'),
+}
+
+
+def fake_options(route: str, size_mb: float) -> tuple[int, int]:
+    """Return the rows and doc_bytes that make the response of a route size_mb large."""
+    target = size_mb * MB
+    if route == 'search':
+        fixed = len(FakeOpenSearch(rows=SEARCH_HITS, doc_bytes=0).body(route))
+        return SEARCH_HITS, max(int((target - fixed) / SEARCH_HITS), 0)
+    fixed = len(FakeOpenSearch(rows=0).body(route))
+    per_row = (len(FakeOpenSearch(rows=100).body(route)) - fixed) / 100
+    return max(int((target - fixed) / per_row), 1), 200
+
+
+def encode_result(content: List[dict]) -> str:
+    """Encode a tool result like the server does before sending it."""
+    from mcp.types import CallToolResult, TextContent
+
+    result = CallToolResult(content=[TextContent(**item) for item in content])
+    return result.model_dump_json(by_alias=True, exclude_none=True)
+
+
+async def measure(tool: dict, arguments: dict) -> Dict[str, Any]:
+    """Call a tool under tracemalloc and return its peak memory and output size."""
+    tool_args = tool['args_model'](opensearch_cluster_name='', **arguments)
+    # Warm up the imports, caches and version checks outside of the measurement
+    encode_result(await tool['function'](tool_args))
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        content = await tool['function'](tool_args)
+        _, tool_peak = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        encoded = encode_result(content)
+        _, encode_peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    text = content[0]['text']
+    if text.startswith('Error'):
+        raise RuntimeError(text[:200])
+    return {'tool_peak': tool_peak, 'encode_peak': encode_peak, 'result_bytes': len(encoded)}
+
+
+async def run_case(tool: dict, arguments: dict, route: str, size_mb: float) -> Dict[str, Any]:
+    """Measure one case against a FakeOpenSearch serving responses of size_mb."""
+    rows, doc_bytes = fake_options(route, size_mb)
+    response_bytes = len(FakeOpenSearch(rows=rows, doc_bytes=doc_bytes).body(route))
+    parent_pipe, child_pipe = multiprocessing.Pipe()
+    server = multiprocessing.get_context('spawn').Process(
+        target=serve_fake, args=(child_pipe, 0, rows, doc_bytes), daemon=True
+    )
+    server.start()
+    try:
+        os.environ['OPENSEARCH_URL'] = f'http://127.0.0.1:{parent_pipe.recv()}'
+        stats = await measure(tool, arguments)
+    finally:
+        server.terminate()
+        server.join()
+    response_mb = response_bytes / MB
+    return {
+        'response_mb': round(response_mb, 2),
+        'tool_peak_mb': round(stats['tool_peak'] / MB, 2),
+        'encode_peak_mb': round(stats['encode_peak'] / MB, 2),
+        'result_mb': round(stats['result_bytes'] / MB, 2),
+        'tool_peak_per_mb': round(stats['tool_peak'] / response_bytes, 2),
+        'encode_peak_per_mb': round(stats['encode_peak'] / response_bytes, 2),
+    }
+
+
+async def run(cases: List[str], sizes: List[float]) -> dict:
+    """Measure every case at every response size."""
+    os.environ['OPENSEARCH_NO_AUTH'] = 'true'
+    from tools.tools import TOOL_REGISTRY
+
+    results: Dict[str, Dict[str, dict]] = {}
+    for case in cases:
+        name, arguments, route = CASES[case]
+        results[case] = {}
+        for size_mb in sizes:
+            stats = await run_case(TOOL_REGISTRY[name], arguments, route, size_mb)
+            results[case][f'{size_mb:g}'] = stats
+            print(
+                f'{case:<24}{stats["response_mb"]:>10.2f}{stats["tool_peak_mb"]:>10.2f}'
+                f'{stats["encode_peak_mb"]:>10.2f}{stats["result_mb"]:>10.2f}'
+                f'{stats["tool_peak_per_mb"]:>10.2f}{stats["encode_peak_per_mb"]:>10.2f}',
+                flush=True,
+            )
+    return {'config': {'python': sys.version.split()[0]}, 'results': results}
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> List[str]:
+    """Return the regressions of the results against the baseline."""
+    regressions = []
+    for case, sizes in results['results'].items():
+        for size, stats in sizes.items():
+            previous = baseline.get('results', {}).get(case, {}).get(size)
+            if not previous:
+                continue
+            for key in ('tool_peak_per_mb', 'encode_peak_per_mb'):
+                if stats[key] > previous[key] * (1 + tolerance):
+                    regressions.append(
+                        f'{case} at {size} MB: {key} {stats[key]}, baseline {previous[key]}'
+                    )
+    return regressions
+
+
+def main() -> None:
+    """Run the benchmark and compare the results against the baseline."""
+    parser = argparse.ArgumentParser(description='Memory benchmark of large-response tools')
+    parser.add_argument('--sizes', default='1,4,16', help='Comma-separated response sizes in MB')
+    parser.add_argument(
+        '--cases', default=','.join(CASES), help=f'Comma-separated cases of {", ".join(CASES)}'
+    )
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='Baseline JSON file')
+    parser.add_argument(
+        '--write-baseline', action='store_true', help='Store the results as the baseline'
+    )
+    parser.add_argument(
+        '--tolerance',
+        type=float,
+        default=0.1,
+        help='Allowed relative growth of the peak per MB against the baseline',
+    )
+    parser.add_argument('--output', default='', help='Also write the results to this file')
+    args = parser.parse_args()
+
+    cases = args.cases.split(',')
+    unknown = [case for case in cases if case not in CASES]
+    if unknown:
+        parser.error(f'Unknown cases: {", ".join(unknown)}')
+    sizes = [float(size) for size in args.sizes.split(',')]
+
+    print(
+        f'{"case":<24}{"resp MB":>10}{"tool MB":>10}{"encode MB":>10}{"result MB":>10}'
+        f'{"tool/MB":>10}{"encode/MB":>10}'
+    )
+    results = asyncio.run(run(cases, sizes))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.write_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+            f.write('\n')
+        print(f'Baseline written to {args.baseline}')
+        return
+
+    baseline: Optional[dict] = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    if baseline is not None:
+        if baseline.get('config', {}) != results['config']:
+            print('Note: the baseline was measured with a different Python version')
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f'REGRESSION: {regression}')
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
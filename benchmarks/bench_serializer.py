@@ -0,0 +1,102 @@
+# Copyright OpenSearch Contributors
+# SPDX-License-Identifier: Apache-2.0
+
+"""Micro-benchmark for request body serialization.
+
+Compares the previous approach (copy the body with every float converted to a plain
+notation number, then encode it with the default serializer) against
+``PlainFloatJSONSerializer``, which renders floats in plain notation while encoding.
+
+Usage:
+    uv run python benchmarks/bench_serializer.py [--number N]
+"""
+
+import argparse
+import math
+import timeit
+import tracemalloc
+from decimal import Decimal
+from opensearch.serializer import PlainFloatJSONSerializer
+from opensearchpy.serializer import JSONSerializer
+
+
+def plain_float(value: float):
+    """Convert a float to an int or float without scientific notation, as done previously."""
+    if math.isnan(value) or math.isinf(value):
+        return None
+    text = format(Decimal(str(value)).normalize(), 'f')
+    if '.' in text:
+        text = text.rstrip('0').rstrip('.')
+    if text in ('', '-'):
+        text = '0'
+    return int(text) if '.' not in text else float(text)
+
+
+def normalize_scientific_notation(value):
+    """Copy a body with every float passed through ``plain_float``, as done previously."""
+    if isinstance(value, dict):
+        return {key: normalize_scientific_notation(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [normalize_scientific_notation(item) for item in value]
+    if isinstance(value, float):
+        return plain_float(value)
+    return value
+
+
+def build_bodies() -> dict:
+    """Build representative search bodies."""
+    return {
+        'terms_10k_strings': {
+            'query': {'terms': {'user.id': [f'user-{i}' for i in range(10_000)]}},
+            'size': 10,
+        },
+        'script_10k_floats': {
+            'query': {
+                'script_score': {
+                    'query': {'match_all': {}},
+                    'script': {
+                        'source': "cosineSimilarity(params.vector, 'embedding') + 1.0",
+                        'params': {'vector': [i * 1.0e-7 for i in range(10_000)]},
+                    },
+                }
+            },
+            'size': 10,
+        },
+        'range_epoch_millis': {
+            'query': {'range': {'timestamp': {'gte': 1732693003e3, 'lte': 1732779403e3}}},
+            'size': 10,
+        },
+    }
+
+
+def measure(func, body, number: int) -> tuple[float, int]:
+    """Return the mean time in microseconds and the peak allocation in bytes."""
+    seconds = timeit.timeit(lambda: func(body), number=number)
+    tracemalloc.start()
+    func(body)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds / number * 1e6, peak
+
+
+def main() -> None:
+    """Run the benchmark and print a comparison table."""
+    parser = argparse.ArgumentParser(description='Request serializer micro-benchmark')
+    parser.add_argument('--number', type=int, default=50, help='Iterations per case')
+    args = parser.parse_args()
+
+    default_serializer = JSONSerializer()
+    plain_serializer = PlainFloatJSONSerializer()
+
+    def previous(body):
+        return default_serializer.dumps(normalize_scientific_notation(body))
+
+    print(f'{"case":<22} {"approach":<10} {"mean (us)":>12} {"peak (KiB)":>12}')
+    for name, body in build_bodies().items():
+        for label, func in (('previous', previous), ('plain', plain_serializer.dumps)):
+            mean_us, peak = measure(func, body, args.number)
+            print(f'{name:<22} {label:<10} {mean_us:>12.1f} {peak / 1024:>12.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+# Copyright OpenSearch Contributors
+# SPDX-License-Identifier: Apache-2.0
+
+"""Cold-start import benchmark for the server entry points.
+
+Imports an entry point in fresh interpreters with ``python -X importtime``, reports
+the median import time and the most expensive modules, and fails when the import
+takes longer than ``--max-ms`` or loads a module the entry point should not need
+(for example boto3 or the streaming server for stdio). Desktop MCP clients start the
+stdio server once per session, so its import time is part of every session start.
+
+Usage:
+    uv run python benchmarks/bench_startup.py [--target stdio|stream|main] [--runs N] [--max-ms MS]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+
+TARGETS = {
+    'stdio': 'mcp_server_opensearch.stdio_server',
+    'stream': 'mcp_server_opensearch.streaming_server',
+    'main': 'mcp_server_opensearch',
+}
+# Modules each entry point must not import; they belong to other transports or to
+# authentication paths that are loaded on first use
+FORBIDDEN_MODULES = {
+    'stdio': ('boto3', 'botocore', 'opensearchpy', 'mcp_server_opensearch.streaming_server'),
+    'stream': ('boto3', 'botocore', 'opensearchpy', 'mcp_server_opensearch.stdio_server'),
+    'main': (
+        'boto3',
+        'opensearchpy',
+        'mcp_server_opensearch.stdio_server',
+        'mcp_server_opensearch.streaming_server',
+    ),
+}
+# Median import time budgets in milliseconds, generous enough for slow CI machines
+DEFAULT_MAX_MS = {'stdio': 1500, 'stream': 1500, 'main': 250}
+
+
+def import_profile(module: str) -> dict:
+    """Import a module in a fresh interpreter and return the cumulative time per module.
+
+    Returns:
+        dict: Cumulative import time in microseconds by module name
+    """
+    src = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+    python_path = os.pathsep.join(filter(None, [src, os.getenv('PYTHONPATH')]))
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True,
+        text=True,
+        env={**os.environ, 'PYTHONPATH': python_path},
+        check=True,
+    )
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative_us, name = line[len('import time:') :].split('|', 2)
+        if cumulative_us.strip().isdigit():
+            cumulative[name.strip()] = int(cumulative_us)
+    return cumulative
+
+
+def main() -> None:
+    """Run the benchmark, print a report and exit with 1 on a regression."""
+    parser = argparse.ArgumentParser(description='Entry point cold-start import benchmark')
+    parser.add_argument('--target', choices=sorted(TARGETS), default='stdio')
+    parser.add_argument('--runs', type=int, default=5, help='Fresh interpreters to measure')
+    parser.add_argument('--top', type=int, default=15, help='Most expensive modules to list')
+    parser.add_argument(
+        '--max-ms',
+        type=float,
+        default=None,
+        help='Fail if the median import time in ms is higher (default: per target budget, 0 disables)',
+    )
+    args = parser.parse_args()
+
+    module = TARGETS[args.target]
+    max_ms = DEFAULT_MAX_MS[args.target] if args.max_ms is None else args.max_ms
+    profiles = [import_profile(module) for _ in range(args.runs)]
+    median_ms = statistics.median(profile[module] for profile in profiles) / 1000
+
+    print(f'{module}: median import time {median_ms:.0f} ms over {args.runs} runs')
+    print(f'{"module":<60} {"cumulative (ms)":>16}')
+    last = profiles[-1]
+    for name, cumulative_us in sorted(last.items(), key=lambda item: -item[1])[1 : args.top + 1]:
+        print(f'{name:<60} {cumulative_us / 1000:>16.1f}')
+
+    failures = []
+    loaded = [name for name in FORBIDDEN_MODULES[args.target] if name in last]
+    if loaded:
+        failures.append(f'imports modules it should load lazily: {", ".join(loaded)}')
+    if max_ms and median_ms > max_ms:
+        failures.append(f'median import time {median_ms:.0f} ms exceeds {max_ms:.0f} ms')
+    for failure in failures:
+        print(f'REGRESSION: {module} {failure}')
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,347 @@
+# Copyright OpenSearch Contributors
+# SPDX-License-Identifier: Apache-2.0
+
+"""End-to-end tool call benchmark.
+
+Starts the server as a subprocess on each transport (stdio and streamable HTTP),
+pointed at an in-process ``FakeOpenSearch`` with configurable latency and response
+sizes, and calls every tool of ``TOOL_REGISTRY`` through the MCP client SDK. Reports
+calls per second, p50 and p99 latency and OpenSearch requests per call for every
+tool, and compares them against a stored baseline.
+
+The exit status is 1 when a tool is more than ``--tolerance`` slower than in the
+baseline (lower calls per second or higher p50) or when tool calls fail. p99 is
+reported but not compared, as it is too noisy on shared machines. Baselines
+depend on the machine: write one with ``--write-baseline`` before changing the
+code, then compare against it after the change.
+
+Usage:
+    uv run python benchmarks/bench_tools.py [--transport stdio|http|both] [--calls N]
+        [--concurrency N] [--latency-ms MS] [--rows N] [--baseline FILE] [--write-baseline]
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import socket
+import sys
+import time
+from aiohttp import ClientSession as HttpSession
+from contextlib import asynccontextmanager
+from fake_opensearch import FakeOpenSearch
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+from mcp.client.streamable_http import streamablehttp_client
+from typing import AsyncIterator, Dict, List, Optional
+
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), 'baseline_tools.json')
+TRANSPORTS = ('stdio', 'http')
+SERVER_START_TIMEOUT = 60
+
+TIME_RANGE = {
+    'selectionTimeRangeStart': '2025-01-01T00:00:00Z',
+    'selectionTimeRangeEnd': '2025-01-02T00:00:00Z',
+    'timeField': '@timestamp',
+}
+# Arguments every tool of TOOL_REGISTRY is called with; tools without an entry are
+# reported as skipped
+TOOL_ARGUMENTS = {
+    'ListIndexTool': {},
+    'IndexMappingTool': {'index': 'logs-1'},
+    'SearchIndexTool': {'index': 'logs-1', 'query': {'query': {'match_all': {}}}},
+    'GetShardsTool': {'index': 'logs-1'},
+    'GetClusterStateTool': {},
+    'GetSegmentsTool': {},
+    'CatNodesTool': {},
+    'GetIndexInfoTool': {'index': 'logs-1'},
+    'GetIndexStatsTool': {'index': 'logs-1'},
+    'GetQueryInsightsTool': {},
+    'GetNodesHotThreadsTool': {},
+    'GetAllocationTool': {},
+    'GetLongRunningTasksTool': {},
+    'GetNodesTool': {},
+    'GenericOpenSearchApiTool': {'path': '/_cluster/health'},
+    'DataDistributionTool': {'index': 'logs-1', **TIME_RANGE},
+    'LogPatternAnalysisTool': {'index': 'logs-1', 'logFieldName': 'message', **TIME_RANGE},
+    'FleetHealthTool': {},
+    'FleetAllocationTool': {},
+    'FleetNodeStatsTool': {},
+}
+
+
+def free_port() -> int:
+    """Return a free local TCP port."""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def server_env(opensearch_url: str) -> Dict[str, str]:
+    """Environment of the server subprocess: single mode against the fake, all tools."""
+    env = dict(os.environ)
+    env.update(
+        {
+            'OPENSEARCH_URL': opensearch_url,
+            'OPENSEARCH_NO_AUTH': 'true',
+            'OPENSEARCH_ENABLED_TOOLS_REGEX': '.*',
+        }
+    )
+    return env
+
+
+@asynccontextmanager
+async def connect(transport: str, env: Dict[str, str]) -> AsyncIterator[ClientSession]:
+    """Start the server on a transport and yield an initialized MCP client session."""
+    server_args = ['-m', 'mcp_server_opensearch', '--startup-timeout', '5']
+    if transport == 'stdio':
+        params = StdioServerParameters(command=sys.executable, args=server_args, env=env)
+        with open(os.devnull, 'w') as devnull:
+            async with stdio_client(params, errlog=devnull) as (read, write):
+                async with ClientSession(read, write) as session:
+                    await session.initialize()
+                    yield session
+        return
+
+    port = free_port()
+    process = await asyncio.create_subprocess_exec(
+        sys.executable,
+        *server_args,
+        '--transport',
+        'stream',
+        '--host',
+        '127.0.0.1',
+        '--port',
+        str(port),
+        env=env,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.DEVNULL,
+    )
+    try:
+        await wait_for_health(f'http://127.0.0.1:{port}/health', process)
+        async with streamablehttp_client(f'http://127.0.0.1:{port}/mcp') as (read, write, _):
+            async with ClientSession(read, write) as session:
+                await session.initialize()
+                yield session
+    finally:
+        if process.returncode is None:
+            process.terminate()
+        await process.wait()
+
+
+async def wait_for_health(url: str, process: asyncio.subprocess.Process) -> None:
+    """Wait until the streaming server answers its health check."""
+    deadline = time.monotonic() + SERVER_START_TIMEOUT
+    async with HttpSession() as http:
+        while time.monotonic() < deadline:
+            if process.returncode is not None:
+                raise RuntimeError(f'Server exited with status {process.returncode}')
+            try:
+                async with http.get(url) as response:
+                    if response.status == 200:
+                        return
+            except OSError:
+                pass
+            await asyncio.sleep(0.1)
+    raise RuntimeError(f'Server did not become healthy within {SERVER_START_TIMEOUT}s')
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Return the q-quantile of values, using the nearest-rank method."""
+    ordered = sorted(values)
+    return ordered[max(math.ceil(q * len(ordered)) - 1, 0)]
+
+
+async def bench_tool(
+    session: ClientSession,
+    fake: FakeOpenSearch,
+    name: str,
+    arguments: dict,
+    calls: int,
+    concurrency: int,
+    warmup: int,
+) -> dict:
+    """Call a tool calls times from concurrency concurrent callers."""
+    for _ in range(warmup):
+        await session.call_tool(name, arguments)
+
+    latencies: List[float] = []
+    errors = 0
+    remaining = calls
+
+    async def caller() -> None:
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            result = await session.call_tool(name, arguments)
+            latencies.append(time.perf_counter() - start)
+            text = result.content[0].text if result.content else ''
+            if result.isError or text.startswith('Error'):
+                errors += 1
+
+    requests_before = sum(fake.requests.values())
+    start = time.perf_counter()
+    await asyncio.gather(*(caller() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    requests = sum(fake.requests.values()) - requests_before
+    return {
+        'calls': calls,
+        'errors': errors,
+        'calls_per_sec': round(calls / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 2),
+        'requests_per_call': round(requests / calls, 2),
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> List[str]:
+    """Return the regressions of the results against the baseline."""
+    regressions = []
+    for transport, tools in results['results'].items():
+        for tool, stats in tools.items():
+            previous = baseline.get('results', {}).get(transport, {}).get(tool)
+            if not previous:
+                continue
+            if stats['calls_per_sec'] < previous['calls_per_sec'] * (1 - tolerance):
+                regressions.append(
+                    f'{transport} {tool}: {stats["calls_per_sec"]} calls/s, '
+                    f'baseline {previous["calls_per_sec"]}'
+                )
+            if stats['p50_ms'] > previous['p50_ms'] * (1 + tolerance):
+                regressions.append(
+                    f'{transport} {tool}: p50 {stats["p50_ms"]} ms, baseline {previous["p50_ms"]}'
+                )
+    return regressions
+
+
+async def run(args: argparse.Namespace) -> dict:
+    """Benchmark the selected tools on the selected transports."""
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+    from tools.tools import TOOL_REGISTRY
+
+    selected = args.tools.split(',') if args.tools else list(TOOL_REGISTRY)
+    transports = TRANSPORTS if args.transport == 'both' else (args.transport,)
+    results: Dict[str, Dict[str, dict]] = {}
+    skipped: Dict[str, str] = {}
+
+    async with FakeOpenSearch(args.latency_ms / 1000, args.rows, args.doc_bytes) as fake:
+        env = server_env(fake.url)
+        for transport in transports:
+            results[transport] = {}
+            async with connect(transport, env) as session:
+                listed = {tool.name for tool in (await session.list_tools()).tools}
+                for name in selected:
+                    if name not in TOOL_ARGUMENTS:
+                        skipped[name] = 'no benchmark arguments'
+                        continue
+                    if name not in listed:
+                        skipped[name] = 'not enabled by the server'
+                        continue
+                    stats = await bench_tool(
+                        session,
+                        fake,
+                        name,
+                        TOOL_ARGUMENTS[name],
+                        args.calls,
+                        args.concurrency,
+                        args.warmup,
+                    )
+                    results[transport][name] = stats
+                    print(
+                        f'{transport:<6}{name:<28}{stats["calls_per_sec"]:>10.1f}'
+                        f'{stats["p50_ms"]:>10.2f}{stats["p99_ms"]:>10.2f}'
+                        f'{stats["requests_per_call"]:>10.2f}{stats["errors"]:>8}',
+                        flush=True,
+                    )
+
+    return {
+        'config': {
+            'calls': args.calls,
+            'concurrency': args.concurrency,
+            'latency_ms': args.latency_ms,
+            'rows': args.rows,
+            'doc_bytes': args.doc_bytes,
+            'python': sys.version.split()[0],
+        },
+        'results': results,
+        'skipped': skipped,
+    }
+
+
+def main() -> None:
+    """Run the benchmark and compare the results against the baseline."""
+    parser = argparse.ArgumentParser(description='End-to-end tool call benchmark')
+    parser.add_argument('--transport', choices=[*TRANSPORTS, 'both'], default='both')
+    parser.add_argument('--tools', default='', help='Comma-separated tools, all by default')
+    parser.add_argument('--calls', type=int, default=200, help='Measured calls per tool')
+    parser.add_argument('--concurrency', type=int, default=4, help='Concurrent callers')
+    parser.add_argument('--warmup', type=int, default=10, help='Unmeasured calls per tool')
+    parser.add_argument(
+        '--latency-ms', type=float, default=0, help='Latency of every OpenSearch response'
+    )
+    parser.add_argument(
+        '--rows', type=int, default=100, help='Rows of _cat responses and hits of searches'
+    )
+    parser.add_argument('--doc-bytes', type=int, default=200, help='Size of every search hit')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='Baseline JSON file')
+    parser.add_argument(
+        '--write-baseline', action='store_true', help='Store the results as the baseline'
+    )
+    parser.add_argument(
+        '--tolerance',
+        type=float,
+        default=0.3,
+        help='Allowed relative drop of calls/s or growth of p50 against the baseline',
+    )
+    parser.add_argument('--output', default='', help='Also write the results to this file')
+    args = parser.parse_args()
+
+    print(
+        f'{"":<6}{"tool":<28}{"calls/s":>10}{"p50 ms":>10}{"p99 ms":>10}'
+        f'{"req/call":>10}{"errors":>8}'
+    )
+    results = asyncio.run(run(args))
+    for name, reason in results['skipped'].items():
+        print(f'skipped {name}: {reason}')
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.write_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+            f.write('\n')
+        print(f'Baseline written to {args.baseline}')
+        return
+
+    failed = False
+    errors = [
+        f'{transport} {tool}'
+        for transport, tools in results['results'].items()
+        for tool, stats in tools.items()
+        if stats['errors']
+    ]
+    if errors:
+        print(f'FAIL: tool calls returned errors: {", ".join(errors)}')
+        failed = True
+
+    baseline: Optional[dict] = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    if baseline is not None:
+        if baseline.get('config', {}) != results['config']:
+            print('Note: the baseline was measured with a different configuration')
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f'REGRESSION: {regression}')
+        failed = failed or bool(regressions)
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,219 @@
+# Copyright OpenSearch Contributors
+# SPDX-License-Identifier: Apache-2.0
+
+"""In-process stand-in for an OpenSearch cluster, used by the benchmarks.
+
+``FakeOpenSearch`` serves the endpoints the tools call (``/``, ``_cat/*``,
+``_search``, ``_cluster/state``, ``_mapping``, ``_stats``, ``_nodes``, ``_insights``,
+the ML tools API, ...) from an aiohttp server on a local port. Every response waits
+``latency`` seconds first, and the size of list responses (``_cat`` rows, search
+hits) is set by ``rows`` and ``doc_bytes``. Responses are rendered once at startup,
+so the stand-in adds as little CPU time as possible to the measurements.
+
+To keep its work out of measurements of the client process, ``serve_fake`` runs it in
+another process and sends its port back through a pipe.
+
+Usage:
+    async with FakeOpenSearch(latency=0.005, rows=100) as fake:
+        os.environ['OPENSEARCH_URL'] = fake.url
+"""
+
+import asyncio
+import json
+from aiohttp import web
+from collections import Counter
+from typing import Any, Optional
+
+
+# Recent enough for every tool of TOOL_REGISTRY
+VERSION = '3.3.0'
+
+
+class FakeOpenSearch:
+    """Fake OpenSearch cluster with configurable latency and response sizes."""
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        rows: int = 100,
+        doc_bytes: int = 200,
+        host: str = '127.0.0.1',
+        port: int = 0,
+    ):
+        """Initialize the cluster.
+
+        Args:
+            latency: Seconds every response is delayed
+            rows: Number of rows of the _cat and search responses
+            doc_bytes: Size of the source of every document
+            host: Address to listen on
+            port: Port to listen on, 0 for a free one
+        """
+        self.latency = latency
+        self.rows = rows
+        self.doc_bytes = doc_bytes
+        self.host = host
+        self.port = port
+        # Requests served, by method and route
+        self.requests: Counter = Counter()
+        self._runner: Optional[web.AppRunner] = None
+        self._responses = self._render_responses()
+
+    @property
+    def url(self) -> str:
+        """URL of the cluster, once started."""
+        return f'http://{self.host}:{self.port}'
+
+    def _render_responses(self) -> dict:
+        """Render the JSON body of every route once."""
+        filler = 'x' * max(self.doc_bytes - 60, 0)
+        docs = [
+            {
+                '_index': 'logs-1',
+                '_id': str(i),
+                '_score': 1.0,
+                '_source': {'@timestamp': '2025-01-01T00:00:00Z', 'message': filler},
+            }
+            for i in range(self.rows)
+        ]
+        cat_rows = [
+            {
+                'index': f'logs-{i}',
+                'health': 'green',
+                'status': 'open',
+                'pri': '1',
+                'rep': '1',
+                'docs.count': '1000',
+                'store.size': '1mb',
+                'shard': '0',
+                'prirep': 'p',
+                'state': 'STARTED',
+                'docs': '1000',
+                'store': '1mb',
+                'node': 'node-1',
+                'ip': '10.0.0.1',
+            }
+            for i in range(self.rows)
+        ]
+        mapping = {'properties': {'@timestamp': {'type': 'date'}, 'message': {'type': 'text'}}}
+        bodies: dict[str, Any] = {
+            'root': {
+                'name': 'node-1',
+                'cluster_name': 'bench',
+                'version': {'distribution': 'opensearch', 'number': VERSION},
+                'tagline': 'The OpenSearch Project: https://opensearch.org/',
+            },
+            'cat': cat_rows,
+            # The plugins the ML Commons and query insights tools need
+            'cat_plugins': [
+                {'name': 'node-1', 'component': component, 'version': VERSION}
+                for component in ('opensearch-ml', 'query-insights')
+            ],
+            'search': {
+                'took': 3,
+                'timed_out': False,
+                '_shards': {'total': 1, 'successful': 1, 'skipped': 0, 'failed': 0},
+                'hits': {'total': {'value': self.rows, 'relation': 'eq'}, 'hits': docs},
+            },
+            'cluster_state': {
+                'cluster_name': 'bench',
+                'cluster_uuid': 'bench',
+                'metadata': {
+                    'indices': {
+                        f'logs-{i}': {'state': 'open', 'mappings': {'_doc': mapping}}
+                        for i in range(self.rows)
+                    }
+                },
+            },
+            'cluster_health': {'cluster_name': 'bench', 'status': 'green', 'number_of_nodes': 1},
+            'index': {'logs-1': {'aliases': {}, 'mappings': mapping, 'settings': {}}},
+            'mapping': {'logs-1': {'mappings': mapping}},
+            'stats': {'_all': {'primaries': {'docs': {'count': 1000}}}, 'indices': {}},
+            'nodes': {
+                '_nodes': {'total': 1, 'successful': 1, 'failed': 0},
+                'nodes': {'node-1': {'name': 'node-1', 'version': VERSION}},
+            },
+            'insights': {'top_queries': []},
+            'ml_tool': {'inference_results': [{'output': [{'result': filler}]}]},
+            'empty': {},
+        }
+        return {name: json.dumps(body).encode() for name, body in bodies.items()}
+
+    def body(self, name: str) -> bytes:
+        """Return the rendered body of a response, by the name route() gives it."""
+        return self._responses[name]
+
+    def route(self, method: str, path: str) -> str:
+        """Return the name of the response served for a request."""
+        segments = [segment for segment in path.strip('/').split('/') if segment]
+        if not segments:
+            return 'root'
+        if segments[0] == '_nodes' and segments[-1] == 'hot_threads':
+            return 'hot_threads'
+        if segments[0] == '_cat':
+            return 'cat_plugins' if segments[1:] == ['plugins'] else 'cat'
+        if segments[0] == '_cluster':
+            return 'cluster_health' if 'health' in segments else 'cluster_state'
+        if segments[0] == '_nodes':
+            return 'nodes'
+        if segments[0] == '_insights':
+            return 'insights'
+        if segments[0] == '_plugins' and '_ml' in segments:
+            return 'ml_tool'
+        if segments[-1] in ('_search', '_msearch', '_count'):
+            return 'search'
+        if segments[-1] == '_mapping':
+            return 'mapping'
+        if segments[-1] == '_stats':
+            return 'stats'
+        if len(segments) == 1 and method in ('GET', 'HEAD'):
+            return 'index'
+        return 'empty'
+
+    async def handle(self, request: web.Request) -> web.Response:
+        """Answer a request with the pre-rendered response of its route."""
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        name = self.route(request.method, request.path)
+        self.requests[(request.method, name)] += 1
+        # Read the body like a cluster would, so request sizes count
+        await request.read()
+        if name == 'hot_threads':
+            return web.Response(text='::: {node-1}\n   Hot threads at 2025-01-01T00:00:00Z\n')
+        return web.Response(body=self._responses[name], content_type='application/json')
+
+    async def start(self) -> 'FakeOpenSearch':
+        """Start serving on the configured port, or on a free one if it is 0."""
+        app = web.Application(client_max_size=64 * 1024 * 1024)
+        app.router.add_route('*', '/{path:.*}', self.handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self) -> None:
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> 'FakeOpenSearch':
+        """Start serving."""
+        return await self.start()
+
+    async def __aexit__(self, *exc_info) -> None:
+        """Stop serving."""
+        await self.stop()
+
+
+def serve_fake(port_pipe: Any, latency: float, rows: int, doc_bytes: int) -> None:
+    """Run a FakeOpenSearch until the process is terminated, sending its port back."""
+
+    async def serve() -> None:
+        fake = await FakeOpenSearch(latency, rows, doc_bytes).start()
+        port_pipe.send(fake.port)
+        await asyncio.Event().wait()
+
+    asyncio.run(serve())
@@ -4,7 +4,7 @@
 import argparse
 import asyncio
 import logging
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 
 def parse_unknown_args_to_dict(unknown_args: List[str]) -> Dict[str, str]:
@@ -54,6 +54,122 @@ def main() -> None:
     parser.add_argument(
         '--port', type=int, default=9900, help='Port to listen on (streaming only)'
     )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Number of worker processes sharing the port (streaming only)',
+    )
+    parser.add_argument(
+        '--stateful',
+        action='store_true',
+        help='Keep per-session state (pinned clients, response cache, search preference) between calls of a streamable HTTP session (streaming only)',
+    )
+    parser.add_argument(
+        '--session-idle-timeout',
+        type=float,
+        default=1800,
+        help='Seconds without requests after which a stateful session expires (streaming only)',
+    )
+    parser.add_argument(
+        '--session-cache-ttl',
+        type=float,
+        default=0,
+        help='Seconds responses are cached within a stateful session, 0 (the default) disables the cache (streaming only)',
+    )
+    parser.add_argument(
+        '--event-store',
+        choices=['memory', 'sqlite', 'none'],
+        default='memory',
+        help='Where stateful sessions keep sent events so clients can resume with Last-Event-ID (streaming only)',
+    )
+    parser.add_argument(
+        '--event-store-path',
+        default='',
+        help='Database file of the sqlite event store, an in-memory database if empty',
+    )
+    parser.add_argument(
+        '--event-store-max-events',
+        type=int,
+        default=10000,
+        help='Maximum number of events kept by the event store, 0 for no limit',
+    )
+    parser.add_argument(
+        '--event-store-max-bytes',
+        type=int,
+        default=64 * 1024 * 1024,
+        help='Maximum total size in bytes of the events kept by the event store, 0 for no limit',
+    )
+    parser.add_argument(
+        '--event-store-max-age',
+        type=float,
+        default=600,
+        help='Seconds events are kept by the event store, 0 for no limit',
+    )
+    parser.add_argument(
+        '--warm-up',
+        action='store_true',
+        help='Connect to all configured clusters concurrently at startup and look up their versions',
+    )
+    parser.add_argument(
+        '--warm-up-timeout',
+        type=float,
+        default=10,
+        help='Seconds the startup warm-up may take before the server starts without the remaining clusters',
+    )
+    parser.add_argument(
+        '--startup-timeout',
+        type=float,
+        default=30,
+        help='Seconds the startup network lookups (API specs, version probe, warm-up) may take before the server starts without them, 0 for no limit',
+    )
+    parser.add_argument(
+        '--ready-interval',
+        type=float,
+        default=15,
+        help='Seconds between the background cluster probes behind /ready, 0 disables them',
+    )
+    parser.add_argument(
+        '--ready-failure-threshold',
+        type=int,
+        default=3,
+        help='Consecutive failed probes after which a cluster makes /ready fail',
+    )
+    parser.add_argument(
+        '--ready-require',
+        choices=['all', 'any'],
+        default='any',
+        help='Whether /ready needs any (default) or all of the probed clusters to be reachable',
+    )
+    parser.add_argument(
+        '--capability-interval',
+        type=float,
+        default=300,
+        help='Seconds between the background lookups of the version, plugins and compatible tools of every cluster in multi mode, 0 disables them',
+    )
+    parser.add_argument(
+        '--tracing',
+        choices=['otlp', 'file'],
+        default=None,
+        help='Export OpenTelemetry traces of tool calls to an OTLP collector or to a file (requires opentelemetry-sdk)',
+    )
+    parser.add_argument(
+        '--tracing-file',
+        default='',
+        help='File the spans are appended to as JSON lines, for --tracing file',
+    )
+    parser.add_argument(
+        '--profile-tools',
+        default='',
+        metavar='DIR',
+        help='Profile a sample of the tool calls and write per-tool cProfile statistics and collapsed stacks to DIR',
+    )
+    parser.add_argument(
+        '--profile-tools-rate',
+        type=float,
+        default=0.1,
+        help='Fraction of the tool calls profiled with --profile-tools',
+    )
     parser.add_argument(
         '--mode',
         choices=['single', 'multi'],
@@ -69,6 +185,18 @@ def main() -> None:
         default='',
         help='Path to a YAML configuration file',
     )
+    parser.add_argument(
+        '--config-watch-interval',
+        type=float,
+        default=0,
+        help='Seconds between checks of the --config file for changes, which are then reloaded without a restart; 0 reloads on SIGHUP only',
+    )
+    parser.add_argument(
+        '--config-drain-timeout',
+        type=float,
+        default=30,
+        help='Seconds the pinned clients of clusters changed by a reload stay open for the calls still using them',
+    )
     parser.add_argument(
         '--debug',
         action='store_true',
@@ -76,6 +204,34 @@ def main() -> None:
     )
 
     args, unknown = parser.parse_known_args()
+    if args.stateful and args.workers > 1:
+        # Session state lives in one process, and workers share the port without affinity
+        parser.error('--stateful cannot be combined with --workers greater than 1')
+    if args.workers > 1:
+        # Like --stateful, the settings of stateful sessions need a single process
+        session_flags = [
+            f'--{dest.replace("_", "-")}'
+            for dest in (
+                'session_idle_timeout',
+                'session_cache_ttl',
+                'event_store',
+                'event_store_path',
+                'event_store_max_events',
+                'event_store_max_bytes',
+                'event_store_max_age',
+            )
+            if getattr(args, dest) != parser.get_default(dest)
+        ]
+        if session_flags:
+            parser.error(
+                f'{", ".join(session_flags)} cannot be combined with --workers greater than 1'
+            )
+    if args.tracing == 'file' and not args.tracing_file:
+        parser.error('--tracing file requires --tracing-file')
+    if not 0 < args.profile_tools_rate <= 1:
+        parser.error('--profile-tools-rate must be greater than 0 and at most 1')
+    if args.config_watch_interval < 0 or args.config_drain_timeout < 0:
+        parser.error('--config-watch-interval and --config-drain-timeout must not be negative')
 
     # Configure logging with appropriate level
     log_level = logging.DEBUG if args.debug else logging.INFO
@@ -87,21 +243,106 @@ def main() -> None:
     logger.info('Starting MCP server...')
     cli_tool_overrides = parse_unknown_args_to_dict(unknown)
 
-    # Import servers lazily to avoid circular imports at module load time
-    from .stdio_server import serve as serve_stdio
-    from .streaming_server import serve as serve_streaming
+    warm_up_timeout = args.warm_up_timeout if args.warm_up else None
+    startup_timeout = args.startup_timeout or None
+
+    if args.config_file_path:
+        from .config_reload import configure_config_reload
+
+        configure_config_reload(
+            args.config_file_path,
+            mode=args.mode,
+            cli_tool_overrides=cli_tool_overrides,
+            watch_interval=args.config_watch_interval,
+            drain_timeout=args.config_drain_timeout,
+        )
+
+    if args.mode == 'multi' and args.capability_interval > 0:
+        from .capabilities import configure_capabilities
+
+        configure_capabilities(args.capability_interval)
+
+    if args.profile_tools:
+        from .profiling import configure_profiling
+
+        configure_profiling(args.profile_tools, args.profile_tools_rate)
+
+    if args.tracing:
+        from .tracing import configure_tracing
+
+        configure_tracing(args.tracing, args.tracing_file)
+        logger.info(f'Tracing tool calls with the {args.tracing} exporter')
+    try:
+        _serve(args, cli_tool_overrides, warm_up_timeout, startup_timeout)
+    finally:
+        if args.tracing:
+            from .tracing import shutdown_tracing
+
+            shutdown_tracing()
+        if args.profile_tools:
+            from .profiling import shutdown_profiling
+
+            shutdown_profiling()
 
-    # Start the appropriate server based on transport type
+
+def _serve(
+    args: argparse.Namespace,
+    cli_tool_overrides: Dict[str, str],
+    warm_up_timeout: Optional[float],
+    startup_timeout: Optional[float],
+) -> None:
+    """Start the server of the transport chosen on the command line."""
+    # Import only the server of the chosen transport, to keep start-up fast
     if args.transport == 'stdio':
+        from .stdio_server import serve as serve_stdio
+
         asyncio.run(
             serve_stdio(
                 mode=args.mode,
                 profile=args.profile,
                 config_file_path=args.config_file_path,
                 cli_tool_overrides=cli_tool_overrides,
+                warm_up_timeout=warm_up_timeout,
+                startup_timeout=startup_timeout,
             )
         )
+        return
+
+    from .readiness import configure_readiness
+    from .streaming_server import serve as serve_streaming, serve_workers
+
+    configure_readiness(
+        interval=args.ready_interval,
+        failure_threshold=args.ready_failure_threshold,
+        require=args.ready_require,
+    )
+
+    if args.workers > 1:
+        serve_workers(
+            host=args.host,
+            port=args.port,
+            workers=args.workers,
+            mode=args.mode,
+            profile=args.profile,
+            config_file_path=args.config_file_path,
+            cli_tool_overrides=cli_tool_overrides,
+            warm_up_timeout=warm_up_timeout,
+            startup_timeout=startup_timeout,
+            profile_tools=args.profile_tools,
+            profile_tools_rate=args.profile_tools_rate,
+        )
     else:
+        event_store = None
+        if args.stateful:
+            from .event_store import create_event_store
+
+            event_store = create_event_store(
+                args.event_store,
+                path=args.event_store_path,
+                max_events=args.event_store_max_events,
+                max_bytes=args.event_store_max_bytes,
+                max_age=args.event_store_max_age,
+            )
         asyncio.run(
             serve_streaming(
                 host=args.host,
@@ -110,6 +351,12 @@ def main() -> None:
                 profile=args.profile,
                 config_file_path=args.config_file_path,
                 cli_tool_overrides=cli_tool_overrides,
+                stateless=not args.stateful,
+                session_idle_timeout=args.session_idle_timeout,
+                session_cache_ttl=args.session_cache_ttl,
+                event_store=event_store,
+                warm_up_timeout=warm_up_timeout,
+                startup_timeout=startup_timeout,
             )
         )
 
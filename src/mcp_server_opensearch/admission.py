@@ -0,0 +1,373 @@
+# Copyright OpenSearch Contributors
+# SPDX-License-Identifier: Apache-2.0
+
+"""Admission control for tool calls.
+
+Tool calls are admitted through a concurrency limit per tool and per cluster. Calls
+over a limit wait in a bounded queue for at most ``queue_timeout`` seconds; calls that
+find the queue full or run out of time are rejected right away with an
+``OverloadedError`` instead of piling up on the coordinating node.
+
+Limits are read from the ``admission_control`` section of the config file:
+
+.. code-block:: yaml
+
+    admission_control:
+      cluster_concurrency: 8     # default limit per cluster (0 = unlimited)
+      tool_concurrency: 0        # default limit per tool (0 = unlimited)
+      queue_size: 32             # calls allowed to wait per limit
+      queue_timeout: 5           # seconds a call may wait before it is rejected
+      clusters:
+        production: 4
+      tools:
+        GetNodesHotThreadsTool: 1
+
+Without that section, or if it is invalid, no limits are applied. Cluster names that are not registered
+share the limit of a single ``<unknown>`` cluster, so arbitrary names sent by clients
+do not create new limiters.
+"""
+
+import asyncio
+import collections
+import contextlib
+import json
+import logging
+import time
+import yaml
+from mcp_server_opensearch.clusters_information import cluster_registry
+from mcp_server_opensearch.global_state import get_mode
+from pydantic import BaseModel, Field, ValidationError
+from typing import AsyncIterator, Deque, Dict, Optional
+
+
+logger = logging.getLogger(__name__)
+
+ADMISSION_CONTROL_STRING = 'admission_control'
+# Cluster label used for calls without a cluster name (single mode)
+DEFAULT_CLUSTER_NAME = 'default'
+# Cluster label shared by calls to cluster names that are not registered
+UNKNOWN_CLUSTER_NAME = '<unknown>'
+
+
+class AdmissionConfig(BaseModel):
+    """Model representing the admission_control section of the config file."""
+
+    cluster_concurrency: int = Field(default=0, ge=0)
+    tool_concurrency: int = Field(default=0, ge=0)
+    queue_size: int = Field(default=32, ge=0)
+    queue_timeout: float = Field(default=5.0, ge=0)
+    clusters: Dict[str, int] = Field(default_factory=dict)
+    tools: Dict[str, int] = Field(default_factory=dict)
+
+
+class OverloadedError(Exception):
+    """Raised when a tool call is rejected by admission control.
+
+    The message is a JSON object, so MCP clients receive a structured error they can
+    recognize and retry later.
+    """
+
+    def __init__(self, scope: str, name: str, reason: str, limit: int, queued: int, waited: float):
+        """Initialize the error.
+
+        Args:
+            scope: 'tool' or 'cluster'
+            name: Name of the tool or cluster whose limit was hit
+            reason: 'queue_full' or 'queue_timeout'
+            limit: Concurrency limit
+            queued: Calls waiting when the call was rejected
+            waited: Seconds the call waited in the queue
+        """
+        self.scope = scope
+        self.name = name
+        self.reason = reason
+        self.limit = limit
+        self.queued = queued
+        self.waited = waited
+        super().__init__(json.dumps(self.to_dict()))
+
+    def to_dict(self) -> dict:
+        """Return the structured error sent to MCP clients."""
+        return {
+            'error': {
+                'type': 'overloaded',
+                'reason': self.reason,
+                'scope': self.scope,
+                'name': self.name,
+                'limit': self.limit,
+                'queued': self.queued,
+                'waited_ms': round(self.waited * 1000, 1),
+                'retryable': True,
+            }
+        }
+
+
+class ConcurrencyLimiter:
+    """Concurrency limit with a bounded FIFO queue of waiting calls.
+
+    Permits are handed directly to the oldest waiter on release, so queued calls are
+    admitted in order and cannot be overtaken by new arrivals.
+    """
+
+    def __init__(self, scope: str, name: str, limit: int, queue_size: int):
+        """Initialize the limiter.
+
+        Args:
+            scope: 'tool' or 'cluster'
+            name: Name of the tool or cluster
+            limit: Maximum number of concurrent calls
+            queue_size: Maximum number of waiting calls
+        """
+        self.scope = scope
+        self.name = name
+        self.limit = limit
+        self.queue_size = queue_size
+        self.active = 0
+        self._waiters: Deque[asyncio.Future] = collections.deque()
+        # Statistics
+        self.admitted = 0
+        self.rejected = 0
+        self.wait_count = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    @property
+    def queued(self) -> int:
+        """Number of calls waiting for a permit."""
+        return len(self._waiters)
+
+    async def acquire(self, deadline: float) -> None:
+        """Take a permit, waiting in the queue until the monotonic deadline at most.
+
+        Args:
+            deadline: ``time.monotonic()`` value after which the call is rejected
+
+        Raises:
+            OverloadedError: If the queue is full or the deadline passes
+        """
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            self.admitted += 1
+            return
+
+        if len(self._waiters) >= self.queue_size:
+            self.rejected += 1
+            raise OverloadedError(
+                self.scope, self.name, 'queue_full', self.limit, len(self._waiters), 0.0
+            )
+
+        started = time.monotonic()
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, max(deadline - started, 0))
+        except BaseException as e:
+            if waiter.done() and not waiter.cancelled():
+                # The permit was handed over just before the wait ended
+                self.release()
+            waited = time.monotonic() - started
+            self._record_wait(waited)
+            if isinstance(e, asyncio.TimeoutError):
+                self.rejected += 1
+                raise OverloadedError(
+                    self.scope, self.name, 'queue_timeout', self.limit, self.queued, waited
+                ) from None
+            raise
+        finally:
+            with contextlib.suppress(ValueError):
+                self._waiters.remove(waiter)
+
+        self.admitted += 1
+        self._record_wait(time.monotonic() - started)
+
+    def release(self) -> None:
+        """Return a permit, handing it to the oldest waiter if there is one."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    def _record_wait(self, waited: float) -> None:
+        self.wait_count += 1
+        self.wait_total += waited
+        self.wait_max = max(self.wait_max, waited)
+
+    def stats(self) -> dict:
+        """Return the limit, current load and wait times of the limiter."""
+        return {
+            'limit': self.limit,
+            'active': self.active,
+            'queued': self.queued,
+            'admitted': self.admitted,
+            'rejected': self.rejected,
+            'wait_count': self.wait_count,
+            'wait_avg_ms': round(self.wait_total / self.wait_count * 1000, 3)
+            if self.wait_count
+            else 0.0,
+            'wait_max_ms': round(self.wait_max * 1000, 3),
+        }
+
+
+class AdmissionController:
+    """Admit tool calls through per-tool and per-cluster concurrency limits."""
+
+    def __init__(self, config: AdmissionConfig):
+        """Initialize the controller.
+
+        Args:
+            config: Limits from the admission_control section of the config file
+        """
+        self.config = config
+        # Key: (scope, name), Value: limiter, created on first use
+        self._limiters: Dict[tuple, ConcurrencyLimiter] = {}
+
+    def _get_limiter(self, scope: str, name: str) -> Optional[ConcurrencyLimiter]:
+        key = (scope, name)
+        limiter = self._limiters.get(key)
+        if limiter is None:
+            if scope == 'tool':
+                limit = self.config.tools.get(name, self.config.tool_concurrency)
+            else:
+                limit = self.config.clusters.get(name, self.config.cluster_concurrency)
+            if not limit:
+                return None
+            limiter = ConcurrencyLimiter(scope, name, limit, self.config.queue_size)
+            self._limiters[key] = limiter
+        return limiter
+
+    @staticmethod
+    def _cluster_key(cluster_name: str) -> str:
+        """Map a cluster name from a tool call to the name its limit is kept under."""
+        if get_mode() == 'single' or not cluster_name:
+            return DEFAULT_CLUSTER_NAME
+        return cluster_name if cluster_name in cluster_registry else UNKNOWN_CLUSTER_NAME
+
+    @contextlib.asynccontextmanager
+    async def admit(
+        self, tool_name: Optional[str], cluster_name: Optional[str] = ''
+    ) -> AsyncIterator[None]:
+        """Hold a tool and a cluster permit for the duration of the context.
+
+        The tool permit is always taken before the cluster permit, and both share the
+        same queue deadline.
+
+        Args:
+            tool_name: Original (registry) name of the tool, None to take no tool permit
+            cluster_name: Name of the target cluster, empty in single mode, None to take
+                no cluster permit (tools that query several clusters take one per cluster)
+
+        Raises:
+            OverloadedError: If the call is rejected
+        """
+        deadline = time.monotonic() + self.config.queue_timeout
+        cluster_key = self._cluster_key(cluster_name) if cluster_name is not None else None
+        limiters = [
+            limiter
+            for limiter in (
+                self._get_limiter('tool', tool_name) if tool_name is not None else None,
+                self._get_limiter('cluster', cluster_key) if cluster_key is not None else None,
+            )
+            if limiter is not None
+        ]
+        acquired = []
+        try:
+            for limiter in limiters:
+                await limiter.acquire(deadline)
+                acquired.append(limiter)
+        except BaseException as e:
+            for limiter in reversed(acquired):
+                limiter.release()
+            if isinstance(e, OverloadedError):
+                logger.warning(f'Rejected {tool_name or "request"} on {cluster_key}: {e}')
+            raise
+
+        try:
+            yield
+        finally:
+            for limiter in reversed(acquired):
+                limiter.release()
+
+    def stats(self) -> dict:
+        """Return the current queue depth and wait times of every limiter."""
+        result = {'tools': {}, 'clusters': {}}
+        for (scope, name), limiter in self._limiters.items():
+            result['tools' if scope == 'tool' else 'clusters'][name] = limiter.stats()
+        return result
+
+
+# Admission controller of the running server, None when admission control is disabled
+_admission_controller: Optional[AdmissionController] = None
+
+
+def load_admission_config(config_file_path: str) -> Optional[AdmissionConfig]:
+    """Read the admission_control section from the config file.
+
+    Args:
+        config_file_path: Path to the YAML configuration file
+
+    Returns:
+        Optional[AdmissionConfig]: The parsed section, or None if it is not present or
+            invalid
+    """
+    if not config_file_path:
+        return None
+    try:
+        with open(config_file_path, 'r', encoding='utf-8') as f:
+            config = yaml.safe_load(f) or {}
+    except Exception as e:
+        logger.error(f'Error loading admission control config: {e}')
+        return None
+    section = config.get(ADMISSION_CONTROL_STRING)
+    if section is None:
+        return None
+    if not isinstance(section, dict):
+        logger.error(
+            f'Invalid {ADMISSION_CONTROL_STRING} config, admission control is disabled: '
+            f'expected a mapping, got {type(section).__name__}'
+        )
+        return None
+    try:
+        return AdmissionConfig(**section)
+    except ValidationError as e:
+        errors = '; '.join(
+            f'{".".join(str(part) for part in error["loc"])}: {error["msg"]}'
+            for error in e.errors()
+        )
+        logger.error(
+            f'Invalid {ADMISSION_CONTROL_STRING} config, admission control is disabled: {errors}'
+        )
+        return None
+
+
+def configure_admission(config_file_path: str) -> None:
+    """Enable admission control if the config file has an admission_control section.
+
+    Args:
+        config_file_path: Path to the YAML configuration file
+    """
+    global _admission_controller
+    admission_config = load_admission_config(config_file_path)
+    _admission_controller = AdmissionController(admission_config) if admission_config else None
+    if admission_config:
+        logger.info(f'Admission control enabled: {admission_config.model_dump()}')
+
+
+def get_admission_controller() -> Optional[AdmissionController]:
+    """Get the admission controller of the running server.
+
+    Returns:
+        Optional[AdmissionController]: The controller, or None if admission control is disabled
+    """
+    return _admission_controller
+
+
+@contextlib.asynccontextmanager
+async def admit(tool_name: Optional[str], cluster_name: Optional[str] = '') -> AsyncIterator[None]:
+    """Admit a tool call through the configured limits; a no-op when disabled."""
+    if _admission_controller is None:
+        yield
+        return
+    async with _admission_controller.admit(tool_name, cluster_name):
+        yield
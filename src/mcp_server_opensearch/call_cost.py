@@ -0,0 +1,145 @@
+# Copyright OpenSearch Contributors
+# SPDX-License-Identifier: Apache-2.0
+
+"""Cost of a tool call, returned in the ``_meta`` block of every tool result.
+
+While a tool call runs, the transport, the connection and the unparsed response
+readers add what they do to the ``CallCost`` of the call: the HTTP requests sent to
+OpenSearch, the bytes sent and received, the ``took`` times reported by OpenSearch,
+the session cache hits and misses and the clusters used. ``add_cost_meta`` wraps the
+call_tool handler of an MCP server, measures the wall time of the call and adds the
+cost to the result under the ``cost`` key of its ``_meta`` block.
+
+Tasks started by a tool inherit the cost of its call, so concurrent requests are
+counted as well.
+"""
+
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from mcp.server import Server
+from mcp.types import CallToolRequest, ServerResult
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+
+
+# Key of the cost in the _meta block of tool results
+COST_META_KEY = 'cost'
+
+
+@dataclass
+class CallCost:
+    """Work done for one tool call."""
+
+    http_requests: int = 0
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    # Sum of the took times of the responses, None if no response reported one
+    took_ms: Optional[int] = None
+    cache_hits: int = 0
+    cache_misses: int = 0
+    clusters: List[str] = field(default_factory=list)
+
+    def add_request(self, bytes_sent: int) -> None:
+        """Count an HTTP request sent to OpenSearch."""
+        self.http_requests += 1
+        self.bytes_sent += bytes_sent
+
+    def add_response(self, bytes_received: int) -> None:
+        """Count the bytes of a response body received from OpenSearch."""
+        self.bytes_received += bytes_received
+
+    def add_took(self, took: Any) -> None:
+        """Add the took time of an OpenSearch response, if it reported one."""
+        if isinstance(took, int) and not isinstance(took, bool):
+            self.took_ms = (self.took_ms or 0) + took
+
+    def add_cache_lookup(self, hit: bool) -> None:
+        """Count a lookup in the session response cache."""
+        if hit:
+            self.cache_hits += 1
+        else:
+            self.cache_misses += 1
+
+    def add_cluster(self, cluster: str) -> None:
+        """Record a cluster the call sent requests to."""
+        if cluster not in self.clusters:
+            self.clusters.append(cluster)
+
+    def to_meta(self, wall_time_ms: float) -> Dict[str, Any]:
+        """Return the cost as the value of the cost key of the result _meta block.
+
+        ``cache`` is 'hit' if every cacheable request was served from the session
+        cache, 'miss' if at least one was not, and None without cacheable requests.
+        ``cluster`` is the name of the cluster used, a list if the call used several.
+        """
+        cache: Optional[str] = None
+        if self.cache_misses:
+            cache = 'miss'
+        elif self.cache_hits:
+            cache = 'hit'
+        cluster: Union[None, str, List[str]] = None
+        if len(self.clusters) == 1:
+            cluster = self.clusters[0]
+        elif self.clusters:
+            cluster = list(self.clusters)
+        return {
+            'wall_time_ms': round(wall_time_ms, 1),
+            'took_ms': self.took_ms,
+            'http_requests': self.http_requests,
+            'bytes_sent': self.bytes_sent,
+            'bytes_received': self.bytes_received,
+            'cache': cache,
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses,
+            'cluster': cluster,
+        }
+
+
+# Cost of the tool call being executed
+_current_cost: ContextVar[Optional[CallCost]] = ContextVar('current_cost', default=None)
+
+
+def current_cost() -> Optional[CallCost]:
+    """Return the cost of the current tool call, or None outside of tool calls."""
+    return _current_cost.get()
+
+
+def with_cost_meta(
+    handler: Callable[[CallToolRequest], Awaitable[ServerResult]],
+) -> Callable[[CallToolRequest], Awaitable[ServerResult]]:
+    """Wrap a call_tool request handler so that its results carry the cost of the call.
+
+    The handler registered by ``Server.call_tool`` builds the result itself, so the
+    cost is added to the result it returns, including error results.
+
+    Args:
+        handler: The CallToolRequest handler of an MCP server
+
+    Returns:
+        The wrapped handler
+    """
+
+    async def handler_with_cost(request: CallToolRequest) -> ServerResult:
+        cost = CallCost()
+        token = _current_cost.set(cost)
+        start = time.monotonic()
+        try:
+            result = await handler(request)
+        finally:
+            _current_cost.reset(token)
+        wall_time_ms = (time.monotonic() - start) * 1000
+        result.root.meta = {**(result.root.meta or {}), COST_META_KEY: cost.to_meta(wall_time_ms)}
+        return result
+
+    return handler_with_cost
+
+
+def add_cost_meta(server: Server) -> None:
+    """Return the cost of every tool call of a server in the _meta block of its result.
+
+    Args:
+        server: MCP server whose call_tool handler is registered
+    """
+    handler = server.request_handlers.get(CallToolRequest)
+    if handler is not None:
+        server.request_handlers[CallToolRequest] = with_cost_meta(handler)
@@ -0,0 +1,287 @@
+# Copyright OpenSearch Contributors
+# SPDX-License-Identifier: Apache-2.0
+
+"""Per-cluster tool compatibility matrix of multi mode.
+
+In multi mode every tool is listed, since the clusters can run different versions,
+and each call looked the version of its cluster up with an extra ``info()`` request
+before checking the tool against it. A ``CapabilityMatrix`` refreshes in the
+background, every ``interval`` seconds, the version and installed plugins of every
+registered cluster and the set of tools compatible with it. Tool calls take the
+version from the matrix, so an incompatible call is rejected without a round trip,
+and ``/capabilities`` lists what each cluster supports.
+
+Entries older than twice the interval are not used, and clusters that failed their
+last refresh or use header authentication are not in the matrix; their tool calls
+look the version up as before.
+
+Some tools need a plugin besides a version, e.g. the ML Commons tools or the query
+insights tool, and name its component in ``required_plugins``. Their calls check the
+installed plugins before calling OpenSearch, so a cluster without the plugin gets a
+local error instead of a failed round trip. The plugins come from the matrix or,
+without it, are looked up once per cluster and reused for ``PLUGINS_TTL`` seconds.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from mcp_server_opensearch.clusters_information import cluster_registry
+from mcp_server_opensearch.global_state import get_mode
+from opensearch.fanout import fan_out
+from semver import Version
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CAPABILITY_INTERVAL = 300
+DEFAULT_CAPABILITY_TIMEOUT = 10
+DEFAULT_CAPABILITY_CONCURRENCY = 8
+
+# Seconds the plugins looked up by a tool call are reused
+PLUGINS_TTL = 300
+
+
+@dataclass
+class ClusterCapabilities:
+    """Version, plugins and compatible tools of one cluster."""
+
+    name: str
+    version: Optional[Version] = None
+    # Plugin components installed on the nodes of the cluster, e.g. opensearch-ml
+    plugins: List[str] = field(default_factory=list)
+    compatible_tools: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+    latency_ms: float = 0.0
+    checked_at: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the capabilities as a JSON-serializable dict."""
+        return {
+            'version': str(self.version) if self.version else None,
+            'plugins': self.plugins,
+            'compatible_tools': self.compatible_tools,
+            'error': self.error,
+            'latency_ms': round(self.latency_ms, 1),
+            'checked_at': self.checked_at,
+        }
+
+
+def compatible_tools(version: Optional[Version], plugins: Optional[List[str]] = None) -> List[str]:
+    """Return the names of the registered tools that support a cluster.
+
+    Args:
+        version: OpenSearch version of the cluster
+        plugins: Plugin components installed on the cluster, None if unknown
+
+    Returns:
+        List[str]: Names of the tools the version supports and whose plugins are installed
+    """
+    from tools.tools import TOOL_REGISTRY
+    from tools.utils import is_tool_compatible, missing_plugins
+
+    return sorted(
+        name
+        for name, info in TOOL_REGISTRY.items()
+        if is_tool_compatible(version, info) and not missing_plugins(plugins, info)
+    )
+
+
+def plugin_components(response: Optional[List[Dict[str, Any]]]) -> List[str]:
+    """Return the plugin components of a ``_cat/plugins`` response, once each."""
+    return sorted({plugin.get('component') for plugin in response or []} - {None})
+
+
+async def fetch_capabilities(args: Any) -> Dict[str, Any]:
+    """Look up the version and installed plugins of a cluster with one client."""
+    from opensearch.client import get_opensearch_client
+
+    async with get_opensearch_client(args) as client:
+        info, plugins = await asyncio.gather(client.info(), client.cat.plugins(format='json'))
+    return {
+        'version': Version.parse(info['version']['number']),
+        'plugins': plugin_components(plugins),
+    }
+
+
+class CapabilityMatrix:
+    """Refresh the capabilities of the registered clusters in the background."""
+
+    def __init__(
+        self,
+        interval: float = DEFAULT_CAPABILITY_INTERVAL,
+        timeout: float = DEFAULT_CAPABILITY_TIMEOUT,
+        max_concurrency: int = DEFAULT_CAPABILITY_CONCURRENCY,
+    ):
+        """Initialize the matrix, see ``configure_capabilities`` for the arguments."""
+        self.interval = interval
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        # Key: cluster name, Value: ClusterCapabilities of its last refresh
+        self.clusters: Dict[str, ClusterCapabilities] = {}
+        self.refreshes = 0
+
+    async def refresh(self, names: Optional[List[str]] = None) -> Dict[str, ClusterCapabilities]:
+        """Look up the capabilities of the clusters concurrently.
+
+        Args:
+            names: Clusters to refresh, all registered clusters if None
+
+        Returns:
+            Dict[str, ClusterCapabilities]: Capabilities of the refreshed clusters
+        """
+        if names is None:
+            names = sorted(cluster_registry) if get_mode() == 'multi' else []
+            # Clusters removed from the configuration no longer count
+            for name in set(self.clusters) - set(names):
+                del self.clusters[name]
+        # The connection of header authentication clusters is only known per request
+        names = [
+            name
+            for name in names
+            if name in cluster_registry and not cluster_registry[name].opensearch_header_auth
+        ]
+        results = await fan_out(
+            names, fetch_capabilities, lambda found: found, self.max_concurrency, self.timeout
+        )
+        refreshed = {}
+        for name, result in zip(names, results):
+            capabilities = ClusterCapabilities(
+                name, error=result.error, latency_ms=result.latency_ms, checked_at=time.time()
+            )
+            if result.error is None:
+                capabilities.version = result.summary['version']
+                capabilities.plugins = result.summary['plugins']
+                capabilities.compatible_tools = compatible_tools(
+                    capabilities.version, capabilities.plugins
+                )
+            else:
+                logger.warning(
+                    f'Could not look up the capabilities of cluster {name}: {result.error}'
+                )
+            refreshed[name] = self.clusters[name] = capabilities
+        self.refreshes += 1
+        return refreshed
+
+    def get(self, name: str) -> Optional[ClusterCapabilities]:
+        """Return the capabilities of a cluster if they are known and fresh.
+
+        Args:
+            name: Cluster name as used in tool arguments
+
+        Returns:
+            Optional[ClusterCapabilities]: The capabilities, or None if they have to be
+                looked up
+        """
+        capabilities = self.clusters.get(name)
+        if capabilities is None or capabilities.error is not None:
+            return None
+        if time.time() - capabilities.checked_at > 2 * self.interval:
+            return None
+        return capabilities
+
+    def forget(self, names: List[str]) -> None:
+        """Drop the capabilities of clusters whose configuration was removed or changed."""
+        for name in names:
+            self.clusters.pop(name, None)
+
+    def listing(self) -> Dict[str, Any]:
+        """Return the capabilities of all clusters for the /capabilities endpoint."""
+        return {
+            'interval': self.interval,
+            'refreshes': self.refreshes,
+            'clusters': {name: state.to_dict() for name, state in sorted(self.clusters.items())},
+        }
+
+    async def run(self) -> None:
+        """Refresh the capabilities every interval seconds until cancelled."""
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.warning(f'Capability refresh failed: {e}')
+            await asyncio.sleep(self.interval)
+
+
+# Capability matrix of the running server, None when it is disabled
+_capability_matrix: Optional[CapabilityMatrix] = None
+
+
+def configure_capabilities(
+    interval: float = DEFAULT_CAPABILITY_INTERVAL,
+    timeout: float = DEFAULT_CAPABILITY_TIMEOUT,
+    max_concurrency: int = DEFAULT_CAPABILITY_CONCURRENCY,
+) -> Optional[CapabilityMatrix]:
+    """Enable the background capability matrix of multi mode.
+
+    Args:
+        interval: Seconds between refreshes, 0 disables the matrix
+        timeout: Seconds the lookup of one cluster may take
+        max_concurrency: Maximum number of clusters looked up at the same time
+
+    Returns:
+        Optional[CapabilityMatrix]: The matrix, or None if it is disabled
+    """
+    global _capability_matrix
+    _capability_matrix = (
+        CapabilityMatrix(interval, timeout, max_concurrency) if interval > 0 else None
+    )
+    return _capability_matrix
+
+
+def get_capability_matrix() -> Optional[CapabilityMatrix]:
+    """Get the capability matrix of the running server.
+
+    Returns:
+        Optional[CapabilityMatrix]: The matrix, or None if it is disabled
+    """
+    return _capability_matrix
+
+
+def get_cluster_capabilities(name: str) -> Optional[ClusterCapabilities]:
+    """Return the fresh capabilities of a cluster, None if they are not known.
+
+    Args:
+        name: Cluster name as used in tool arguments
+
+    Returns:
+        Optional[ClusterCapabilities]: The capabilities, or None
+    """
+    if _capability_matrix is None:
+        return None
+    return _capability_matrix.get(name)
+
+
+# Plugins looked up by tool calls
+# Key: cluster name as used in tool arguments ('' in single mode), Value: (checked_at, plugins)
+_installed_plugins: Dict[str, Tuple[float, List[str]]] = {}
+
+
+def get_cached_plugins(name: str) -> Optional[List[str]]:
+    """Return the installed plugins of a cluster if they are known and fresh.
+
+    Args:
+        name: Cluster name as used in tool arguments ('' in single mode)
+
+    Returns:
+        Optional[List[str]]: The plugin components, or None if they have to be looked up
+    """
+    capabilities = get_cluster_capabilities(name)
+    if capabilities is not None:
+        return capabilities.plugins
+    cached = _installed_plugins.get(name)
+    if cached is None or time.time() - cached[0] > PLUGINS_TTL:
+        return None
+    return cached[1]
+
+
+def cache_plugins(name: str, plugins: List[str]) -> None:
+    """Remember the installed plugins of a cluster looked up by a tool call."""
+    _installed_plugins[name] = (time.time(), plugins)
+
+
+def forget_plugins(names: Iterable[str]) -> None:
+    """Drop the cached plugins of clusters whose configuration was removed or changed."""
+    for name in names:
+        _installed_plugins.pop(name, None)
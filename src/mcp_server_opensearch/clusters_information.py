@@ -4,8 +4,9 @@
 import logging
 import os
 import yaml
+from dataclasses import dataclass, field
 from pydantic import BaseModel
-from typing import Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 
 class ClusterInfo(BaseModel):
@@ -22,6 +23,7 @@ class ClusterInfo(BaseModel):
     opensearch_no_auth: Optional[bool] = None
     ssl_verify: Optional[bool] = None
     opensearch_header_auth: Optional[bool] = None
+    groups: Optional[List[str]] = None
 
 
 # Global dictionary to store cluster information
@@ -52,33 +54,17 @@ def get_cluster(name: str) -> Optional[ClusterInfo]:
     return cluster_registry.get(name)
 
 
-async def load_clusters_from_yaml(file_path: str) -> None:
-    """Load cluster configurations from a YAML file and populate the global registry.
-
-    Args:
-        file_path: Path to the YAML configuration file
-
-    Raises:
-        FileNotFoundError: If the YAML file doesn't exist
-        PermissionError: If the file cannot be read due to permissions
-        yaml.YAMLError: If the YAML file is malformed
-        UnicodeDecodeError: If the file has encoding issues
-        OSError: For other file system related errors
-    """
-    if not file_path:
-        return
-
+def _read_yaml(file_path: str) -> Any:
+    """Read and parse a YAML file, adding the file path to the errors."""
     # Check if file exists
     if not os.path.exists(file_path):
         raise FileNotFoundError(f'YAML file not found: {file_path}')
 
-    result = {'loaded_clusters': [], 'errors': [], 'total_clusters': 0}
-
     try:
         # Try to open and read the file with proper error handling
         try:
             with open(file_path, 'r', encoding='utf-8') as file:
-                config = yaml.safe_load(file)
+                return yaml.safe_load(file)
         except PermissionError as e:
             raise PermissionError(f'Permission denied reading YAML file {file_path}: {str(e)}')
         except UnicodeDecodeError as e:
@@ -91,45 +77,154 @@ async def load_clusters_from_yaml(file_path: str) -> None:
             )
         except OSError as e:
             raise OSError(f'OS error reading YAML file {file_path}: {str(e)}')
+    except yaml.YAMLError as e:
+        raise yaml.YAMLError(f'Invalid YAML format in {file_path}: {str(e)}')
+
 
-        # Process clusters
-        clusters = config.get('clusters', {})
-        result['total_clusters'] = len(clusters)
-        logging.info(f'Total clusters found in config file: {result["total_clusters"]}')
-
-        for cluster_name, cluster_config in clusters.items():
-            try:
-                # Validate required fields
-                if 'opensearch_url' not in cluster_config:
-                    result['errors'].append(f'Missing opensearch_url for cluster: {cluster_name}')
-                    continue
-                cluster_info = ClusterInfo(
-                    opensearch_url=cluster_config['opensearch_url'],
-                    iam_arn=cluster_config.get('iam_arn', None),
-                    aws_region=cluster_config.get('aws_region', None),
-                    opensearch_username=cluster_config.get('opensearch_username', None),
-                    opensearch_password=cluster_config.get('opensearch_password', None),
-                    profile=cluster_config.get('profile', None),
-                    is_serverless=cluster_config.get('is_serverless', None),
-                    timeout=cluster_config.get('timeout', None),
-                    opensearch_no_auth=cluster_config.get('opensearch_no_auth', None),
-                    ssl_verify=cluster_config.get('ssl_verify', None),
-                    opensearch_header_auth=cluster_config.get('opensearch_header_auth', None),
-                )
-
-                # Add cluster to registry without checking connection
-                add_cluster(name=cluster_name, cluster_info=cluster_info)
-                result['loaded_clusters'].append(cluster_name)
-
-            except Exception as e:
-                result['errors'].append(f"Error processing cluster '{cluster_name}': {str(e)}")
-
-        result['loaded_clusters'] = list(cluster_registry.keys())
-        if result['errors']:
-            logging.error(f'Loading errors: {result["errors"]}')
-
-        logging.info(f'Loaded clusters: {result["loaded_clusters"]}')
+def parse_clusters(config: Any) -> Tuple[Dict[str, ClusterInfo], List[str]]:
+    """Build the cluster configurations of a parsed YAML configuration.
+
+    Args:
+        config: Parsed content of the YAML configuration file
+
+    Returns:
+        Tuple[Dict[str, ClusterInfo], List[str]]: The valid clusters by name, and the
+            errors of the clusters that could not be built
+    """
+    clusters: Dict[str, ClusterInfo] = {}
+    errors: List[str] = []
+    for cluster_name, cluster_config in ((config or {}).get('clusters') or {}).items():
+        try:
+            # Validate required fields
+            if 'opensearch_url' not in cluster_config:
+                errors.append(f'Missing opensearch_url for cluster: {cluster_name}')
+                continue
+            clusters[cluster_name] = ClusterInfo(
+                opensearch_url=cluster_config['opensearch_url'],
+                iam_arn=cluster_config.get('iam_arn', None),
+                aws_region=cluster_config.get('aws_region', None),
+                opensearch_username=cluster_config.get('opensearch_username', None),
+                opensearch_password=cluster_config.get('opensearch_password', None),
+                profile=cluster_config.get('profile', None),
+                is_serverless=cluster_config.get('is_serverless', None),
+                timeout=cluster_config.get('timeout', None),
+                opensearch_no_auth=cluster_config.get('opensearch_no_auth', None),
+                ssl_verify=cluster_config.get('ssl_verify', None),
+                opensearch_header_auth=cluster_config.get('opensearch_header_auth', None),
+                groups=cluster_config.get('groups', None),
+            )
+        except Exception as e:
+            errors.append(f"Error processing cluster '{cluster_name}': {str(e)}")
+    return clusters, errors
+
+
+async def load_clusters_from_yaml(file_path: str) -> None:
+    """Load cluster configurations from a YAML file and populate the global registry.
+
+    Args:
+        file_path: Path to the YAML configuration file
+
+    Raises:
+        FileNotFoundError: If the YAML file doesn't exist
+        PermissionError: If the file cannot be read due to permissions
+        yaml.YAMLError: If the YAML file is malformed
+        UnicodeDecodeError: If the file has encoding issues
+        OSError: For other file system related errors
+    """
+    if not file_path:
         return
 
-    except yaml.YAMLError as e:
-        raise yaml.YAMLError(f'Invalid YAML format in {file_path}: {str(e)}')
+    clusters, errors = parse_clusters(_read_yaml(file_path))
+    logging.info(f'Total clusters found in config file: {len(clusters) + len(errors)}')
+
+    # Add clusters to registry without checking connection
+    for cluster_name, cluster_info in clusters.items():
+        add_cluster(name=cluster_name, cluster_info=cluster_info)
+
+    if errors:
+        logging.error(f'Loading errors: {errors}')
+    logging.info(f'Loaded clusters: {list(cluster_registry.keys())}')
+
+
+@dataclass
+class ClusterChanges:
+    """Difference between two sets of cluster configurations."""
+
+    added: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+
+    @property
+    def affected(self) -> List[str]:
+        """Clusters whose existing clients no longer match their configuration."""
+        return self.removed + self.changed
+
+    def __bool__(self) -> bool:
+        """Whether any cluster was added, removed or changed."""
+        return bool(self.added or self.removed or self.changed)
+
+
+def diff_clusters(old: Dict[str, ClusterInfo], new: Dict[str, ClusterInfo]) -> ClusterChanges:
+    """Compare two sets of cluster configurations by name.
+
+    Args:
+        old: Current clusters by name
+        new: Clusters that replace them
+
+    Returns:
+        ClusterChanges: Names of the added, removed and changed clusters
+    """
+
+    # Groups only select clusters for fleet tools, their clients stay valid
+    def connection(info: ClusterInfo) -> dict:
+        return info.model_dump(exclude={'groups'})
+
+    return ClusterChanges(
+        added=sorted(set(new) - set(old)),
+        removed=sorted(set(old) - set(new)),
+        changed=sorted(
+            name for name in set(old) & set(new) if connection(old[name]) != connection(new[name])
+        ),
+    )
+
+
+def read_clusters_from_yaml(file_path: str) -> Dict[str, ClusterInfo]:
+    """Read the cluster configurations of a YAML file without touching the registry.
+
+    Unlike ``load_clusters_from_yaml``, which skips invalid clusters, any invalid
+    cluster makes the whole file invalid, so that a bad edit is not half applied.
+
+    Args:
+        file_path: Path to the YAML configuration file
+
+    Returns:
+        Dict[str, ClusterInfo]: The clusters by name
+
+    Raises:
+        ValueError: If a cluster configuration is invalid
+        FileNotFoundError, PermissionError, yaml.YAMLError, UnicodeDecodeError, OSError:
+            If the file cannot be read, as for ``load_clusters_from_yaml``
+    """
+    clusters, errors = parse_clusters(_read_yaml(file_path))
+    if errors:
+        raise ValueError(f'Invalid clusters in {file_path}: {errors}')
+    return clusters
+
+
+def replace_clusters(clusters: Dict[str, ClusterInfo]) -> ClusterChanges:
+    """Replace the content of the global registry with new cluster configurations.
+
+    The registry is updated in place without awaiting, so no tool call sees a mix of
+    the old and new clusters, and modules that imported ``cluster_registry`` see the
+    new content.
+
+    Args:
+        clusters: The new clusters by name
+
+    Returns:
+        ClusterChanges: What changed against the previous clusters
+    """
+    changes = diff_clusters(cluster_registry, clusters)
+    cluster_registry.clear()
+    cluster_registry.update(clusters)
+    return changes
@@ -0,0 +1,381 @@
+# Copyright OpenSearch Contributors
+# SPDX-License-Identifier: Apache-2.0
+
+"""Reloading of the cluster and tool configuration without a restart.
+
+When the server runs with ``--config``, a ``ConfigReloader`` reloads the file on
+SIGHUP and, with ``--config-watch-interval``, whenever the file changes. A reload
+builds the new clusters (multi mode) and the new enabled tools completely before
+anything is replaced; if the file cannot be read, a cluster is invalid or the tool
+config is rejected, the reload fails and the running configuration stays as it was.
+
+A successful reload swaps the cluster registry and the enabled tools in place
+without awaiting in between, so a tool call sees either the old or the new
+configuration, never a mix. Only the clusters that were removed or whose settings
+changed are affected: their clients pinned to stateful sessions are unpinned, so
+the next calls connect with the new settings, and closed once the calls still
+using them had ``drain_timeout`` seconds to finish. Their cached versions,
+readiness and capabilities are dropped too, and the capabilities of added and
+changed clusters are looked up again. Clients of unchanged clusters are kept.
+When the enabled tools changed, the clients that listed them are sent a
+``notifications/tools/list_changed`` notification, so they list them again.
+
+Admission control limits are read at startup only and are not reloaded.
+"""
+
+import asyncio
+import logging
+import os
+import signal
+import weakref
+from dataclasses import dataclass, field
+from mcp.server.lowlevel import NotificationOptions, Server
+from mcp_server_opensearch.clusters_information import (
+    ClusterChanges,
+    read_clusters_from_yaml,
+    replace_clusters,
+)
+from typing import Any, List, Optional, Set, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+# Seconds pinned clients of changed clusters stay open for the calls still using them
+DEFAULT_DRAIN_TIMEOUT = 30
+
+
+@dataclass
+class ReloadResult:
+    """Outcome of one configuration reload."""
+
+    ok: bool
+    clusters: ClusterChanges = field(default_factory=ClusterChanges)
+    tools_changed: bool = False
+    error: Optional[str] = None
+
+    @property
+    def changed(self) -> bool:
+        """Whether the reload changed the clusters or the enabled tools."""
+        return bool(self.clusters) or self.tools_changed
+
+
+def _file_signature(path: str) -> Optional[Tuple[int, int, int]]:
+    """Return what identifies a version of a file, None if it cannot be read."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    # The inode changes when editors replace the file instead of writing it
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+def _tool_listing(tools: dict) -> dict:
+    """Return what clients see of the enabled tools."""
+    return {
+        name: (info.get('display_name', name), info.get('description'), info.get('input_schema'))
+        for name, info in tools.items()
+    }
+
+
+class ConfigReloader:
+    """Reload the configuration file of the running server."""
+
+    def __init__(
+        self,
+        config_file_path: str,
+        mode: str = 'single',
+        cli_tool_overrides: dict = None,
+        watch_interval: float = 0,
+        drain_timeout: float = DEFAULT_DRAIN_TIMEOUT,
+    ):
+        """Initialize the reloader, see ``configure_config_reload`` for the arguments."""
+        self.config_file_path = config_file_path
+        self.mode = mode
+        self.cli_tool_overrides = cli_tool_overrides or {}
+        self.watch_interval = watch_interval
+        self.drain_timeout = drain_timeout
+        # Enabled tools of the server, replaced in place on reload
+        self.enabled_tools: Optional[dict] = None
+        self.reloads = 0
+        self.failures = 0
+        # Version of the file that was last loaded
+        self._signature = _file_signature(config_file_path)
+        # Created on first use, as the reloader is configured before the event loop runs
+        self._lock: Optional[asyncio.Lock] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self._draining: List[Any] = []
+        # MCP sessions that listed the tools, told when a reload changes them
+        self._sessions: 'weakref.WeakSet[Any]' = weakref.WeakSet()
+
+    def track_tools(self, enabled_tools: dict) -> None:
+        """Set the enabled tools dict of the server that reloads replace in place.
+
+        Args:
+            enabled_tools: The dict the list_tools and call_tool handlers read
+        """
+        self.enabled_tools = enabled_tools
+
+    def track_session(self, session: Any) -> None:
+        """Notify an MCP session when a reload changes the enabled tools.
+
+        Args:
+            session: The ``ServerSession`` of a client that listed the tools
+        """
+        self._sessions.add(session)
+
+    async def _load_tools(self) -> dict:
+        """Build the enabled tools of the configuration file like the startup does."""
+        from opensearch.helper import get_installed_plugins, get_opensearch_version
+        from tools.config import apply_custom_tool_config
+        from tools.tool_filter import get_allow_write_setting, get_tools, set_allow_write_setting
+        from tools.tool_params import baseToolArgs
+        from tools.tools import TOOL_REGISTRY
+
+        config = apply_custom_tool_config(
+            TOOL_REGISTRY, self.config_file_path, self.cli_tool_overrides
+        )
+        version = plugins = None
+        if self.mode != 'multi':
+            version = await get_opensearch_version(baseToolArgs(opensearch_cluster_name=''))
+            if version is None:
+                # Filtering without a version would change the tools for no reason
+                raise ValueError('the OpenSearch version could not be looked up')
+            plugins = await get_installed_plugins(baseToolArgs(opensearch_cluster_name=''))
+        # get_tools also sets the allow_write setting, which must not change on failure
+        allow_write = get_allow_write_setting()
+        try:
+            return await get_tools(
+                tool_registry=config,
+                config_file_path=self.config_file_path,
+                opensearch_version=version,
+                installed_plugins=plugins,
+            )
+        except Exception:
+            set_allow_write_setting(allow_write)
+            raise
+
+    async def reload(self) -> ReloadResult:
+        """Reload the configuration file, keeping the running one if it is invalid.
+
+        Returns:
+            ReloadResult: What changed, or the error that stopped the reload
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            # A failed version of the file is not retried until it changes again
+            self._signature = _file_signature(self.config_file_path)
+            try:
+                clusters = None
+                if self.mode == 'multi':
+                    clusters = read_clusters_from_yaml(self.config_file_path)
+                tools = await self._load_tools() if self.enabled_tools is not None else None
+            except Exception as e:
+                self.failures += 1
+                logger.error(
+                    f'Reloading {self.config_file_path} failed, keeping the running '
+                    f'configuration: {e}'
+                )
+                return ReloadResult(ok=False, error=str(e))
+
+            # Swap everything without awaiting, so no call sees half of the change
+            changes = replace_clusters(clusters) if clusters is not None else ClusterChanges()
+            tools_changed = False
+            if tools is not None:
+                tools_changed = _tool_listing(tools) != _tool_listing(self.enabled_tools)
+                self.enabled_tools.clear()
+                self.enabled_tools.update(tools)
+            self.reloads += 1
+
+            if changes.affected:
+                self._release_clusters(changes.affected)
+            self._refresh_capabilities(changes.added + changes.changed)
+            if tools_changed and self._sessions:
+                self._spawn(self._notify_tools_changed(list(self._sessions)))
+            logger.info(
+                f'Reloaded {self.config_file_path}: clusters added {changes.added}, '
+                f'removed {changes.removed}, changed {changes.changed}; '
+                f'tools {"changed" if tools_changed else "unchanged"}'
+            )
+            return ReloadResult(ok=True, clusters=changes, tools_changed=tools_changed)
+
+    async def reload_if_changed(self) -> Optional[ReloadResult]:
+        """Reload the configuration file if it changed since it was last loaded.
+
+        Returns:
+            Optional[ReloadResult]: The outcome of the reload, None if the file did not
+                change
+        """
+        if _file_signature(self.config_file_path) == self._signature:
+            return None
+        return await self.reload()
+
+    def _release_clusters(self, names: List[str]) -> None:
+        """Forget the clients and cached state of clusters whose settings are gone."""
+        from mcp_server_opensearch.capabilities import forget_plugins, get_capability_matrix
+        from mcp_server_opensearch.readiness import get_readiness_prober
+        from mcp_server_opensearch.sessions import get_session_registry
+        from mcp_server_opensearch.warmup import cluster_readiness
+        from opensearch.helper import forget_opensearch_versions
+
+        for name in names:
+            # The cached version belongs to the old endpoint
+            cluster_readiness.pop(name, None)
+        forget_opensearch_versions(names)
+        prober = get_readiness_prober()
+        if prober is not None:
+            prober.forget(names)
+        forget_plugins(names)
+        matrix = get_capability_matrix()
+        if matrix is not None:
+            matrix.forget(names)
+        registry = get_session_registry()
+        if registry is None:
+            return
+        clients = registry.detach_clients(names)
+        if clients:
+            logger.info(f'Closing {len(clients)} pinned clients of clusters {names}')
+            self._draining.extend(clients)
+            self._spawn(self._drain(clients))
+
+    def _refresh_capabilities(self, names: List[str]) -> None:
+        """Look up the capabilities of new cluster settings before the next refresh."""
+        from mcp_server_opensearch.capabilities import get_capability_matrix
+
+        matrix = get_capability_matrix()
+        if matrix is not None and names:
+            self._spawn(matrix.refresh(names))
+
+    async def _drain(self, clients: List[Any]) -> None:
+        """Close unpinned clients once the calls still using them had time to finish."""
+        await asyncio.sleep(self.drain_timeout)
+        await self._close_clients(clients)
+
+    async def _notify_tools_changed(self, sessions: List[Any]) -> None:
+        """Send the tools/list_changed notification to the sessions that listed the tools."""
+        for session in sessions:
+            try:
+                await session.send_tool_list_changed()
+            except Exception as e:
+                # The client is gone, it lists the new tools when it connects again
+                logger.debug(f'Cannot notify a session of the changed tools: {e}')
+                self._sessions.discard(session)
+
+    async def _close_clients(self, clients: List[Any]) -> None:
+        """Close the clients that are still draining."""
+        for client in clients:
+            if client not in self._draining:
+                continue
+            self._draining.remove(client)
+            try:
+                await client.close()
+            except Exception as e:
+                logger.warning(f'Error closing client of a reloaded cluster: {e}')
+
+    async def watch(self) -> None:
+        """Reload the configuration file whenever it changes, until cancelled."""
+        while True:
+            await asyncio.sleep(self.watch_interval)
+            try:
+                await self.reload_if_changed()
+            except Exception as e:
+                logger.warning(f'Error watching {self.config_file_path}: {e}')
+
+    def _spawn(self, coroutine) -> None:
+        """Run a coroutine in the background until it is done or the reloader stops."""
+        task = asyncio.ensure_future(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def start(self) -> None:
+        """Reload on SIGHUP and watch the file, in the running event loop.
+
+        A configuration that changed while the server was starting, or before a
+        worker process was restarted, is loaded right away.
+        """
+        if hasattr(signal, 'SIGHUP'):
+            try:
+                asyncio.get_running_loop().add_signal_handler(
+                    signal.SIGHUP, lambda: self._spawn(self.reload())
+                )
+            except (NotImplementedError, RuntimeError) as e:
+                logger.warning(f'Cannot reload the configuration on SIGHUP: {e}')
+        if self.watch_interval > 0:
+            self._spawn(self.watch())
+        await self.reload_if_changed()
+
+    async def stop(self) -> None:
+        """Stop reloading and close the clients that are still draining."""
+        if hasattr(signal, 'SIGHUP'):
+            try:
+                asyncio.get_running_loop().remove_signal_handler(signal.SIGHUP)
+            except (NotImplementedError, RuntimeError):
+                pass
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        await self._close_clients(list(self._draining))
+
+
+class ReloadableServer(Server):
+    """MCP server that announces tool list changes while reloading is enabled."""
+
+    def create_initialization_options(
+        self,
+        notification_options: Optional[NotificationOptions] = None,
+        experimental_capabilities: Optional[dict] = None,
+    ):
+        """Create the initialization options, with the tools.listChanged capability.
+
+        The capability is only set if a configuration reloader is configured, as the
+        enabled tools cannot change otherwise.
+        """
+        if notification_options is None:
+            notification_options = NotificationOptions(
+                tools_changed=get_config_reloader() is not None
+            )
+        return super().create_initialization_options(
+            notification_options, experimental_capabilities
+        )
+
+
+# Configuration reloader of the running server, None without a configuration file
+_config_reloader: Optional[ConfigReloader] = None
+
+
+def configure_config_reload(
+    config_file_path: str,
+    mode: str = 'single',
+    cli_tool_overrides: dict = None,
+    watch_interval: float = 0,
+    drain_timeout: float = DEFAULT_DRAIN_TIMEOUT,
+) -> Optional[ConfigReloader]:
+    """Enable reloading of the configuration file.
+
+    Args:
+        config_file_path: Path to the YAML configuration file, empty to disable reloading
+        mode: Server mode, 'single' or 'multi'
+        cli_tool_overrides: Tool name and description overrides from the command line
+        watch_interval: Seconds between checks of the file for changes, 0 to reload
+            on SIGHUP only
+        drain_timeout: Seconds pinned clients of changed clusters stay open
+
+    Returns:
+        Optional[ConfigReloader]: The reloader, or None without a configuration file
+    """
+    global _config_reloader
+    _config_reloader = None
+    if config_file_path:
+        _config_reloader = ConfigReloader(
+            config_file_path, mode, cli_tool_overrides, watch_interval, drain_timeout
+        )
+    return _config_reloader
+
+
+def get_config_reloader() -> Optional[ConfigReloader]:
+    """Get the configuration reloader of the running server.
+
+    Returns:
+        Optional[ConfigReloader]: The reloader, or None without a configuration file
+    """
+    return _config_reloader
@@ -0,0 +1,432 @@
+# Copyright OpenSearch Contributors
+# SPDX-License-Identifier: Apache-2.0
+
+"""Event stores that make stateful streamable HTTP sessions resumable.
+
+Every message the server sends on a streamable HTTP stream is stored with an event id.
+A client that lost its connection reconnects with the ``Last-Event-ID`` header and gets
+the events it missed, instead of running the tool (and its OpenSearch query) again.
+
+Two bounded stores are provided:
+
+- ``MemoryEventStore``: a ring buffer in the server process
+- ``SQLiteEventStore``: a SQLite database, which keeps large results off the heap
+
+Both drop their oldest events once ``max_events``, ``max_bytes`` or ``max_age`` is
+exceeded. The MCP SDK numbers the streams of every session the same way, so each
+session gets its own view of the shared store (``for_session``) and can only replay
+its own events.
+"""
+
+import anyio
+import collections
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from mcp.server.streamable_http import EventCallback, EventMessage, EventStore
+from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+from mcp.types import JSONRPCMessage
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_EVENTS = 10000
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_MAX_AGE = 600
+# PRAGMA application_id of the SQLite databases created by the store ('OSMC')
+SQLITE_APPLICATION_ID = 0x4F534D43
+# Seconds between the checks of the SQLite store for events older than max_age
+SQLITE_AGE_PRUNE_INTERVAL = 1.0
+
+
+def _serialize(message: JSONRPCMessage) -> str:
+    return message.model_dump_json(by_alias=True, exclude_none=True)
+
+
+class BoundedEventStore(ABC):
+    """Event store shared by all sessions, with retention limits.
+
+    Args:
+        max_events: Maximum number of events kept, 0 for no limit
+        max_bytes: Maximum total size of the stored messages in bytes, 0 for no limit
+        max_age: Seconds an event is kept, 0 for no limit
+    """
+
+    def __init__(
+        self,
+        max_events: int = DEFAULT_MAX_EVENTS,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_age: float = DEFAULT_MAX_AGE,
+    ):
+        """Initialize the store with its retention limits."""
+        self.max_events = max_events
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.stored = 0
+        self.evicted = 0
+        self.replayed = 0
+
+    def for_session(self) -> 'SessionEventStore':
+        """Return a view of the store for one session."""
+        return SessionEventStore(self, uuid.uuid4().hex)
+
+    @abstractmethod
+    async def append(self, namespace: str, stream_id: str, data: str) -> str:
+        """Store a serialized message and return its event id."""
+
+    @abstractmethod
+    async def events_after(
+        self, namespace: str, last_event_id: str
+    ) -> Optional[Tuple[str, List[Tuple[str, str]]]]:
+        """Return the stream id and the (event id, data) pairs stored after an event.
+
+        Returns None if the event is unknown, expired or belongs to another session.
+        """
+
+    @abstractmethod
+    async def discard(self, namespace: str) -> None:
+        """Drop all events of a session."""
+
+    @abstractmethod
+    def size(self) -> Tuple[int, int]:
+        """Return the number of stored events and their total size in bytes."""
+
+    async def close(self) -> None:
+        """Release the resources of the store."""
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the usage and limits of the store."""
+        events, size = self.size()
+        return {
+            'type': type(self).__name__,
+            'events': events,
+            'bytes': size,
+            'max_events': self.max_events,
+            'max_bytes': self.max_bytes,
+            'max_age': self.max_age,
+            'stored': self.stored,
+            'evicted': self.evicted,
+            'replayed': self.replayed,
+        }
+
+
+class SessionEventStore(EventStore):
+    """View of a shared event store that only sees the events of one session."""
+
+    def __init__(self, store: BoundedEventStore, namespace: str):
+        """Initialize the view of the events stored under namespace."""
+        self.store = store
+        self.namespace = namespace
+
+    async def store_event(self, stream_id: str, message: JSONRPCMessage) -> str:
+        """Store a message of the session and return its event id."""
+        return await self.store.append(self.namespace, stream_id, _serialize(message))
+
+    async def replay_events_after(
+        self, last_event_id: str, send_callback: EventCallback
+    ) -> Optional[str]:
+        """Send the events of the session stored after an event, return their stream id."""
+        found = await self.store.events_after(self.namespace, last_event_id)
+        if found is None:
+            logger.debug(f'Event {last_event_id} is not available for replay')
+            return None
+        stream_id, events = found
+        for event_id, data in events:
+            await send_callback(EventMessage(JSONRPCMessage.model_validate_json(data), event_id))
+        self.store.replayed += len(events)
+        return stream_id
+
+    async def discard(self) -> None:
+        """Drop the events of the session."""
+        await self.store.discard(self.namespace)
+
+
+@dataclass
+class _StoredEvent:
+    stream_key: Tuple[str, str]
+    data: str
+    size: int
+    created: float
+
+
+class MemoryEventStore(BoundedEventStore):
+    """Event store that keeps events in a bounded ring buffer in memory."""
+
+    def __init__(self, *args, **kwargs):
+        """Initialize an empty store, see ``BoundedEventStore`` for the arguments."""
+        super().__init__(*args, **kwargs)
+        self._next_id = 0
+        # Key: event id, Value: event, oldest first
+        self._events: 'collections.OrderedDict[int, _StoredEvent]' = collections.OrderedDict()
+        # Key: (namespace, stream id), Value: ids of the events of the stream, oldest first
+        self._streams: Dict[Tuple[str, str], Deque[int]] = {}
+        self._bytes = 0
+
+    async def append(self, namespace: str, stream_id: str, data: str) -> str:
+        """Store a serialized message and return its event id."""
+        event_id = self._next_id
+        self._next_id += 1
+        self.stored += 1
+        size = len(data.encode())
+        if self.max_bytes and size > self.max_bytes:
+            logger.warning(f'Event {event_id} of {size} bytes exceeds the event store size limit')
+            self.evicted += 1
+            return str(event_id)
+
+        stream_key = (namespace, stream_id)
+        self._events[event_id] = _StoredEvent(stream_key, data, size, time.monotonic())
+        self._streams.setdefault(stream_key, collections.deque()).append(event_id)
+        self._bytes += size
+        self._prune()
+        return str(event_id)
+
+    async def events_after(
+        self, namespace: str, last_event_id: str
+    ) -> Optional[Tuple[str, List[Tuple[str, str]]]]:
+        """Return the stream id and the events stored after an event of the session."""
+        self._prune()
+        try:
+            last = int(last_event_id)
+        except ValueError:
+            return None
+        event = self._events.get(last)
+        if event is None or event.stream_key[0] != namespace:
+            return None
+        events = [
+            (str(event_id), self._events[event_id].data)
+            for event_id in self._streams[event.stream_key]
+            if event_id > last
+        ]
+        return event.stream_key[1], events
+
+    async def discard(self, namespace: str) -> None:
+        """Drop all events of a session."""
+        for stream_key in [key for key in self._streams if key[0] == namespace]:
+            for event_id in self._streams.pop(stream_key):
+                self._bytes -= self._events.pop(event_id).size
+
+    def size(self) -> Tuple[int, int]:
+        """Return the number of stored events and their total size in bytes."""
+        return len(self._events), self._bytes
+
+    def _prune(self) -> None:
+        """Drop the oldest events until the store is within its limits."""
+        cutoff = time.monotonic() - self.max_age if self.max_age else None
+        while self._events:
+            event_id, event = next(iter(self._events.items()))
+            if not (
+                (self.max_events and len(self._events) > self.max_events)
+                or (self.max_bytes and self._bytes > self.max_bytes)
+                or (cutoff is not None and event.created < cutoff)
+            ):
+                break
+            del self._events[event_id]
+            stream = self._streams[event.stream_key]
+            stream.popleft()
+            if not stream:
+                del self._streams[event.stream_key]
+            self._bytes -= event.size
+            self.evicted += 1
+
+
+class SQLiteEventStore(BoundedEventStore):
+    """Event store that keeps events in a SQLite database.
+
+    The database is recreated on startup. A file that holds tables of anything else is
+    refused rather than overwritten.
+
+    Args:
+        path: Path of the database file, ':memory:' for a private in-memory database
+    """
+
+    def __init__(self, path: str, *args, **kwargs):
+        """Open the database and recreate its events table."""
+        super().__init__(*args, **kwargs)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        try:
+            self._create_schema()
+        except Exception:
+            self._conn.close()
+            raise
+        self._count = 0
+        self._bytes = 0
+        self._age_pruned = time.monotonic()
+
+    def _create_schema(self) -> None:
+        """Create the events table, refusing databases that were not created by this store."""
+        (application_id,) = self._conn.execute('PRAGMA application_id').fetchone()
+        (tables,) = self._conn.execute(
+            "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table'"
+        ).fetchone()
+        if tables and application_id != SQLITE_APPLICATION_ID:
+            raise ValueError(f'{self.path} is not an event store database of this server')
+        self._conn.executescript(
+            f"""
+            PRAGMA application_id = {SQLITE_APPLICATION_ID};
+            PRAGMA journal_mode = WAL;
+            PRAGMA synchronous = OFF;
+            -- Sessions do not outlive the server, so neither do their events
+            DROP TABLE IF EXISTS opensearch_mcp_events;
+            CREATE TABLE opensearch_mcp_events (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                namespace TEXT NOT NULL,
+                stream_id TEXT NOT NULL,
+                created REAL NOT NULL,
+                size INTEGER NOT NULL,
+                data TEXT NOT NULL
+            );
+            CREATE INDEX opensearch_mcp_events_stream ON opensearch_mcp_events (namespace, stream_id, id);
+            CREATE INDEX opensearch_mcp_events_created ON opensearch_mcp_events (created);
+            """
+        )
+
+    async def append(self, namespace: str, stream_id: str, data: str) -> str:
+        """Store a serialized message in a worker thread and return its event id."""
+        return await anyio.to_thread.run_sync(self._append, namespace, stream_id, data)
+
+    async def events_after(
+        self, namespace: str, last_event_id: str
+    ) -> Optional[Tuple[str, List[Tuple[str, str]]]]:
+        """Return the stream id and the events stored after an event of the session."""
+        return await anyio.to_thread.run_sync(self._events_after, namespace, last_event_id)
+
+    async def discard(self, namespace: str) -> None:
+        """Drop all events of a session."""
+        await anyio.to_thread.run_sync(self._discard, namespace)
+
+    def size(self) -> Tuple[int, int]:
+        """Return the number of stored events and their total size in bytes."""
+        return self._count, self._bytes
+
+    async def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._conn.close()
+
+    def _append(self, namespace: str, stream_id: str, data: str) -> str:
+        size = len(data.encode())
+        with self._lock:
+            self.stored += 1
+            cursor = self._conn.execute(
+                'INSERT INTO opensearch_mcp_events (namespace, stream_id, created, size, data) VALUES (?, ?, ?, ?, ?)',
+                (namespace, stream_id, time.time(), size, data),
+            )
+            self._count += 1
+            self._bytes += size
+            self._prune()
+            return str(cursor.lastrowid)
+
+    def _events_after(
+        self, namespace: str, last_event_id: str
+    ) -> Optional[Tuple[str, List[Tuple[str, str]]]]:
+        try:
+            last = int(last_event_id)
+        except ValueError:
+            return None
+        with self._lock:
+            self._prune()
+            row = self._conn.execute(
+                'SELECT stream_id FROM opensearch_mcp_events WHERE id = ? AND namespace = ?',
+                (last, namespace),
+            ).fetchone()
+            if row is None:
+                return None
+            rows = self._conn.execute(
+                'SELECT id, data FROM opensearch_mcp_events WHERE namespace = ? AND stream_id = ? AND id > ? ORDER BY id',
+                (namespace, row[0], last),
+            ).fetchall()
+        return row[0], [(str(event_id), data) for event_id, data in rows]
+
+    def _discard(self, namespace: str) -> None:
+        with self._lock:
+            count, size = self._conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM opensearch_mcp_events WHERE namespace = ?',
+                (namespace,),
+            ).fetchone()
+            self._conn.execute(
+                'DELETE FROM opensearch_mcp_events WHERE namespace = ?', (namespace,)
+            )
+            self._count -= count
+            self._bytes -= size
+
+    def _prune(self) -> None:
+        """Drop the oldest events until the store is within its limits. Called with the lock held."""
+        # Expired events are looked for at most once per interval, not on every append
+        now = time.monotonic()
+        if self.max_age and now - self._age_pruned >= SQLITE_AGE_PRUNE_INTERVAL:
+            self._age_pruned = now
+            self._delete_oldest('created < ?', time.time() - self.max_age)
+        while self._count and (
+            (self.max_events and self._count > self.max_events)
+            or (self.max_bytes and self._bytes > self.max_bytes)
+        ):
+            # Drop the oldest events in batches rather than one statement per event
+            batch = max(self._count - self.max_events, 1) if self.max_events else 1
+            if self.max_bytes and self._bytes > self.max_bytes:
+                batch = max(batch, self._count // 10, 1)
+            self._delete_oldest(
+                'id IN (SELECT id FROM opensearch_mcp_events ORDER BY id LIMIT ?)', batch
+            )
+
+    def _delete_oldest(self, condition: str, value: Any) -> None:
+        count, size = self._conn.execute(
+            f'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM opensearch_mcp_events WHERE {condition}',
+            (value,),
+        ).fetchone()
+        if count:
+            self._conn.execute(f'DELETE FROM opensearch_mcp_events WHERE {condition}', (value,))
+            self._count -= count
+            self._bytes -= size
+            self.evicted += count
+
+
+class ResumableSessionManager(StreamableHTTPSessionManager):
+    """Session manager that gives every new session its own view of a shared event store."""
+
+    @property
+    def event_store(self) -> Optional[SessionEventStore]:
+        """Return a view of the shared store for a new session, None without a store."""
+        # Read once per session, when the session manager creates its transport
+        if self.shared_event_store is None:
+            return None
+        return self.shared_event_store.for_session()
+
+    @event_store.setter
+    def event_store(self, store: Optional[BoundedEventStore]) -> None:
+        self.shared_event_store = store
+
+
+def create_event_store(
+    store_type: str = 'memory',
+    path: str = '',
+    max_events: int = DEFAULT_MAX_EVENTS,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    max_age: float = DEFAULT_MAX_AGE,
+) -> Optional[BoundedEventStore]:
+    """Create the event store of a stateful streaming server.
+
+    Args:
+        store_type: 'memory', 'sqlite' or 'none'
+        path: Database file of the SQLite store, a private in-memory database if empty
+        max_events: Maximum number of events kept, 0 for no limit
+        max_bytes: Maximum total size of the stored messages in bytes, 0 for no limit
+        max_age: Seconds an event is kept, 0 for no limit
+
+    Returns:
+        Optional[BoundedEventStore]: The event store, or None if resumability is disabled
+    """
+    limits = {'max_events': max_events, 'max_bytes': max_bytes, 'max_age': max_age}
+    if store_type == 'memory':
+        return MemoryEventStore(**limits)
+    if store_type == 'sqlite':
+        return SQLiteEventStore(path or ':memory:', **limits)
+    if store_type == 'none':
+        return None
+    raise ValueError(f'Unknown event store type: {store_type}')
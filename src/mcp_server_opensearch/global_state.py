@@ -5,7 +5,8 @@
 Global state management for the OpenSearch MCP Server.
 
 This module provides a centralized way to store and access the current server mode,
-profile, and config file path that need to be available throughout the application.
+profile, config file path and worker id that need to be available throughout the
+application.
 """
 
 import logging
@@ -15,6 +16,7 @@ from typing import Optional
 _current_mode: Optional[str] = None
 _current_profile: Optional[str] = None
 _current_config_file_path: Optional[str] = None
+_current_worker_id: Optional[int] = None
 
 logger = logging.getLogger(__name__)
 
@@ -83,3 +85,24 @@ def get_config_file_path() -> str:
     """
     global _current_config_file_path
     return _current_config_file_path or ''
+
+
+def set_worker_id(worker_id: int) -> None:
+    """Set the id of the current streaming server worker process.
+
+    Args:
+        worker_id: The worker index (0 to workers - 1)
+    """
+    global _current_worker_id
+    _current_worker_id = worker_id
+    logger.debug(f'Set global worker_id to: {worker_id}')
+
+
+def get_worker_id() -> Optional[int]:
+    """Get the id of the current streaming server worker process.
+
+    Returns:
+        Optional[int]: The worker index, or None when running a single process.
+    """
+    global _current_worker_id
+    return _current_worker_id
@@ -0,0 +1,638 @@
+# Copyright OpenSearch Contributors
+# SPDX-License-Identifier: Apache-2.0
+
+"""Load generator for capacity planning of a running MCP server.
+
+``opensearch-mcp-loadgen`` connects to a server over stdio or streamable HTTP with
+the MCP client SDK and replays a weighted mix of tool calls from a YAML scenario.
+Calls are scheduled open-loop: they start at the target rate whether or not earlier
+calls have completed, and their latency is measured from the time they were
+scheduled, so a slow server shows up as latency instead of a lower request rate.
+
+A scenario runs one or more stages of increasing rate. For every stage the report
+shows the achieved throughput, the error rate by kind and latency histograms, and
+the first stage the server cannot sustain is reported as its saturation point.
+
+Example scenario::
+
+    calls:
+      - tool: SearchIndexTool
+        weight: 4
+        arguments: {index: logs-1, query: {query: {match_all: {}}}}
+      - tool: ListIndexTool
+        weight: 1
+    ramp: {start: 10, stop: 100, step: 10, duration: 30}
+    timeout: 30
+"""
+
+import argparse
+import asyncio
+import bisect
+import json
+import logging
+import math
+import os
+import random
+import shlex
+import sys
+import time
+import yaml
+from collections import Counter
+from contextlib import AsyncExitStack
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set
+
+
+DEFAULT_URL = 'http://localhost:9900/mcp/'
+DEFAULT_COMMAND = f'{sys.executable} -m mcp_server_opensearch'
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_MAX_IN_FLIGHT = 1000
+# A stage is saturated when it completes less than this share of its target rate
+DEFAULT_MIN_THROUGHPUT_RATIO = 0.9
+DEFAULT_MAX_ERROR_RATE = 0.01
+ARRIVALS = ('uniform', 'poisson')
+
+# Upper bounds of the buckets of rendered histograms, in seconds
+DISPLAY_BUCKETS = tuple(m * 10**e for e in range(-4, 3) for m in (1, 2, 5)) + (600,)
+# Histogram buckets grow by 10% from 0.1 ms to 10 minutes, and include the display
+# buckets so that they can be rendered exactly
+HISTOGRAM_BUCKETS = tuple(
+    sorted({0.0001 * 1.1**i for i in range(int(math.log(6e6, 1.1)) + 2)} | set(DISPLAY_BUCKETS))
+)
+HISTOGRAM_WIDTH = 40
+
+ERROR_TIMEOUT = 'timeout'
+ERROR_TOOL = 'tool_error'
+
+
+@dataclass
+class CallSpec:
+    """Tool call of a scenario and its share of the calls."""
+
+    tool: str
+    arguments: Dict[str, Any] = field(default_factory=dict)
+    weight: float = 1.0
+
+
+@dataclass
+class Stage:
+    """Period of a scenario during which calls are started at a fixed rate."""
+
+    rate: float
+    duration: float
+
+
+@dataclass
+class Scenario:
+    """Weighted mix of tool calls and the stages it is replayed in."""
+
+    calls: List[CallSpec]
+    stages: List[Stage]
+    timeout: float = DEFAULT_TIMEOUT
+
+
+def _positive(value: Any, name: str) -> float:
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f'{name} must be a number, got {value!r}')
+    if number <= 0:
+        raise ValueError(f'{name} must be greater than 0, got {value!r}')
+    return number
+
+
+def parse_scenario(data: Any) -> Scenario:
+    """Build a scenario from its YAML document.
+
+    The stages are given either as a ``stages`` list of ``{rate, duration}``, as a
+    single ``rate`` and ``duration``, or as a ``ramp`` of ``{start, stop, step,
+    duration}`` that runs every rate from start to stop for duration seconds.
+
+    Args:
+        data: Parsed YAML document of the scenario
+
+    Returns:
+        Scenario: The scenario
+
+    Raises:
+        ValueError: If the scenario is invalid
+    """
+    if not isinstance(data, dict):
+        raise ValueError('The scenario must be a mapping')
+    calls = []
+    for entry in data.get('calls') or []:
+        if not isinstance(entry, dict) or not entry.get('tool'):
+            raise ValueError(f'Every call needs a tool, got {entry!r}')
+        arguments = entry.get('arguments') or {}
+        if not isinstance(arguments, dict):
+            raise ValueError(f'The arguments of {entry["tool"]} must be a mapping')
+        weight = _positive(entry.get('weight', 1), f'weight of {entry["tool"]}')
+        calls.append(CallSpec(str(entry['tool']), arguments, weight))
+    if not calls:
+        raise ValueError('The scenario has no calls')
+
+    if 'stages' in data:
+        stages = [
+            Stage(
+                _positive(stage.get('rate'), 'rate'), _positive(stage.get('duration'), 'duration')
+            )
+            for stage in data['stages'] or []
+        ]
+    elif 'ramp' in data:
+        ramp = data['ramp'] or {}
+        start = _positive(ramp.get('start'), 'ramp start')
+        stop = _positive(ramp.get('stop'), 'ramp stop')
+        step = _positive(ramp.get('step'), 'ramp step')
+        duration = _positive(ramp.get('duration'), 'ramp duration')
+        count = int(math.floor((stop - start) / step + 1e-9)) + 1
+        stages = [Stage(start + i * step, duration) for i in range(max(count, 1))]
+    elif 'rate' in data:
+        stages = [
+            Stage(_positive(data['rate'], 'rate'), _positive(data.get('duration'), 'duration'))
+        ]
+    else:
+        raise ValueError('The scenario needs stages, a ramp or a rate and duration')
+    if not stages:
+        raise ValueError('The scenario has no stages')
+
+    timeout = _positive(data.get('timeout', DEFAULT_TIMEOUT), 'timeout')
+    return Scenario(calls, stages, timeout)
+
+
+def load_scenario(path: str) -> Scenario:
+    """Load a scenario from a YAML file.
+
+    Raises:
+        ValueError: If the file cannot be read or the scenario is invalid
+    """
+    try:
+        with open(path, encoding='utf-8') as f:
+            data = yaml.safe_load(f)
+    except (OSError, yaml.YAMLError) as e:
+        raise ValueError(f'Could not load the scenario {path}: {e}')
+    return parse_scenario(data)
+
+
+class LatencyHistogram:
+    """Latency histogram with buckets 10% apart, so percentiles are within 10%."""
+
+    def __init__(self):
+        """Initialize an empty histogram."""
+        self.counts = [0] * (len(HISTOGRAM_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        """Count a latency in seconds."""
+        self.counts[bisect.bisect_left(HISTOGRAM_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+
+    def percentile(self, q: float) -> float:
+        """Return the upper bound of the bucket of the q-quantile, in seconds."""
+        if not self.count:
+            return 0.0
+        rank = max(math.ceil(q * self.count), 1)
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                bound = HISTOGRAM_BUCKETS[index] if index < len(HISTOGRAM_BUCKETS) else self.max
+                return min(bound, self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, Any]:
+        """Return the count and the latency percentiles in milliseconds."""
+        return {
+            'count': self.count,
+            'mean_ms': round(self.total / self.count * 1000, 2) if self.count else 0.0,
+            'min_ms': round(self.min * 1000, 2) if self.count else 0.0,
+            'p50_ms': round(self.percentile(0.5) * 1000, 2),
+            'p90_ms': round(self.percentile(0.9) * 1000, 2),
+            'p99_ms': round(self.percentile(0.99) * 1000, 2),
+            'p999_ms': round(self.percentile(0.999) * 1000, 2),
+            'max_ms': round(self.max * 1000, 2),
+        }
+
+    def render(self, width: int = HISTOGRAM_WIDTH) -> List[str]:
+        """Render the histogram as text bars, one line per non-empty display bucket.
+
+        The display buckets follow a 1-2-5 series, coarser than the buckets the
+        percentiles are computed from.
+        """
+        counts: Counter = Counter()
+        for index, count in enumerate(self.counts):
+            if count:
+                bound = HISTOGRAM_BUCKETS[index] if index < len(HISTOGRAM_BUCKETS) else self.max
+                position = bisect.bisect_left(DISPLAY_BUCKETS, bound)
+                counts[position] += count
+        if not counts:
+            return []
+        peak = max(counts.values())
+        lines = []
+        for position, count in sorted(counts.items()):
+            if position < len(DISPLAY_BUCKETS):
+                label = f'<= {DISPLAY_BUCKETS[position] * 1000:>8g} ms'
+            else:
+                label = f'>  {DISPLAY_BUCKETS[-1] * 1000:>8g} ms'
+            bar = '#' * max(round(count / peak * width), 1)
+            lines.append(f'{label} {count:>8} {count / self.count:>6.1%} {bar}')
+        return lines
+
+
+@dataclass
+class StageResult:
+    """Outcome of the calls of one stage."""
+
+    stage: Stage
+    scheduled: int = 0
+    # Calls not started because too many calls were in flight
+    dropped: int = 0
+    succeeded: int = 0
+    # Key: error kind, Value: number of failed calls
+    errors: Counter = field(default_factory=Counter)
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    # Key: tool name, Value: latency of its calls, failed calls included
+    tool_latency: Dict[str, LatencyHistogram] = field(default_factory=dict)
+    # Seconds from the first scheduled call to the completion of the last call
+    elapsed: float = 0.0
+    max_in_flight: int = 0
+
+    @property
+    def throughput(self) -> float:
+        """Successful calls per second.
+
+        The fastest latency is taken off the elapsed time, as even a server that keeps
+        up needs that long to complete the last call of the stage.
+        """
+        fastest = self.latency.min if self.latency.count else 0.0
+        elapsed = max(self.elapsed - fastest, self.stage.duration)
+        return self.succeeded / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def error_rate(self) -> float:
+        """Share of the scheduled calls that failed or were dropped."""
+        if not self.scheduled:
+            return 0.0
+        return (sum(self.errors.values()) + self.dropped) / self.scheduled
+
+    def record(self, tool: str, latency: float, error: Optional[str]) -> None:
+        """Count a finished call, with the kind of its error or None on success."""
+        if error is None:
+            self.succeeded += 1
+        else:
+            self.errors[error] += 1
+        self.latency.record(latency)
+        self.tool_latency.setdefault(tool, LatencyHistogram()).record(latency)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the result of the stage as written to the JSON report."""
+        return {
+            'rate': self.stage.rate,
+            'duration': self.stage.duration,
+            'scheduled': self.scheduled,
+            'succeeded': self.succeeded,
+            'dropped': self.dropped,
+            'errors': dict(self.errors),
+            'error_rate': round(self.error_rate, 4),
+            'throughput': round(self.throughput, 2),
+            'max_in_flight': self.max_in_flight,
+            'latency': self.latency.summary(),
+            'tools': {tool: h.summary() for tool, h in sorted(self.tool_latency.items())},
+        }
+
+
+def saturation_reason(
+    result: StageResult,
+    min_throughput_ratio: float = DEFAULT_MIN_THROUGHPUT_RATIO,
+    max_error_rate: float = DEFAULT_MAX_ERROR_RATE,
+    slo_p99_ms: Optional[float] = None,
+) -> Optional[str]:
+    """Return why a stage was not sustained by the server, or None if it was.
+
+    Args:
+        result: Outcome of the stage
+        min_throughput_ratio: Share of the target rate the server must complete
+        max_error_rate: Highest acceptable share of failed or dropped calls
+        slo_p99_ms: Highest acceptable p99 latency, None to ignore latency
+
+    Returns:
+        Optional[str]: The reason, or None if the stage was sustained
+    """
+    target = result.stage.rate * (1 - result.error_rate)
+    if result.throughput < target * min_throughput_ratio:
+        return (
+            f'throughput {result.throughput:.1f}/s is below '
+            f'{min_throughput_ratio:.0%} of {result.stage.rate:g}/s'
+        )
+    if result.error_rate > max_error_rate:
+        return f'error rate {result.error_rate:.2%} is above {max_error_rate:.2%}'
+    p99_ms = result.latency.percentile(0.99) * 1000
+    if slo_p99_ms is not None and p99_ms > slo_p99_ms:
+        return f'p99 {p99_ms:.1f} ms is above {slo_p99_ms:g} ms'
+    return None
+
+
+def classify_result(result: Any) -> Optional[str]:
+    """Return the error kind of a tool result, or None if the call succeeded.
+
+    Structured errors, such as the ``overloaded`` errors of admission control, are
+    reported by their type.
+    """
+    if not getattr(result, 'isError', False):
+        return None
+    for content in getattr(result, 'content', None) or []:
+        text = getattr(content, 'text', None)
+        if not text:
+            continue
+        try:
+            error = json.loads(text).get('error')
+        except (ValueError, AttributeError):
+            continue
+        if isinstance(error, dict) and error.get('type'):
+            return str(error['type'])
+    return ERROR_TOOL
+
+
+# Calls that timed out and are left to complete in the background
+_late_calls: Set[asyncio.Future] = set()
+
+
+def _forget_late_call(call: asyncio.Future) -> None:
+    _late_calls.discard(call)
+    if not call.cancelled():
+        call.exception()
+
+
+async def call_once(
+    session: Any, spec: CallSpec, scheduled_at: float, timeout: float, result: StageResult
+) -> None:
+    """Make one tool call and record its latency from the time it was scheduled."""
+    call = asyncio.ensure_future(session.call_tool(spec.tool, spec.arguments))
+    done, _ = await asyncio.wait({call}, timeout=timeout)
+    if not done:
+        # Cancelling the call, or letting the MCP client time it out, tears down the
+        # streams of the session when the response arrives late
+        _late_calls.add(call)
+        call.add_done_callback(_forget_late_call)
+        error = ERROR_TIMEOUT
+    else:
+        try:
+            error = classify_result(call.result())
+        except Exception as e:
+            error = type(e).__name__
+    result.record(spec.tool, time.perf_counter() - scheduled_at, error)
+
+
+async def close_sessions(stack: AsyncExitStack, grace: float) -> None:
+    """Wait up to grace seconds for late calls, then close the sessions.
+
+    Errors of the MCP client while closing, such as responses that arrive after the
+    client is closed, do not change the results and are ignored.
+    """
+    if _late_calls:
+        await asyncio.wait(set(_late_calls), timeout=grace)
+    logging.getLogger('mcp.client.streamable_http').setLevel(logging.CRITICAL)
+    try:
+        await stack.aclose()
+    except Exception:
+        pass
+
+
+async def run_stage(
+    sessions: List[Any],
+    scenario: Scenario,
+    stage: Stage,
+    rng: random.Random,
+    arrival: str = 'uniform',
+    max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+) -> StageResult:
+    """Start calls at the rate of a stage, open-loop, and wait for all of them.
+
+    Calls are spread over the sessions round-robin. When ``max_in_flight`` calls are
+    already running, the next call is dropped rather than delayed.
+    """
+    result = StageResult(stage)
+    weights = [spec.weight for spec in scenario.calls]
+    tasks: set = set()
+    start = time.perf_counter()
+    end = start + stage.duration
+    next_at = start
+    while next_at < end:
+        delay = next_at - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        result.scheduled += 1
+        if len(tasks) >= max_in_flight:
+            result.dropped += 1
+        else:
+            spec = rng.choices(scenario.calls, weights)[0]
+            session = sessions[result.scheduled % len(sessions)]
+            task = asyncio.create_task(call_once(session, spec, next_at, scenario.timeout, result))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            result.max_in_flight = max(result.max_in_flight, len(tasks))
+        if arrival == 'poisson':
+            next_at += rng.expovariate(stage.rate)
+        else:
+            # Not summed up, so rounding errors do not add an extra call
+            next_at = start + result.scheduled / stage.rate
+    if tasks:
+        await asyncio.wait(set(tasks))
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+def create_http_client(
+    headers: Optional[Dict[str, str]] = None,
+    timeout: Optional[Any] = None,
+    auth: Optional[Any] = None,
+) -> Any:
+    """Create the HTTP client of a streamable HTTP session, without a connection limit.
+
+    Every call in flight holds a connection for its response stream, and waiting for
+    one of the 100 connections of the default pool fails the whole session.
+    """
+    import httpx
+
+    return httpx.AsyncClient(
+        follow_redirects=True,
+        headers=headers,
+        timeout=timeout if timeout is not None else httpx.Timeout(DEFAULT_TIMEOUT),
+        auth=auth,
+        limits=httpx.Limits(max_connections=None, max_keepalive_connections=None),
+    )
+
+
+async def open_sessions(
+    stack: AsyncExitStack,
+    transport: str,
+    url: str,
+    command: str,
+    connections: int,
+) -> List[Any]:
+    """Connect to the server and initialize the MCP sessions of the load generator."""
+    from mcp import ClientSession, StdioServerParameters
+    from mcp.client.stdio import stdio_client
+    from mcp.client.streamable_http import streamablehttp_client
+
+    sessions = []
+    for _ in range(connections if transport == 'stream' else 1):
+        if transport == 'stdio':
+            args = shlex.split(command)
+            streams = await stack.enter_async_context(
+                # The server is configured by the environment of the load generator
+                stdio_client(
+                    StdioServerParameters(command=args[0], args=args[1:], env=dict(os.environ))
+                )
+            )
+        else:
+            streams = await stack.enter_async_context(
+                streamablehttp_client(url, httpx_client_factory=create_http_client)
+            )
+        session = await stack.enter_async_context(ClientSession(streams[0], streams[1]))
+        await session.initialize()
+        sessions.append(session)
+    return sessions
+
+
+def format_report(
+    results: List[StageResult], saturated_at: Optional[int], reason: Optional[str]
+) -> str:
+    """Render the stage results, histograms and saturation point as text."""
+    lines = [
+        f'{"rate/s":>8}{"scheduled":>11}{"ok/s":>9}{"errors":>8}{"dropped":>9}'
+        f'{"p50 ms":>10}{"p90 ms":>10}{"p99 ms":>10}{"max ms":>10}{"in flight":>11}'
+    ]
+    for result in results:
+        latency = result.latency.summary()
+        lines.append(
+            f'{result.stage.rate:>8g}{result.scheduled:>11}{result.throughput:>9.1f}'
+            f'{sum(result.errors.values()):>8}{result.dropped:>9}{latency["p50_ms"]:>10.2f}'
+            f'{latency["p90_ms"]:>10.2f}{latency["p99_ms"]:>10.2f}{latency["max_ms"]:>10.2f}'
+            f'{result.max_in_flight:>11}'
+        )
+    for result in results:
+        lines.append('')
+        lines.append(f'Stage {result.stage.rate:g}/s for {result.stage.duration:g}s')
+        for kind, count in result.errors.most_common():
+            lines.append(f'  error {kind}: {count} ({count / result.scheduled:.2%})')
+        for tool, histogram in sorted(result.tool_latency.items()):
+            summary = histogram.summary()
+            lines.append(
+                f'  {tool}: {summary["count"]} calls, p50 {summary["p50_ms"]} ms, '
+                f'p99 {summary["p99_ms"]} ms'
+            )
+        lines.extend(f'  {line}' for line in result.latency.render())
+    lines.append('')
+    if saturated_at is None:
+        lines.append('No saturation: the server sustained every stage')
+    else:
+        sustained = results[saturated_at - 1].stage.rate if saturated_at else None
+        lines.append(f'Saturated at {results[saturated_at].stage.rate:g}/s: {reason}')
+        lines.append(
+            f'Highest sustained rate: {sustained:g}/s' if sustained else 'No stage was sustained'
+        )
+    return '\n'.join(lines)
+
+
+async def run(args: argparse.Namespace, scenario: Scenario) -> int:
+    """Replay the scenario against the server, print the report and return the exit status."""
+    rng = random.Random(args.seed)
+    results: List[StageResult] = []
+    saturated_at = reason = None
+    stack = AsyncExitStack()
+    try:
+        sessions = await open_sessions(
+            stack, args.transport, args.url, args.command, args.connections
+        )
+        available = {tool.name for tool in (await sessions[0].list_tools()).tools}
+        missing = sorted({spec.tool for spec in scenario.calls} - available)
+        if missing:
+            print(f'The server does not provide the tools {", ".join(missing)}', file=sys.stderr)
+            return 2
+        for stage in scenario.stages:
+            print(f'Running {stage.rate:g} calls/s for {stage.duration:g}s', file=sys.stderr)
+            result = await run_stage(
+                sessions, scenario, stage, rng, args.arrival, args.max_in_flight
+            )
+            results.append(result)
+            if saturated_at is not None:
+                continue
+            reason = saturation_reason(
+                result, args.min_throughput_ratio, args.max_error_rate, args.slo_p99_ms
+            )
+            if reason is not None:
+                saturated_at = len(results) - 1
+                if args.stop_at_saturation:
+                    break
+    finally:
+        await close_sessions(stack, scenario.timeout)
+
+    print(format_report(results, saturated_at, reason))
+    if args.output:
+        report = {
+            'stages': [result.to_dict() for result in results],
+            'saturation': None
+            if saturated_at is None
+            else {'rate': results[saturated_at].stage.rate, 'reason': reason},
+        }
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+def main() -> None:
+    """Entry point of the opensearch-mcp-loadgen command."""
+    parser = argparse.ArgumentParser(
+        description='Replay a weighted mix of tool calls against a running MCP server'
+    )
+    parser.add_argument('scenario', help='YAML scenario with the calls and stages to replay')
+    parser.add_argument('--transport', choices=['stdio', 'stream'], default='stream')
+    parser.add_argument('--url', default=DEFAULT_URL, help='MCP endpoint (stream only)')
+    parser.add_argument(
+        '--command', default=DEFAULT_COMMAND, help='Command that starts the server (stdio only)'
+    )
+    parser.add_argument(
+        '--connections',
+        type=int,
+        default=1,
+        help='MCP sessions to spread calls over (stream only)',
+    )
+    parser.add_argument(
+        '--rate', type=float, help='Replace the stages with one stage at this rate'
+    )
+    parser.add_argument('--duration', type=float, help='Duration of the --rate stage')
+    parser.add_argument('--arrival', choices=ARRIVALS, default='uniform')
+    parser.add_argument('--max-in-flight', type=int, default=DEFAULT_MAX_IN_FLIGHT)
+    parser.add_argument('--min-throughput-ratio', type=float, default=DEFAULT_MIN_THROUGHPUT_RATIO)
+    parser.add_argument('--max-error-rate', type=float, default=DEFAULT_MAX_ERROR_RATE)
+    parser.add_argument('--slo-p99-ms', type=float, help='p99 latency above which a stage fails')
+    parser.add_argument(
+        '--stop-at-saturation', action='store_true', help='Skip the stages after saturation'
+    )
+    parser.add_argument('--seed', type=int, help='Seed of the call mix and arrivals')
+    parser.add_argument('--output', help='Also write the report as JSON to this file')
+    args = parser.parse_args()
+
+    try:
+        scenario = load_scenario(args.scenario)
+        if args.rate is not None:
+            duration = args.duration or scenario.stages[0].duration
+            scenario.stages = [
+                Stage(_positive(args.rate, '--rate'), _positive(duration, '--duration'))
+            ]
+    except ValueError as e:
+        parser.error(str(e))
+    if args.connections < 1 or args.max_in_flight < 1:
+        parser.error('--connections and --max-in-flight must be at least 1')
+
+    sys.exit(asyncio.run(run(args, scenario)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,491 @@
+# Copyright OpenSearch Contributors
+# SPDX-License-Identifier: Apache-2.0
+
+"""Prometheus metrics of the streaming server.
+
+The metrics are kept in process by a small registry and rendered in the Prometheus
+text exposition format at ``GET /metrics``, so no client library is needed.
+Recording a value is a dictionary lookup and, for histograms, a bisect, cheap enough
+for every tool call and OpenSearch request:
+
+- tool calls by tool and outcome, their latency, in-flight calls and the size of
+  their arguments and results
+- OpenSearch requests by cluster, method, endpoint and outcome, and their latency
+- reuse of pinned clients and hits of the session response cache
+
+Gauges of admission control, stateful sessions and the event store are read when
+the metrics are scraped. With several workers, every worker process keeps its own
+metrics and labels them with its ``worker`` id. Workers write a snapshot of their
+metrics to a directory shared with their siblings every ``SNAPSHOT_INTERVAL``
+seconds, so the worker that answers a scrape renders the metrics of all workers.
+"""
+
+import asyncio
+import bisect
+import contextlib
+import json
+import logging
+import math
+import os
+import time
+from mcp_server_opensearch.admission import OverloadedError, get_admission_controller
+from mcp_server_opensearch.global_state import get_worker_id
+from mcp_server_opensearch.sessions import get_session_registry
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+# Namespaces whose next path segment is an API name rather than a value
+NAMED_API_NAMESPACES = frozenset({'_cat', '_cluster'})
+
+OUTCOME_OK = 'ok'
+OUTCOME_ERROR = 'error'
+OUTCOME_OVERLOADED = 'overloaded'
+OUTCOME_CANCELLED = 'cancelled'
+
+# Seconds between the snapshots workers write for the scrapes answered by their siblings
+SNAPSHOT_INTERVAL = 1.0
+
+# Directory shared by the worker processes for their metric snapshots
+_snapshot_dir: Optional[str] = None
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels: Sequence[Tuple[str, str]]) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels) + '}'
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Metric:
+    """Base class of the metrics, holding one value per combination of label values."""
+
+    type = 'untyped'
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        """Initialize the metric with its name, HELP text and label names."""
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        # Key: label values, Value: metric value
+        self._values: Dict[Tuple[str, ...], Any] = {}
+
+    def samples(self) -> Iterator[Tuple[str, List[Tuple[str, str]], float]]:
+        """Yield the (sample name, labels, value) of every sample."""
+        for label_values, value in self._values.items():
+            yield self.name, list(zip(self.label_names, label_values)), value
+
+    def clear(self) -> None:
+        """Drop the values of all label combinations."""
+        self._values.clear()
+
+
+class Counter(Metric):
+    """Monotonically increasing count."""
+
+    type = 'counter'
+
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        """Add amount to the value of the label combination."""
+        self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def get(self, *label_values: str) -> float:
+        """Return the value of the label combination, 0 if it was never set."""
+        return self._values.get(label_values, 0)
+
+
+class Gauge(Counter):
+    """Value that goes up and down."""
+
+    type = 'gauge'
+
+    def dec(self, *label_values: str, amount: float = 1) -> None:
+        """Subtract amount from the value of the label combination."""
+        self.inc(*label_values, amount=-amount)
+
+    def set(self, *label_values: str, value: float) -> None:
+        """Set the value of the label combination."""
+        self._values[label_values] = value
+
+
+class Histogram(Metric):
+    """Distribution of observed values in cumulative buckets."""
+
+    type = 'histogram'
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        """Initialize the histogram with the upper bounds of its buckets."""
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *label_values: str) -> None:
+        """Count a value in the buckets of the label combination."""
+        state = self._values.get(label_values)
+        if state is None:
+            # Per bucket counts (the last one is +Inf), sum
+            state = self._values[label_values] = [[0] * (len(self.buckets) + 1), 0.0]
+        state[0][bisect.bisect_left(self.buckets, value)] += 1
+        state[1] += value
+
+    def count(self, *label_values: str) -> int:
+        """Return the number of values observed for the label combination."""
+        state = self._values.get(label_values)
+        return sum(state[0]) if state else 0
+
+    def samples(self) -> Iterator[Tuple[str, List[Tuple[str, str]], float]]:
+        """Yield the bucket, sum and count samples of every label combination."""
+        for label_values, (counts, total) in self._values.items():
+            labels = list(zip(self.label_names, label_values))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                le = '+Inf' if math.isinf(bound) else _format_value(bound)
+                yield f'{self.name}_bucket', labels + [('le', le)], cumulative
+            yield f'{self.name}_sum', labels, total
+            yield f'{self.name}_count', labels, cumulative
+
+
+class MetricsRegistry:
+    """Set of metrics rendered together."""
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self.metrics: List[Metric] = []
+
+    def register(self, metric: Metric) -> Metric:
+        """Add a metric to the registry and return it."""
+        self.metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> Counter:
+        """Create and register a counter."""
+        return self.register(Counter(name, documentation, label_names))
+
+    def gauge(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> Gauge:
+        """Create and register a gauge."""
+        return self.register(Gauge(name, documentation, label_names))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        """Create and register a histogram."""
+        return self.register(Histogram(name, documentation, label_names, buckets))
+
+    def clear(self) -> None:
+        """Reset all values, keeping the metrics registered."""
+        for metric in self.metrics:
+            metric.clear()
+
+    def render(
+        self,
+        extra: Sequence[Metric] = (),
+        const_labels: Sequence[Tuple[str, str]] = (),
+    ) -> str:
+        """Render the metrics in the Prometheus text exposition format.
+
+        Args:
+            extra: Metrics built at scrape time to render along with the registered ones
+            const_labels: Labels added to every sample
+
+        Returns:
+            str: The exposition text
+        """
+        lines = []
+        for metric in [*self.metrics, *extra]:
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.type}')
+            for name, labels, value in metric.samples():
+                lines.append(
+                    f'{name}{_format_labels([*const_labels, *labels])} {_format_value(value)}'
+                )
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+TOOL_CALLS = registry.counter(
+    'opensearch_mcp_tool_calls_total', 'Tool calls by tool and outcome', ('tool', 'outcome')
+)
+TOOL_DURATION = registry.histogram(
+    'opensearch_mcp_tool_duration_seconds', 'Duration of tool calls', ('tool',)
+)
+TOOL_IN_FLIGHT = registry.gauge(
+    'opensearch_mcp_tool_calls_in_flight', 'Tool calls being executed', ('tool',)
+)
+TOOL_REQUEST_BYTES = registry.histogram(
+    'opensearch_mcp_tool_request_bytes',
+    'Size of the JSON arguments of tool calls',
+    ('tool',),
+    SIZE_BUCKETS,
+)
+TOOL_RESPONSE_BYTES = registry.histogram(
+    'opensearch_mcp_tool_response_bytes',
+    'Size of the text of tool results',
+    ('tool',),
+    SIZE_BUCKETS,
+)
+OPENSEARCH_REQUEST_DURATION = registry.histogram(
+    'opensearch_mcp_opensearch_request_duration_seconds',
+    'Duration of requests to OpenSearch by cluster, method, endpoint and outcome',
+    ('cluster', 'method', 'endpoint', 'outcome'),
+)
+CLIENT_POOL_REQUESTS = registry.counter(
+    'opensearch_mcp_client_pool_requests_total',
+    'Client lookups of tool calls: hit when a pinned session client is reused, miss when a client is created',
+    ('result',),
+)
+SESSION_CACHE_REQUESTS = registry.counter(
+    'opensearch_mcp_session_cache_requests_total',
+    'Lookups of read-only requests in the session response cache',
+    ('result',),
+)
+
+
+def endpoint_label(url: str) -> str:
+    """Reduce a request path to a low-cardinality endpoint label.
+
+    API segments (starting with an underscore) and the API names after ``_cat`` and
+    ``_cluster`` are kept, index names, ids and other values are replaced with ``*``,
+    e.g. ``/logs-2025/_search`` becomes ``/*/_search``.
+    """
+    path = url.split('?', 1)[0].strip('/')
+    if not path:
+        return '/'
+    parts = path.split('/')
+    return '/' + '/'.join(
+        part if part.startswith('_') or (i > 0 and parts[i - 1] in NAMED_API_NAMESPACES) else '*'
+        for i, part in enumerate(parts)
+    )
+
+
+def _text_size(result: Any) -> int:
+    size = 0
+    for item in result or ():
+        text = item.get('text') if isinstance(item, dict) else getattr(item, 'text', None)
+        if text:
+            size += len(text) if text.isascii() else len(text.encode('utf-8'))
+    return size
+
+
+def _is_error_result(result: Any) -> bool:
+    """Whether a tool reported an error in its result, as tools do instead of raising."""
+    if not result:
+        return False
+    first = result[0]
+    text = first.get('text') if isinstance(first, dict) else getattr(first, 'text', None)
+    return isinstance(text, str) and text.startswith('Error')
+
+
+class ToolCallRecord:
+    """Measurement of one tool call; the result is passed with ``set_result``."""
+
+    def __init__(self):
+        """Initialize the record without a result."""
+        self.result: Any = None
+
+    def set_result(self, result: Any) -> None:
+        """Set the result of the tool call, used to tell errors from successes."""
+        self.result = result
+
+
+@contextlib.contextmanager
+def track_tool_call(tool: str, arguments: Optional[dict]) -> Iterator[ToolCallRecord]:
+    """Record the outcome, latency, in-flight count and payload sizes of a tool call.
+
+    Args:
+        tool: Name of the tool
+        arguments: Arguments of the call as sent by the client
+    """
+    try:
+        TOOL_REQUEST_BYTES.observe(len(json.dumps(arguments or {})), tool)
+    except (TypeError, ValueError):
+        pass
+    record = ToolCallRecord()
+    TOOL_IN_FLIGHT.inc(tool)
+    start = time.monotonic()
+    outcome = OUTCOME_ERROR
+    try:
+        yield record
+        outcome = OUTCOME_ERROR if _is_error_result(record.result) else OUTCOME_OK
+        TOOL_RESPONSE_BYTES.observe(_text_size(record.result), tool)
+    except OverloadedError:
+        outcome = OUTCOME_OVERLOADED
+        raise
+    except asyncio.CancelledError:
+        outcome = OUTCOME_CANCELLED
+        raise
+    finally:
+        TOOL_IN_FLIGHT.dec(tool)
+        TOOL_DURATION.observe(time.monotonic() - start, tool)
+        TOOL_CALLS.inc(tool, outcome)
+
+
+def _runtime_metrics(event_store: Any = None) -> List[Metric]:
+    """Build the gauges read from admission control, sessions and the event store."""
+    metrics: List[Metric] = []
+
+    controller = get_admission_controller()
+    if controller is not None:
+        labels = ('scope', 'name')
+        active = Gauge('opensearch_mcp_admission_active', 'Admitted calls being executed', labels)
+        queued = Gauge('opensearch_mcp_admission_queued', 'Calls waiting for admission', labels)
+        rejected = Counter(
+            'opensearch_mcp_admission_rejected_total', 'Calls rejected by admission', labels
+        )
+        for scope, limiters in controller.stats().items():
+            for name, stats in limiters.items():
+                active.set(scope, name, value=stats['active'])
+                queued.set(scope, name, value=stats['queued'])
+                rejected.inc(scope, name, amount=stats['rejected'])
+        metrics += [active, queued, rejected]
+
+    session_registry = get_session_registry()
+    if session_registry is not None:
+        sessions = Gauge('opensearch_mcp_sessions_active', 'Active stateful sessions')
+        clients = Gauge('opensearch_mcp_session_clients', 'OpenSearch clients pinned to sessions')
+        cached = Gauge('opensearch_mcp_session_cache_entries', 'Responses in session caches')
+        states = list(session_registry.sessions.values())
+        sessions.set(value=len(states))
+        clients.set(value=sum(len(state.clients) for state in states))
+        cached.set(value=sum(len(state.response_cache) for state in states))
+        metrics += [sessions, clients, cached]
+
+    if event_store is not None:
+        stats = event_store.stats()
+        events = Gauge('opensearch_mcp_event_store_events', 'Events kept for stream resumption')
+        size = Gauge('opensearch_mcp_event_store_bytes', 'Size of the kept events in bytes')
+        events.set(value=stats['events'])
+        size.set(value=stats['bytes'])
+        metrics += [events, size]
+        for key in ('stored', 'evicted', 'replayed'):
+            counter = Counter(f'opensearch_mcp_event_store_{key}_total', f'Events {key}')
+            counter.inc(amount=stats[key])
+            metrics.append(counter)
+
+    return metrics
+
+
+def configure_snapshots(directory: Optional[str]) -> None:
+    """Set the directory the worker processes share their metrics through.
+
+    Args:
+        directory: Directory of the snapshots, None to render only the own metrics
+    """
+    global _snapshot_dir
+    _snapshot_dir = directory
+
+
+def _families(event_store: Any = None) -> List[dict]:
+    """Collect the samples of all metrics of the process."""
+    return [
+        {
+            'name': metric.name,
+            'type': metric.type,
+            'documentation': metric.documentation,
+            'samples': list(metric.samples()),
+        }
+        for metric in [*registry.metrics, *_runtime_metrics(event_store)]
+    ]
+
+
+def write_snapshot(event_store: Any = None) -> None:
+    """Write the metrics of this worker for the scrapes answered by the other workers."""
+    path = os.path.join(_snapshot_dir, f'worker-{get_worker_id()}.json')
+    with open(f'{path}.tmp', 'w') as f:
+        json.dump(_families(event_store), f)
+    # Readers see either the previous or the new snapshot, never a partial one
+    os.replace(f'{path}.tmp', path)
+
+
+async def write_snapshots(event_store: Any = None, interval: float = SNAPSHOT_INTERVAL) -> None:
+    """Write a snapshot of the metrics of this worker every interval, until cancelled."""
+    while True:
+        try:
+            write_snapshot(event_store)
+        except OSError as e:
+            logger.warning(f'Error writing the metrics snapshot: {e}')
+        await asyncio.sleep(interval)
+
+
+def _read_snapshots(worker_id: int) -> Dict[int, List[dict]]:
+    """Read the latest snapshots of the other workers."""
+    snapshots = {}
+    for file_name in os.listdir(_snapshot_dir):
+        name, extension = os.path.splitext(file_name)
+        if extension != '.json' or not name.startswith('worker-'):
+            continue
+        try:
+            other_id = int(name[len('worker-') :])
+            if other_id != worker_id:
+                with open(os.path.join(_snapshot_dir, file_name)) as f:
+                    snapshots[other_id] = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f'Error reading the metrics snapshot {file_name}: {e}')
+    return snapshots
+
+
+def _render_workers(workers: Dict[int, List[dict]]) -> str:
+    """Render the metrics of several workers, one family per metric name."""
+    # Key: metric name, Value: header lines and sample lines of all workers
+    families: Dict[str, List[str]] = {}
+    for worker_id in sorted(workers):
+        worker_label = ('worker', str(worker_id))
+        for family in workers[worker_id]:
+            lines = families.get(family['name'])
+            if lines is None:
+                lines = families[family['name']] = [
+                    f'# HELP {family["name"]} {family["documentation"]}',
+                    f'# TYPE {family["name"]} {family["type"]}',
+                ]
+            for name, labels, value in family['samples']:
+                lines.append(
+                    f'{name}{_format_labels([worker_label, *labels])} {_format_value(value)}'
+                )
+    return '\n'.join(line for lines in families.values() for line in lines) + '\n'
+
+
+def render_metrics(event_store: Any = None) -> str:
+    """Render all metrics of the process in the Prometheus text exposition format.
+
+    With shared snapshots, the metrics of the other workers are rendered as well.
+
+    Args:
+        event_store: Event store of the server, if any
+
+    Returns:
+        str: The exposition text
+    """
+    worker_id = get_worker_id()
+    if worker_id is not None and _snapshot_dir is not None:
+        workers = _read_snapshots(worker_id)
+        workers[worker_id] = _families(event_store)
+        return _render_workers(workers)
+    const_labels = [('worker', str(worker_id))] if worker_id is not None else []
+    return registry.render(_runtime_metrics(event_store), const_labels)
@@ -0,0 +1,275 @@
+# Copyright OpenSearch Contributors
+# SPDX-License-Identifier: Apache-2.0
+
+"""Opt-in profiling of tool calls.
+
+With ``--profile-tools DIR``, a fraction of the tool calls (``--profile-tools-rate``)
+runs under cProfile while a background thread samples the stack of the event loop
+thread every millisecond. The profiles are handed to a writer thread, which
+aggregates them per tool and every ``flush_interval`` seconds, and at shutdown,
+writes the results of the tools with new calls to the directory:
+
+- ``<tool>.pstats``: cProfile statistics of all profiled calls of the tool, for
+  ``python -m pstats`` or snakeviz
+- ``<tool>.collapsed``: the sampled stacks in the collapsed format of
+  ``flamegraph.pl`` and speedscope, one ``frame;frame;frame count`` line per stack
+
+Only one call is profiled at a time, since a thread can only run one profiler.
+Coroutines of other calls that run while the profiled call awaits show up in its
+profile too. Samples taken while the event loop waits for I/O are left out of the
+stacks. When profiling is disabled, the call_tool handler is not wrapped at all.
+"""
+
+import logging
+import os
+import queue
+import random
+import re
+import sys
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from mcp.server import Server
+from mcp.types import CallToolRequest, ServerResult
+from mcp_server_opensearch.global_state import get_worker_id
+from types import FrameType
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SAMPLE_RATE = 0.1
+# Seconds between two samples of the event loop stack
+DEFAULT_SAMPLE_INTERVAL = 0.001
+# Seconds between two writes of the profile files
+DEFAULT_FLUSH_INTERVAL = 10
+
+
+def _frame_name(frame: FrameType) -> str:
+    code = frame.f_code
+    return f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})'
+
+
+def _collapse(frame: FrameType) -> str:
+    """Return the stack of a frame in collapsed format, outermost frame first."""
+    names = []
+    while frame is not None:
+        names.append(_frame_name(frame))
+        frame = frame.f_back
+    return ';'.join(reversed(names))
+
+
+class _StackSampler(threading.Thread):
+    """Thread that counts the stacks of another thread at a fixed interval."""
+
+    def __init__(self, thread_id: int, interval: float):
+        super().__init__(name='tool-profiler', daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stopped = threading.Event()
+
+    def run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            # The event loop is waiting for I/O, not using the CPU
+            if frame is None or frame.f_code.co_filename.endswith('selectors.py'):
+                continue
+            self.stacks[_collapse(frame)] += 1
+
+    def stop(self) -> Counter:
+        self._stopped.set()
+        self.join()
+        return self.stacks
+
+
+class ToolProfiler:
+    """Profile a sample of the tool calls and write per-tool results to a directory."""
+
+    def __init__(
+        self,
+        directory: str,
+        sample_rate: float = DEFAULT_SAMPLE_RATE,
+        interval: float = DEFAULT_SAMPLE_INTERVAL,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+    ):
+        """Initialize the profiler.
+
+        Args:
+            directory: Directory the profiles are written to, created if missing
+            sample_rate: Fraction of the tool calls that are profiled
+            interval: Seconds between two samples of the event loop stack
+            flush_interval: Seconds between two writes of the profile files
+
+        Raises:
+            ValueError: If the sample rate is not in (0, 1]
+        """
+        if not 0 < sample_rate <= 1:
+            raise ValueError(
+                f'sample_rate must be greater than 0 and at most 1, got {sample_rate}'
+            )
+        self.directory = directory
+        self.sample_rate = sample_rate
+        self.interval = interval
+        self.flush_interval = flush_interval
+        # Key: tool name, Value: aggregated statistics or sampled stacks of its calls
+        self.stats: Dict[str, Any] = {}
+        self.stacks: Dict[str, Counter] = {}
+        self.profiled_calls: Counter = Counter()
+        self._active = False
+        # Profiles of finished calls that the writer has not aggregated yet
+        self._pending: queue.SimpleQueue = queue.SimpleQueue()
+        self._flush_lock = threading.Lock()
+        self._writer: Optional[threading.Thread] = None
+        self._closed = threading.Event()
+        os.makedirs(directory, exist_ok=True)
+
+    def should_profile(self) -> bool:
+        """Decide whether to profile the next call."""
+        return not self._active and random.random() < self.sample_rate
+
+    @contextmanager
+    def profile(self, tool: str) -> Iterator[None]:
+        """Profile a block as a call of a tool and write the results of the tool."""
+        # Imported here, so that servers without profiling do not load the profilers
+        import cProfile
+
+        profiler = cProfile.Profile()
+        sampler = _StackSampler(threading.get_ident(), self.interval)
+        self._active = True
+        sampler.start()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            stacks = sampler.stop()
+            self._active = False
+            self._record(tool, profiler, stacks)
+
+    def _record(self, tool: str, profiler: Any, stacks: Counter) -> None:
+        """Hand the profile of a call to the writer thread."""
+        self.profiled_calls[tool] += 1
+        self._pending.put((tool, profiler, stacks))
+        # Threads do not survive a fork, so each process starts its own writer
+        if (self._writer is None or not self._writer.is_alive()) and not self._closed.is_set():
+            self._writer = threading.Thread(
+                target=self._run_writer, name='tool-profile-writer', daemon=True
+            )
+            self._writer.start()
+
+    def _run_writer(self) -> None:
+        while not self._closed.wait(self.flush_interval):
+            self.flush()
+
+    def flush(self) -> None:
+        """Aggregate the pending profiles and write the files of their tools."""
+        import pstats
+
+        with self._flush_lock:
+            tools = set()
+            while True:
+                try:
+                    tool, profiler, stacks = self._pending.get_nowait()
+                except queue.Empty:
+                    break
+                profiler.create_stats()
+                if tool in self.stats:
+                    self.stats[tool].add(profiler)
+                else:
+                    self.stats[tool] = pstats.Stats(profiler)
+                self.stacks.setdefault(tool, Counter()).update(stacks)
+                tools.add(tool)
+            for tool in sorted(tools):
+                try:
+                    self._write(tool)
+                except OSError as e:
+                    logger.warning(f'Could not write the profile of tool {tool}: {e}')
+
+    def close(self) -> None:
+        """Stop the writer thread and write the profiles that are still pending."""
+        self._closed.set()
+        if self._writer is not None and self._writer.is_alive():
+            self._writer.join()
+        self.flush()
+
+    def _path(self, tool: str, extension: str) -> str:
+        name = re.sub(r'[^\w.-]', '_', tool)
+        worker_id = get_worker_id()
+        if worker_id is not None:
+            # Workers profile their own calls, so each one writes its own files
+            name = f'{name}.worker-{worker_id}'
+        return os.path.join(self.directory, f'{name}.{extension}')
+
+    def _write(self, tool: str) -> None:
+        self.stats[tool].dump_stats(self._path(tool, 'pstats'))
+        with open(self._path(tool, 'collapsed'), 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks[tool].most_common():
+                f.write(f'{stack} {count}\n')
+
+    def wrap(
+        self, handler: Callable[[CallToolRequest], Awaitable[ServerResult]]
+    ) -> Callable[[CallToolRequest], Awaitable[ServerResult]]:
+        """Wrap a call_tool request handler so that a sample of its calls is profiled."""
+
+        async def profiled_handler(request: CallToolRequest) -> ServerResult:
+            if not self.should_profile():
+                return await handler(request)
+            with self.profile(request.params.name):
+                return await handler(request)
+
+        return profiled_handler
+
+
+# Profiler of the running server, None when tool profiling is disabled
+_tool_profiler: Optional[ToolProfiler] = None
+
+
+def configure_profiling(
+    directory: str, sample_rate: float = DEFAULT_SAMPLE_RATE
+) -> Optional[ToolProfiler]:
+    """Enable the profiling of tool calls.
+
+    Args:
+        directory: Directory the profiles are written to, '' disables profiling
+        sample_rate: Fraction of the tool calls that are profiled
+
+    Returns:
+        Optional[ToolProfiler]: The profiler, or None if profiling is disabled
+
+    Raises:
+        ValueError: If the sample rate is not in (0, 1]
+    """
+    global _tool_profiler
+    _tool_profiler = ToolProfiler(directory, sample_rate) if directory else None
+    if _tool_profiler is not None:
+        logger.info(f'Profiling {sample_rate:.0%} of the tool calls into {directory}')
+    return _tool_profiler
+
+
+def get_tool_profiler() -> Optional[ToolProfiler]:
+    """Get the tool profiler of the running server.
+
+    Returns:
+        Optional[ToolProfiler]: The profiler, or None if profiling is disabled
+    """
+    return _tool_profiler
+
+
+def shutdown_profiling() -> None:
+    """Write the pending profiles of the tool profiler, if tool profiling is enabled."""
+    if _tool_profiler is not None:
+        _tool_profiler.close()
+
+
+def add_tool_profiler(server: Server) -> None:
+    """Profile a sample of the tool calls of a server, if tool profiling is enabled.
+
+    Args:
+        server: MCP server whose call_tool handler is registered
+    """
+    if _tool_profiler is None:
+        return
+    handler = server.request_handlers.get(CallToolRequest)
+    if handler is not None:
+        server.request_handlers[CallToolRequest] = _tool_profiler.wrap(handler)
@@ -0,0 +1,244 @@
+# Copyright OpenSearch Contributors
+# SPDX-License-Identifier: Apache-2.0
+
+"""Readiness of the streaming server for load balancers.
+
+``/health`` only tells that the process is alive. ``/ready`` tells whether the server
+can actually reach its OpenSearch clusters: a background ``ReadinessProber`` probes
+every cluster every ``interval`` seconds (building a client, which resolves and
+refreshes the credentials, and calling the root endpoint) and caches per cluster its
+reachability, version, credential expiry and breaker state. The endpoint only reads
+that cache, so it answers without calling OpenSearch.
+
+A cluster's breaker opens after ``failure_threshold`` consecutive failed probes and
+closes again on the next successful one, so a single lost probe does not take the
+server out of rotation. A cluster is ready once it has answered a probe, while its
+breaker is closed and its assumed IAM role credentials have not expired. The server
+is ready when any probed cluster is ready, so one unreachable cluster of a multi
+cluster deployment does not take every pod out of rotation; the response reports
+each cluster separately. With ``require='all'`` every probed cluster must be ready.
+Clusters that use header authentication are not probed.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+from mcp_server_opensearch.clusters_information import cluster_registry
+from mcp_server_opensearch.global_state import get_mode
+from mcp_server_opensearch.warmup import SINGLE_MODE_CLUSTER, SKIPPED, probe_clusters
+from semver import Version
+from typing import Any, Dict, List, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_READY_INTERVAL = 15
+DEFAULT_PROBE_TIMEOUT = 5
+DEFAULT_FAILURE_THRESHOLD = 3
+
+BREAKER_CLOSED = 'closed'
+BREAKER_OPEN = 'open'
+
+
+@dataclass
+class ClusterHealth:
+    """Cached outcome of the probes of one cluster."""
+
+    name: str
+    reachable: bool = False
+    # Whether the cluster answered at least one probe
+    seen: bool = False
+    version: Optional[Version] = None
+    error: Optional[str] = None
+    latency_ms: float = 0.0
+    checked_at: float = 0.0
+    credentials_expiry: Optional[float] = None
+    consecutive_failures: int = 0
+    breaker: str = BREAKER_CLOSED
+
+    def is_ready(self, now: float) -> bool:
+        """Whether the cluster counts as ready at time now."""
+        if not self.seen or self.breaker == BREAKER_OPEN:
+            return False
+        return self.credentials_expiry is None or self.credentials_expiry > now
+
+    def to_dict(self, now: float) -> Dict[str, Any]:
+        """Return the state of the cluster as reported by /ready."""
+        return {
+            'ready': self.is_ready(now),
+            'reachable': self.reachable,
+            'version': str(self.version) if self.version else None,
+            'breaker': self.breaker,
+            'consecutive_failures': self.consecutive_failures,
+            'credentials_expires_in': (
+                round(self.credentials_expiry - now) if self.credentials_expiry else None
+            ),
+            'latency_ms': round(self.latency_ms, 1),
+            'checked_at': self.checked_at,
+            'error': self.error,
+        }
+
+
+def _iam_arn(cluster_name: str) -> str:
+    """IAM role the connection of a cluster assumes, '' if none."""
+    if cluster_name:
+        cluster_info = cluster_registry.get(cluster_name)
+        return (cluster_info.iam_arn or '').strip() if cluster_info else ''
+    return os.getenv('AWS_IAM_ARN', '').strip()
+
+
+class ReadinessProber:
+    """Probe the clusters in the background and cache the readiness of the server."""
+
+    def __init__(
+        self,
+        interval: float = DEFAULT_READY_INTERVAL,
+        timeout: float = DEFAULT_PROBE_TIMEOUT,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        require: str = 'any',
+    ):
+        """Initialize the prober.
+
+        Args:
+            interval: Seconds between probes
+            timeout: Seconds a probe of all clusters may take
+            failure_threshold: Consecutive failed probes that open a cluster's breaker
+            require: 'any' if one ready cluster is enough, 'all' if every one must be ready
+        """
+        if require not in ('all', 'any'):
+            raise ValueError(f"require must be 'all' or 'any', got {require!r}")
+        self.interval = interval
+        self.timeout = timeout
+        self.failure_threshold = max(failure_threshold, 1)
+        self.require = require
+        self.clusters: Dict[str, ClusterHealth] = {}
+        # Clusters that are not probed because they use header authentication
+        self.skipped: List[str] = []
+        self.probes = 0
+        self.ready = False
+        self._status_code = 503
+        self._body = json.dumps({'status': 'starting', 'clusters': {}}).encode()
+
+    async def probe(self) -> None:
+        """Probe all clusters once and update the cached readiness."""
+        from opensearch.client import get_assumed_role_expiry
+
+        readiness = await probe_clusters(self.timeout)
+        self.skipped = [name for name, state in readiness.items() if state.status == SKIPPED]
+        probed = {name: state for name, state in readiness.items() if name not in self.skipped}
+        for name, state in probed.items():
+            health = self.clusters.setdefault(name, ClusterHealth(name))
+            health.checked_at = state.checked_at
+            health.latency_ms = state.duration_ms
+            health.reachable = state.ready
+            if state.ready:
+                health.seen = True
+                health.version = state.version
+                health.error = None
+                health.consecutive_failures = 0
+                health.breaker = BREAKER_CLOSED
+            else:
+                health.error = state.error
+                health.consecutive_failures += 1
+                if health.consecutive_failures >= self.failure_threshold:
+                    if health.breaker != BREAKER_OPEN:
+                        logger.warning(
+                            f'Readiness breaker of cluster {name or SINGLE_MODE_CLUSTER} '
+                            f'opened: {state.error}'
+                        )
+                    health.breaker = BREAKER_OPEN
+            iam_arn = _iam_arn(name)
+            health.credentials_expiry = get_assumed_role_expiry(iam_arn) if iam_arn else None
+        # Clusters removed from the configuration no longer count
+        for name in set(self.clusters) - set(probed):
+            del self.clusters[name]
+        self.probes += 1
+        self._render()
+
+    def forget(self, names: List[str]) -> None:
+        """Drop the cached probes of clusters whose configuration was removed or changed.
+
+        Args:
+            names: Names of the clusters
+        """
+        for name in names:
+            self.clusters.pop(name, None)
+        self._render()
+
+    def _render(self) -> None:
+        """Build the /ready response, so that requests only return it."""
+        now = time.time()
+        ready = [health.is_ready(now) for health in self.clusters.values()]
+        if not ready:
+            # Nothing to probe, e.g. only clusters with header authentication
+            self.ready = True
+        elif self.require == 'any':
+            self.ready = any(ready)
+        else:
+            self.ready = all(ready)
+        self._status_code = 200 if self.ready else 503
+        body = {
+            'status': 'ready' if self.ready else 'not_ready',
+            'mode': get_mode(),
+            'require': self.require,
+            'probes': self.probes,
+            'clusters': {
+                name or SINGLE_MODE_CLUSTER: health.to_dict(now)
+                for name, health in self.clusters.items()
+            },
+            'skipped': [name or SINGLE_MODE_CLUSTER for name in self.skipped],
+        }
+        self._body = json.dumps(body).encode()
+
+    def response(self) -> Tuple[int, bytes]:
+        """Return the status code and JSON body of the cached readiness."""
+        return self._status_code, self._body
+
+    async def run(self) -> None:
+        """Probe the clusters every interval seconds until cancelled."""
+        while True:
+            try:
+                await self.probe()
+            except Exception as e:
+                logger.warning(f'Readiness probe failed: {e}')
+            await asyncio.sleep(self.interval)
+
+
+# Readiness prober of the running server, None when readiness probing is disabled
+_readiness_prober: Optional[ReadinessProber] = None
+
+
+def configure_readiness(
+    interval: float = DEFAULT_READY_INTERVAL,
+    timeout: float = DEFAULT_PROBE_TIMEOUT,
+    failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+    require: str = 'any',
+) -> Optional[ReadinessProber]:
+    """Enable the background readiness prober of the streaming server.
+
+    Args:
+        interval: Seconds between probes, 0 disables the prober
+        timeout: Seconds a probe of all clusters may take
+        failure_threshold: Consecutive failed probes that open a cluster's breaker
+        require: 'any' if one ready cluster is enough, 'all' if every one must be ready
+
+    Returns:
+        Optional[ReadinessProber]: The prober, or None if it is disabled
+    """
+    global _readiness_prober
+    _readiness_prober = (
+        ReadinessProber(interval, timeout, failure_threshold, require) if interval > 0 else None
+    )
+    return _readiness_prober
+
+
+def get_readiness_prober() -> Optional[ReadinessProber]:
+    """Get the readiness prober of the running server.
+
+    Returns:
+        Optional[ReadinessProber]: The prober, or None if it is disabled
+    """
+    return _readiness_prober
@@ -0,0 +1,251 @@
+# Copyright OpenSearch Contributors
+# SPDX-License-Identifier: Apache-2.0
+
+"""Per-session state for the stateful streamable HTTP transport.
+
+In stateful mode every MCP session (identified by the ``mcp-session-id`` header) gets
+its own ``SessionState``: OpenSearch clients that stay open for the whole session,
+an optional response cache and a search ``preference`` value, so that repeated searches
+of a session hit the same shard copies and their request caches. Sessions that see
+no requests for ``idle_timeout`` seconds are expired and their clients are closed.
+"""
+
+import collections
+import logging
+import pickle
+import time
+from mcp.server.lowlevel.server import request_ctx
+from starlette.requests import Request
+from typing import Any, Dict, Hashable, Iterable, List, Optional
+
+
+logger = logging.getLogger(__name__)
+
+MCP_SESSION_ID_HEADER = 'mcp-session-id'
+DEFAULT_IDLE_TIMEOUT = 1800
+# Responses are only cached when a ttl is configured, as cached data may be stale
+DEFAULT_CACHE_TTL = 0
+DEFAULT_CACHE_SIZE = 256
+
+
+class ResponseCache:
+    """LRU cache of OpenSearch responses with a time to live.
+
+    Responses are stored pickled, so callers may modify the responses they get, and a
+    hit costs one deserialization instead of a deep copy.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_CACHE_TTL, max_entries: int = DEFAULT_CACHE_SIZE):
+        """Initialize the cache.
+
+        Args:
+            ttl: Seconds a response is kept, 0 disables the cache
+            max_entries: Maximum number of cached responses
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        # Key: request key, Value: (expiry time, response)
+        self._entries: collections.OrderedDict = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached response, or None if it is missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return pickle.loads(entry[1])
+
+    def put(self, key: Hashable, response: Any) -> None:
+        """Cache a response, evicting the least recently used one when full."""
+        if self.ttl <= 0 or self.max_entries <= 0:
+            return
+        self._entries[key] = (
+            time.monotonic() + self.ttl,
+            pickle.dumps(response, protocol=pickle.HIGHEST_PROTOCOL),
+        )
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        """Return the number of cached responses, including expired ones."""
+        return len(self._entries)
+
+
+class SessionState:
+    """State kept for one MCP session."""
+
+    def __init__(self, session_id: str, cache_ttl: float = DEFAULT_CACHE_TTL):
+        """Initialize the state.
+
+        Args:
+            session_id: The mcp-session-id of the session
+            cache_ttl: Seconds responses are cached, 0 disables the cache
+        """
+        self.session_id = session_id
+        self.last_active = time.monotonic()
+        # Key: (cluster name, auth headers), Value: AsyncOpenSearch client pinned to the session
+        self.clients: Dict[Hashable, Any] = {}
+        self.response_cache = ResponseCache(ttl=cache_ttl)
+
+    @property
+    def preference(self) -> str:
+        """Search preference that routes the session's searches to the same shard copies."""
+        return self.session_id
+
+    def touch(self) -> None:
+        """Mark the session as active."""
+        self.last_active = time.monotonic()
+
+    async def close(self) -> None:
+        """Close the clients pinned to the session."""
+        for client in self.clients.values():
+            try:
+                await client.close()
+            except Exception as e:
+                logger.warning(f'Error closing client of session {self.session_id}: {e}')
+        self.clients.clear()
+
+    def detach_clients(self, cluster_names: Iterable[str]) -> List[Any]:
+        """Unpin the clients of some clusters, so that the next calls create new ones.
+
+        Args:
+            cluster_names: Names of the clusters whose clients are unpinned
+
+        Returns:
+            List[Any]: The unpinned clients, which the caller closes
+        """
+        names = set(cluster_names)
+        keys = [key for key in self.clients if key[0] in names]
+        return [self.clients.pop(key) for key in keys]
+
+
+class SessionRegistry:
+    """Registry of the active sessions with idle expiry."""
+
+    def __init__(
+        self, idle_timeout: float = DEFAULT_IDLE_TIMEOUT, cache_ttl: float = DEFAULT_CACHE_TTL
+    ):
+        """Initialize the registry.
+
+        Args:
+            idle_timeout: Seconds without requests after which a session expires
+            cache_ttl: Seconds responses are cached per session, 0 disables the cache
+        """
+        self.idle_timeout = idle_timeout
+        self.cache_ttl = cache_ttl
+        self.sessions: Dict[str, SessionState] = {}
+
+    def get_or_create(self, session_id: str) -> SessionState:
+        """Return the state of a session, creating it on first use, and mark it active."""
+        state = self.sessions.get(session_id)
+        if state is None:
+            state = SessionState(session_id, cache_ttl=self.cache_ttl)
+            self.sessions[session_id] = state
+            logger.debug(f'Created state for session {session_id}')
+        state.touch()
+        return state
+
+    def touch(self, session_id: str) -> None:
+        """Mark a session as active if it is known."""
+        state = self.sessions.get(session_id)
+        if state is not None:
+            state.touch()
+
+    async def remove(self, session_id: str) -> None:
+        """Drop a session and close its clients."""
+        state = self.sessions.pop(session_id, None)
+        if state is not None:
+            await state.close()
+            logger.info(f'Removed session {session_id}')
+
+    async def expire_idle(self) -> List[str]:
+        """Remove the sessions that were idle for longer than idle_timeout.
+
+        Returns:
+            List[str]: Ids of the expired sessions
+        """
+        cutoff = time.monotonic() - self.idle_timeout
+        expired = [sid for sid, state in self.sessions.items() if state.last_active < cutoff]
+        for session_id in expired:
+            await self.remove(session_id)
+        return expired
+
+    def detach_clients(self, cluster_names: Iterable[str]) -> List[Any]:
+        """Unpin the clients of some clusters from all sessions.
+
+        Args:
+            cluster_names: Names of the clusters whose clients are unpinned
+
+        Returns:
+            List[Any]: The unpinned clients, which the caller closes
+        """
+        names = set(cluster_names)
+        return [
+            client for state in self.sessions.values() for client in state.detach_clients(names)
+        ]
+
+    async def close(self) -> None:
+        """Remove all sessions."""
+        for session_id in list(self.sessions):
+            await self.remove(session_id)
+
+
+# Session registry of the running server, None in stateless mode
+_session_registry: Optional[SessionRegistry] = None
+
+
+def configure_sessions(
+    stateless: bool,
+    idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+    cache_ttl: float = DEFAULT_CACHE_TTL,
+) -> Optional[SessionRegistry]:
+    """Enable per-session state for stateful servers.
+
+    Args:
+        stateless: Whether the server runs without sessions
+        idle_timeout: Seconds without requests after which a session expires
+        cache_ttl: Seconds responses are cached within a session, 0 disables the cache
+
+    Returns:
+        Optional[SessionRegistry]: The registry, or None in stateless mode
+    """
+    global _session_registry
+    _session_registry = None if stateless else SessionRegistry(idle_timeout, cache_ttl)
+    return _session_registry
+
+
+def get_session_registry() -> Optional[SessionRegistry]:
+    """Get the session registry of the running server.
+
+    Returns:
+        Optional[SessionRegistry]: The registry, or None in stateless mode
+    """
+    return _session_registry
+
+
+def get_current_session() -> Optional[SessionState]:
+    """Return the state of the session the current tool call belongs to.
+
+    Returns:
+        Optional[SessionState]: The session state, or None outside of a stateful
+            streamable HTTP session
+    """
+    if _session_registry is None:
+        return None
+    try:
+        request = request_ctx.get().request
+    except LookupError:
+        return None
+    if not isinstance(request, Request):
+        return None
+    session_id = request.headers.get(MCP_SESSION_ID_HEADER)
+    if not session_id:
+        return None
+    return _session_registry.get_or_create(session_id)
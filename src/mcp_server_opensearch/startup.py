@@ -0,0 +1,273 @@
+# Copyright OpenSearch Contributors
+# SPDX-License-Identifier: Apache-2.0
+
+"""Concurrent startup pipeline.
+
+The startup steps (loading the clusters, fetching the API specifications, probing the
+OpenSearch version and plugins, the warm-up, applying the tool config and filtering
+the tools)
+are mostly independent I/O. ``run_pipeline`` starts every step as soon as the steps
+it depends on have finished, so the time to ready is the longest chain of dependent
+steps instead of the sum of all steps, and logs the duration of each step.
+
+The whole startup is bounded by a deadline. Optional steps (network lookups that
+have a safe fallback) that are still running when it passes are cancelled and their
+fallback is used, so a slow GitHub or cluster cannot hold up the server. Required
+steps always run to completion and their errors stop the startup as before.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from mcp_server_opensearch.clusters_information import load_clusters_from_yaml
+from mcp_server_opensearch.warmup import warm_up_clusters
+from opensearch.helper import get_installed_plugins, get_opensearch_version
+from tools.config import apply_custom_tool_config
+from tools.tool_filter import get_tools
+from tools.tool_generator import generate_tools_from_openapi
+from tools.tool_params import baseToolArgs
+from tools.tools import TOOL_REGISTRY
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STARTUP_TIMEOUT = 30
+
+DONE = 'done'
+FAILED = 'failed'
+TIMEOUT = 'timeout'
+
+
+@dataclass
+class StartupStep:
+    """One step of the startup pipeline.
+
+    Steps receive the results of the steps they depend on as keyword arguments.
+    """
+
+    name: str
+    run: Callable[..., Awaitable[Any]]
+    depends_on: Tuple[str, ...] = ()
+    # Optional steps fall back to ``fallback`` when they fail or miss the deadline
+    optional: bool = False
+    fallback: Any = None
+
+
+@dataclass
+class StepResult:
+    """Outcome of one startup step."""
+
+    name: str
+    status: str
+    value: Any = None
+    error: Optional[str] = None
+    duration_ms: float = 0.0
+
+
+async def run_pipeline(
+    steps: List[StartupStep], timeout: Optional[float] = DEFAULT_STARTUP_TIMEOUT
+) -> Dict[str, StepResult]:
+    """Run the startup steps concurrently in dependency order.
+
+    Args:
+        steps: Steps to run; dependencies must refer to steps of the same list
+        timeout: Seconds after which running optional steps are cancelled and optional
+            steps that have not started yet are skipped, None for no deadline
+
+    Returns:
+        Dict[str, StepResult]: Result of every step by name
+
+    Raises:
+        ValueError: If a step depends on an unknown step or the dependencies form a cycle
+        Exception: The error of a required step that failed
+    """
+    by_name = {step.name: step for step in steps}
+    for step in steps:
+        unknown = [name for name in step.depends_on if name not in by_name]
+        if unknown:
+            raise ValueError(f'Startup step {step.name} depends on unknown steps: {unknown}')
+
+    start = time.monotonic()
+    deadline = None if timeout is None else start + timeout
+    results: Dict[str, StepResult] = {}
+    # Key: task, Value: (step, start time of the step)
+    running: Dict[asyncio.Task, Tuple[StartupStep, float]] = {}
+    waiting = list(steps)
+
+    def finish(
+        step: StartupStep, status: str, value: Any, error: Optional[str], step_start: float
+    ) -> None:
+        results[step.name] = StepResult(
+            step.name, status, value, error, (time.monotonic() - step_start) * 1000
+        )
+        duration = results[step.name].duration_ms
+        if status == DONE:
+            logger.info(f'Startup step {step.name} finished in {duration:.0f} ms')
+        else:
+            logger.warning(
+                f'Startup step {step.name} {status} after {duration:.0f} ms, '
+                f'continuing without it: {error}'
+            )
+
+    try:
+        while waiting or running:
+            past_deadline = deadline is not None and time.monotonic() >= deadline
+            for step in [s for s in waiting if all(d in results for d in s.depends_on)]:
+                waiting.remove(step)
+                if past_deadline and step.optional:
+                    finish(
+                        step, TIMEOUT, step.fallback, 'startup deadline passed', time.monotonic()
+                    )
+                    continue
+                kwargs = {name: results[name].value for name in step.depends_on}
+                running[asyncio.create_task(step.run(**kwargs))] = (step, time.monotonic())
+
+            if not running:
+                if waiting:
+                    cycle = [step.name for step in waiting]
+                    raise ValueError(f'Startup steps have circular dependencies: {cycle}')
+                break
+
+            remaining = None
+            if deadline is not None and any(step.optional for step, _ in running.values()):
+                remaining = max(deadline - time.monotonic(), 0)
+            done, _ = await asyncio.wait(
+                running, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+            )
+
+            for task in done:
+                step, step_start = running.pop(task)
+                error = task.exception()
+                if error is None:
+                    finish(step, DONE, task.result(), None, step_start)
+                elif step.optional:
+                    finish(step, FAILED, step.fallback, str(error), step_start)
+                else:
+                    raise error
+
+            if deadline is not None and time.monotonic() >= deadline:
+                for task, (step, step_start) in list(running.items()):
+                    if step.optional:
+                        task.cancel()
+                        await asyncio.gather(task, return_exceptions=True)
+                        del running[task]
+                        finish(
+                            step,
+                            TIMEOUT,
+                            step.fallback,
+                            f'no result within the startup deadline of {timeout}s',
+                            step_start,
+                        )
+    finally:
+        for task in running:
+            task.cancel()
+        await asyncio.gather(*running, return_exceptions=True)
+
+    total_ms = (time.monotonic() - start) * 1000
+    steps_ms = sum(result.duration_ms for result in results.values())
+    logger.info(
+        f'Startup finished in {total_ms:.0f} ms ({steps_ms:.0f} ms if run one after another)'
+    )
+    return results
+
+
+def startup_steps(
+    mode: str = 'single',
+    config_file_path: str = '',
+    cli_tool_overrides: dict = None,
+    warm_up_timeout: Optional[float] = None,
+) -> List[StartupStep]:
+    """Build the steps that load the enabled tools of a server.
+
+    The spec fetch, the cluster loading and the version and plugin probes start right
+    away. The warm-up needs the clusters, the tool config needs the generated tools and
+    the tool filter needs the config, the version and the plugins. In single mode the
+    version probe waits for the warm-up, so that it reuses the version the warm-up found.
+
+    Args:
+        mode: Server mode, 'single' or 'multi'
+        config_file_path: Path to a YAML configuration file
+        cli_tool_overrides: Tool name and description overrides from the command line
+        warm_up_timeout: Seconds the cluster warm-up may take, None to skip it
+
+    Returns:
+        List[StartupStep]: The steps, ending with 'tools' that yields the enabled tools
+    """
+
+    async def load_clusters() -> None:
+        if mode == 'multi':
+            await load_clusters_from_yaml(config_file_path)
+
+    async def fetch_specs() -> None:
+        await generate_tools_from_openapi()
+
+    async def warm_up(clusters: None) -> None:
+        await warm_up_clusters(warm_up_timeout)
+
+    async def probe_version(**_) -> Any:
+        return await get_opensearch_version(baseToolArgs(opensearch_cluster_name=''))
+
+    async def probe_plugins() -> Any:
+        return await get_installed_plugins(baseToolArgs(opensearch_cluster_name=''))
+
+    async def apply_config(specs: None) -> dict:
+        return apply_custom_tool_config(TOOL_REGISTRY, config_file_path, cli_tool_overrides or {})
+
+    async def filter_tools(config: dict, version: Any = None, plugins: Any = None) -> dict:
+        return await get_tools(
+            tool_registry=config,
+            config_file_path=config_file_path,
+            opensearch_version=version,
+            installed_plugins=plugins,
+        )
+
+    steps = [
+        StartupStep('clusters', load_clusters),
+        StartupStep('specs', fetch_specs, optional=True),
+        StartupStep('config', apply_config, depends_on=('specs',)),
+    ]
+    if warm_up_timeout:
+        steps.append(StartupStep('warm_up', warm_up, depends_on=('clusters',), optional=True))
+    if mode == 'multi':
+        # Multi mode serves every tool, so no version is needed to filter them
+        steps.append(StartupStep('tools', filter_tools, depends_on=('config',)))
+    else:
+        steps.append(
+            StartupStep(
+                'version',
+                probe_version,
+                depends_on=('warm_up',) if warm_up_timeout else (),
+                optional=True,
+            )
+        )
+        steps.append(StartupStep('plugins', probe_plugins, optional=True))
+        steps.append(
+            StartupStep('tools', filter_tools, depends_on=('config', 'version', 'plugins'))
+        )
+    return steps
+
+
+async def run_startup(
+    mode: str = 'single',
+    config_file_path: str = '',
+    cli_tool_overrides: dict = None,
+    warm_up_timeout: Optional[float] = None,
+    timeout: Optional[float] = DEFAULT_STARTUP_TIMEOUT,
+) -> dict:
+    """Run the startup pipeline and return the enabled tools.
+
+    Args:
+        mode: Server mode, 'single' or 'multi'
+        config_file_path: Path to a YAML configuration file
+        cli_tool_overrides: Tool name and description overrides from the command line
+        warm_up_timeout: Seconds the cluster warm-up may take, None to skip it
+        timeout: Seconds the optional startup steps may take, None for no deadline
+
+    Returns:
+        dict: The enabled tools
+    """
+    steps = startup_steps(mode, config_file_path, cli_tool_overrides, warm_up_timeout)
+    results = await run_pipeline(steps, timeout)
+    return results['tools'].value
@@ -1,16 +1,19 @@
 # Copyright OpenSearch Contributors
 # SPDX-License-Identifier: Apache-2.0
 
+import asyncio
 import logging
-from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import TextContent, Tool
-from mcp_server_opensearch.clusters_information import load_clusters_from_yaml
+from opensearch.deadline import tool_deadline
+from mcp_server_opensearch import tracing
+from mcp_server_opensearch.call_cost import add_cost_meta
+from mcp_server_opensearch.capabilities import get_capability_matrix
+from mcp_server_opensearch.config_reload import ReloadableServer, get_config_reloader
+from mcp_server_opensearch.admission import DEFAULT_CLUSTER_NAME, admit, configure_admission
 from mcp_server_opensearch.global_state import set_mode, set_profile, set_config_file_path
-from tools.tool_filter import get_tools
-from tools.tool_generator import generate_tools_from_openapi
-from tools.tools import TOOL_REGISTRY
-from tools.config import apply_custom_tool_config
+from mcp_server_opensearch.profiling import add_tool_profiler
+from mcp_server_opensearch.startup import DEFAULT_STARTUP_TIMEOUT, run_startup
 
 
 # --- Server setup ---
@@ -19,6 +22,8 @@ async def serve(
     profile: str = '',
     config_file_path: str = '',
     cli_tool_overrides: dict = None,
+    warm_up_timeout: float = None,
+    startup_timeout: float = DEFAULT_STARTUP_TIMEOUT,
 ) -> None:
     # Set the global mode
     set_mode(mode)
@@ -31,25 +36,22 @@ async def serve(
     if config_file_path:
         set_config_file_path(config_file_path)
 
-    server = Server('opensearch-mcp-server')
-    # Load clusters from YAML file
-    if mode == 'multi':
-        await load_clusters_from_yaml(config_file_path)
+    # Enable admission control if configured
+    configure_admission(config_file_path)
 
-    # Call tool generator
-    await generate_tools_from_openapi()
-    # Apply custom tool config (custom name and description)
-    customized_registry = apply_custom_tool_config(
-        TOOL_REGISTRY, config_file_path, cli_tool_overrides or {}
-    )
-    # Get enabled tools (tool filter)
-    enabled_tools = await get_tools(
-        tool_registry=customized_registry, config_file_path=config_file_path
+    server = ReloadableServer('opensearch-mcp-server')
+    # Load clusters, specs, version and config concurrently
+    enabled_tools = await run_startup(
+        mode, config_file_path, cli_tool_overrides, warm_up_timeout, startup_timeout
     )
     logging.info(f'Enabled tools: {list(enabled_tools.keys())}')
 
     @server.list_tools()
     async def list_tools() -> list[Tool]:
+        reloader = get_config_reloader()
+        if reloader is not None:
+            # Clients that listed the tools are told when a reload changes them
+            reloader.track_session(server.request_context.session)
         tools = []
         for tool_name, tool_info in enabled_tools.items():
             tools.append(
@@ -76,10 +78,39 @@ async def serve(
         tool = enabled_tools.get(found_tool_key)
         from tools.tool_params import validate_args_for_mode
 
-        parsed = validate_args_for_mode(arguments, tool['args_model'])
-        return await tool['function'](parsed)
+        with tracing.tool_call_span(found_tool_key) as call_span:
+            with tracing.span('validate_args_for_mode'):
+                parsed = validate_args_for_mode(arguments, tool['args_model'])
+            tracing.set_call_cluster(
+                call_span, parsed.opensearch_cluster_name or DEFAULT_CLUSTER_NAME
+            )
+            # The per-call deadline takes precedence over the one from the tool config
+            with tool_deadline(parsed.call_timeout or tool.get('call_timeout')):
+                async with admit(found_tool_key, parsed.opensearch_cluster_name):
+                    with tracing.trace_response_formatting():
+                        return await tool['function'](parsed)
+
+    add_cost_meta(server)
+    add_tool_profiler(server)
+
+    # Reload the config file on SIGHUP or when it changes, if configured
+    reloader = get_config_reloader()
+    if reloader is not None:
+        reloader.track_tools(enabled_tools)
+        await reloader.start()
+
+    # Refresh the per-cluster capabilities in the background, if enabled
+    matrix = get_capability_matrix()
+    matrix_task = asyncio.create_task(matrix.run()) if matrix is not None else None
 
     # Start stdio-based MCP server
     options = server.create_initialization_options()
-    async with stdio_server() as (reader, writer):
-        await server.run(reader, writer, options, raise_exceptions=True)
+    try:
+        async with stdio_server() as (reader, writer):
+            await server.run(reader, writer, options, raise_exceptions=True)
+    finally:
+        if matrix_task is not None:
+            matrix_task.cancel()
+            await asyncio.gather(matrix_task, return_exceptions=True)
+        if reloader is not None:
+            await reloader.stop()
@@ -1,33 +1,93 @@
 # Copyright OpenSearch Contributors
 # SPDX-License-Identifier: Apache-2.0
 
+import asyncio
 import logging
+import os
+import shutil
+import signal
+import socket
+import tempfile
+import time
 import uvicorn
 import contextlib
-from typing import AsyncIterator
+from typing import Any, AsyncIterator, Dict, Optional
 from mcp.server import Server
 from mcp.server.sse import SseServerTransport
 from mcp.types import TextContent, Tool
-from mcp_server_opensearch.clusters_information import load_clusters_from_yaml
-from mcp_server_opensearch.global_state import set_mode, set_profile, set_config_file_path
+from opensearch.deadline import tool_deadline
+from mcp_server_opensearch import tracing
+from mcp_server_opensearch.call_cost import add_cost_meta
+from mcp_server_opensearch.capabilities import get_capability_matrix
+from mcp_server_opensearch.config_reload import ReloadableServer, get_config_reloader
+from mcp_server_opensearch.admission import (
+    DEFAULT_CLUSTER_NAME,
+    admit,
+    configure_admission,
+    get_admission_controller,
+)
+from mcp_server_opensearch.event_store import BoundedEventStore, ResumableSessionManager
+from mcp_server_opensearch.metrics import (
+    CONTENT_TYPE as METRICS_CONTENT_TYPE,
+    configure_snapshots,
+    render_metrics,
+    track_tool_call,
+    write_snapshots,
+)
+from mcp_server_opensearch.profiling import (
+    DEFAULT_SAMPLE_RATE,
+    add_tool_profiler,
+    configure_profiling,
+    shutdown_profiling,
+)
+from mcp_server_opensearch.readiness import get_readiness_prober
+from mcp_server_opensearch.startup import DEFAULT_STARTUP_TIMEOUT, run_startup
+from mcp_server_opensearch.sessions import (
+    DEFAULT_CACHE_TTL,
+    DEFAULT_IDLE_TIMEOUT,
+    MCP_SESSION_ID_HEADER,
+    configure_sessions,
+)
+from mcp_server_opensearch.global_state import (
+    get_worker_id,
+    set_config_file_path,
+    set_mode,
+    set_profile,
+    set_worker_id,
+)
 from starlette.applications import Starlette
+from starlette.datastructures import Headers
 from starlette.requests import Request
-from starlette.responses import Response
+from starlette.responses import JSONResponse, Response
 from starlette.routing import Mount, Route
-from tools.tool_filter import get_tools
-from tools.tool_generator import generate_tools_from_openapi
 from starlette.types import Scope, Receive, Send
-from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
-from tools.tools import TOOL_REGISTRY
-from tools.config import apply_custom_tool_config
 
 
-async def create_mcp_server(
+def _session_transports(session_manager: Any) -> Optional[Dict[str, Any]]:
+    """Return the transports of the open sessions of a session manager, by session id.
+
+    The MCP SDK keeps them in the private ``_server_instances`` attribute of
+    ``StreamableHTTPSessionManager``, so this is the only place that reads it.
+
+    Returns:
+        Optional[Dict[str, Any]]: The transports, or None if the SDK does not have them
+    """
+    transports = getattr(session_manager, '_server_instances', None)
+    return transports if isinstance(transports, dict) else None
+
+
+async def load_enabled_tools(
     mode: str = 'single',
     profile: str = '',
     config_file_path: str = '',
     cli_tool_overrides: dict = None,
-) -> Server:
+    warm_up_timeout: Optional[float] = None,
+    startup_timeout: Optional[float] = DEFAULT_STARTUP_TIMEOUT,
+) -> dict:
+    """Run the startup steps and return the enabled tools.
+
+    The result is the startup snapshot shared by all worker processes.
+    """
     # Set the global mode
     set_mode(mode)
 
@@ -39,25 +99,31 @@ async def create_mcp_server(
     if config_file_path:
         set_config_file_path(config_file_path)
 
-    # Load clusters from YAML file
-    if mode == 'multi':
-        await load_clusters_from_yaml(config_file_path)
+    # Enable admission control if configured
+    configure_admission(config_file_path)
 
-    server = Server('opensearch-mcp-server')
-    # Call tool generator
-    await generate_tools_from_openapi()
-    # Apply custom tool config (custom name and description)
-    customized_registry = apply_custom_tool_config(
-        TOOL_REGISTRY, config_file_path, cli_tool_overrides or {}
-    )
-    # Get enabled tools (tool filter)
-    enabled_tools = await get_tools(
-        tool_registry=customized_registry, config_file_path=config_file_path
+    # Load clusters, specs, version and config concurrently
+    enabled_tools = await run_startup(
+        mode, config_file_path, cli_tool_overrides, warm_up_timeout, startup_timeout
     )
     logging.info(f'Enabled tools: {list(enabled_tools.keys())}')
+    # Reloads of the config file replace the enabled tools in place
+    reloader = get_config_reloader()
+    if reloader is not None:
+        reloader.track_tools(enabled_tools)
+    return enabled_tools
+
+
+def build_mcp_server(enabled_tools: dict) -> Server:
+    """Create the MCP server and register the list_tools and call_tool handlers."""
+    server = ReloadableServer('opensearch-mcp-server')
 
     @server.list_tools()
     async def list_tools() -> list[Tool]:
+        reloader = get_config_reloader()
+        if reloader is not None:
+            # Clients that listed the tools are told when a reload changes them
+            reloader.track_session(server.request_context.session)
         tools = []
         for tool_name, tool_info in enabled_tools.items():
             tools.append(
@@ -84,22 +150,65 @@ async def create_mcp_server(
         tool = enabled_tools.get(found_tool_key)
         from tools.tool_params import validate_args_for_mode
 
-        parsed = validate_args_for_mode(arguments, tool['args_model'])
-        return await tool['function'](parsed)
+        with (
+            track_tool_call(found_tool_key, arguments) as call,
+            tracing.tool_call_span(found_tool_key) as call_span,
+        ):
+            with tracing.span('validate_args_for_mode'):
+                parsed = validate_args_for_mode(arguments, tool['args_model'])
+            tracing.set_call_cluster(
+                call_span, parsed.opensearch_cluster_name or DEFAULT_CLUSTER_NAME
+            )
+            # The per-call deadline takes precedence over the one from the tool config
+            with tool_deadline(parsed.call_timeout or tool.get('call_timeout')):
+                async with admit(found_tool_key, parsed.opensearch_cluster_name):
+                    with tracing.trace_response_formatting():
+                        result = await tool['function'](parsed)
+            call.set_result(result)
+            return result
+
+    add_cost_meta(server)
+    add_tool_profiler(server)
 
     return server
 
 
+async def create_mcp_server(
+    mode: str = 'single',
+    profile: str = '',
+    config_file_path: str = '',
+    cli_tool_overrides: dict = None,
+    warm_up_timeout: Optional[float] = None,
+    startup_timeout: Optional[float] = DEFAULT_STARTUP_TIMEOUT,
+) -> Server:
+    enabled_tools = await load_enabled_tools(
+        mode, profile, config_file_path, cli_tool_overrides, warm_up_timeout, startup_timeout
+    )
+    return build_mcp_server(enabled_tools)
+
+
 class MCPStarletteApp:
-    def __init__(self, mcp_server: Server, stateless: bool = True):
+    def __init__(
+        self,
+        mcp_server: Server,
+        stateless: bool = True,
+        session_idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+        session_cache_ttl: float = DEFAULT_CACHE_TTL,
+        event_store: Optional[BoundedEventStore] = None,
+    ):
         self.mcp_server = mcp_server
         self.sse = SseServerTransport('/messages/')
-        self.session_manager = StreamableHTTPSessionManager(
+        # Events can only be replayed within a session, so the store needs stateful mode
+        self.event_store = None if stateless else event_store
+        self.session_manager = ResumableSessionManager(
             app=self.mcp_server,
-            event_store=None,
+            event_store=self.event_store,
             json_response=False,
             stateless=stateless,
         )
+        self.session_registry = configure_sessions(
+            stateless, idle_timeout=session_idle_timeout, cache_ttl=session_cache_ttl
+        )
 
     async def handle_sse(self, request: Request) -> None:
         async with self.sse.connect_sse(
@@ -116,8 +225,48 @@ class MCPStarletteApp:
         # Done to prevent 'NoneType' errors. For more details: https://github.com/modelcontextprotocol/python-sdk/blob/main/src/mcp/server/sse.py#L33-L37
         return Response()
 
+    def _worker_headers(self) -> Optional[Dict[str, str]]:
+        worker_id = get_worker_id()
+        if worker_id is None:
+            return None
+        # Let load balancer checks tell the worker processes apart
+        return {'x-worker-id': str(worker_id), 'x-worker-pid': str(os.getpid())}
+
     async def handle_health(self, request: Request) -> Response:
-        return Response('OK', status_code=200)
+        return Response('OK', status_code=200, headers=self._worker_headers())
+
+    async def handle_ready(self, request: Request) -> Response:
+        """Report the cached cluster probes, with 503 while the server is not ready."""
+        prober = get_readiness_prober()
+        if prober is None:
+            return JSONResponse(
+                {'status': 'ready', 'probing': False}, headers=self._worker_headers()
+            )
+        status_code, body = prober.response()
+        return Response(
+            body,
+            status_code=status_code,
+            media_type='application/json',
+            headers=self._worker_headers(),
+        )
+
+    async def handle_metrics(self, request: Request) -> Response:
+        """Expose the metrics of this process in the Prometheus text format."""
+        return Response(render_metrics(self.event_store), media_type=METRICS_CONTENT_TYPE)
+
+    async def handle_capabilities(self, request: Request) -> Response:
+        """List the version, plugins and compatible tools of every cluster."""
+        matrix = get_capability_matrix()
+        if matrix is None:
+            return JSONResponse({'enabled': False})
+        return JSONResponse({'enabled': True, **matrix.listing()})
+
+    async def handle_admission(self, request: Request) -> Response:
+        """Report queue depth and wait times of the admission control limits."""
+        controller = get_admission_controller()
+        if controller is None:
+            return JSONResponse({'enabled': False})
+        return JSONResponse({'enabled': True, **controller.stats()})
 
     @contextlib.asynccontextmanager
     async def lifespan(self, app: Starlette) -> AsyncIterator[None]:
@@ -127,20 +276,89 @@ class MCPStarletteApp:
         """
         async with self.session_manager.run():
             logging.info('Application started with StreamableHTTP session manager!')
+            reaper = None
+            if self.session_registry is not None:
+                reaper = asyncio.create_task(self._expire_idle_sessions())
+            prober = get_readiness_prober()
+            prober_task = asyncio.create_task(prober.run()) if prober is not None else None
+            matrix = get_capability_matrix()
+            matrix_task = asyncio.create_task(matrix.run()) if matrix is not None else None
+            reloader = get_config_reloader()
+            if reloader is not None:
+                await reloader.start()
             try:
                 yield
             finally:
                 logging.info('Application shutting down...')
+                if reloader is not None:
+                    await reloader.stop()
+                for task in (prober_task, matrix_task):
+                    if task is not None:
+                        task.cancel()
+                        await asyncio.gather(task, return_exceptions=True)
+                if reaper is not None:
+                    reaper.cancel()
+                    await self.session_registry.close()
+                if self.event_store is not None:
+                    await self.event_store.close()
+
+    async def _expire_idle_sessions(self) -> None:
+        """Periodically terminate sessions that have been idle for too long."""
+        registry = self.session_registry
+        interval = min(max(registry.idle_timeout / 2, 1), 60)
+        transports = _session_transports(self.session_manager)
+        if transports is None:
+            logging.warning(
+                'Idle sessions are not expired: the MCP SDK does not expose its sessions'
+            )
+            return
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                # Track sessions that have not called a tool yet as well
+                for session_id in list(transports):
+                    if session_id not in registry.sessions:
+                        registry.get_or_create(session_id)
+                for session_id in await registry.expire_idle():
+                    transport = transports.pop(session_id, None)
+                    if transport is not None:
+                        await transport.terminate()
+                        await self._discard_events(transport)
+                    logging.info(f'Expired idle session {session_id}')
+            except Exception as e:
+                logging.warning(f'Error expiring idle sessions: {e}')
 
     async def handle_streamable_http(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Handle streamable HTTP requests."""
+        session_id = None
+        if self.session_registry is not None:
+            session_id = Headers(scope=scope).get(MCP_SESSION_ID_HEADER)
+            if session_id:
+                self.session_registry.touch(session_id)
         await self.session_manager.handle_request(scope, receive, send)
+        if session_id and scope['method'] == 'DELETE':
+            # The client terminated the session
+            transports = _session_transports(self.session_manager) or {}
+            transport = transports.pop(session_id, None)
+            if transport is not None:
+                await self._discard_events(transport)
+            await self.session_registry.remove(session_id)
+
+    async def _discard_events(self, transport) -> None:
+        """Drop the stored events of a session that has ended."""
+        session_events = getattr(transport, '_event_store', None)
+        if session_events is not None:
+            await session_events.discard()
 
     def create_app(self) -> Starlette:
         return Starlette(
             routes=[
                 Route('/sse', endpoint=self.handle_sse, methods=['GET']),
                 Route('/health', endpoint=self.handle_health, methods=['GET']),
+                Route('/ready', endpoint=self.handle_ready, methods=['GET']),
+                Route('/admission', endpoint=self.handle_admission, methods=['GET']),
+                Route('/metrics', endpoint=self.handle_metrics, methods=['GET']),
+                Route('/capabilities', endpoint=self.handle_capabilities, methods=['GET']),
                 Mount('/messages/', app=self.sse.handle_post_message),
                 Mount('/mcp', app=self.handle_streamable_http),
                 Mount('/mcp/', app=self.handle_streamable_http),
@@ -157,9 +375,22 @@ async def serve(
     config_file_path: str = '',
     cli_tool_overrides: dict = None,
     stateless: bool = True,
+    session_idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+    session_cache_ttl: float = DEFAULT_CACHE_TTL,
+    event_store: Optional[BoundedEventStore] = None,
+    warm_up_timeout: Optional[float] = None,
+    startup_timeout: Optional[float] = DEFAULT_STARTUP_TIMEOUT,
 ) -> None:
-    mcp_server = await create_mcp_server(mode, profile, config_file_path, cli_tool_overrides)
-    app_handler = MCPStarletteApp(mcp_server, stateless=stateless)
+    mcp_server = await create_mcp_server(
+        mode, profile, config_file_path, cli_tool_overrides, warm_up_timeout, startup_timeout
+    )
+    app_handler = MCPStarletteApp(
+        mcp_server,
+        stateless=stateless,
+        session_idle_timeout=session_idle_timeout,
+        session_cache_ttl=session_cache_ttl,
+        event_store=event_store,
+    )
     app = app_handler.create_app()
 
     config = uvicorn.Config(
@@ -170,3 +401,160 @@ async def serve(
     )
     server = uvicorn.Server(config)
     await server.serve()
+
+
+def _run_worker(
+    worker_id: int,
+    enabled_tools: dict,
+    sock: socket.socket,
+    stateless: bool,
+    metrics_dir: str,
+    profile_tools: str = '',
+    profile_tools_rate: float = DEFAULT_SAMPLE_RATE,
+) -> None:
+    """Serve the streaming app on an inherited listening socket in a worker process."""
+    set_worker_id(worker_id)
+    configure_snapshots(metrics_dir)
+    # Every worker profiles its own calls into files of its own
+    configure_profiling(profile_tools, profile_tools_rate)
+    app_handler = MCPStarletteApp(build_mcp_server(enabled_tools), stateless=stateless)
+    config = uvicorn.Config(app=app_handler.create_app(), timeout_graceful_shutdown=10)
+
+    async def run() -> None:
+        snapshots = asyncio.create_task(write_snapshots(app_handler.event_store))
+        try:
+            await uvicorn.Server(config).serve(sockets=[sock])
+        finally:
+            snapshots.cancel()
+
+    asyncio.run(run())
+
+
+def serve_workers(
+    host: str = '0.0.0.0',
+    port: int = 9900,
+    workers: int = 2,
+    mode: str = 'single',
+    profile: str = '',
+    config_file_path: str = '',
+    cli_tool_overrides: dict = None,
+    stateless: bool = True,
+    warm_up_timeout: Optional[float] = None,
+    startup_timeout: Optional[float] = DEFAULT_STARTUP_TIMEOUT,
+    profile_tools: str = '',
+    profile_tools_rate: float = DEFAULT_SAMPLE_RATE,
+) -> None:
+    """Run the streaming server in several pre-forked worker processes.
+
+    The startup steps (cluster loading, tool generation, config and filters) run once
+    in the parent process. The listening socket is bound before forking, so every
+    worker inherits both the enabled tools and the socket and the kernel spreads
+    connections across them. OpenSearch clients are created inside each worker.
+    Workers that exit with an error are restarted; SIGINT and SIGTERM are forwarded
+    to all workers for a graceful shutdown, and SIGHUP to make them reload the config
+    file. Restarted workers load a config file that changed since the startup.
+    Workers share their metrics through a temporary directory, so a scrape of
+    ``/metrics`` answered by any worker includes all of them. Workers serve stateless
+    sessions only, so the session and event store settings of ``serve`` do not apply.
+    """
+    if not hasattr(os, 'fork'):
+        raise RuntimeError('Running multiple workers requires a platform with os.fork')
+
+    enabled_tools = asyncio.run(
+        load_enabled_tools(
+            mode, profile, config_file_path, cli_tool_overrides, warm_up_timeout, startup_timeout
+        )
+    )
+
+    family = socket.AF_INET6 if ':' in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    metrics_dir = tempfile.mkdtemp(prefix='opensearch-mcp-metrics-')
+
+    # Key: worker process id, Value: worker index
+    children: Dict[int, int] = {}
+    shutting_down = False
+
+    def spawn(worker_id: int) -> None:
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            if hasattr(signal, 'SIGHUP'):
+                # Until the worker installs its own reload handler
+                signal.signal(signal.SIGHUP, signal.SIG_IGN)
+            exit_code = 0
+            try:
+                _run_worker(
+                    worker_id,
+                    enabled_tools,
+                    sock,
+                    stateless,
+                    metrics_dir,
+                    profile_tools,
+                    profile_tools_rate,
+                )
+            except BaseException as e:
+                logging.error(f'Worker {worker_id} failed: {e}')
+                exit_code = 1
+            finally:
+                # os._exit skips the exit handlers that would export the pending spans
+                tracing.shutdown_tracing()
+                shutdown_profiling()
+                os._exit(exit_code)
+        children[pid] = worker_id
+        logging.info(f'Started worker {worker_id} (pid {pid})')
+
+    def stop(signum, frame) -> None:
+        nonlocal shutting_down
+        shutting_down = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def reload(signum, frame) -> None:
+        # Every worker has its own copy of the configuration to reload
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGHUP)
+            except ProcessLookupError:
+                pass
+
+    previous_handlers = {
+        signum: signal.signal(signum, stop) for signum in (signal.SIGINT, signal.SIGTERM)
+    }
+    if hasattr(signal, 'SIGHUP') and get_config_reloader() is not None:
+        previous_handlers[signal.SIGHUP] = signal.signal(signal.SIGHUP, reload)
+    try:
+        for worker_id in range(workers):
+            spawn(worker_id)
+        logging.info(f'Serving on {host}:{port} with {workers} workers')
+
+        while children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            worker_id = children.pop(pid, None)
+            if worker_id is None:
+                continue
+            exit_code = os.waitstatus_to_exitcode(status)
+            if shutting_down or exit_code == 0:
+                logging.info(f'Worker {worker_id} (pid {pid}) exited')
+                continue
+            logging.warning(
+                f'Worker {worker_id} (pid {pid}) exited with code {exit_code}, restarting'
+            )
+            # Avoid a tight restart loop when workers crash on startup
+            time.sleep(1)
+            spawn(worker_id)
+    finally:
+        for signum, handler in previous_handlers.items():
+            signal.signal(signum, handler)
+        sock.close()
+        shutil.rmtree(metrics_dir, ignore_errors=True)
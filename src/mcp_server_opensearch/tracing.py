@@ -0,0 +1,218 @@
+# Copyright OpenSearch Contributors
+# SPDX-License-Identifier: Apache-2.0
+
+"""Optional OpenTelemetry tracing of tool calls.
+
+When tracing is enabled, every tool call produces a ``call_tool`` span with child
+spans for argument validation (``validate_args_for_mode``), client creation and
+credential resolution (``get_opensearch_client``), every request to OpenSearch
+(``perform_request``) and the formatting of the result (``format_response``, from
+the last OpenSearch response until the tool returns). All spans carry the tool and
+cluster names.
+
+Spans are exported to an OTLP collector (configured with the standard
+``OTEL_EXPORTER_OTLP_*`` environment variables) or written as JSON lines to a file.
+The OpenTelemetry SDK is only imported when tracing is enabled; without it, the
+helpers of this module do nothing.
+"""
+
+import contextlib
+import os
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+
+SERVICE_NAME = 'opensearch-mcp-server'
+TRACING_EXPORTERS = ('otlp', 'file')
+
+ATTR_TOOL = 'mcp.tool.name'
+ATTR_CLUSTER = 'opensearch.cluster.name'
+ATTR_METHOD = 'http.request.method'
+ATTR_ENDPOINT = 'opensearch.endpoint'
+ATTR_OUTCOME = 'opensearch.outcome'
+ATTR_CACHE = 'opensearch.session_cache'
+ATTR_CLIENT_POOL = 'opensearch.client_pool'
+
+# Tracer and provider of the running server, None when tracing is disabled
+_tracer = None
+_provider = None
+# File the 'file' exporter writes to
+_stream = None
+
+# Tool and cluster of the tool call being traced, added to all of its spans
+_call_attributes: ContextVar[Optional[Dict[str, str]]] = ContextVar(
+    'call_attributes', default=None
+)
+# End time in ns of the last OpenSearch response of the tool call, shared with the
+# tasks the tool starts
+_last_response_end: ContextVar[Optional[List[Optional[int]]]] = ContextVar(
+    'last_response_end', default=None
+)
+
+
+class _NoopSpan:
+    """Span used when tracing is disabled."""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def configure_tracing(exporter: Optional[str], file_path: str = '') -> None:
+    """Enable tracing with the given exporter, or disable it.
+
+    Args:
+        exporter: 'otlp', 'file', or None to disable tracing
+        file_path: File the spans are appended to as JSON lines, for the 'file' exporter
+
+    Raises:
+        RuntimeError: If the OpenTelemetry SDK or the OTLP exporter is not installed
+        ValueError: If the exporter is unknown or the file path is missing
+    """
+    global _tracer, _provider, _stream
+    shutdown_tracing()
+    if not exporter:
+        return
+    if exporter not in TRACING_EXPORTERS:
+        raise ValueError(f'Unknown tracing exporter: {exporter}')
+    if exporter == 'file' and not file_path:
+        raise ValueError('The file tracing exporter needs a file path')
+
+    try:
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import (
+            BatchSpanProcessor,
+            ConsoleSpanExporter,
+            SimpleSpanProcessor,
+        )
+    except ImportError as e:
+        raise RuntimeError(
+            'Tracing requires the OpenTelemetry SDK: pip install opentelemetry-sdk'
+        ) from e
+
+    provider = TracerProvider(resource=Resource.create({'service.name': SERVICE_NAME}))
+    if exporter == 'file':
+        _stream = open(file_path, 'a', encoding='utf-8')
+        span_exporter = ConsoleSpanExporter(
+            out=_stream, formatter=lambda span: span.to_json(indent=None) + os.linesep
+        )
+        provider.add_span_processor(SimpleSpanProcessor(span_exporter))
+    else:
+        try:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        except ImportError:
+            try:
+                from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import (
+                    OTLPSpanExporter,
+                )
+            except ImportError as e:
+                raise RuntimeError(
+                    'The otlp tracing exporter requires an OTLP exporter: '
+                    'pip install opentelemetry-exporter-otlp-proto-http'
+                ) from e
+        provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+
+    _provider = provider
+    _tracer = provider.get_tracer('mcp_server_opensearch')
+
+
+def shutdown_tracing() -> None:
+    """Export the pending spans and disable tracing."""
+    global _tracer, _provider, _stream
+    if _provider is not None:
+        _provider.shutdown()
+    if _stream is not None:
+        _stream.close()
+    _tracer = None
+    _provider = None
+    _stream = None
+
+
+def is_tracing_enabled() -> bool:
+    """Whether spans are recorded."""
+    return _tracer is not None
+
+
+@contextlib.contextmanager
+def span(name: str, attributes: Optional[Dict[str, Any]] = None) -> Iterator[Any]:
+    """Trace a block as a span that carries the tool and cluster of the current call.
+
+    Exceptions raised in the block are recorded on the span.
+
+    Args:
+        name: Name of the span
+        attributes: Additional span attributes; None values are left out
+
+    Yields:
+        The span, or a no-op span when tracing is disabled
+    """
+    if _tracer is None:
+        yield _NOOP_SPAN
+        return
+    span_attributes = dict(_call_attributes.get() or {})
+    span_attributes.update({k: v for k, v in (attributes or {}).items() if v is not None})
+    with _tracer.start_as_current_span(name, attributes=span_attributes) as current:
+        yield current
+
+
+@contextlib.contextmanager
+def tool_call_span(tool: str) -> Iterator[Any]:
+    """Trace a tool call; its child spans carry the tool name.
+
+    Args:
+        tool: Name of the tool
+
+    Yields:
+        The call_tool span, or a no-op span when tracing is disabled
+    """
+    if _tracer is None:
+        yield _NOOP_SPAN
+        return
+    token = _call_attributes.set({ATTR_TOOL: tool})
+    try:
+        with span('call_tool') as current:
+            yield current
+    finally:
+        _call_attributes.reset(token)
+
+
+def set_call_cluster(current: Any, cluster: str) -> None:
+    """Record the cluster of the current tool call on its span and its later child spans."""
+    if _tracer is None:
+        return
+    current.set_attribute(ATTR_CLUSTER, cluster)
+    attributes = _call_attributes.get()
+    if attributes is not None:
+        attributes[ATTR_CLUSTER] = cluster
+
+
+@contextlib.contextmanager
+def trace_response_formatting() -> Iterator[None]:
+    """Trace the formatting of a tool result as a format_response span.
+
+    The span starts at the last OpenSearch response of the block and ends when the
+    block returns, which is the time the tool spends turning responses into text.
+    """
+    if _tracer is None:
+        yield
+        return
+    holder: List[Optional[int]] = [None]
+    token = _last_response_end.set(holder)
+    try:
+        yield
+    finally:
+        _last_response_end.reset(token)
+    if holder[0] is not None:
+        attributes = dict(_call_attributes.get() or {})
+        _tracer.start_span('format_response', start_time=holder[0], attributes=attributes).end()
+
+
+def mark_response_received() -> None:
+    """Record that an OpenSearch response of the current tool call was received."""
+    holder = _last_response_end.get()
+    if holder is not None:
+        holder[0] = time.time_ns()
@@ -0,0 +1,224 @@
+# Copyright OpenSearch Contributors
+# SPDX-License-Identifier: Apache-2.0
+
+"""Startup warm-up of the configured OpenSearch clusters.
+
+Without a warm-up, the first tool call against a cluster pays for credential
+resolution (including STS role assumption), client construction, TLS and the
+version lookup all at once. ``warm_up_clusters`` does this for every cluster
+concurrently at startup, bounded by a deadline, and records the readiness of each
+cluster. Clusters that fail or do not answer in time are only logged; the server
+keeps serving and their tool calls connect on demand as before.
+
+The version found by the warm-up is reused by tool calls for ``VERSION_TTL`` seconds
+instead of being looked up on every call.
+"""
+
+import anyio
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass
+from mcp_server_opensearch.clusters_information import cluster_registry
+from mcp_server_opensearch.global_state import get_mode
+from semver import Version
+from typing import Any, Dict, List, Optional
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WARM_UP_TIMEOUT = 10
+# Seconds a version found by the warm-up is reused by tool calls
+VERSION_TTL = 300
+# Name under which the cluster of single mode is reported
+SINGLE_MODE_CLUSTER = 'default'
+
+READY = 'ready'
+FAILED = 'failed'
+TIMEOUT = 'timeout'
+SKIPPED = 'skipped'
+
+
+@dataclass
+class ClusterReadiness:
+    """Outcome of the warm-up of one cluster."""
+
+    name: str
+    status: str
+    version: Optional[Version] = None
+    error: Optional[str] = None
+    duration_ms: float = 0.0
+    checked_at: float = 0.0
+
+    @property
+    def ready(self) -> bool:
+        """Whether the cluster answered with its version."""
+        return self.status == READY
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the readiness as a JSON-serializable dict."""
+        return {
+            'status': self.status,
+            'version': str(self.version) if self.version else None,
+            'error': self.error,
+            'duration_ms': round(self.duration_ms, 1),
+        }
+
+
+# Readiness of the warmed-up clusters
+# Key: cluster name as used in tool arguments ('' in single mode), Value: ClusterReadiness
+cluster_readiness: Dict[str, ClusterReadiness] = {}
+
+
+def get_cluster_readiness() -> Dict[str, ClusterReadiness]:
+    """Get the readiness of the warmed-up clusters.
+
+    Returns:
+        Dict[str, ClusterReadiness]: Readiness by cluster name, empty without warm-up
+    """
+    return cluster_readiness
+
+
+def get_warm_version(cluster_name: str) -> Optional[Version]:
+    """Return the version found by the warm-up if it is still fresh.
+
+    Args:
+        cluster_name: Cluster name as used in tool arguments ('' in single mode)
+
+    Returns:
+        Optional[Version]: The cluster version, or None if it has to be looked up
+    """
+    readiness = cluster_readiness.get(cluster_name)
+    if readiness is None or not readiness.ready or readiness.version is None:
+        return None
+    if time.time() - readiness.checked_at > VERSION_TTL:
+        return None
+    return readiness.version
+
+
+def _display_name(cluster_name: str) -> str:
+    return cluster_name or SINGLE_MODE_CLUSTER
+
+
+def _uses_header_auth(cluster_name: str) -> bool:
+    """Whether the connection of a cluster is only known from the headers of a request."""
+    if cluster_name:
+        cluster_info = cluster_registry.get(cluster_name)
+        return bool(cluster_info and cluster_info.opensearch_header_auth)
+    return os.getenv('OPENSEARCH_HEADER_AUTH', '').lower() == 'true'
+
+
+async def _warm_up_cluster(cluster_name: str) -> ClusterReadiness:
+    """Build a client for a cluster and look up its version."""
+    from opensearch.client import initialize_client
+    from tools.tool_params import baseToolArgs
+
+    start = time.monotonic()
+    client = None
+    try:
+        # The thread gets the settings read here, as a reload may swap the registry meanwhile
+        cluster_info = cluster_registry.get(cluster_name) if cluster_name else None
+        # Credential resolution and STS calls block, so build the client in a thread
+        client = await anyio.to_thread.run_sync(
+            initialize_client, baseToolArgs(opensearch_cluster_name=cluster_name), cluster_info
+        )
+        info = await client.info()
+        return ClusterReadiness(
+            cluster_name,
+            READY,
+            version=Version.parse(info['version']['number']),
+            duration_ms=(time.monotonic() - start) * 1000,
+            checked_at=time.time(),
+        )
+    except Exception as e:
+        return ClusterReadiness(
+            cluster_name,
+            FAILED,
+            error=str(e),
+            duration_ms=(time.monotonic() - start) * 1000,
+            checked_at=time.time(),
+        )
+    finally:
+        if client is not None:
+            with anyio.CancelScope(shield=True):
+                await client.close()
+
+
+async def probe_clusters(timeout: float = DEFAULT_WARM_UP_TIMEOUT) -> Dict[str, ClusterReadiness]:
+    """Connect to every configured cluster concurrently and record its readiness.
+
+    Clusters that use header authentication are skipped, as their connection is only
+    known when a request arrives.
+
+    Args:
+        timeout: Seconds the probes may take
+
+    Returns:
+        Dict[str, ClusterReadiness]: Readiness by cluster name ('' in single mode)
+    """
+    # Load the client modules up front, so their import does not eat into the deadline
+    import opensearch.client  # noqa: F401
+
+    names: List[str] = list(cluster_registry) if get_mode() == 'multi' else ['']
+    pending: Dict[asyncio.Task, str] = {}
+    for name in names:
+        if _uses_header_auth(name):
+            cluster_readiness[name] = ClusterReadiness(
+                name, SKIPPED, error='header authentication', checked_at=time.time()
+            )
+        else:
+            pending[asyncio.create_task(_warm_up_cluster(name))] = name
+
+    if pending:
+        try:
+            done, not_done = await asyncio.wait(pending, timeout=timeout)
+        finally:
+            # Do not leave probes behind when the caller is cancelled
+            for task in pending:
+                task.cancel()
+        for task in done:
+            cluster_readiness[pending[task]] = task.result()
+        for task in not_done:
+            cluster_readiness[pending[task]] = ClusterReadiness(
+                pending[task],
+                TIMEOUT,
+                error=f'no answer within {timeout}s',
+                duration_ms=timeout * 1000,
+                checked_at=time.time(),
+            )
+        await asyncio.gather(*not_done, return_exceptions=True)
+
+    return {name: cluster_readiness[name] for name in names}
+
+
+async def warm_up_clusters(
+    timeout: float = DEFAULT_WARM_UP_TIMEOUT,
+) -> Dict[str, ClusterReadiness]:
+    """Connect to every configured cluster concurrently and log its readiness.
+
+    Failures never stop the server.
+
+    Args:
+        timeout: Seconds the whole warm-up may take
+
+    Returns:
+        Dict[str, ClusterReadiness]: Readiness by cluster name ('' in single mode)
+    """
+    start = time.monotonic()
+    readiness = await probe_clusters(timeout)
+    for name, state in readiness.items():
+        if state.ready:
+            logger.info(
+                f'Cluster {_display_name(name)} is ready (OpenSearch {state.version}, '
+                f'{state.duration_ms:.0f} ms)'
+            )
+        else:
+            logger.warning(
+                f'Cluster {_display_name(name)} is not warmed up ({state.status}): {state.error}'
+            )
+    ready = sum(1 for state in readiness.values() if state.ready)
+    logger.info(
+        f'Warmed up {ready}/{len(readiness)} clusters in {(time.monotonic() - start) * 1000:.0f} ms'
+    )
+    return readiness
@@ -8,11 +8,15 @@ This module provides functions to initialize OpenSearch clients with different
 authentication methods and connection modes (single vs multi-cluster).
 """
 
-import boto3
+import anyio
+import asyncio
 import logging
 import os
+import time
+import uuid
+from datetime import datetime
 from contextlib import asynccontextmanager
-from typing import Any, AsyncIterator, Dict, Optional
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, Optional, Set
 from urllib.parse import urlparse
 
 from mcp.server.lowlevel.server import request_ctx
@@ -20,9 +24,23 @@ from starlette.requests import Request
 
 from mcp_server_opensearch.clusters_information import ClusterInfo, get_cluster
 from mcp_server_opensearch.global_state import get_mode, get_profile
-from opensearchpy import AsyncOpenSearch, AsyncHttpConnection, AWSV4SignerAsyncAuth
+from mcp_server_opensearch import metrics, tracing
+from mcp_server_opensearch.admission import DEFAULT_CLUSTER_NAME
+from mcp_server_opensearch.sessions import get_current_session
+from opensearchpy import AsyncOpenSearch, AWSV4SignerAsyncAuth
+from opensearch.serializer import PlainFloatJSONSerializer
+from opensearch.transport import (
+    OPAQUE_ID_HEADER,
+    ToolCallConnection,
+    ToolCallTransport,
+    request_opaque_id,
+)
 from tools.tool_params import baseToolArgs
-from botocore.credentials import Credentials
+
+
+if TYPE_CHECKING:
+    import boto3
+    from botocore.credentials import Credentials
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -32,6 +50,19 @@ OPENSEARCH_SERVICE = 'es'
 OPENSEARCH_SERVERLESS_SERVICE = 'aoss'
 DEFAULT_TIMEOUT = 30
 DEFAULT_SSL_VERIFY = True
+# Shared request serializer, renders floats without scientific notation
+DEFAULT_SERIALIZER = PlainFloatJSONSerializer()
+# Upper bound for cancelling server-side tasks after a tool call was cancelled
+TASK_CANCEL_TIMEOUT = 5
+# Assumed role credentials are renewed this many seconds before they expire
+ASSUMED_ROLE_REFRESH_MARGIN = 300
+
+# Credentials of assumed IAM roles, reused until shortly before they expire
+# Key: (profile, role ARN, region), Value: (expiry timestamp, Credentials)
+_assumed_role_credentials: Dict[tuple, tuple] = {}
+
+# Replaced session clients that are closed once their credentials expire
+_retiring_clients: Set[asyncio.Task] = set()
 
 
 # Custom exceptions
@@ -53,8 +84,19 @@ class ConfigurationError(OpenSearchClientError):
     pass
 
 
+def __getattr__(name: str) -> Any:
+    # boto3 is imported on first use, as only the AWS authentication paths need it
+    if name == 'boto3':
+        import boto3
+
+        return boto3
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
 # Public API Functions
-def initialize_client(args: baseToolArgs) -> AsyncOpenSearch:
+def initialize_client(
+    args: baseToolArgs, cluster_info: Optional[ClusterInfo] = None
+) -> AsyncOpenSearch:
     """Initialize and return an OpenSearch client based on the current mode.
 
     Behavior depends on the global mode:
@@ -63,6 +105,8 @@ def initialize_client(args: baseToolArgs) -> AsyncOpenSearch:
 
     Args:
         args (baseToolArgs): Arguments containing optional opensearch_cluster_name
+        cluster_info (Optional[ClusterInfo]): Settings of the cluster in multi mode,
+            looked up in the cluster registry if not given
 
     Returns:
         OpenSearch: An initialized OpenSearch client instance
@@ -83,13 +127,15 @@ def initialize_client(args: baseToolArgs) -> AsyncOpenSearch:
             if not args or not args.opensearch_cluster_name:
                 raise ConfigurationError('In multi mode, opensearch_cluster_name must be provided')
             # Get cluster information
-            cluster_info = get_cluster(args.opensearch_cluster_name)
+            cluster_info = cluster_info or get_cluster(args.opensearch_cluster_name)
             if not cluster_info:
                 raise ConfigurationError(
                     f'Cluster "{args.opensearch_cluster_name}" not found in configuration'
                 )
 
-            return _initialize_client_multi_mode(cluster_info)
+            client = _initialize_client_multi_mode(cluster_info)
+            client.transport.cluster_name = args.opensearch_cluster_name
+            return client
         else:
             raise ConfigurationError(f'Unknown mode: {mode}. Must be "single" or "multi"')
 
@@ -123,20 +169,131 @@ async def get_opensearch_client(args: baseToolArgs) -> AsyncIterator[AsyncOpenSe
         AuthenticationError: If authentication fails
     """
     client = None
+    pinned = False
+    opaque_id = f'opensearch-mcp-{uuid.uuid4().hex}'
+    token = request_opaque_id.set(opaque_id)
     try:
-        logger.debug('Creating OpenSearch client')
-        client = initialize_client(args)
+        with tracing.span(
+            'get_opensearch_client',
+            {tracing.ATTR_CLUSTER: args.opensearch_cluster_name or DEFAULT_CLUSTER_NAME},
+        ) as client_span:
+            session = get_current_session()
+            if session is not None:
+                # Stateful sessions keep one client per cluster and credentials
+                key = (
+                    args.opensearch_cluster_name,
+                    tuple(sorted(_get_auth_from_headers().items())),
+                )
+                client = session.clients.get(key)
+                if client is not None and _credentials_expiring(client):
+                    # Sessions can outlive assumed role credentials, so renew the client
+                    logger.info(f'Renewing expiring client of session {session.session_id}')
+                    _retire_client(session.clients.pop(key))
+                    client = None
+                pool_result = 'miss' if client is None else 'hit'
+                metrics.CLIENT_POOL_REQUESTS.inc(pool_result)
+                client_span.set_attribute(tracing.ATTR_CLIENT_POOL, pool_result)
+                if client is None:
+                    logger.debug(f'Creating OpenSearch client for session {session.session_id}')
+                    client = _initialize_tool_client(args)
+                    client.transport.session = session
+                    session.clients[key] = client
+                pinned = True
+            else:
+                logger.debug('Creating OpenSearch client')
+                metrics.CLIENT_POOL_REQUESTS.inc('miss')
+                client = _initialize_tool_client(args)
         yield client
-    finally:
+    except asyncio.CancelledError:
+        # The MCP request was cancelled or the client disconnected: stop the work the
+        # cluster is still doing for this call. The in-flight HTTP request itself is
+        # aborted by the cancellation, and its connection is closed.
         if client is not None:
+            with anyio.move_on_after(TASK_CANCEL_TIMEOUT, shield=True):
+                await cancel_server_tasks(client, opaque_id)
+        raise
+    finally:
+        request_opaque_id.reset(token)
+        if client is not None and not pinned:
             try:
                 logger.debug('Closing OpenSearch client')
-                await client.close()
+                # Shielded, so the connections are released even when cancelled
+                with anyio.CancelScope(shield=True):
+                    await client.close()
             except Exception as e:
                 # Log but don't propagate cleanup errors to avoid masking original errors
                 logger.warning(f'Error closing OpenSearch client: {e}')
 
 
+def _initialize_tool_client(args: baseToolArgs) -> AsyncOpenSearch:
+    """Initialize the client of a tool call, telling it which cluster version applies."""
+    client = initialize_client(args)
+    if not _get_auth_from_headers().get('opensearch_url'):
+        client.transport.version_key = args.opensearch_cluster_name
+    return client
+
+
+def _credentials_expiring(client: AsyncOpenSearch) -> bool:
+    """Whether the temporary credentials of a client are due to be renewed."""
+    expiry = getattr(client.transport, 'credentials_expiry', None)
+    return expiry is not None and expiry - ASSUMED_ROLE_REFRESH_MARGIN <= time.time()
+
+
+def _retire_client(client: AsyncOpenSearch) -> None:
+    """Close a replaced client once its credentials expire.
+
+    Calls that still use the client can finish meanwhile, as its credentials stay
+    valid until then.
+    """
+
+    async def close_at_expiry() -> None:
+        await asyncio.sleep(max(0.0, client.transport.credentials_expiry - time.time()))
+        try:
+            await client.close()
+        except Exception as e:
+            logger.warning(f'Error closing renewed OpenSearch client: {e}')
+
+    task = asyncio.ensure_future(close_at_expiry())
+    _retiring_clients.add(task)
+    task.add_done_callback(_retiring_clients.discard)
+
+
+async def cancel_server_tasks(client: AsyncOpenSearch, opaque_id: str) -> list[str]:
+    """Cancel the running server-side tasks that were started with the given X-Opaque-Id.
+
+    Only cancellable top-level tasks are cancelled; their child tasks (e.g. shard
+    searches) are cancelled by OpenSearch along with them. Errors are logged and not
+    raised, since this runs while a tool call is being cancelled.
+
+    Args:
+        client: The OpenSearch client of the cancelled tool call
+        opaque_id: The X-Opaque-Id header value sent with the tool call's requests
+
+    Returns:
+        list[str]: Ids of the tasks that were cancelled
+    """
+    cancelled = []
+    try:
+        response = await client.transport.perform_request(
+            'GET', '/_tasks', params={'detailed': 'false'}
+        )
+        for node in (response or {}).get('nodes', {}).values():
+            for task_id, task in node.get('tasks', {}).items():
+                if (
+                    task.get('headers', {}).get(OPAQUE_ID_HEADER) != opaque_id
+                    or not task.get('cancellable')
+                    or task.get('parent_task_id')
+                ):
+                    continue
+                await client.transport.perform_request('POST', f'/_tasks/{task_id}/_cancel')
+                cancelled.append(task_id)
+    except Exception as e:
+        logger.warning(f'Error cancelling server-side tasks for {opaque_id}: {e}')
+    if cancelled:
+        logger.info(f'Cancelled server-side tasks {cancelled} of cancelled tool call')
+    return cancelled
+
+
 # Private Implementation Functions
 def _initialize_client_single_mode() -> AsyncOpenSearch:
     """Initialize OpenSearch client for single mode using environment variables.
@@ -179,11 +336,16 @@ def _initialize_client_single_mode() -> AsyncOpenSearch:
         aws_secret_access_key = None
         aws_session_token = None
 
-        # Default to region from environment
-        aws_region = get_aws_region_single_mode()
-
         # Check if header auth is enabled and update variables accordingly
         use_header_auth = os.getenv('OPENSEARCH_HEADER_AUTH', '').lower() == 'true'
+
+        # Default to region from environment
+        aws_region = None
+        if _uses_aws_auth(
+            opensearch_no_auth, opensearch_username, opensearch_password, iam_arn, use_header_auth
+        ):
+            aws_region = get_aws_region_single_mode()
+
         if use_header_auth:
             header_auth = _get_auth_from_headers()
             header_url = header_auth.get('opensearch_url')
@@ -278,11 +440,16 @@ def _initialize_client_multi_mode(cluster_info: ClusterInfo) -> AsyncOpenSearch:
         aws_secret_access_key = None
         aws_session_token = None
 
-        # Default to region from cluster config
-        aws_region = get_aws_region_multi_mode(cluster_info)
-
         # Check if header auth is enabled and update variables accordingly
         use_header_auth = cluster_info.opensearch_header_auth or False
+
+        # Default to region from cluster config
+        aws_region = None
+        if _uses_aws_auth(
+            opensearch_no_auth, opensearch_username, opensearch_password, iam_arn, use_header_auth
+        ):
+            aws_region = get_aws_region_multi_mode(cluster_info)
+
         if use_header_auth:
             header_auth = _get_auth_from_headers()
             header_url = header_auth.get('opensearch_url')
@@ -400,17 +567,12 @@ def _create_opensearch_client(
         'hosts': [opensearch_url],
         'use_ssl': (parsed_url.scheme == 'https'),
         'verify_certs': ssl_verify,
-        'connection_class': AsyncHttpConnection,
+        'connection_class': ToolCallConnection,
         'timeout': timeout,
+        'serializer': DEFAULT_SERIALIZER,
+        'transport_class': ToolCallTransport,
     }
 
-    # Create boto3 session
-    try:
-        session = boto3.Session(profile_name=profile) if profile else boto3.Session()
-    except Exception as e:
-        logger.warning(f"Failed to create boto3 session with profile '{profile}': {e}")
-        session = boto3.Session()
-
     # Authentication logic with proper error handling
     try:
         # 1. No authentication
@@ -426,6 +588,8 @@ def _create_opensearch_client(
         if aws_access_key_id and aws_secret_access_key and aws_region:
             logger.info('[HEADER AUTH] Using AWS credentials from headers')
             try:
+                from botocore.credentials import Credentials
+
                 if not aws_region or (isinstance(aws_region, str) and not aws_region.strip()):
                     raise AuthenticationError(
                         'AWS region is required for header-based authentication'
@@ -451,22 +615,20 @@ def _create_opensearch_client(
                 if not aws_region or (isinstance(aws_region, str) and not aws_region.strip()):
                     raise AuthenticationError('AWS region is required for IAM role authentication')
 
-                sts_client = session.client('sts', region_name=aws_region)
-                assumed_role = sts_client.assume_role(
-                    RoleArn=iam_arn.strip(), RoleSessionName='OpenSearchClientSession'
-                )
-                creds_dict = assumed_role['Credentials']
-                credentials = Credentials(
-                    access_key=creds_dict['AccessKeyId'],
-                    secret_key=creds_dict['SecretAccessKey'],
-                    token=creds_dict.get('SessionToken'),
+                credentials = _assume_role(
+                    _create_boto3_session(profile), profile, iam_arn.strip(), aws_region
                 )
 
                 aws_auth = AWSV4SignerAsyncAuth(
                     credentials=credentials, region=aws_region.strip(), service=service_name
                 )
                 client_kwargs['http_auth'] = aws_auth
-                return AsyncOpenSearch(**client_kwargs)
+                client = AsyncOpenSearch(**client_kwargs)
+                # Clients pinned to a session are renewed before these credentials expire
+                cached = _assumed_role_credentials.get((profile, iam_arn.strip(), aws_region))
+                if cached is not None and cached[1] is credentials:
+                    client.transport.credentials_expiry = cached[0]
+                return client
             except Exception as e:
                 logger.error(f'[IAM AUTH] Failed to assume IAM role {iam_arn}: {e}')
                 raise AuthenticationError(f'Failed to assume IAM role {iam_arn}: {e}')
@@ -489,7 +651,7 @@ def _create_opensearch_client(
                     'AWS region is required for AWS credentials authentication'
                 )
 
-            credentials = session.get_credentials()
+            credentials = _create_boto3_session(profile).get_credentials()
             if not credentials:
                 raise AuthenticationError('No AWS credentials found in session')
 
@@ -512,6 +674,90 @@ def _create_opensearch_client(
     raise AuthenticationError('No valid authentication method provided for OpenSearch')
 
 
+def _uses_aws_auth(
+    opensearch_no_auth: bool,
+    opensearch_username: str,
+    opensearch_password: str,
+    iam_arn: str,
+    use_header_auth: bool,
+) -> bool:
+    """Whether requests may be signed with AWS credentials, which needs an AWS region.
+
+    Mirrors the order of the authentication methods in _create_opensearch_client, so
+    connections without authentication or with basic authentication skip the region
+    lookup (and loading boto3).
+    """
+    if opensearch_no_auth:
+        return False
+    if use_header_auth or (iam_arn and iam_arn.strip()):
+        return True
+    return not (opensearch_username and opensearch_password)
+
+
+def _create_boto3_session(profile: str) -> 'boto3.Session':
+    """Create a boto3 session for the profile, falling back to the default session."""
+    import boto3
+
+    try:
+        return boto3.Session(profile_name=profile) if profile else boto3.Session()
+    except Exception as e:
+        logger.warning(f"Failed to create boto3 session with profile '{profile}': {e}")
+        return boto3.Session()
+
+
+def _assume_role(
+    session: 'boto3.Session', profile: str, iam_arn: str, aws_region: str
+) -> 'Credentials':
+    """Assume an IAM role, reusing earlier credentials of the role while they are valid.
+
+    Args:
+        session: boto3 session used to call STS
+        profile: AWS profile of the session
+        iam_arn: ARN of the role to assume
+        aws_region: AWS region of the STS endpoint
+
+    Returns:
+        Credentials: Temporary credentials of the role
+    """
+    from botocore.credentials import Credentials
+
+    key = (profile, iam_arn, aws_region)
+    cached = _assumed_role_credentials.get(key)
+    if cached is not None and cached[0] - ASSUMED_ROLE_REFRESH_MARGIN > time.time():
+        return cached[1]
+
+    sts_client = session.client('sts', region_name=aws_region)
+    assumed_role = sts_client.assume_role(
+        RoleArn=iam_arn, RoleSessionName='OpenSearchClientSession'
+    )
+    creds_dict = assumed_role['Credentials']
+    credentials = Credentials(
+        access_key=creds_dict['AccessKeyId'],
+        secret_key=creds_dict['SecretAccessKey'],
+        token=creds_dict.get('SessionToken'),
+    )
+    expiration = creds_dict.get('Expiration')
+    if isinstance(expiration, datetime):
+        _assumed_role_credentials[key] = (expiration.timestamp(), credentials)
+    return credentials
+
+
+def get_assumed_role_expiry(iam_arn: str) -> Optional[float]:
+    """Get the expiry of the cached credentials of an assumed IAM role.
+
+    Args:
+        iam_arn: ARN of the role
+
+    Returns:
+        Optional[float]: Earliest expiry timestamp of the role's credentials, or None if
+            the role has not been assumed
+    """
+    expiries = [
+        expiry for (_, arn, _), (expiry, _) in _assumed_role_credentials.items() if arn == iam_arn
+    ]
+    return min(expiries) if expiries else None
+
+
 def get_aws_region_single_mode() -> Optional[str]:
     """Get AWS region for single mode using environment variables.
 
@@ -531,6 +777,8 @@ def get_aws_region_single_mode() -> Optional[str]:
             logger.debug(f'Using AWS_REGION: {aws_region}')
             return aws_region
 
+        import boto3
+
         # Try command line argument, then environment variable
         aws_profile = get_profile() or os.getenv('AWS_PROFILE', '').strip()
         if aws_profile:
@@ -589,6 +837,8 @@ def get_aws_region_multi_mode(cluster_info: ClusterInfo) -> Optional[str]:
         # Try cluster-specific profile
         if cluster_info.profile and cluster_info.profile.strip():
             try:
+                import boto3
+
                 session = boto3.Session(profile_name=cluster_info.profile)
                 region = session.region_name
                 if region:
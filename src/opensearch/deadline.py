@@ -0,0 +1,154 @@
+# Copyright OpenSearch Contributors
+# SPDX-License-Identifier: Apache-2.0
+
+"""Deadline propagation from tool calls to OpenSearch requests.
+
+A tool call may carry a deadline (``call_timeout`` in the tool arguments or the tool
+config). Every request sent while the deadline is active gets the time that is left
+as its HTTP timeout, so sub-requests of one tool share a single budget. Search and
+``_cat`` requests also receive it as a server-side timeout, so the cluster stops
+working on a request once the caller has given up on it.
+
+Clusters reject query parameters they do not know, so ``cancel_after_time_interval``
+(OpenSearch 1.2+) and ``cluster_manager_timeout`` (2.0+, ``master_timeout`` before)
+are only added when the version of the cluster is known without a request. Otherwise
+the request relies on the search ``timeout`` and the HTTP timeout alone.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from semver import Version
+from typing import Any, Iterator, Mapping, Optional, Tuple, Union
+
+
+# Share of the remaining time given to the cluster, so partial results and errors
+# still arrive before the HTTP request times out
+SERVER_TIMEOUT_RATIO = 0.9
+# First versions that accept the version dependent server-side timeouts
+CANCEL_AFTER_TIME_INTERVAL_VERSION = Version(1, 2, 0)
+CLUSTER_MANAGER_TIMEOUT_VERSION = Version(2, 0, 0)
+# _cat APIs that accept cluster_manager_timeout
+CAT_CLUSTER_MANAGER_APIS = frozenset(
+    {
+        'allocation',
+        'cluster_manager',
+        'indices',
+        'master',
+        'nodeattrs',
+        'nodes',
+        'pending_tasks',
+        'plugins',
+        'repositories',
+        'segments',
+        'shards',
+        'snapshots',
+        'templates',
+        'thread_pool',
+    }
+)
+
+# time.monotonic() value at which the current tool call has to be done
+_current_deadline: ContextVar[Optional[float]] = ContextVar('tool_call_deadline', default=None)
+
+
+class DeadlineExceededError(Exception):
+    """Raised when a request would be sent after the tool call deadline has passed."""
+
+    pass
+
+
+@contextmanager
+def tool_deadline(seconds: Optional[float]) -> Iterator[None]:
+    """Apply a deadline to all OpenSearch requests sent within the context.
+
+    A nested deadline never extends the deadline that is already active.
+
+    Args:
+        seconds: Time budget of the tool call, None for no deadline
+    """
+    if not seconds:
+        yield
+        return
+    deadline = time.monotonic() + seconds
+    current = _current_deadline.get()
+    if current is not None:
+        deadline = min(deadline, current)
+    token = _current_deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _current_deadline.reset(token)
+
+
+def get_remaining_time() -> Optional[float]:
+    """Return the seconds left until the current deadline, or None without a deadline."""
+    deadline = _current_deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def _format_time_value(seconds: float) -> str:
+    return f'{max(int(seconds * 1000), 1)}ms'
+
+
+def apply_deadline(
+    method: str,
+    url: str,
+    params: Optional[Mapping[str, Any]] = None,
+    body: Any = None,
+    timeout: Optional[Union[int, float]] = None,
+    version: Optional[Version] = None,
+) -> Tuple[Optional[Mapping[str, Any]], Optional[Union[int, float]]]:
+    """Fit the HTTP timeout and server-side timeouts of a request to the current deadline.
+
+    Timeouts that were set explicitly and are shorter than the remaining time are kept.
+
+    Args:
+        method: HTTP method
+        url: Path (and optional query string) of the request
+        params: Query parameters of the request
+        body: Request body
+        timeout: HTTP timeout of the request in seconds, if set
+        version: OpenSearch version of the cluster, None if it is not known; the
+            version dependent server-side timeouts are only added when it is known
+
+    Returns:
+        Tuple: The query parameters and the HTTP timeout to use
+
+    Raises:
+        DeadlineExceededError: If the deadline has already passed
+    """
+    remaining = get_remaining_time()
+    if remaining is None:
+        return params, timeout
+    if remaining <= 0:
+        raise DeadlineExceededError(f'Tool call deadline exceeded before sending {method} {url}')
+
+    params = dict(params) if params else {}
+    if timeout is None:
+        timeout = params.pop('request_timeout', None)
+    timeout = min(timeout, remaining) if timeout else remaining
+
+    server_timeout = _format_time_value(remaining * SERVER_TIMEOUT_RATIO)
+    cancellable = version is not None and version >= CANCEL_AFTER_TIME_INTERVAL_VERSION
+    path = url.split('?', 1)[0].strip('/').split('/')
+    if path[-1] == '_search':
+        if not (isinstance(body, Mapping) and 'timeout' in body):
+            params.setdefault('timeout', server_timeout)
+        if cancellable:
+            params.setdefault('cancel_after_time_interval', server_timeout)
+    elif path[-1] == '_msearch':
+        if cancellable:
+            params.setdefault('cancel_after_time_interval', server_timeout)
+    elif len(path) >= 2 and path[0] == '_cat' and path[1] in CAT_CLUSTER_MANAGER_APIS:
+        if version is not None and not (
+            {'master_timeout', 'cluster_manager_timeout'} & set(params)
+        ):
+            if version >= CLUSTER_MANAGER_TIMEOUT_VERSION:
+                params['cluster_manager_timeout'] = server_timeout
+            else:
+                params['master_timeout'] = server_timeout
+
+    return params, timeout
@@ -0,0 +1,73 @@
+# Copyright OpenSearch Contributors
+# SPDX-License-Identifier: Apache-2.0
+
+"""Concurrent requests to many clusters.
+
+``fan_out`` sends one request to each of a list of clusters, at most
+``max_concurrency`` at a time and each within ``cluster_timeout`` seconds, and
+returns one ``ClusterResult`` per cluster with its latency. A cluster that fails or
+does not answer in time gets an error instead of failing the others. It is shared by
+the fleet tools and the capability matrix.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from tools.tool_params import baseToolArgs
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+
+DEFAULT_FLEET_CONCURRENCY = 8
+DEFAULT_CLUSTER_TIMEOUT = 10
+# Name under which the cluster of single mode is reported
+SINGLE_MODE_CLUSTER = 'default'
+
+
+@dataclass
+class ClusterResult:
+    """Summary of one cluster, or the error that prevented it."""
+
+    cluster: str
+    latency_ms: float = 0.0
+    summary: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+
+async def fan_out(
+    names: List[str],
+    fetch: Callable[[baseToolArgs], Awaitable[Any]],
+    summarize: Callable[[Any], Dict[str, Any]],
+    max_concurrency: int = DEFAULT_FLEET_CONCURRENCY,
+    cluster_timeout: float = DEFAULT_CLUSTER_TIMEOUT,
+) -> List[ClusterResult]:
+    """Query the clusters concurrently and summarize their responses.
+
+    Args:
+        names: Names of the clusters
+        fetch: Sends the request to one cluster
+        summarize: Turns the response of a cluster into its summary row
+        max_concurrency: Maximum number of clusters queried at the same time
+        cluster_timeout: Seconds each cluster may take, including the connection
+
+    Returns:
+        List[ClusterResult]: One result per cluster, in the order of names
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def query(name: str) -> ClusterResult:
+        result = ClusterResult(name or SINGLE_MODE_CLUSTER)
+        async with semaphore:
+            start = time.monotonic()
+            try:
+                response = await asyncio.wait_for(
+                    fetch(baseToolArgs(opensearch_cluster_name=name)), cluster_timeout
+                )
+                result.summary = summarize(response)
+            except asyncio.TimeoutError:
+                result.error = f'no answer within {cluster_timeout}s'
+            except Exception as e:
+                result.error = str(e) or type(e).__name__
+            result.latency_ms = (time.monotonic() - start) * 1000
+        return result
+
+    return await asyncio.gather(*(query(name) for name in names))
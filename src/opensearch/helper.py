@@ -1,13 +1,12 @@
 # Copyright OpenSearch Contributors
 # SPDX-License-Identifier: Apache-2.0
 
+import asyncio
 import json
 import logging
 import csv
+import functools
 import io
-import math
-from decimal import Decimal
-import json
 from semver import Version
 from tools.tool_params import *
 
@@ -54,8 +53,10 @@ async def search_index(args: SearchIndexArgs) -> json:
     from tools.tools import TOOL_REGISTRY
 
     async with get_opensearch_client(args) as client:
-        query = normalize_scientific_notation(args.query)
-        
+        # Floats are written in plain notation by the client serializer, so a shallow
+        # copy is enough to set the size without mutating the caller's query
+        query = json.loads(args.query) if isinstance(args.query, str) else dict(args.query)
+
         # Limit size to maximum of 100
         tool_info = TOOL_REGISTRY.get('SearchIndexTool', {})
         max_size_limit = tool_info.get('max_size_limit', 100)  # Default to 100 if not configured
@@ -292,6 +293,37 @@ async def get_nodes_info(args: GetNodesArgs) -> json:
         return response
 
 
+async def get_cluster_health(args: baseToolArgs) -> json:
+    """Get the health of the cluster.
+
+    Args:
+        args: baseToolArgs containing connection parameters
+
+    Returns:
+        json: Cluster health from the /_cluster/health endpoint
+    """
+    from .client import get_opensearch_client
+
+    async with get_opensearch_client(args) as client:
+        return await client.cluster.health()
+
+
+async def get_nodes_stats(args: baseToolArgs, metric: str = 'jvm,os,fs') -> json:
+    """Get statistics of the nodes in the cluster.
+
+    Args:
+        args: baseToolArgs containing connection parameters
+        metric: Comma-separated metric groups to return
+
+    Returns:
+        json: Node statistics from the /_nodes/stats endpoint
+    """
+    from .client import get_opensearch_client
+
+    async with get_opensearch_client(args) as client:
+        return await client.nodes.stats(metric=metric)
+
+
 def convert_search_results_to_csv(search_results: dict) -> str:
     """Convert OpenSearch search results to CSV format.
     
@@ -413,121 +445,140 @@ def _flatten_object(obj: dict, row: dict, prefix: str = '') -> None:
             row[field_name] = str(value) if value is not None else ''
 
 
-async def get_opensearch_version(args: baseToolArgs) -> Version:
-    """Get the version of OpenSearch cluster.
+# Last version looked up by get_opensearch_version, per cluster name as used in tool
+# arguments ('' in single mode)
+_looked_up_versions: dict[str, Version] = {}
 
-    Returns:
-        Version: The version of OpenSearch cluster (SemVer style)
-    """
-    from .client import get_opensearch_client
 
-    try:
-        async with get_opensearch_client(args) as client:
-            response = await client.info()
-            return Version.parse(response['version']['number'])
-    except Exception as e:
-        logger.error(f'Error getting OpenSearch version: {e}')
-        return None
+def _fresh_version(cluster_name: str) -> Version | None:
+    """Return the version found by the startup warm-up or the capability matrix."""
+    from mcp_server_opensearch.capabilities import get_cluster_capabilities
+    from mcp_server_opensearch.warmup import get_warm_version
+
+    version = get_warm_version(cluster_name)
+    if version is not None:
+        return version
+    capabilities = get_cluster_capabilities(cluster_name)
+    return capabilities.version if capabilities is not None else None
 
-def plain_float(value):
-    """Convert a float to a non-scientific notation number.
 
-    This function is intended to normalize floating-point values so that
-    when they are serialized to JSON they do not appear in scientific
-    notation (e.g., `1.23E10`), which some APIs (like OpenSearch) may
-    reject for numeric fields such as epoch millis.
+def get_known_opensearch_version(cluster_name: str) -> Version | None:
+    """Get the version of a configured cluster if it is known without a request.
 
     Args:
-        value (float | None): The input floating-point value to normalize.
-            If None, NaN, or an infinite value is passed, it is treated
-            as invalid.
+        cluster_name: Cluster name as used in tool arguments ('' in single mode)
 
     Returns:
-        int | float | None:
-            - `None` if `value` is None, NaN, or infinite.
-            - An `int` if the normalized representation has no fractional
-              part (e.g., `1.000E3` → `1000`).
-            - A `float` if the normalized representation has a fractional
-              part (e.g., `1.234E2` → `123.4`).
+        Version | None: The version from the warm-up, the capability matrix or an
+            earlier lookup, or None if it is not known
     """
-    if value is None or math.isnan(value) or math.isinf(value):
-        return None
+    version = _fresh_version(cluster_name)
+    if version is not None:
+        return version
+    return _looked_up_versions.get(cluster_name)
 
-    d = Decimal(str(value)).normalize()
-    s = format(d, "f")
-    if "." in s:
-        s = s.rstrip("0").rstrip(".")
-    if s == "" or s == "-":
-        s = "0"
 
-    if "." not in s:
-        return int(s)
-    else:
-        return float(s)
+def forget_opensearch_versions(cluster_names) -> None:
+    """Drop the looked up versions of clusters whose configuration changed."""
+    for cluster_name in cluster_names:
+        _looked_up_versions.pop(cluster_name, None)
 
 
-def _convert_value(v):
-    """Recursively normalize scientific-notation floats inside a structure.
+def get_cached_opensearch_version(args: baseToolArgs) -> Version | None:
+    """Get the version of OpenSearch cluster if it is known without a request.
 
-    This is an internal helper that walks nested Python objects and applies
-    `plain_float` to all `float` values. Only `float` instances are touched;
-    strings and other scalar types are left unchanged.
+    Returns:
+        Version | None: The version of OpenSearch cluster, or None if it is not known
+            or a header points to another cluster
+    """
+    from .client import _get_auth_from_headers
+
+    if _get_auth_from_headers().get('opensearch_url'):
+        return None
+    return get_known_opensearch_version(args.opensearch_cluster_name)
 
-    Args:
-        v (Any): A value that may be a dict, list, float, or any other type.
-            - If `v` is a `dict`, all values are processed recursively.
-            - If `v` is a `list`, all elements are processed recursively.
-            - If `v` is a `float`, it is passed through `plain_float`.
-            - Any other type is returned as-is.
+
+async def get_opensearch_version(args: baseToolArgs) -> Version:
+    """Get the version of OpenSearch cluster.
 
     Returns:
-        Any: A new structure of the same shape with all `float` values
-        normalized (non-scientific notation) where possible.
+        Version: The version of OpenSearch cluster (SemVer style)
     """
-    if isinstance(v, dict):
-        return {k: _convert_value(sub) for k, sub in v.items()}
-    elif isinstance(v, list):
-        return [_convert_value(sub) for sub in v]
-    elif isinstance(v, float):
-        return plain_float(v)
-    else:
-        return v
+    from .client import _get_auth_from_headers, get_opensearch_client
 
+    # Reuse the version found by the startup warm-up or the capability matrix, unless
+    # a header points elsewhere
+    configured = not _get_auth_from_headers().get('opensearch_url')
+    if configured:
+        version = _fresh_version(args.opensearch_cluster_name)
+        if version is not None:
+            return version
 
-def normalize_scientific_notation(body):
-    """Normalize scientific-notation floats in a request body.
+    try:
+        async with get_opensearch_client(args) as client:
+            response = await client.info()
+            version = Version.parse(response['version']['number'])
+    except Exception as e:
+        logger.error(f'Error getting OpenSearch version: {e}')
+        return None
+    if configured:
+        _looked_up_versions[args.opensearch_cluster_name] = version
+    return version
 
-    This function is meant to be used before sending a request body to
-    OpenSearch (or similar APIs) to ensure that numeric values do not
-    appear in scientific notation, which can cause parsing errors for
-    date/epoch fields.
 
-    The function supports both Python objects and JSON strings:
+# Plugin lookups in progress, per cluster name as used in tool arguments, shared by
+# the calls that need the plugins before the first lookup finished
+_plugin_lookups: dict[str, asyncio.Future] = {}
 
-    - If `body` is a `dict` or `list`, it is processed recursively.
-    - If `body` is a JSON `str`, it is first deserialized with
-      `json.loads`, then processed, and the resulting Python object
-      is returned.
 
-    Args:
-        body (dict | list | str): The request body to normalize. It can be:
-            - A nested Python structure (`dict` / `list`) containing floats.
-            - A JSON string representing such a structure.
+async def _look_up_plugins(args: baseToolArgs, cacheable: bool) -> list[str] | None:
+    """Look up the plugin components installed on an OpenSearch cluster."""
+    from .client import get_opensearch_client
+    from mcp_server_opensearch.capabilities import cache_plugins, plugin_components
 
-    Returns:
-        dict | list:
-            The normalized Python structure (usually a dict) with all floats
-            converted to non-scientific notation numeric values where possible.
-            This object can be passed directly to `opensearch-py` as `body`.
+    try:
+        async with get_opensearch_client(args) as client:
+            response = await client.cat.plugins(format='json')
+        plugins = plugin_components(response)
+    except Exception as e:
+        logger.error(f'Error getting the installed OpenSearch plugins: {e}')
+        return None
+    if cacheable:
+        cache_plugins(args.opensearch_cluster_name, plugins)
+    return plugins
+
+
+def _end_plugin_lookup(cluster_name: str, lookup: asyncio.Future) -> None:
+    """Stop sharing a finished plugin lookup."""
+    if _plugin_lookups.get(cluster_name) is lookup:
+        del _plugin_lookups[cluster_name]
 
-    Raises:
-        json.JSONDecodeError: If `body` is a string that is not valid JSON.
-    """
-    if isinstance(body, str):
-        # Treat as JSON string
-        data = json.loads(body)
-        return _convert_value(data)
-    else:
-        # Treat as Python object (dict / list / etc.)
-        return _convert_value(body)
 
+async def get_installed_plugins(args: baseToolArgs) -> list[str] | None:
+    """Get the plugin components installed on an OpenSearch cluster.
+
+    The plugins are reused from the capability matrix or an earlier lookup, unless a
+    header points to another cluster. Concurrent calls for the same cluster share one
+    lookup.
+
+    Returns:
+        list[str] | None: The plugin components, e.g. opensearch-ml, or None if they
+            could not be looked up
+    """
+    from .client import _get_auth_from_headers
+    from mcp_server_opensearch.capabilities import get_cached_plugins
+
+    if _get_auth_from_headers().get('opensearch_url'):
+        return await _look_up_plugins(args, cacheable=False)
+    cluster_name = args.opensearch_cluster_name
+    plugins = get_cached_plugins(cluster_name)
+    if plugins is not None:
+        return plugins
+
+    lookup = _plugin_lookups.get(cluster_name)
+    if lookup is None or lookup.done() or lookup.get_loop() is not asyncio.get_running_loop():
+        lookup = asyncio.ensure_future(_look_up_plugins(args, cacheable=True))
+        _plugin_lookups[cluster_name] = lookup
+        lookup.add_done_callback(functools.partial(_end_plugin_lookup, cluster_name))
+    # A caller that is cancelled does not stop the lookup the other callers wait for
+    return await asyncio.shield(lookup)
@@ -0,0 +1,252 @@
+# Copyright OpenSearch Contributors
+# SPDX-License-Identifier: Apache-2.0
+
+"""Unparsed access to OpenSearch HTTP responses.
+
+``AsyncOpenSearch.transport.perform_request`` always reads the whole response body
+and deserializes it. The functions in this module send the request through the same
+transport and connection, with their retries, deadline, metrics and tracing, but hand
+the body to a ``ResponseBodyReader`` as bytes, so callers can forward it as-is, stream
+it in chunks or stop reading early.
+"""
+
+import asyncio
+import codecs
+import contextlib
+import logging
+import re
+from contextvars import ContextVar
+from mcp_server_opensearch.call_cost import current_cost
+from typing import TYPE_CHECKING, Any, AsyncGenerator, List, Mapping, Optional, Tuple
+
+
+if TYPE_CHECKING:
+    import aiohttp
+    from opensearchpy import AsyncOpenSearch
+
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Size of the chunks read from the socket
+DEFAULT_CHUNK_SIZE = 64 * 1024
+# took of a JSON response, which OpenSearch writes as its first field
+TOOK_PATTERN = re.compile(rb'\s*\{\s*"took"\s*:\s*(\d+)')
+
+
+class ResponseBodyReader:
+    """Reads the body of a successful response in place of the connection.
+
+    Subclasses implement ``read``, which gets the aiohttp response before its body
+    is read. The request then returns an empty body. ``read`` is called again if the
+    request is retried, unless ``handed_on`` was set.
+    """
+
+    def __init__(self):
+        """Initialize the reader."""
+        # Whether part of the body was passed on already, so a retry would repeat it
+        self.handed_on = False
+        # Bytes of the body read from the connection
+        self.received = 0
+
+    async def read(self, response: 'aiohttp.ClientResponse') -> None:
+        """Read the body of the response.
+
+        Args:
+            response: Response with a 2xx status and an unread body
+        """
+        raise NotImplementedError
+
+
+# Reader of the response body of the request being sent, None to decode it
+response_body_reader: ContextVar[Optional[ResponseBodyReader]] = ContextVar(
+    'response_body_reader', default=None
+)
+
+
+async def _perform_request(
+    client: 'AsyncOpenSearch',
+    reader: ResponseBodyReader,
+    method: str,
+    url: str,
+    params: Optional[Mapping[str, Any]],
+    body: Any,
+    headers: Optional[Mapping[str, str]],
+) -> None:
+    """Send a request through the client transport, with its body handed to reader."""
+    token = response_body_reader.set(reader)
+    try:
+        await client.transport.perform_request(
+            method, url, params=params, body=body, headers=headers
+        )
+    finally:
+        response_body_reader.reset(token)
+
+
+class _RawBodyReader(ResponseBodyReader):
+    """Reads the body as bytes, up to max_bytes."""
+
+    def __init__(self, max_bytes: Optional[int]):
+        """Initialize the reader.
+
+        Args:
+            max_bytes: Stop reading once this many bytes were received, None for no limit
+        """
+        super().__init__()
+        self.max_bytes = max_bytes
+        self.data = b''
+        self.truncated = False
+        self.encoding = 'utf-8'
+
+    async def read(self, response: 'aiohttp.ClientResponse') -> None:
+        """Read the body, starting over if the request was retried."""
+        self.encoding = response.charset or 'utf-8'
+        if self.max_bytes is None:
+            self.data = await response.read()
+            self.received += len(self.data)
+            return
+        chunks: List[bytes] = []
+        size = 0
+        self.truncated = False
+        async for chunk in response.content.iter_chunked(DEFAULT_CHUNK_SIZE):
+            self.received += len(chunk)
+            remaining = self.max_bytes - size
+            if len(chunk) >= remaining:
+                chunks.append(chunk[:remaining])
+                # Only report truncation if there is data left unread
+                self.truncated = len(chunk) > remaining or not response.content.at_eof()
+                break
+            chunks.append(chunk)
+            size += len(chunk)
+        self.data = b''.join(chunks)
+
+
+async def read_raw_response(
+    client: 'AsyncOpenSearch',
+    method: str,
+    url: str,
+    params: Optional[Mapping[str, Any]] = None,
+    body: Any = None,
+    headers: Optional[Mapping[str, str]] = None,
+    max_bytes: Optional[int] = None,
+) -> Tuple[str, bool]:
+    """Read a response body as text without deserializing it.
+
+    Args:
+        client: The OpenSearch client whose transport is used
+        method: HTTP method
+        url: Path (and optional query string) relative to the cluster URL
+        params: Optional query parameters
+        body: Optional request body
+        headers: Optional additional request headers
+        max_bytes: Stop reading from the socket once this many bytes were received
+
+    Returns:
+        Tuple[str, bool]: The decoded body and whether it was truncated at max_bytes
+
+    Raises:
+        TransportError: If OpenSearch responds with a non-2xx status or cannot be reached
+    """
+    reader = _RawBodyReader(max_bytes)
+    await _perform_request(client, reader, method, url, params, body, headers)
+
+    cost = current_cost()
+    if cost is not None:
+        took = TOOK_PATTERN.match(reader.data)
+        if took:
+            cost.add_took(int(took.group(1)))
+
+    if reader.truncated:
+        logger.debug(f'Response for {method} {url} truncated at {max_bytes} bytes')
+    return reader.data.decode(reader.encoding, errors='replace'), reader.truncated
+
+
+class _StreamBodyReader(ResponseBodyReader):
+    """Passes the body on as line-aligned text chunks through a queue."""
+
+    def __init__(self, queue: asyncio.Queue, chunk_size: int):
+        """Initialize the reader.
+
+        Args:
+            queue: Queue the text chunks are put in
+            chunk_size: Approximate size of the text chunks
+        """
+        super().__init__()
+        self.queue = queue
+        self.chunk_size = chunk_size
+
+    async def read(self, response: 'aiohttp.ClientResponse') -> None:
+        """Decode the body incrementally and put it in the queue in chunks."""
+        decoder = codecs.getincrementaldecoder(response.charset or 'utf-8')(errors='replace')
+        pending = ''
+        async for data in response.content.iter_chunked(self.chunk_size):
+            self.received += len(data)
+            pending += decoder.decode(data)
+            if len(pending) < self.chunk_size:
+                continue
+            # Cut after the last complete line, or mid-line if a line exceeds a chunk
+            cut = pending.rfind('\n') + 1 or len(pending)
+            chunk, pending = pending[:cut], pending[cut:]
+            self.handed_on = True
+            await self.queue.put(chunk)
+
+        tail = pending + decoder.decode(b'', final=True)
+        if tail:
+            self.handed_on = True
+            await self.queue.put(tail)
+
+
+async def iter_response_text(
+    client: 'AsyncOpenSearch',
+    method: str,
+    url: str,
+    params: Optional[Mapping[str, Any]] = None,
+    body: Any = None,
+    headers: Optional[Mapping[str, str]] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> AsyncGenerator[str, None]:
+    """Yield a response body as decoded text chunks while it is being received.
+
+    Chunks are roughly chunk_size characters long and end on a line boundary whenever
+    possible, so rows of ``_cat`` APIs are not split across chunks. Only about one
+    chunk is held in memory at a time. Closing the generator early stops the request
+    and closes its connection. A response that fails after the first chunk was
+    yielded raises ``ResponseInterruptedError`` and is not retried.
+
+    Args:
+        client: The OpenSearch client whose transport is used
+        method: HTTP method
+        url: Path (and optional query string) relative to the cluster URL
+        params: Optional query parameters
+        body: Optional request body
+        headers: Optional additional request headers
+        chunk_size: Approximate size of the yielded chunks
+
+    Yields:
+        str: The next piece of the response body
+    """
+    # One chunk at a time, so the socket is only read as fast as the chunks are used
+    queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+    reader = _StreamBodyReader(queue, chunk_size)
+    request = asyncio.create_task(
+        _perform_request(client, reader, method, url, params, body, headers)
+    )
+    try:
+        while True:
+            next_chunk = asyncio.ensure_future(queue.get())
+            await asyncio.wait({next_chunk, request}, return_when=asyncio.FIRST_COMPLETED)
+            if next_chunk.done():
+                yield next_chunk.result()
+                continue
+            next_chunk.cancel()
+            while not queue.empty():
+                yield queue.get_nowait()
+            # Raise the error of the request, if any
+            request.result()
+            return
+    finally:
+        if not request.done():
+            # The chunks are no longer wanted: stop reading and close the connection
+            request.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await request
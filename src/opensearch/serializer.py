@@ -0,0 +1,103 @@
+# Copyright OpenSearch Contributors
+# SPDX-License-Identifier: Apache-2.0
+
+"""Request body serialization for OpenSearch clients.
+
+OpenSearch rejects numbers written in scientific notation (e.g. ``1.7e+12``) for
+fields such as epoch millis. Instead of rewriting the request body before it is
+sent, the serializer defined here renders floats in plain notation while the
+body is encoded, so no intermediate copy of the query is created.
+"""
+
+import math
+from decimal import Decimal
+from json.encoder import _make_iterencode, encode_basestring
+from opensearchpy.exceptions import SerializationError
+from opensearchpy.serializer import JSONSerializer
+from typing import Any
+
+
+# Integral floats below this magnitude are exactly representable as int
+_EXACT_INT_LIMIT = 2**53
+
+_CONTAINER_TYPES = (dict, list, tuple)
+_SCALAR_TYPES = frozenset({str, int, bool, type(None)})
+
+
+def plain_float_str(value: float) -> str:
+    """Render a float as a JSON number without scientific notation.
+
+    Args:
+        value: The float to render
+
+    Returns:
+        str: ``null`` for NaN/infinity, an integer literal for integral values
+        (e.g. ``1732693003000``), otherwise the shortest plain decimal literal
+    """
+    if math.isnan(value) or math.isinf(value):
+        return 'null'
+    if value.is_integer() and abs(value) < _EXACT_INT_LIMIT:
+        return str(int(value))
+
+    text = repr(value)
+    if 'e' not in text and 'E' not in text:
+        return text
+
+    text = format(Decimal(text), 'f')
+    if '.' in text:
+        text = text.rstrip('0').rstrip('.')
+    return text if text not in ('', '-', '-0') else '0'
+
+
+def _contains_float(data: Any) -> bool:
+    """Check whether a nested structure of dicts and lists holds any float value.
+
+    Each container is scanned by collecting the set of its item types, which keeps
+    the check cheap for large lists of strings or integers.
+    """
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        items = value.values() if isinstance(value, dict) else value
+        types = set(map(type, items))
+        if float in types:
+            return True
+        if types <= _SCALAR_TYPES:
+            continue
+        for item_type in types - _SCALAR_TYPES:
+            if issubclass(item_type, float):
+                return True
+            if issubclass(item_type, _CONTAINER_TYPES):
+                stack.extend(item for item in items if type(item) is item_type)
+    return False
+
+
+class PlainFloatJSONSerializer(JSONSerializer):
+    """JSON serializer that writes floats in plain (non-scientific) notation.
+
+    Bodies without floats are encoded by the standard C encoder. Only bodies that
+    contain floats go through the pure Python encoder with a custom float renderer.
+    """
+
+    def dumps(self, data: Any) -> Any:
+        """Serialize a request body to JSON, leaving strings untouched."""
+        # Don't serialize strings, and keep the fast path when there is nothing to rewrite
+        if not isinstance(data, (dict, list, tuple)) or not _contains_float(data):
+            return super().dumps(data)
+
+        iterencode = _make_iterencode(
+            {},
+            self.default,
+            encode_basestring,
+            None,
+            plain_float_str,
+            ':',
+            ',',
+            False,
+            False,
+            True,
+        )
+        try:
+            return ''.join(iterencode(data, 0))
+        except (ValueError, TypeError) as e:
+            raise SerializationError(data, e)
@@ -0,0 +1,255 @@
+# Copyright OpenSearch Contributors
+# SPDX-License-Identifier: Apache-2.0
+
+"""Transport used by the clients of tool calls.
+
+``ToolCallTransport`` adds the per-call behaviour to every request a tool sends:
+
+- timeouts fitted to the tool call deadline (see ``opensearch.deadline``)
+- the ``X-Opaque-Id`` header of the tool call, used to find its server-side tasks
+- for clients pinned to a stateful session, the session's search ``preference``
+  and response cache
+- request latency and cache metrics (see ``mcp_server_opensearch.metrics``)
+- the cost of the tool call (see ``mcp_server_opensearch.call_cost``), with
+  ``ToolCallConnection`` counting the HTTP requests and their bytes
+- unparsed responses: while a ``ResponseBodyReader`` is set in
+  ``response_body_reader`` (see ``opensearch.response_stream``), the body of a
+  successful response is handed to it unread instead of being decoded
+"""
+
+import asyncio
+import json
+import time
+from contextvars import ContextVar
+from mcp_server_opensearch import metrics, tracing
+from mcp_server_opensearch.call_cost import current_cost
+from opensearch.deadline import apply_deadline, get_remaining_time
+from opensearch.response_stream import response_body_reader
+from opensearchpy import AsyncHttpConnection, AsyncTransport
+from opensearchpy.connection.http_async import OpenSearchClientResponse
+from opensearchpy.exceptions import (
+    ConnectionError,
+    ConnectionTimeout,
+    OpenSearchException,
+    TransportError,
+)
+from typing import Any, Collection, Hashable, Mapping, Optional, Union
+
+
+# Header that tags every request of a tool call, so its server-side tasks can be found
+OPAQUE_ID_HEADER = 'X-Opaque-Id'
+# Endpoints whose last path segment accepts the preference parameter; _msearch takes
+# it per search in the body only, and rejects it as a URL parameter
+PREFERENCE_ENDPOINTS = frozenset({'_search', '_count'})
+# Read-only endpoints that are sent as POST
+READ_ONLY_POST_ENDPOINTS = PREFERENCE_ENDPOINTS | {'_msearch'}
+# Paths that are never served from the session cache, as they must be current
+UNCACHED_PATH_PREFIXES = (
+    '_tasks',
+    '_nodes/hot_threads',
+    '_cat/tasks',
+    '_cat/pending_tasks',
+    '_cluster/pending_tasks',
+)
+
+# X-Opaque-Id of the tool call whose requests are being sent
+request_opaque_id: ContextVar[Optional[str]] = ContextVar('request_opaque_id', default=None)
+
+
+class ResponseInterruptedError(OpenSearchException):
+    """Raised when a response fails after part of its body was passed on.
+
+    It is not a ``TransportError``, so the transport does not retry the request.
+    """
+
+
+def with_opaque_id(headers: Optional[Mapping[str, str]]) -> Optional[Mapping[str, str]]:
+    """Add the X-Opaque-Id header of the current tool call to the request headers."""
+    opaque_id = request_opaque_id.get()
+    if opaque_id is None:
+        return headers
+    return {**(headers or {}), OPAQUE_ID_HEADER: opaque_id}
+
+
+def _cache_key(
+    method: str, url: str, params: Optional[Mapping[str, Any]], body: Any
+) -> Optional[Hashable]:
+    """Return the session cache key of a read-only request, or None if it is not cacheable."""
+    path = url.split('?', 1)[0].strip('/')
+    if path.startswith(UNCACHED_PATH_PREFIXES):
+        return None
+    if method not in ('GET', 'HEAD') and not (
+        method == 'POST' and path.rsplit('/', 1)[-1] in READ_ONLY_POST_ENDPOINTS
+    ):
+        return None
+    try:
+        body_key = body if isinstance(body, (str, bytes)) else json.dumps(body, sort_keys=True)
+        params_key = tuple(sorted((params or {}).items()))
+        hash(params_key)
+    except (TypeError, ValueError):
+        return None
+    return method, url, params_key, body_key
+
+
+class ToolCallClientResponse(OpenSearchClientResponse):
+    """Response whose body is handed to the current ``ResponseBodyReader``, if any."""
+
+    async def text(self, encoding: Any = None, errors: str = 'strict') -> Any:
+        """Return the body as text, or '' after passing it to the body reader."""
+        reader = response_body_reader.get()
+        if reader is None or not (200 <= self.status < 300):
+            return await super().text(encoding, errors)
+        await reader.read(self)
+        return ''
+
+
+class ToolCallConnection(AsyncHttpConnection):
+    """Connection that counts the requests and bytes of a tool call in its cost.
+
+    Successful responses are handed unread to the current ``ResponseBodyReader``.
+    """
+
+    async def _create_aiohttp_session(self) -> Any:
+        await super()._create_aiohttp_session()
+        # The session only takes the response class when it is created
+        self.session._response_class = ToolCallClientResponse
+
+    async def perform_request(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Mapping[str, Any]] = None,
+        body: Optional[bytes] = None,
+        timeout: Optional[Union[int, float]] = None,
+        ignore: Collection[int] = (),
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> Any:
+        """Perform the request, recording its size in the cost of the tool call."""
+        cost = current_cost()
+        if cost is not None:
+            cost.add_request(len(body) if body else 0)
+        reader = response_body_reader.get()
+        received = reader.received if reader is not None else 0
+        try:
+            status, response_headers, raw_data = await super().perform_request(
+                method, url, params, body, timeout=timeout, ignore=ignore, headers=headers
+            )
+        except TransportError as e:
+            if reader is not None and reader.handed_on:
+                raise ResponseInterruptedError(
+                    f'Response interrupted after {reader.received} bytes: {e}'
+                ) from e
+            raise
+        finally:
+            if cost is not None and reader is not None:
+                # Also count the part of a body that was read before the request stopped
+                cost.add_response(reader.received - received)
+        if cost is not None and reader is None:
+            # The body is already decoded, so prefer the size sent by OpenSearch
+            content_length = response_headers.get('content-length')
+            cost.add_response(int(content_length) if content_length else len(raw_data or ''))
+        return status, response_headers, raw_data
+
+
+class ToolCallTransport(AsyncTransport):
+    """Transport that applies the context of the current tool call to every request."""
+
+    # SessionState of the session the client is pinned to, if any
+    session = None
+    # Cluster the client connects to, as used in metrics
+    cluster_name = 'default'
+    # Expiry timestamp of the temporary credentials the client signs with, if any
+    credentials_expiry: Optional[float] = None
+    # Name the version of the cluster is known under ('' in single mode), None if the
+    # cluster is only given by the request headers
+    version_key: Optional[str] = None
+
+    async def perform_request(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Mapping[str, Any]] = None,
+        body: Any = None,
+        timeout: Optional[Union[int, float]] = None,
+        ignore: Collection[int] = (),
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> Any:
+        """Send the request with the deadline, opaque id and session settings applied."""
+        session = self.session
+        if session is not None and url.split('?', 1)[0].rstrip('/').rsplit('/', 1)[-1] in (
+            PREFERENCE_ENDPOINTS
+        ):
+            params = {'preference': session.preference, **(params or {})}
+
+        # Bodies handed to a reader are not kept, so they cannot be cached either
+        cache_key = (
+            _cache_key(method, url, params, body)
+            if session is not None and response_body_reader.get() is None
+            else None
+        )
+        cost = current_cost()
+        if cost is not None:
+            cost.add_cluster(self.cluster_name)
+        endpoint = metrics.endpoint_label(url)
+        with tracing.span(
+            'perform_request',
+            {
+                tracing.ATTR_CLUSTER: self.cluster_name,
+                tracing.ATTR_METHOD: method,
+                tracing.ATTR_ENDPOINT: endpoint,
+            },
+        ) as request_span:
+            if cache_key is not None:
+                cached = session.response_cache.get(cache_key)
+                metrics.SESSION_CACHE_REQUESTS.inc('miss' if cached is None else 'hit')
+                request_span.set_attribute(tracing.ATTR_CACHE, 'miss' if cached is None else 'hit')
+                if cost is not None:
+                    cost.add_cache_lookup(cached is not None)
+                if cached is not None:
+                    return cached
+
+            version = None
+            if self.version_key is not None and get_remaining_time() is not None:
+                from opensearch.helper import get_known_opensearch_version
+
+                version = get_known_opensearch_version(self.version_key)
+            params, timeout = apply_deadline(method, url, params, body, timeout, version)
+            start = time.monotonic()
+            outcome = metrics.OUTCOME_OK
+            try:
+                response = await super().perform_request(
+                    method,
+                    url,
+                    params=params,
+                    body=body,
+                    timeout=timeout,
+                    ignore=ignore,
+                    headers=with_opaque_id(headers),
+                )
+                tracing.mark_response_received()
+                if cost is not None and isinstance(response, dict):
+                    cost.add_took(response.get('took'))
+            except ConnectionTimeout:
+                outcome = 'timeout'
+                raise
+            except ConnectionError:
+                outcome = 'connection_error'
+                raise
+            except TransportError as e:
+                outcome = str(e.status_code)
+                raise
+            except asyncio.CancelledError:
+                outcome = metrics.OUTCOME_CANCELLED
+                raise
+            except Exception:
+                outcome = metrics.OUTCOME_ERROR
+                raise
+            finally:
+                metrics.OPENSEARCH_REQUEST_DURATION.observe(
+                    time.monotonic() - start, self.cluster_name, method, endpoint, outcome
+                )
+                request_span.set_attribute(tracing.ATTR_OUTCOME, outcome)
+
+        if cache_key is not None:
+            session.response_cache.put(cache_key, response)
+        return response
@@ -13,6 +13,7 @@ DISPLAY_NAME_STRING = 'display_name'
 DESCRIPTION_STRING = 'description'
 ARGS_STRING = 'args'
 MAX_SIZE_LIMIT = 'max_size_limit'
+CALL_TIMEOUT = 'call_timeout'
 
 # Regex pattern for tool display name validation
 DISPLAY_NAME_PATTERN = r'^[a-zA-Z0-9_-]+$'
@@ -55,7 +56,7 @@ def _load_config_from_file(config_from_file: Dict[str, Any]) -> Dict[str, Dict[s
                 if parsed_args := _parse_args_map(tool_name, value):
                     out.setdefault(ARGS_STRING, {}).update(parsed_args)
                 continue
-            if key in (DISPLAY_NAME_STRING, DESCRIPTION_STRING, MAX_SIZE_LIMIT):
+            if key in (DISPLAY_NAME_STRING, DESCRIPTION_STRING, MAX_SIZE_LIMIT, CALL_TIMEOUT):
                 out[key] = value
                 continue
             # Disallow non-standard top-level fields in YAML config
@@ -111,7 +112,13 @@ def parse_cli_to_nested_config(cli_tool_overrides: Dict[str, str]) -> Dict[str,
             continue
         # Only allow top-level fields: display_name, description, args
         top_field = nested_keys[2]
-        if top_field not in (DISPLAY_NAME_STRING, DESCRIPTION_STRING, ARGS_STRING, MAX_SIZE_LIMIT):
+        if top_field not in (
+            DISPLAY_NAME_STRING,
+            DESCRIPTION_STRING,
+            ARGS_STRING,
+            MAX_SIZE_LIMIT,
+            CALL_TIMEOUT,
+        ):
             continue
         nested = _put_nested_dict(nested, nested_keys[1:], raw_value)
 
@@ -0,0 +1,384 @@
+# Copyright OpenSearch Contributors
+# SPDX-License-Identifier: Apache-2.0
+
+"""Fleet tools that run one diagnostic against many clusters at once.
+
+Questions like "which of my clusters are yellow" would otherwise take one tool call
+per cluster. The fleet tools query every cluster of the registry (or the clusters
+given by name or by group) concurrently, at most ``max_concurrency`` at a time and
+each within ``cluster_timeout`` seconds, and return one summary row per cluster
+with its latency. A cluster that fails or does not answer in time gets an error
+row instead of failing the whole call. Each request is admitted through the
+admission control limit of its cluster, while the call itself only takes the permit
+of its tool.
+"""
+
+from .tool_params import baseToolArgs
+from mcp_server_opensearch.admission import admit
+from mcp_server_opensearch.clusters_information import cluster_registry
+from mcp_server_opensearch.global_state import get_mode
+from opensearch.fanout import (
+    DEFAULT_CLUSTER_TIMEOUT,
+    DEFAULT_FLEET_CONCURRENCY,
+    ClusterResult,
+    fan_out,
+)
+from opensearch.helper import get_allocation, get_cluster_health, get_nodes_stats
+from pydantic import Field, field_validator
+from pydantic.json_schema import SkipJsonSchema
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+
+class FleetToolArgs(baseToolArgs):
+    """Arguments shared by the fleet tools."""
+
+    # Fleet tools query the clusters selected by clusters and group, never just one
+    opensearch_cluster_name: SkipJsonSchema[Optional[str]] = None
+
+    clusters: Optional[List[str]] = Field(
+        default=None,
+        description='Names of the clusters to query. Defaults to all configured clusters.',
+    )
+    group: Optional[str] = Field(
+        default=None,
+        description='Only query the clusters that list this group in their "groups" setting',
+    )
+    problems_only: bool = Field(
+        default=False,
+        description='Only list the clusters with a problem and the clusters that could not be queried',
+    )
+    max_concurrency: int = Field(
+        default=DEFAULT_FLEET_CONCURRENCY,
+        ge=1,
+        le=64,
+        description='Maximum number of clusters queried at the same time',
+    )
+    cluster_timeout: float = Field(
+        default=DEFAULT_CLUSTER_TIMEOUT,
+        gt=0,
+        description='Seconds each cluster may take to answer before it is reported as timed out',
+    )
+
+    @field_validator('opensearch_cluster_name')
+    @classmethod
+    def _no_target_cluster(cls, value: Optional[str]) -> None:
+        """Drop the cluster name filled in for single mode, so no cluster permit is taken."""
+        return None
+
+
+class FleetHealthArgs(FleetToolArgs):
+    """Arguments for the FleetHealthTool."""
+
+
+class FleetAllocationArgs(FleetToolArgs):
+    """Arguments for the FleetAllocationTool."""
+
+    disk_threshold: float = Field(
+        default=85, description='Disk usage in percent above which a node is reported'
+    )
+
+
+class FleetNodeStatsArgs(FleetToolArgs):
+    """Arguments for the FleetNodeStatsTool."""
+
+    heap_threshold: float = Field(
+        default=85, description='JVM heap usage in percent above which a node is reported'
+    )
+    cpu_threshold: float = Field(
+        default=90, description='CPU usage in percent above which a node is reported'
+    )
+    disk_threshold: float = Field(
+        default=85, description='Disk usage in percent above which a node is reported'
+    )
+
+
+def select_clusters(args: FleetToolArgs) -> List[str]:
+    """Return the names of the clusters a fleet tool call queries.
+
+    Args:
+        args: Arguments of the fleet tool call
+
+    Returns:
+        List[str]: Cluster names, '' for the cluster of single mode
+
+    Raises:
+        ValueError: If a named cluster is not configured or no cluster is in the group
+    """
+    if get_mode() != 'multi':
+        return ['']
+    names = sorted(cluster_registry)
+    if args.clusters:
+        unknown = [name for name in args.clusters if name not in cluster_registry]
+        if unknown:
+            raise ValueError(f'Unknown clusters: {", ".join(unknown)}')
+        names = [name for name in names if name in args.clusters]
+    if args.group:
+        names = [name for name in names if args.group in (cluster_registry[name].groups or [])]
+        if not names:
+            raise ValueError(f'No configured cluster is in group {args.group}')
+    return names
+
+
+def _number(value: Any) -> Optional[float]:
+    """Convert a _cat value to a number, None if it is missing."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _max(values: List[Optional[float]]) -> Optional[float]:
+    values = [value for value in values if value is not None]
+    return max(values) if values else None
+
+
+def summarize_health(response: dict) -> Dict[str, Any]:
+    """Summarize a /_cluster/health response."""
+    return {
+        'status': response.get('status'),
+        'nodes': response.get('number_of_nodes'),
+        'data_nodes': response.get('number_of_data_nodes'),
+        'active_shards': response.get('active_shards'),
+        'unassigned': response.get('unassigned_shards'),
+        'relocating': response.get('relocating_shards'),
+        'initializing': response.get('initializing_shards'),
+        'pending_tasks': response.get('number_of_pending_tasks'),
+    }
+
+
+def summarize_allocation(response: List[dict], disk_threshold: float) -> Dict[str, Any]:
+    """Summarize a /_cat/allocation response."""
+    nodes = [row for row in response if row.get('node') != 'UNASSIGNED']
+    unassigned = sum(
+        int(_number(row.get('shards')) or 0) for row in response if row.get('node') == 'UNASSIGNED'
+    )
+    disk = {row.get('node'): _number(row.get('disk.percent')) for row in nodes}
+    fullest = max(disk, key=lambda node: disk[node] or 0, default=None)
+    return {
+        'nodes': len(nodes),
+        'shards': sum(int(_number(row.get('shards')) or 0) for row in nodes),
+        'unassigned': unassigned,
+        'max_disk_percent': disk.get(fullest),
+        'fullest_node': fullest,
+        'nodes_over_threshold': sum(
+            1 for percent in disk.values() if percent is not None and percent > disk_threshold
+        ),
+    }
+
+
+def _disk_percent(node: dict) -> Optional[float]:
+    total = node.get('fs', {}).get('total', {})
+    size, available = total.get('total_in_bytes'), total.get('available_in_bytes')
+    if not size or available is None:
+        return None
+    return 100 * (1 - available / size)
+
+
+def summarize_nodes_stats(
+    response: dict, heap_threshold: float, cpu_threshold: float, disk_threshold: float
+) -> Dict[str, Any]:
+    """Summarize a /_nodes/stats response."""
+    heap, cpu, disk, load = [], [], [], []
+    hot_nodes = []
+    for node_id, node in (response.get('nodes') or {}).items():
+        node_heap = node.get('jvm', {}).get('mem', {}).get('heap_used_percent')
+        node_cpu = node.get('os', {}).get('cpu', {}).get('percent')
+        node_disk = _disk_percent(node)
+        heap.append(node_heap)
+        cpu.append(node_cpu)
+        disk.append(node_disk)
+        load.append(node.get('os', {}).get('cpu', {}).get('load_average', {}).get('1m'))
+        if (
+            (node_heap is not None and node_heap > heap_threshold)
+            or (node_cpu is not None and node_cpu > cpu_threshold)
+            or (node_disk is not None and node_disk > disk_threshold)
+        ):
+            hot_nodes.append(node.get('name', node_id))
+    return {
+        'nodes': len(heap),
+        'max_heap_percent': _max(heap),
+        'max_cpu_percent': _max(cpu),
+        'max_disk_percent': _max(disk),
+        'max_load_1m': _max(load),
+        'hot_nodes': ','.join(sorted(hot_nodes)),
+    }
+
+
+def _cell(value: Any) -> str:
+    if value is None or value == '':
+        return '-'
+    if isinstance(value, float):
+        return f'{value:.1f}'
+    return str(value)
+
+
+def format_fleet_table(
+    title: str,
+    columns: List[str],
+    results: List[ClusterResult],
+    is_problem: Callable[[Dict[str, Any]], bool],
+    problems_only: bool = False,
+) -> str:
+    """Format the results as a table with one row per cluster.
+
+    Args:
+        title: First line of the text
+        columns: Keys of the summaries to show, after the cluster name
+        results: Results of the clusters
+        is_problem: Tells whether the summary of a cluster shows a problem
+        problems_only: Leave out the clusters without a problem or error
+
+    Returns:
+        str: The title, a count of the problems and errors, and the table
+    """
+    errors = [result for result in results if result.error]
+    problems = [result for result in results if not result.error and is_problem(result.summary)]
+    shown = errors + problems if problems_only else results
+    header = ['cluster', *columns, 'latency_ms', 'error']
+    lines = [
+        f'{title} of {len(results)} clusters: {len(problems)} with problems, '
+        f'{len(errors)} not reachable',
+        ' | '.join(header),
+    ]
+    for result in sorted(shown, key=lambda result: result.cluster):
+        row = [result.cluster, *(result.summary.get(column) for column in columns)]
+        row += [f'{result.latency_ms:.0f}', result.error]
+        lines.append(' | '.join(_cell(value) for value in row))
+    return '\n'.join(lines) + '\n'
+
+
+async def _run_fleet_tool(
+    args: FleetToolArgs,
+    title: str,
+    fetch: Callable[[baseToolArgs], Awaitable[Any]],
+    summarize: Callable[[Any], Dict[str, Any]],
+    columns: List[str],
+    is_problem: Callable[[Dict[str, Any]], bool],
+) -> list[dict]:
+    async def admitted_fetch(cluster_args: baseToolArgs) -> Any:
+        # Every cluster request counts against the admission limit of its cluster
+        async with admit(None, cluster_args.opensearch_cluster_name):
+            return await fetch(cluster_args)
+
+    try:
+        names = select_clusters(args)
+        results = await fan_out(
+            names, admitted_fetch, summarize, args.max_concurrency, args.cluster_timeout
+        )
+        text = format_fleet_table(title, columns, results, is_problem, args.problems_only)
+        return [{'type': 'text', 'text': text}]
+    except Exception as e:
+        return [{'type': 'text', 'text': f'Error getting {title.lower()}: {str(e)}'}]
+
+
+async def fleet_health_tool(args: FleetHealthArgs) -> list[dict]:
+    """Tool to get the health of many clusters at once.
+
+    Args:
+        args: FleetHealthArgs selecting the clusters
+
+    Returns:
+        list[dict]: Health summary table in MCP format
+    """
+    return await _run_fleet_tool(
+        args,
+        'Cluster health',
+        get_cluster_health,
+        summarize_health,
+        [
+            'status',
+            'nodes',
+            'data_nodes',
+            'active_shards',
+            'unassigned',
+            'relocating',
+            'initializing',
+            'pending_tasks',
+        ],
+        lambda summary: summary.get('status') != 'green',
+    )
+
+
+async def fleet_allocation_tool(args: FleetAllocationArgs) -> list[dict]:
+    """Tool to get the shard allocation and disk usage of many clusters at once.
+
+    Args:
+        args: FleetAllocationArgs selecting the clusters and the disk threshold
+
+    Returns:
+        list[dict]: Allocation summary table in MCP format
+    """
+    return await _run_fleet_tool(
+        args,
+        'Shard allocation',
+        get_allocation,
+        lambda response: summarize_allocation(response, args.disk_threshold),
+        [
+            'nodes',
+            'shards',
+            'unassigned',
+            'max_disk_percent',
+            'fullest_node',
+            'nodes_over_threshold',
+        ],
+        lambda summary: bool(summary.get('nodes_over_threshold') or summary.get('unassigned')),
+    )
+
+
+async def fleet_node_stats_tool(args: FleetNodeStatsArgs) -> list[dict]:
+    """Tool to get the heap, CPU and disk usage of the nodes of many clusters at once.
+
+    Args:
+        args: FleetNodeStatsArgs selecting the clusters and the thresholds
+
+    Returns:
+        list[dict]: Node statistics summary table in MCP format
+    """
+    return await _run_fleet_tool(
+        args,
+        'Node statistics',
+        get_nodes_stats,
+        lambda response: summarize_nodes_stats(
+            response, args.heap_threshold, args.cpu_threshold, args.disk_threshold
+        ),
+        [
+            'nodes',
+            'max_heap_percent',
+            'max_cpu_percent',
+            'max_disk_percent',
+            'max_load_1m',
+            'hot_nodes',
+        ],
+        lambda summary: bool(summary.get('hot_nodes')),
+    )
+
+
+FLEET_TOOLS_REGISTRY = {
+    'FleetHealthTool': {
+        'display_name': 'FleetHealthTool',
+        'description': 'Gets the health of all configured OpenSearch clusters (or the given clusters or group) concurrently in one call, with one row per cluster: status, nodes, active, unassigned, relocating and initializing shards, pending tasks, latency and errors. Set problems_only=true to list only clusters that are not green or not reachable.',
+        'input_schema': FleetHealthArgs.model_json_schema(),
+        'function': fleet_health_tool,
+        'args_model': FleetHealthArgs,
+        'min_version': '1.0.0',
+        'http_methods': 'GET',
+    },
+    'FleetAllocationTool': {
+        'display_name': 'FleetAllocationTool',
+        'description': 'Gets the shard allocation of all configured OpenSearch clusters (or the given clusters or group) concurrently in one call, with one row per cluster: nodes, shards, unassigned shards, the highest node disk usage and the number of nodes above disk_threshold percent. Set problems_only=true to list only clusters with full disks, unassigned shards or errors.',
+        'input_schema': FleetAllocationArgs.model_json_schema(),
+        'function': fleet_allocation_tool,
+        'args_model': FleetAllocationArgs,
+        'min_version': '1.0.0',
+        'http_methods': 'GET',
+    },
+    'FleetNodeStatsTool': {
+        'display_name': 'FleetNodeStatsTool',
+        'description': 'Gets node statistics of all configured OpenSearch clusters (or the given clusters or group) concurrently in one call, with one row per cluster: the highest JVM heap, CPU and disk usage and 1 minute load of its nodes, and the nodes above the heap, CPU or disk thresholds. Set problems_only=true to list only clusters with such nodes or errors.',
+        'input_schema': FleetNodeStatsArgs.model_json_schema(),
+        'function': fleet_node_stats_tool,
+        'args_model': FleetNodeStatsArgs,
+        'min_version': '1.0.0',
+        'http_methods': 'GET',
+    },
+}
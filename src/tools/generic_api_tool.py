@@ -3,12 +3,13 @@
 
 import json
 import logging
-import os
+from .streaming import DEFAULT_STREAM_MAX_BYTES, stream_text_content
+from .tool_params import baseToolArgs
+from opensearch.response_stream import iter_response_text, read_raw_response
+from pydantic import Field
 from typing import Any, Dict, Optional
 from urllib.parse import urlencode
 
-from .tool_params import baseToolArgs
-from pydantic import BaseModel, Field
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +34,19 @@ class GenericOpenSearchApiArgs(baseToolArgs):
     headers: Optional[Dict[str, str]] = Field(
         default=None, description='Additional HTTP headers to include in the request'
     )
+    raw: bool = Field(
+        default=False,
+        description='Return the response body exactly as sent by OpenSearch, without parsing and re-formatting it. Recommended for large responses such as /_cat/* or /_cluster/state.',
+    )
+    stream: bool = Field(
+        default=False,
+        description='Stream the response body to the client in chunks while it is received instead of returning it at once. Implies raw. Recommended for very large responses such as /_cat/segments or /_nodes/hot_threads.',
+    )
+    max_bytes: Optional[int] = Field(
+        default=None,
+        gt=0,
+        description='Only used when raw or stream is true. Maximum number of response bytes to read (10485760 by default when streaming); the response is truncated once this limit is reached.',
+    )
 
     class Config:
         json_schema_extra = {
@@ -54,6 +68,13 @@ class GenericOpenSearchApiArgs(baseToolArgs):
                     'body': {'query': {'match': {'title': 'search term'}}},
                 },
                 {'path': '/_cluster/health', 'method': 'GET'},
+                {
+                    'path': '/_cat/segments',
+                    'method': 'GET',
+                    'query_params': {'v': True},
+                    'raw': True,
+                    'max_bytes': 1048576,
+                },
             ]
         }
 
@@ -113,9 +134,10 @@ async def generic_opensearch_api_tool(args: GenericOpenSearchApiArgs) -> list[di
         if not args.path.startswith('/'):
             return [{'type': 'text', 'text': 'Error: API path must start with "/"'}]
 
-        # Initialize OpenSearch client with context manager for proper cleanup
+        # Imported here so opensearch-py is only loaded once a tool is called
         from opensearch.client import get_opensearch_client
 
+        # Initialize OpenSearch client with context manager for proper cleanup
         async with get_opensearch_client(args) as client:
             # Build the request URL
             url = args.path
@@ -138,6 +160,32 @@ async def generic_opensearch_api_tool(args: GenericOpenSearchApiArgs) -> list[di
             if args.headers:
                 request_params['headers'] = args.headers
 
+            # Create descriptive message
+            message = f'OpenSearch API Response ({method} {args.path})'
+            if args.query_params:
+                message += f' with query params: {args.query_params}'
+
+            if args.stream:
+                # Forward the response body chunk by chunk as it arrives
+                logger.info(f'Making streamed {method} request to {url}')
+                return await stream_text_content(
+                    iter_response_text(client, **request_params),
+                    message,
+                    max_bytes=args.max_bytes or DEFAULT_STREAM_MAX_BYTES,
+                )
+
+            if args.raw:
+                # Forward the response body without deserializing and re-serializing it
+                logger.info(f'Making raw {method} request to {url}')
+                formatted_response, truncated = await read_raw_response(
+                    client, max_bytes=args.max_bytes, **request_params
+                )
+                if truncated:
+                    formatted_response += (
+                        f'\n[Response truncated after {args.max_bytes} bytes (max_bytes)]'
+                    )
+                return [{'type': 'text', 'text': f'{message}:\n{formatted_response}'}]
+
             # Make the API request using the transport layer
             logger.info(f'Making {method} request to {url}')
             response = await client.transport.perform_request(**request_params)
@@ -150,11 +198,6 @@ async def generic_opensearch_api_tool(args: GenericOpenSearchApiArgs) -> list[di
                 # Most APIs return JSON
                 formatted_response = json.dumps(response, indent=2)
 
-            # Create descriptive message
-            message = f'OpenSearch API Response ({method} {args.path})'
-            if args.query_params:
-                message += f' with query params: {args.query_params}'
-
             return [{'type': 'text', 'text': f'{message}:\n{formatted_response}'}]
 
     except Exception as e:
@@ -6,7 +6,6 @@ import logging
 from typing import Dict, Any
 from .tool_params import baseToolArgs
 from pydantic import Field
-from opensearch.client import get_opensearch_client
 
 logger = logging.getLogger(__name__)
 
@@ -31,7 +30,12 @@ class LogPatternAnalysisToolArgs(baseToolArgs):
 
 async def call_opensearch_tool(tool_name: str, parameters: Dict[str, Any], args: baseToolArgs) -> list[dict]:
     """Call OpenSearch ML tools API"""
+    from .tools import check_tool_compatibility
+    from opensearch.client import get_opensearch_client
+
     try:
+        # Check the plugins and a cached version only, so no request is added
+        await check_tool_compatibility(tool_name, args, lookup_version=False)
         async with get_opensearch_client(args) as client:
             # Call OpenSearch ML tools execute API
             response = await client.transport.perform_request(
@@ -89,6 +93,7 @@ SKILLS_TOOLS_REGISTRY = {
         'function': data_distribution_tool,
         'args_model': DataDistributionToolArgs,
         'min_version': '3.3.0',
+        'required_plugins': ['opensearch-ml'],
         'http_methods': 'POST',
     },
     'LogPatternAnalysisTool': {
@@ -98,6 +103,7 @@ SKILLS_TOOLS_REGISTRY = {
         'function': log_pattern_analysis_tool,
         'args_model': LogPatternAnalysisToolArgs,
         'min_version': '3.3.0',
+        'required_plugins': ['opensearch-ml'],
         'http_methods': 'POST',
     },
 }
\ No newline at end of file
@@ -0,0 +1,91 @@
+# Copyright OpenSearch Contributors
+# SPDX-License-Identifier: Apache-2.0
+
+import io
+import logging
+from mcp.server.lowlevel.server import request_ctx
+from typing import Any, AsyncIterator, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+
+def _get_progress_context() -> Tuple[Optional[Any], Optional[Any]]:
+    """Return the progress token and request context of the current tool call, if any."""
+    try:
+        context = request_ctx.get()
+    except LookupError:
+        return None, None
+    token = context.meta.progressToken if context.meta else None
+    return token, context
+
+
+# Bytes of a streamed response kept in the tool result when no limit is given
+DEFAULT_STREAM_MAX_BYTES = 10 * 1024 * 1024
+
+
+def _utf8_size(text: str) -> int:
+    return len(text) if text.isascii() else len(text.encode('utf-8'))
+
+
+async def stream_text_content(
+    chunks: AsyncIterator[str], message: str, max_bytes: int = DEFAULT_STREAM_MAX_BYTES
+) -> list[dict]:
+    """Forward text chunks to the MCP client as they are produced.
+
+    The tool result always holds the response text, since many clients never pass
+    progress messages to the model. If the client sent a progress token with the tool
+    call, every chunk is also sent right away as the message of a progress
+    notification, so the client can show the response while it arrives.
+
+    The text is joined as it arrives and cut off after max_bytes bytes (UTF-8), at
+    which point the rest of the response is not read, so memory stays bounded by the
+    limit.
+
+    Args:
+        chunks: Async iterator of text chunks, e.g. from iter_response_text
+        message: Description of the response, used as the first line of the result
+        max_bytes: Maximum number of response bytes in the result
+
+    Returns:
+        list[dict]: Tool result in MCP format
+    """
+    token, context = _get_progress_context()
+
+    text = io.StringIO()
+    chunk_count = 0
+    sent_bytes = 0
+    truncated = False
+    try:
+        async for chunk in chunks:
+            size = _utf8_size(chunk)
+            if sent_bytes + size > max_bytes:
+                # Cut at the limit, dropping a character split by it
+                chunk = chunk.encode('utf-8')[: max_bytes - sent_bytes].decode(
+                    'utf-8', errors='ignore'
+                )
+                size = _utf8_size(chunk)
+                truncated = True
+            chunk_count += 1
+            sent_bytes += size
+            text.write(chunk)
+            if token is not None and chunk:
+                await context.session.send_progress_notification(
+                    progress_token=token,
+                    progress=sent_bytes,
+                    message=chunk,
+                    related_request_id=context.request_id,
+                )
+            if truncated:
+                break
+    finally:
+        # Stop reading the rest of a truncated response
+        aclose = getattr(chunks, 'aclose', None)
+        if aclose is not None:
+            await aclose()
+    logger.debug(f'Streamed {chunk_count} chunks ({sent_bytes} bytes) to the client')
+
+    result = f'{message}:\n{text.getvalue()}'
+    if truncated:
+        result += f'\n[Response truncated after {max_bytes} bytes (max_bytes)]'
+    return [{'type': 'text', 'text': result}]
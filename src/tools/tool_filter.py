@@ -9,6 +9,7 @@ from .tool_params import baseToolArgs
 from .tools import TOOL_REGISTRY
 from .utils import (
     is_tool_compatible,
+    missing_plugins,
     parse_comma_separated,
     load_yaml_config,
     validate_tools,
@@ -20,6 +21,12 @@ from mcp_server_opensearch.global_state import get_mode
 # This is set during server initialization and used by individual tools
 _resolved_allow_write_setting = None
 
+# baseToolArgs fields hidden from the input schema in single mode
+SINGLE_MODE_HIDDEN_FIELDS = ('opensearch_cluster_name',)
+
+# Default of get_tools' opensearch_version: look the version up
+_LOOKUP_VERSION = object()
+
 
 def process_regex_patterns(regex_list, tool_names):
     """Process regex patterns and return matching tool names."""
@@ -294,15 +301,25 @@ def process_tool_filter(
         logging.error(f'Error processing tool filter: {str(e)}')
 
 
-async def get_tools(tool_registry: dict, config_file_path: str = '') -> dict:
+async def get_tools(
+    tool_registry: dict,
+    config_file_path: str = '',
+    opensearch_version=_LOOKUP_VERSION,
+    installed_plugins: list[str] | None = None,
+) -> dict:
     """Filter and return available tools based on server mode and OpenSearch version.
 
     In 'multi' mode, returns all tools without filtering. In 'single' mode, filters tools
-    based on OpenSearch version compatibility and removes base tool arguments from schemas.
+    based on OpenSearch version compatibility and installed plugins and removes base tool
+    arguments from schemas.
 
     Args:
         tool_registry (dict): The tool registry to filter.
         config_file_path (str): Path to a YAML configuration file
+        opensearch_version (Version | None): Version probed ahead of the call, None if it
+            is unknown; looked up when not given
+        installed_plugins (list[str] | None): Plugin components installed on the cluster,
+            None if they are unknown
 
     Returns:
         dict: Dictionary of enabled tools with their configurations
@@ -322,7 +339,9 @@ async def get_tools(tool_registry: dict, config_file_path: str = '') -> dict:
     enabled = {}
 
     # Get OpenSearch version for compatibility checking (only in single mode)
-    version = await get_opensearch_version(baseToolArgs(opensearch_cluster_name=''))
+    version = opensearch_version
+    if version is _LOOKUP_VERSION:
+        version = await get_opensearch_version(baseToolArgs(opensearch_cluster_name=''))
     logging.info(f'Connected OpenSearch version: {version}')
 
     env_config = {
@@ -355,13 +374,15 @@ async def get_tools(tool_registry: dict, config_file_path: str = '') -> dict:
         # If tool is not compatible with the current OpenSearch version, skip, don't enable
         if not is_tool_compatible(version, info):
             continue
+        # Nor if the plugin serving it is not installed
+        if missing_plugins(installed_plugins, info):
+            continue
 
-        # Remove baseToolArgs fields from input schema for single mode
-        # This simplifies the schema since base args are handled internally
+        # Remove the cluster name from input schema for single mode
+        # This simplifies the schema since the cluster is handled internally
         schema = tool_info['input_schema'].copy()
         if 'properties' in schema:
-            base_fields = baseToolArgs.model_fields.keys()
-            for field in base_fields:
+            for field in SINGLE_MODE_HIDDEN_FIELDS:
                 schema['properties'].pop(field, None)
                 # Also remove from required array if present
                 if 'required' in schema and field in schema['required']:
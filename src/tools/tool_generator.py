@@ -2,7 +2,9 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import aiohttp
+import asyncio
 import json
+import logging
 import yaml
 import ssl
 import os
@@ -13,6 +15,8 @@ from pydantic import BaseModel, create_model
 from typing import Any, Dict, List
 
 
+logger = logging.getLogger(__name__)
+
 # Constants
 BASE_URL = 'https://raw.githubusercontent.com/opensearch-project/opensearch-api-specification/refs/heads/main/spec/namespaces'
 SPEC_FILES = ['cluster.yaml', '_core.yaml']
@@ -304,17 +308,22 @@ def generate_tool_from_group(base_name: str, endpoints: List[Dict]) -> Dict[str,
 
 async def generate_tools_from_openapi() -> Dict[str, Dict[str, Any]]:
     """Generate tools from OpenSearch API specification and append to TOOL_REGISTRY."""
-    try:
-        for spec_file in SPEC_FILES:
-            spec = await fetch_github_spec(spec_file)
+    # Fetch the spec files concurrently, a failed file does not stop the others
+    specs = await asyncio.gather(
+        *(fetch_github_spec(spec_file) for spec_file in SPEC_FILES), return_exceptions=True
+    )
+    for spec_file, spec in zip(SPEC_FILES, specs):
+        if isinstance(spec, Exception):
+            logger.error(f'Error fetching {spec_file}: {spec}')
+            continue
+        try:
             grouped_ops = group_endpoints_by_operation(spec.get('paths', {}))
             # Generate tools for each operation group
             for group_name, endpoints in grouped_ops.items():
                 base_name = ''.join(part.title() for part in group_name.split('.'))
                 tool_name = f'{base_name.replace("_", "")}Tool'
                 TOOL_REGISTRY[tool_name] = generate_tool_from_group(base_name, endpoints)
-
-    except Exception as e:
-        print(f'Error generating tools: {e}')
+        except Exception as e:
+            logger.error(f'Error generating tools: {e}')
 
     return TOOL_REGISTRY
@@ -60,6 +60,11 @@ class baseToolArgs(BaseModel):
     """Base class for all tool arguments that contains common OpenSearch connection parameters."""
 
     opensearch_cluster_name: str = Field(description='The name of the OpenSearch cluster')
+    call_timeout: Optional[float] = Field(
+        default=None,
+        gt=0,
+        description='Optional deadline for the whole tool call in seconds. It is applied to every request the tool sends to OpenSearch, including server-side search timeouts.',
+    )
 
 
 class ListIndicesArgs(baseToolArgs):
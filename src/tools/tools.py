@@ -19,15 +19,17 @@ from .tool_params import (
     SearchIndexArgs,
     baseToolArgs,
 )
-from .utils import is_tool_compatible
+from .utils import is_tool_compatible, missing_plugins
 from opensearch.helper import (
     convert_search_results_to_csv,
     get_allocation,
+    get_cached_opensearch_version,
     get_cluster_state,
     get_index,
     get_index_info,
     get_index_mapping,
     get_index_stats,
+    get_installed_plugins,
     get_long_running_tasks,
     get_nodes,
     get_nodes_info,
@@ -40,10 +42,18 @@ from opensearch.helper import (
     search_index,
 )
 from .skills_tools import SKILLS_TOOLS_REGISTRY
-
-
-async def check_tool_compatibility(tool_name: str, args: baseToolArgs = None):
-    opensearch_version = await get_opensearch_version(args)
+from .fleet_tools import FLEET_TOOLS_REGISTRY
+
+
+async def check_tool_compatibility(
+    tool_name: str, args: baseToolArgs = None, lookup_version: bool = True
+):
+    # Without lookup_version only a version known without a request is checked
+    opensearch_version = (
+        await get_opensearch_version(args)
+        if lookup_version
+        else get_cached_opensearch_version(args)
+    )
     if not is_tool_compatible(opensearch_version, TOOL_REGISTRY[tool_name]):
         tool_display_name = TOOL_REGISTRY[tool_name].get('display_name', tool_name)
         min_version = TOOL_REGISTRY[tool_name].get('min_version', '')
@@ -65,6 +75,17 @@ async def check_tool_compatibility(tool_name: str, args: baseToolArgs = None):
 
         raise Exception(error_message)
 
+    # Tools served by a plugin fail on clusters without it, so check before calling
+    if TOOL_REGISTRY[tool_name].get('required_plugins'):
+        installed_plugins = await get_installed_plugins(args)
+        missing = missing_plugins(installed_plugins, TOOL_REGISTRY[tool_name])
+        if missing:
+            tool_display_name = TOOL_REGISTRY[tool_name].get('display_name', tool_name)
+            raise Exception(
+                f"Tool '{tool_display_name}' requires the OpenSearch plugin "
+                f'{", ".join(missing)}, which is not installed on this cluster.'
+            )
+
 
 async def list_indices_tool(args: ListIndicesArgs) -> list[dict]:
     try:
@@ -504,6 +525,7 @@ from .generic_api_tool import GenericOpenSearchApiArgs, generic_opensearch_api_t
 # Registry of available OpenSearch tools with their metadata
 TOOL_REGISTRY = {
     **SKILLS_TOOLS_REGISTRY,
+    **FLEET_TOOLS_REGISTRY,
     'ListIndexTool': {
         'display_name': 'ListIndexTool',
         'description': 'Lists indices in the OpenSearch cluster. By default, returns a filtered list of index names only to minimize response size. Set include_detail=true to return full metadata from cat.indices (docs.count, store.size, etc.). If an index parameter is provided, returns detailed information for that specific index including mappings and settings.',
@@ -589,6 +611,7 @@ TOOL_REGISTRY = {
         'function': get_query_insights_tool,
         'args_model': GetQueryInsightsArgs,
         'min_version': '2.12.0',  # Query insights feature requires OpenSearch 2.12+
+        'required_plugins': ['query-insights'],
         'http_methods': 'GET',
     },
     'GetNodesHotThreadsTool': {
@@ -28,6 +28,27 @@ def is_tool_compatible(current_version: Version | None, tool_info: dict = {}):
     return min_tool_version <= current_version <= max_tool_version
 
 
+def missing_plugins(installed_plugins: list[str] | None, tool_info: dict = {}) -> list[str]:
+    """Return the plugins a tool requires that are not installed on a cluster.
+
+    Args:
+        installed_plugins (list[str] | None): Plugin components installed on the cluster,
+            None if they are unknown
+        tool_info (dict): Tool information containing required_plugins
+
+    Returns:
+        list[str]: The missing plugin components, empty if the tool can be called
+    """
+    # Unknown plugins, e.g. on serverless collections, never block a tool
+    if installed_plugins is None:
+        return []
+    return [
+        plugin
+        for plugin in tool_info.get('required_plugins', [])
+        if plugin not in installed_plugins
+    ]
+
+
 def parse_comma_separated(text, separator=','):
     """Parse a comma-separated string into a list of trimmed values."""
     if not text:
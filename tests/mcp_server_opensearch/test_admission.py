@@ -0,0 +1,224 @@
+# Copyright OpenSearch Contributors
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import json
+import pytest
+import time
+from mcp_server_opensearch import admission
+from mcp_server_opensearch.admission import (
+    AdmissionConfig,
+    AdmissionController,
+    ConcurrencyLimiter,
+    OverloadedError,
+    admit,
+    configure_admission,
+    get_admission_controller,
+    load_admission_config,
+)
+from mcp_server_opensearch.clusters_information import ClusterInfo, cluster_registry
+from mcp_server_opensearch.global_state import set_mode
+
+
+class TestConcurrencyLimiter:
+    """Tests of ConcurrencyLimiter."""
+
+    @pytest.mark.asyncio
+    async def test_waiters_admitted_in_order(self):
+        """Test that queued calls get the permit in arrival order."""
+        limiter = ConcurrencyLimiter('cluster', 'test', limit=1, queue_size=2)
+        order = []
+
+        await limiter.acquire(time.monotonic() + 1)
+
+        async def waiter(name):
+            await limiter.acquire(time.monotonic() + 1)
+            order.append(name)
+            limiter.release()
+
+        tasks = [asyncio.create_task(waiter(name)) for name in ('first', 'second')]
+        await asyncio.sleep(0)
+        assert limiter.queued == 2
+
+        limiter.release()
+        await asyncio.gather(*tasks)
+
+        assert order == ['first', 'second']
+        assert limiter.active == 0
+        stats = limiter.stats()
+        assert stats['admitted'] == 3
+        assert stats['wait_count'] == 2
+        assert stats['wait_max_ms'] > 0
+
+    @pytest.mark.asyncio
+    async def test_reject_when_queue_full(self):
+        """Test that calls are rejected right away once the queue is full."""
+        limiter = ConcurrencyLimiter('tool', 'SearchIndexTool', limit=1, queue_size=0)
+        await limiter.acquire(time.monotonic() + 1)
+
+        with pytest.raises(OverloadedError) as exc_info:
+            await limiter.acquire(time.monotonic() + 1)
+
+        error = json.loads(str(exc_info.value))['error']
+        assert error['type'] == 'overloaded'
+        assert error['reason'] == 'queue_full'
+        assert error['scope'] == 'tool'
+        assert error['name'] == 'SearchIndexTool'
+        assert error['limit'] == 1
+        assert limiter.stats()['rejected'] == 1
+
+    @pytest.mark.asyncio
+    async def test_reject_after_queue_timeout(self):
+        """Test that a queued call is rejected when its deadline passes."""
+        limiter = ConcurrencyLimiter('cluster', 'test', limit=1, queue_size=1)
+        await limiter.acquire(time.monotonic() + 1)
+
+        with pytest.raises(OverloadedError) as exc_info:
+            await limiter.acquire(time.monotonic() + 0.01)
+
+        assert exc_info.value.reason == 'queue_timeout'
+        assert exc_info.value.waited > 0
+        assert limiter.queued == 0
+        # The permit is still held by the first call only
+        limiter.release()
+        assert limiter.active == 0
+
+
+class TestAdmissionController:
+    """Tests of AdmissionController."""
+
+    def setup_method(self):
+        """Register two clusters in multi mode."""
+        set_mode('multi')
+        for name in ('prod', 'staging'):
+            cluster_registry[name] = ClusterInfo(opensearch_url=f'http://{name}:9200')
+
+    def teardown_method(self):
+        """Remove the clusters."""
+        cluster_registry.clear()
+        set_mode('single')
+
+    @pytest.mark.asyncio
+    async def test_per_tool_and_cluster_limits(self):
+        """Test that tool overrides and cluster defaults are applied."""
+        controller = AdmissionController(
+            AdmissionConfig(
+                cluster_concurrency=2,
+                queue_size=0,
+                tools={'GetNodesHotThreadsTool': 1},
+            )
+        )
+
+        async with controller.admit('GetNodesHotThreadsTool', 'prod'):
+            with pytest.raises(OverloadedError) as exc_info:
+                async with controller.admit('GetNodesHotThreadsTool', 'prod'):
+                    pass
+            assert exc_info.value.scope == 'tool'
+
+            async with controller.admit('SearchIndexTool', 'prod'):
+                with pytest.raises(OverloadedError) as exc_info:
+                    async with controller.admit('SearchIndexTool', 'prod'):
+                        pass
+                assert exc_info.value.scope == 'cluster'
+                assert exc_info.value.name == 'prod'
+
+                # Other clusters have their own limit
+                async with controller.admit('SearchIndexTool', 'staging'):
+                    pass
+
+        stats = controller.stats()
+        assert stats['tools']['GetNodesHotThreadsTool']['active'] == 0
+        assert stats['tools']['GetNodesHotThreadsTool']['rejected'] == 1
+        assert stats['clusters']['prod']['active'] == 0
+        assert stats['clusters']['prod']['rejected'] == 1
+        # Tools without a limit are not tracked
+        assert 'SearchIndexTool' not in stats['tools']
+
+    @pytest.mark.asyncio
+    async def test_release_tool_permit_when_cluster_rejects(self):
+        """Test that the tool permit is returned if the cluster permit is refused."""
+        controller = AdmissionController(
+            AdmissionConfig(cluster_concurrency=1, tool_concurrency=5, queue_size=0)
+        )
+
+        async with controller.admit('ListIndexTool'):
+            with pytest.raises(OverloadedError):
+                async with controller.admit('ListIndexTool'):
+                    pass
+            assert controller.stats()['tools']['ListIndexTool']['active'] == 1
+
+        assert controller.stats()['clusters']['default']['active'] == 0
+
+    @pytest.mark.asyncio
+    async def test_unknown_clusters_share_one_limit(self):
+        """Test that cluster names that are not registered do not get their own limiters."""
+        controller = AdmissionController(AdmissionConfig(cluster_concurrency=1, queue_size=0))
+
+        async with controller.admit('SearchIndexTool', 'made-up-1'):
+            with pytest.raises(OverloadedError) as exc_info:
+                async with controller.admit('SearchIndexTool', 'made-up-2'):
+                    pass
+            assert exc_info.value.name == '<unknown>'
+            async with controller.admit('SearchIndexTool', 'prod'):
+                pass
+
+        assert sorted(controller.stats()['clusters']) == ['<unknown>', 'prod']
+
+
+class TestConfigureAdmission:
+    """Tests of reading and enabling the admission control config."""
+
+    def teardown_method(self):
+        """Disable admission control."""
+        admission._admission_controller = None
+
+    def test_load_admission_config(self, tmp_path):
+        """Test reading the admission_control section of the config file."""
+        config_file = tmp_path / 'config.yml'
+        config_file.write_text(
+            'admission_control:\n'
+            '  cluster_concurrency: 4\n'
+            '  queue_timeout: 0.5\n'
+            '  tools:\n'
+            '    GetNodesHotThreadsTool: 1\n'
+        )
+
+        config = load_admission_config(str(config_file))
+
+        assert config.cluster_concurrency == 4
+        assert config.tool_concurrency == 0
+        assert config.queue_size == 32
+        assert config.queue_timeout == 0.5
+        assert config.tools == {'GetNodesHotThreadsTool': 1}
+
+    @pytest.mark.parametrize(
+        'section',
+        [
+            '  queue_size: -1\n  clusters:\n    production: many\n',
+            '  - cluster_concurrency\n',
+        ],
+    )
+    def test_invalid_section_is_reported(self, tmp_path, caplog, section):
+        """Test that an invalid section names the bad keys and disables admission control."""
+        config_file = tmp_path / 'config.yml'
+        config_file.write_text('admission_control:\n' + section)
+
+        configure_admission(str(config_file))
+
+        assert get_admission_controller() is None
+        assert 'Invalid admission_control config' in caplog.text
+        if 'queue_size' in section:
+            assert 'queue_size: Input should be greater than or equal to 0' in caplog.text
+            assert 'clusters.production:' in caplog.text
+
+    @pytest.mark.asyncio
+    async def test_disabled_without_section(self, tmp_path):
+        """Test that no limits apply without an admission_control section."""
+        config_file = tmp_path / 'config.yml'
+        config_file.write_text('tools:\n  ListIndexTool:\n    display_name: list\n')
+
+        configure_admission(str(config_file))
+
+        assert get_admission_controller() is None
+        async with admit('ListIndexTool', 'any'):
+            pass
@@ -0,0 +1,148 @@
+# Copyright OpenSearch Contributors
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from mcp.types import CallToolRequest, CallToolRequestParams
+from mcp_server_opensearch.call_cost import COST_META_KEY, CallCost
+from mcp_server_opensearch.clusters_information import ClusterInfo, cluster_registry
+from mcp_server_opensearch.global_state import set_mode
+
+
+ROOT_RESPONSE = json.dumps({'version': {'number': '2.19.0'}})
+SEARCH_RESPONSE = json.dumps({'took': 7, 'hits': {'total': {'value': 0}, 'hits': []}})
+
+
+@pytest.fixture(autouse=True)
+def clean_clusters():
+    """Reset the clusters after each test."""
+    yield
+    cluster_registry.clear()
+    set_mode('single')
+
+
+@pytest_asyncio.fixture
+async def opensearch():
+    """Fake OpenSearch cluster registered as the 'local' cluster."""
+
+    async def root(request: web.Request) -> web.Response:
+        return web.Response(text=ROOT_RESPONSE, content_type='application/json')
+
+    async def search(request: web.Request) -> web.Response:
+        return web.Response(text=SEARCH_RESPONSE, content_type='application/json')
+
+    app = web.Application()
+    app.router.add_get('/', root)
+    app.router.add_post('/logs-1/_search', search)
+    app.router.add_get('/logs-1/_search', search)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    set_mode('multi')
+    cluster_registry['local'] = ClusterInfo(
+        opensearch_url=f'http://127.0.0.1:{port}', opensearch_no_auth=True
+    )
+    yield
+    await runner.cleanup()
+
+
+async def call(tool: str, arguments: dict):
+    """Call a tool through the call_tool handler of the streaming server."""
+    from mcp_server_opensearch.streaming_server import build_mcp_server
+    from tools.tools import TOOL_REGISTRY
+
+    server = build_mcp_server({tool: TOOL_REGISTRY[tool]})
+    request = CallToolRequest(
+        method='tools/call', params=CallToolRequestParams(name=tool, arguments=arguments)
+    )
+    return (await server.request_handlers[CallToolRequest](request)).root
+
+
+class TestCallCost:
+    """Tests of CallCost."""
+
+    def test_to_meta(self):
+        """Test the summary of the cache lookups and clusters."""
+        cost = CallCost()
+        meta = cost.to_meta(1.234)
+        assert meta['wall_time_ms'] == 1.2
+        assert meta['took_ms'] is None
+        assert meta['cache'] is None
+        assert meta['cluster'] is None
+
+        cost.add_cluster('a')
+        cost.add_cluster('a')
+        cost.add_took(3)
+        cost.add_took(None)
+        cost.add_took(4)
+        cost.add_cache_lookup(True)
+        meta = cost.to_meta(0)
+        assert meta['took_ms'] == 7
+        assert meta['cache'] == 'hit'
+        assert meta['cluster'] == 'a'
+
+        cost.add_cluster('b')
+        cost.add_cache_lookup(False)
+        meta = cost.to_meta(0)
+        assert meta['cache'] == 'miss'
+        assert (meta['cache_hits'], meta['cache_misses']) == (1, 1)
+        assert meta['cluster'] == ['a', 'b']
+
+
+class TestCostMeta:
+    """Tests of the cost reported in the _meta of tool results."""
+
+    @pytest.mark.asyncio
+    async def test_built_in_tool(self, opensearch):
+        """Test the cost of a built-in tool call."""
+        result = await call(
+            'SearchIndexTool',
+            {
+                'opensearch_cluster_name': 'local',
+                'index': 'logs-1',
+                'query': {'query': {'match_all': {}}},
+            },
+        )
+
+        assert not result.isError
+        cost = result.meta[COST_META_KEY]
+        # The version lookup of the tool and the search
+        assert cost['http_requests'] == 2
+        assert cost['took_ms'] == 7
+        assert cost['bytes_sent'] > 0
+        assert cost['bytes_received'] == len(ROOT_RESPONSE) + len(SEARCH_RESPONSE)
+        assert cost['cache'] is None
+        assert cost['cluster'] == 'local'
+        assert cost['wall_time_ms'] > 0
+        assert result.model_dump(by_alias=True)['_meta'][COST_META_KEY] == cost
+
+    @pytest.mark.asyncio
+    async def test_generic_api_tool_raw(self, opensearch):
+        """Test the cost of an unparsed response of GenericOpenSearchApiTool."""
+        result = await call(
+            'GenericOpenSearchApiTool',
+            {'opensearch_cluster_name': 'local', 'path': '/logs-1/_search', 'raw': True},
+        )
+
+        assert not result.isError
+        cost = result.meta[COST_META_KEY]
+        assert cost['http_requests'] == 1
+        assert cost['took_ms'] == 7
+        assert cost['bytes_sent'] == 0
+        assert cost['bytes_received'] == len(SEARCH_RESPONSE)
+        assert cost['cluster'] == 'local'
+
+    @pytest.mark.asyncio
+    async def test_error_result(self):
+        """Test that results of failed calls carry the cost too."""
+        result = await call('SearchIndexTool', {'index': 'logs-1'})
+
+        assert result.isError
+        cost = result.meta[COST_META_KEY]
+        assert cost['http_requests'] == 0
+        assert cost['cluster'] is None
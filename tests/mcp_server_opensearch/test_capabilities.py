@@ -0,0 +1,228 @@
+# Copyright OpenSearch Contributors
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import pytest
+import pytest_asyncio
+import time
+from aiohttp import web
+from mcp_server_opensearch import capabilities
+from mcp_server_opensearch.capabilities import (
+    CapabilityMatrix,
+    compatible_tools,
+    configure_capabilities,
+    get_cached_plugins,
+    get_cluster_capabilities,
+)
+from mcp_server_opensearch.clusters_information import ClusterInfo, cluster_registry
+from mcp_server_opensearch.global_state import set_mode
+from semver import Version
+from unittest.mock import patch
+
+
+async def start_cluster(version: str, plugins: list):
+    """Start a fake cluster that answers the version and plugin lookups."""
+
+    async def info(request: web.Request) -> web.Response:
+        return web.json_response({'version': {'number': version}})
+
+    async def cat_plugins(request: web.Request) -> web.Response:
+        return web.json_response(
+            [{'name': f'node-{i}', 'component': plugin} for i in (1, 2) for plugin in plugins]
+        )
+
+    app = web.Application()
+    app.router.add_get('/', info)
+    app.router.add_get('/_cat/plugins', cat_plugins)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    return runner, f'http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}'
+
+
+@pytest_asyncio.fixture
+async def clusters():
+    """Register an old and a new cluster, an unreachable one and a header auth one."""
+    set_mode('multi')
+    runners = []
+    for name, version, plugins in (
+        ('old', '1.3.0', []),
+        ('new', '2.19.0', ['query-insights', 'opensearch-ml']),
+    ):
+        runner, url = await start_cluster(version, plugins)
+        runners.append(runner)
+        cluster_registry[name] = ClusterInfo(opensearch_url=url, opensearch_no_auth=True)
+    cluster_registry['down'] = ClusterInfo(
+        opensearch_url='http://127.0.0.1:1', opensearch_no_auth=True, timeout=1
+    )
+    cluster_registry['headers'] = ClusterInfo(
+        opensearch_url='http://headers:9200', opensearch_header_auth=True
+    )
+    yield
+    cluster_registry.clear()
+    capabilities._capability_matrix = None
+    capabilities._installed_plugins.clear()
+    set_mode('single')
+    for runner in runners:
+        await runner.cleanup()
+
+
+class TestCapabilityMatrix:
+    """Tests of CapabilityMatrix."""
+
+    @pytest.mark.asyncio
+    async def test_refresh(self, clusters):
+        """Test that every reachable cluster gets its version, plugins and tools."""
+        matrix = CapabilityMatrix(interval=60, timeout=2)
+        await matrix.refresh()
+
+        assert sorted(matrix.clusters) == ['down', 'new', 'old']
+        new = matrix.get('new')
+        assert new.version == Version.parse('2.19.0')
+        assert new.plugins == ['opensearch-ml', 'query-insights']
+        assert 'GetQueryInsightsTool' in new.compatible_tools
+        assert 'GetQueryInsightsTool' not in matrix.get('old').compatible_tools
+        assert 'ListIndexTool' in matrix.get('old').compatible_tools
+        assert matrix.clusters['down'].error
+        assert matrix.get('down') is None
+        assert matrix.get('headers') is None
+        listing = matrix.listing()
+        assert listing['refreshes'] == 1
+        assert listing['clusters']['new']['version'] == '2.19.0'
+
+    @pytest.mark.asyncio
+    async def test_stale_and_removed_entries(self, clusters):
+        """Test that old entries are not used and removed clusters are dropped."""
+        matrix = CapabilityMatrix(interval=60, timeout=2)
+        await matrix.refresh(['old'])
+        matrix.clusters['old'].checked_at = time.time() - 121
+
+        assert matrix.get('old') is None
+        del cluster_registry['old']
+        await matrix.refresh()
+        assert 'old' not in matrix.clusters
+        matrix.forget(['new'])
+        assert 'new' not in matrix.clusters
+
+    @pytest.mark.asyncio
+    async def test_version_lookup_uses_matrix(self, clusters):
+        """Test that tool calls take the version from the matrix without a request."""
+        from opensearch.helper import get_opensearch_version
+        from tools.tool_params import baseToolArgs
+
+        matrix = configure_capabilities(interval=60, timeout=2)
+        await matrix.refresh(['new'])
+
+        with patch('opensearch.client.get_opensearch_client') as get_client:
+            version = await get_opensearch_version(baseToolArgs(opensearch_cluster_name='new'))
+
+        assert version == Version.parse('2.19.0')
+        get_client.assert_not_called()
+        assert get_cluster_capabilities('old') is None
+
+    def test_disabled(self):
+        """Test that an interval of 0 disables the matrix."""
+        assert configure_capabilities(interval=0) is None
+        assert get_cluster_capabilities('any') is None
+
+
+class TestPlugins:
+    """Tests of the plugin lookups and plugin requirements of tools."""
+
+    def test_compatible_tools_need_plugins(self):
+        """Test that tools whose plugin is not installed are not compatible."""
+        tools = compatible_tools(Version.parse('3.3.0'), ['query-insights'])
+
+        assert 'GetQueryInsightsTool' in tools
+        assert 'DataDistributionTool' not in tools
+        assert 'DataDistributionTool' in compatible_tools(Version.parse('3.3.0'))
+
+    @pytest.mark.asyncio
+    async def test_plugins_from_matrix_and_cache(self, clusters):
+        """Test that plugins are reused from the matrix, or looked up once per cluster."""
+        from opensearch.helper import get_installed_plugins
+        from tools.tool_params import baseToolArgs
+
+        matrix = configure_capabilities(interval=60, timeout=2)
+        await matrix.refresh(['new'])
+        with patch('opensearch.client.get_opensearch_client') as get_client:
+            plugins = await get_installed_plugins(baseToolArgs(opensearch_cluster_name='new'))
+        get_client.assert_not_called()
+        assert plugins == ['opensearch-ml', 'query-insights']
+
+        assert await get_installed_plugins(baseToolArgs(opensearch_cluster_name='old')) == []
+        assert get_cached_plugins('old') == []
+        capabilities._installed_plugins['old'] = (time.time() - 301, [])
+        assert get_cached_plugins('old') is None
+        capabilities.forget_plugins(['old'])
+        assert 'old' not in capabilities._installed_plugins
+
+    @pytest.mark.asyncio
+    async def test_unreachable_plugins_are_not_cached(self, clusters):
+        """Test that a failed lookup leaves the plugins unknown."""
+        from opensearch.helper import get_installed_plugins
+        from tools.tool_params import baseToolArgs
+
+        assert await get_installed_plugins(baseToolArgs(opensearch_cluster_name='down')) is None
+        assert get_cached_plugins('down') is None
+
+    @pytest.mark.asyncio
+    async def test_concurrent_plugin_lookups_are_shared(self, monkeypatch):
+        """Test that concurrent calls for a cluster wait for one plugin lookup."""
+        from contextlib import asynccontextmanager
+        from opensearch.helper import get_installed_plugins
+        from tools.tool_params import baseToolArgs
+        from unittest.mock import Mock
+
+        client = Mock()
+        requests = 0
+
+        async def cat_plugins(format):
+            nonlocal requests
+            requests += 1
+            await asyncio.sleep(0.05)
+            return [{'component': 'opensearch-ml'}]
+
+        client.cat.plugins = cat_plugins
+
+        @asynccontextmanager
+        async def get_client(args):
+            yield client
+
+        monkeypatch.setattr('opensearch.client.get_opensearch_client', get_client)
+        args = baseToolArgs(opensearch_cluster_name='x')
+        try:
+            first = asyncio.ensure_future(get_installed_plugins(args))
+            await asyncio.sleep(0)
+            # A caller that gives up does not stop the lookup of the others
+            first.cancel()
+            results = await asyncio.gather(*(get_installed_plugins(args) for _ in range(5)))
+        finally:
+            capabilities._installed_plugins.clear()
+
+        assert results == [['opensearch-ml']] * 5
+        assert requests == 1
+
+    @pytest.mark.asyncio
+    async def test_unexpected_plugin_rows(self, monkeypatch):
+        """Test that rows without a component are skipped and odd responses leave plugins unknown."""
+        from contextlib import asynccontextmanager
+        from opensearch.helper import get_installed_plugins
+        from tools.tool_params import baseToolArgs
+        from unittest.mock import AsyncMock, Mock
+
+        client = Mock()
+
+        @asynccontextmanager
+        async def get_client(args):
+            yield client
+
+        monkeypatch.setattr('opensearch.client.get_opensearch_client', get_client)
+        try:
+            client.cat.plugins = AsyncMock(return_value=[{'name': 'node-1'}, {'component': 'a'}])
+            assert await get_installed_plugins(baseToolArgs(opensearch_cluster_name='x')) == ['a']
+            client.cat.plugins = AsyncMock(return_value=['not a row'])
+            assert await get_installed_plugins(baseToolArgs(opensearch_cluster_name='y')) is None
+        finally:
+            capabilities._installed_plugins.clear()
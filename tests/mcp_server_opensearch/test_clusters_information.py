@@ -7,9 +7,12 @@ from unittest.mock import patch, MagicMock, AsyncMock
 from mcp_server_opensearch.clusters_information import (
     ClusterInfo,
     add_cluster,
+    diff_clusters,
     get_cluster,
     load_clusters_from_yaml,
     cluster_registry,
+    read_clusters_from_yaml,
+    replace_clusters,
 )
 
 
@@ -285,3 +288,55 @@ clusters:
         """Test loading from None path."""
         await load_clusters_from_yaml(None)
         assert len(cluster_registry) == 0
+
+
+class TestReplaceClusters:
+    """Test cases for the replace_clusters function."""
+
+    def setup_method(self):
+        """Clear the cluster registry before each test."""
+        cluster_registry.clear()
+
+    def test_diff_clusters(self):
+        """Test that clusters are compared by name and settings."""
+        old = {
+            'a': ClusterInfo(opensearch_url='https://a:9200'),
+            'b': ClusterInfo(opensearch_url='https://b:9200'),
+            'c': ClusterInfo(opensearch_url='https://c:9200'),
+        }
+        new = {
+            'a': ClusterInfo(opensearch_url='https://a:9200'),
+            'b': ClusterInfo(opensearch_url='https://b:9200', timeout=60),
+            'd': ClusterInfo(opensearch_url='https://d:9200'),
+        }
+
+        changes = diff_clusters(old, new)
+
+        assert (changes.added, changes.removed, changes.changed) == (['d'], ['c'], ['b'])
+        assert changes.affected == ['c', 'b']
+        assert not diff_clusters(old, dict(old))
+        # Groups do not change how the cluster is connected to
+        regrouped = {'a': ClusterInfo(opensearch_url='https://a:9200', groups=['prod'])}
+        assert not diff_clusters({'a': old['a']}, regrouped)
+
+    def test_replace_clusters_in_place(self):
+        """Test that the registry object is kept and its content replaced."""
+        registry = cluster_registry
+        add_cluster('old', ClusterInfo(opensearch_url='https://old:9200'))
+
+        changes = replace_clusters({'new': ClusterInfo(opensearch_url='https://new:9200')})
+
+        assert cluster_registry is registry
+        assert list(cluster_registry) == ['new']
+        assert (changes.added, changes.removed) == (['new'], ['old'])
+
+    def test_read_clusters_from_yaml_is_strict(self, tmp_path):
+        """Test that reading rejects the file when one cluster is invalid."""
+        path = tmp_path / 'config.yml'
+        path.write_text(
+            'clusters:\n  good:\n    opensearch_url: "https://good:9200"\n  bad:\n    timeout: 5\n'
+        )
+
+        with pytest.raises(ValueError, match='Missing opensearch_url for cluster: bad'):
+            read_clusters_from_yaml(str(path))
+        assert len(cluster_registry) == 0
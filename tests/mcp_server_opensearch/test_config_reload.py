@@ -0,0 +1,274 @@
+# Copyright OpenSearch Contributors
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import os
+import pytest
+from mcp_server_opensearch import config_reload, readiness, sessions, warmup
+from mcp_server_opensearch.clusters_information import ClusterInfo, cluster_registry
+from mcp_server_opensearch.config_reload import (
+    ConfigReloader,
+    ReloadableServer,
+    configure_config_reload,
+)
+from mcp_server_opensearch.global_state import set_mode
+from mcp_server_opensearch.sessions import configure_sessions
+from mcp_server_opensearch.warmup import READY, ClusterReadiness
+from unittest.mock import AsyncMock
+
+
+CLUSTERS = """
+clusters:
+  logs:
+    opensearch_url: "http://logs:9200"
+  metrics:
+    opensearch_url: "http://metrics:9200"
+"""
+
+
+@pytest.fixture(autouse=True)
+def clean_state():
+    """Reset the global state the reloader changes."""
+    set_mode('multi')
+    yield
+    cluster_registry.clear()
+    warmup.cluster_readiness.clear()
+    sessions._session_registry = None
+    readiness._readiness_prober = None
+    config_reload._config_reloader = None
+    set_mode('single')
+
+
+def write_config(path, content: str) -> None:
+    """Write the configuration file so its change is detected."""
+    path.write_text(content)
+    # Make sure the change is seen even within the mtime resolution
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    """Create a configuration file with two clusters."""
+    path = tmp_path / 'config.yml'
+    write_config(path, CLUSTERS)
+    return path
+
+
+class TestReload:
+    """Tests of ConfigReloader.reload."""
+
+    @pytest.mark.asyncio
+    async def test_cluster_changes(self, config_file):
+        """Test that only the clients and state of changed clusters are released."""
+        reloader = ConfigReloader(str(config_file), mode='multi', drain_timeout=0)
+        await reloader.reload()
+        registry_object = cluster_registry
+        registry = configure_sessions(stateless=False)
+        session = registry.get_or_create('session-1')
+        logs_client, metrics_client = AsyncMock(), AsyncMock()
+        session.clients[('logs', ())] = logs_client
+        session.clients[('metrics', ())] = metrics_client
+        warmup.cluster_readiness['logs'] = ClusterReadiness('logs', READY)
+        warmup.cluster_readiness['metrics'] = ClusterReadiness('metrics', READY)
+
+        write_config(
+            config_file,
+            'clusters:\n'
+            '  logs:\n    opensearch_url: "http://logs-new:9200"\n'
+            '  metrics:\n    opensearch_url: "http://metrics:9200"\n'
+            '  traces:\n    opensearch_url: "http://traces:9200"\n',
+        )
+        result = await reloader.reload()
+
+        assert result.ok
+        assert result.clusters.added == ['traces']
+        assert result.clusters.changed == ['logs']
+        assert result.clusters.removed == []
+        assert cluster_registry is registry_object
+        assert cluster_registry['logs'] == ClusterInfo(opensearch_url='http://logs-new:9200')
+        assert list(session.clients) == [('metrics', ())]
+        assert list(warmup.cluster_readiness) == ['metrics']
+        await reloader.stop()
+        logs_client.close.assert_awaited_once()
+        metrics_client.close.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_draining_clients_are_closed_later(self, config_file):
+        """Test that unpinned clients stay open for the drain timeout."""
+        reloader = ConfigReloader(str(config_file), mode='multi', drain_timeout=0.05)
+        await reloader.reload()
+        registry = configure_sessions(stateless=False)
+        client = AsyncMock()
+        registry.get_or_create('session-1').clients[('metrics', ())] = client
+
+        write_config(config_file, 'clusters:\n  logs:\n    opensearch_url: "http://logs:9200"\n')
+        result = await reloader.reload()
+
+        assert result.clusters.removed == ['metrics']
+        client.close.assert_not_awaited()
+        await asyncio.sleep(0.1)
+        client.close.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        'content',
+        [
+            'clusters: [unclosed',
+            'clusters:\n  logs:\n    opensearch_username: "admin"\n',
+        ],
+    )
+    async def test_failed_reload_keeps_config(self, config_file, content):
+        """Test that an unreadable file or an invalid cluster leaves everything as it was."""
+        reloader = ConfigReloader(str(config_file), mode='multi')
+        await reloader.reload()
+        enabled_tools = {'ListIndexTool': {'description': 'List indices'}}
+        reloader.track_tools(enabled_tools)
+
+        write_config(config_file, content)
+        result = await reloader.reload()
+
+        assert not result.ok
+        assert result.error
+        assert sorted(cluster_registry) == ['logs', 'metrics']
+        assert enabled_tools == {'ListIndexTool': {'description': 'List indices'}}
+        assert reloader.failures == 1
+
+    @pytest.mark.asyncio
+    async def test_tools_replaced_in_place(self, config_file, monkeypatch):
+        """Test that the enabled tools dict is updated with the new tool config."""
+        from tools.tools import TOOL_REGISTRY
+
+        # The tool config also updates the default registry
+        monkeypatch.setitem(TOOL_REGISTRY, 'ListIndexTool', TOOL_REGISTRY['ListIndexTool'])
+        reloader = ConfigReloader(str(config_file), mode='multi')
+        enabled_tools = {'ListIndexTool': TOOL_REGISTRY['ListIndexTool']}
+        reloader.track_tools(enabled_tools)
+
+        write_config(
+            config_file, CLUSTERS + 'tools:\n  ListIndexTool:\n    display_name: list_indices\n'
+        )
+        result = await reloader.reload()
+
+        assert result.ok and result.tools_changed
+        assert enabled_tools['ListIndexTool']['display_name'] == 'list_indices'
+        assert 'SearchIndexTool' in enabled_tools
+
+    @pytest.mark.asyncio
+    async def test_sessions_notified_of_changed_tools(self, config_file, monkeypatch):
+        """Test that the sessions that listed the tools are told when they change."""
+        from tools.tools import TOOL_REGISTRY
+
+        monkeypatch.setitem(TOOL_REGISTRY, 'ListIndexTool', TOOL_REGISTRY['ListIndexTool'])
+        reloader = ConfigReloader(str(config_file), mode='multi')
+        reloader.track_tools({'ListIndexTool': TOOL_REGISTRY['ListIndexTool']})
+        session, gone = AsyncMock(), AsyncMock()
+        gone.send_tool_list_changed.side_effect = RuntimeError('closed')
+        reloader.track_session(session)
+        reloader.track_session(gone)
+
+        write_config(
+            config_file, CLUSTERS + 'tools:\n  ListIndexTool:\n    display_name: list_indices\n'
+        )
+        await reloader.reload()
+        await asyncio.gather(*reloader._tasks)
+        # An unchanged reload sends nothing
+        write_config(
+            config_file, CLUSTERS + 'tools:\n  ListIndexTool:\n    display_name: list_indices\n'
+        )
+        result = await reloader.reload()
+        await asyncio.gather(*reloader._tasks)
+
+        assert not result.tools_changed
+        session.send_tool_list_changed.assert_awaited_once()
+        gone.send_tool_list_changed.assert_awaited_once()
+        assert list(reloader._sessions) == [session]
+
+    @pytest.mark.asyncio
+    async def test_single_mode_without_version_fails(self, config_file, monkeypatch):
+        """Test that single mode keeps its tools when the version cannot be looked up."""
+        set_mode('single')
+        monkeypatch.setattr(
+            'opensearch.helper.get_opensearch_version', AsyncMock(return_value=None)
+        )
+        reloader = ConfigReloader(str(config_file), mode='single')
+        enabled_tools = {'ListIndexTool': {'description': 'List indices'}}
+        reloader.track_tools(enabled_tools)
+
+        result = await reloader.reload()
+
+        assert not result.ok
+        assert 'version' in result.error
+        assert list(enabled_tools) == ['ListIndexTool']
+        assert not cluster_registry
+
+
+class TestTriggers:
+    """Tests of what starts a reload and how reloading is configured."""
+
+    @pytest.mark.asyncio
+    async def test_reload_if_changed(self, config_file):
+        """Test that the file is only reloaded when it changed since the last load."""
+        reloader = ConfigReloader(str(config_file), mode='multi')
+
+        assert await reloader.reload_if_changed() is None
+        write_config(config_file, 'clusters:\n  logs:\n    opensearch_url: "http://logs:9200"\n')
+        assert (await reloader.reload_if_changed()).clusters.added == ['logs']
+        assert await reloader.reload_if_changed() is None
+
+    @pytest.mark.asyncio
+    async def test_watch(self, config_file):
+        """Test that the watcher reloads a changed file."""
+        reloader = configure_config_reload(str(config_file), mode='multi', watch_interval=0.01)
+        await reloader.start()
+        try:
+            write_config(config_file, CLUSTERS)
+            for _ in range(100):
+                if cluster_registry:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            await reloader.stop()
+
+        assert sorted(cluster_registry) == ['logs', 'metrics']
+        assert reloader.reloads == 1
+
+    @pytest.mark.asyncio
+    async def test_sighup(self, config_file):
+        """Test that SIGHUP reloads the file."""
+        import signal
+
+        if not hasattr(signal, 'SIGHUP'):
+            pytest.skip('SIGHUP is not available on this platform')
+        reloader = ConfigReloader(str(config_file), mode='multi')
+        await reloader.start()
+        try:
+            os.kill(os.getpid(), signal.SIGHUP)
+            for _ in range(100):
+                if cluster_registry:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            await reloader.stop()
+
+        assert sorted(cluster_registry) == ['logs', 'metrics']
+
+    def test_tools_changed_capability(self, config_file):
+        """Test that the tools.listChanged capability is only set while reloading."""
+        server = ReloadableServer('test-server')
+
+        @server.list_tools()
+        async def list_tools():
+            return []
+
+        options = server.create_initialization_options()
+        assert not options.capabilities.tools.listChanged
+
+        configure_config_reload(str(config_file), mode='multi')
+        options = server.create_initialization_options()
+        assert options.capabilities.tools.listChanged
+
+    def test_configure_without_config_file(self):
+        """Test that reloading is disabled without a configuration file."""
+        assert configure_config_reload('') is None
+        assert config_reload.get_config_reloader() is None
@@ -0,0 +1,218 @@
+# Copyright OpenSearch Contributors
+# SPDX-License-Identifier: Apache-2.0
+
+import pytest
+import time
+from mcp.types import JSONRPCMessage, JSONRPCNotification, JSONRPCResponse
+from mcp_server_opensearch import event_store as event_store_module
+from mcp_server_opensearch.event_store import (
+    MemoryEventStore,
+    ResumableSessionManager,
+    SQLiteEventStore,
+    create_event_store,
+)
+from unittest.mock import Mock
+
+
+def _response(request_id: int, text: str) -> JSONRPCMessage:
+    return JSONRPCMessage(
+        JSONRPCResponse(jsonrpc='2.0', id=request_id, result={'content': [{'text': text}]})
+    )
+
+
+def _progress(progress: int) -> JSONRPCMessage:
+    return JSONRPCMessage(
+        JSONRPCNotification(
+            jsonrpc='2.0', method='notifications/progress', params={'progress': progress}
+        )
+    )
+
+
+async def _replay(session_store, last_event_id):
+    replayed = []
+
+    async def send(event_message):
+        replayed.append((event_message.event_id, event_message.message))
+
+    stream_id = await session_store.replay_events_after(last_event_id, send)
+    return stream_id, replayed
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def make_store(request):
+    """Create event stores of each type, closing the SQLite ones afterwards."""
+    stores = []
+
+    def make(**limits):
+        store = create_event_store(request.param, **limits)
+        stores.append(store)
+        return store
+
+    yield make
+    for store in stores:
+        if isinstance(store, SQLiteEventStore):
+            store._conn.close()
+
+
+class TestEventStore:
+    """Tests that apply to every event store."""
+
+    @pytest.mark.asyncio
+    async def test_replay_after_event(self, make_store):
+        """Test that the events of a stream after the last received one are replayed."""
+        store = make_store()
+        session = store.for_session()
+        first = await session.store_event('1', _progress(1))
+        await session.store_event('2', _progress(1))
+        second = await session.store_event('1', _progress(2))
+        third = await session.store_event('1', _response(1, 'done'))
+
+        stream_id, replayed = await _replay(session, first)
+
+        assert stream_id == '1'
+        assert [event_id for event_id, _ in replayed] == [second, third]
+        assert replayed[1][1] == _response(1, 'done')
+        assert store.stats()['replayed'] == 2
+
+    @pytest.mark.asyncio
+    async def test_sessions_are_isolated(self, make_store):
+        """Test that a session cannot replay the events of another session."""
+        store = make_store()
+        session, other = store.for_session(), store.for_session()
+        first = await session.store_event('1', _progress(1))
+        await other.store_event('1', _response(1, 'secret'))
+        await session.store_event('1', _response(1, 'mine'))
+
+        _, replayed = await _replay(session, first)
+
+        assert [message for _, message in replayed] == [_response(1, 'mine')]
+        assert await _replay(other, first) == (None, [])
+        assert await _replay(session, 'not-an-id') == (None, [])
+
+        await session.discard()
+        assert store.size()[0] == 1
+        assert await _replay(session, first) == (None, [])
+
+    @pytest.mark.asyncio
+    async def test_event_and_byte_limits(self, make_store):
+        """Test that the oldest events are dropped when the limits are exceeded."""
+        message_size = len(
+            _response(1, 'x' * 100).model_dump_json(by_alias=True, exclude_none=True)
+        )
+        store = make_store(max_events=3, max_bytes=0)
+        session = store.for_session()
+        ids = [await session.store_event('1', _response(1, 'x' * 100)) for _ in range(5)]
+
+        assert store.size() == (3, 3 * message_size)
+        assert await _replay(session, ids[0]) == (None, [])
+        assert len((await _replay(session, ids[2]))[1]) == 2
+
+        store = make_store(max_events=0, max_bytes=2 * message_size)
+        session = store.for_session()
+        for _ in range(5):
+            await session.store_event('1', _response(1, 'x' * 100))
+
+        stats = store.stats()
+        assert (stats['events'], stats['bytes']) == (2, 2 * message_size)
+        assert (stats['stored'], stats['evicted']) == (5, 3)
+
+    @pytest.mark.asyncio
+    async def test_age_limit(self, make_store, monkeypatch):
+        """Test that events older than max_age are dropped."""
+        store = make_store(max_age=60)
+        session = store.for_session()
+        first = await session.store_event('1', _progress(1))
+        await session.store_event('1', _progress(2))
+
+        monotonic, wall = time.monotonic(), time.time()
+        monkeypatch.setattr(event_store_module.time, 'monotonic', lambda: monotonic + 61)
+        monkeypatch.setattr(event_store_module.time, 'time', lambda: wall + 61)
+
+        assert await _replay(session, first) == (None, [])
+        assert store.size() == (0, 0)
+
+
+class TestMemoryEventStore:
+    """Tests of MemoryEventStore."""
+
+    @pytest.mark.asyncio
+    async def test_oversized_event_is_not_kept(self):
+        """Test that an event larger than max_bytes is not stored."""
+        store = MemoryEventStore(max_bytes=10)
+        session = store.for_session()
+
+        event_id = await session.store_event('1', _response(1, 'x' * 100))
+
+        assert event_id
+        assert store.size() == (0, 0)
+        assert store.evicted == 1
+
+
+class TestSQLiteEventStore:
+    """Tests of SQLiteEventStore."""
+
+    @pytest.mark.asyncio
+    async def test_foreign_database_is_not_overwritten(self, tmp_path):
+        """Test that a database with other tables is refused and our own one is reused."""
+        import sqlite3
+
+        foreign = tmp_path / 'foreign.db'
+        with sqlite3.connect(foreign) as conn:
+            conn.execute('CREATE TABLE events (id INTEGER)')
+        with pytest.raises(ValueError):
+            SQLiteEventStore(str(foreign))
+        with sqlite3.connect(foreign) as conn:
+            assert conn.execute('SELECT COUNT(*) FROM events').fetchone() == (0,)
+
+        path = str(tmp_path / 'events.db')
+        store = SQLiteEventStore(path)
+        await store.for_session().store_event('1', _progress(1))
+        await store.close()
+        store = SQLiteEventStore(path)
+        assert store.size() == (0, 0)
+        await store.close()
+
+    @pytest.mark.asyncio
+    async def test_age_is_checked_once_per_interval(self, monkeypatch):
+        """Test that appends do not look for expired events more than once per interval."""
+        store = SQLiteEventStore(':memory:', max_age=60)
+        conditions = []
+        delete_oldest = store._delete_oldest
+
+        def record(condition, value):
+            conditions.append(condition)
+            delete_oldest(condition, value)
+
+        monkeypatch.setattr(store, '_delete_oldest', record)
+        session = store.for_session()
+        for progress in range(10):
+            await session.store_event('1', _progress(progress))
+        assert conditions == []
+
+        monotonic = time.monotonic()
+        monkeypatch.setattr(event_store_module.time, 'monotonic', lambda: monotonic + 2)
+        await session.store_event('1', _progress(10))
+        await session.store_event('1', _progress(11))
+        assert conditions == ['created < ?']
+        await store.close()
+
+
+def test_session_manager_gives_each_session_a_view():
+    """Test that every transport created by the session manager gets its own view."""
+    store = MemoryEventStore()
+    manager = ResumableSessionManager(app=Mock(), event_store=store)
+
+    first, second = manager.event_store, manager.event_store
+
+    assert manager.shared_event_store is store
+    assert first.store is store and second.store is store
+    assert first.namespace != second.namespace
+    assert ResumableSessionManager(app=Mock(), event_store=None).event_store is None
+
+
+def test_create_event_store():
+    """Test that the configured store type is created."""
+    assert create_event_store('none') is None
+    assert isinstance(create_event_store('memory', max_events=5), MemoryEventStore)
+    with pytest.raises(ValueError):
+        create_event_store('redis')
@@ -0,0 +1,249 @@
+# Copyright OpenSearch Contributors
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import json
+import pytest
+import random
+from contextlib import AsyncExitStack
+from mcp.types import CallToolResult, TextContent
+from mcp_server_opensearch import loadgen
+from mcp_server_opensearch.admission import OverloadedError
+from mcp_server_opensearch.loadgen import (
+    ERROR_TIMEOUT,
+    ERROR_TOOL,
+    CallSpec,
+    LatencyHistogram,
+    Scenario,
+    Stage,
+    StageResult,
+    classify_result,
+    close_sessions,
+    format_report,
+    load_scenario,
+    parse_scenario,
+    run_stage,
+    saturation_reason,
+)
+
+
+CALLS = [{'tool': 'SearchIndexTool', 'weight': 3, 'arguments': {'index': 'logs'}}]
+
+
+class FakeSession:
+    """MCP session whose tool calls take a fixed time, optionally failing."""
+
+    def __init__(self, latency: float = 0.0, result: CallToolResult = None):
+        """Initialize the session with the latency and result of every call."""
+        self.latency = latency
+        self.result = result or CallToolResult(content=[TextContent(type='text', text='ok')])
+        self.calls = []
+
+    async def call_tool(self, name, arguments):
+        """Record the call and return the result after the latency."""
+        self.calls.append(name)
+        await asyncio.sleep(self.latency)
+        return self.result
+
+
+class TestParseScenario:
+    """Tests of parse_scenario."""
+
+    def test_stages(self):
+        """Test a scenario with explicit stages."""
+        scenario = parse_scenario(
+            {
+                'calls': CALLS + [{'tool': 'ListIndexTool'}],
+                'stages': [{'rate': 5, 'duration': 10}, {'rate': 20, 'duration': 5}],
+                'timeout': 2,
+            }
+        )
+
+        assert scenario.calls == [
+            CallSpec('SearchIndexTool', {'index': 'logs'}, 3.0),
+            CallSpec('ListIndexTool', {}, 1.0),
+        ]
+        assert scenario.stages == [Stage(5, 10), Stage(20, 5)]
+        assert scenario.timeout == 2
+
+    def test_ramp(self):
+        """Test that a ramp expands to one stage per rate, stop included."""
+        scenario = parse_scenario(
+            {'calls': CALLS, 'ramp': {'start': 10, 'stop': 40, 'step': 10, 'duration': 30}}
+        )
+
+        assert [stage.rate for stage in scenario.stages] == [10, 20, 30, 40]
+        assert all(stage.duration == 30 for stage in scenario.stages)
+
+    def test_single_rate(self):
+        """Test a scenario with one rate and duration."""
+        scenario = parse_scenario({'calls': CALLS, 'rate': 50, 'duration': 60})
+
+        assert scenario.stages == [Stage(50, 60)]
+
+    @pytest.mark.parametrize(
+        'data, message',
+        [
+            ([], 'must be a mapping'),
+            ({'rate': 1, 'duration': 1}, 'no calls'),
+            ({'calls': [{'weight': 1}], 'rate': 1, 'duration': 1}, 'needs a tool'),
+            ({'calls': [{'tool': 'A', 'weight': 0}], 'rate': 1, 'duration': 1}, 'weight of A'),
+            ({'calls': CALLS}, 'needs stages'),
+            ({'calls': CALLS, 'rate': 'fast', 'duration': 1}, 'rate must be a number'),
+            ({'calls': CALLS, 'stages': []}, 'no stages'),
+        ],
+    )
+    def test_invalid(self, data, message):
+        """Test that invalid scenarios are rejected with a clear error."""
+        with pytest.raises(ValueError, match=message):
+            parse_scenario(data)
+
+    def test_load_scenario(self, tmp_path):
+        """Test loading a scenario from a YAML file."""
+        path = tmp_path / 'scenario.yml'
+        path.write_text('calls:\n  - tool: ListIndexTool\nrate: 2\nduration: 3\n')
+
+        assert load_scenario(str(path)).stages == [Stage(2, 3)]
+        with pytest.raises(ValueError, match='Could not load'):
+            load_scenario(str(tmp_path / 'missing.yml'))
+
+
+class TestLatencyHistogram:
+    """Tests of LatencyHistogram."""
+
+    def test_percentiles(self):
+        """Test that percentiles are within one bucket of the recorded latencies."""
+        histogram = LatencyHistogram()
+        for ms in range(1, 101):
+            histogram.record(ms / 1000)
+
+        summary = histogram.summary()
+        assert summary['count'] == 100
+        assert 50 <= summary['p50_ms'] <= 55
+        assert 99 <= summary['p99_ms'] <= 100
+        assert summary['max_ms'] == 100
+        assert summary['min_ms'] == 1
+
+    def test_empty(self):
+        """Test that an empty histogram reports zeros."""
+        assert LatencyHistogram().summary()['p99_ms'] == 0.0
+
+    def test_render(self):
+        """Test that every non-empty bucket is rendered with its share."""
+        histogram = LatencyHistogram()
+        histogram.record(0.001)
+        histogram.record(0.001)
+        histogram.record(0.5)
+
+        lines = histogram.render(width=10)
+        assert len(lines) == 2
+        assert lines[0].endswith('#' * 10)
+        assert '66.7%' in lines[0]
+
+
+class TestClassifyResult:
+    """Tests of classify_result."""
+
+    def test_success(self):
+        """Test that results without isError are successes."""
+        assert classify_result(CallToolResult(content=[])) is None
+
+    def test_structured_error(self):
+        """Test that structured errors are reported by their type."""
+        error = OverloadedError('tool', 'SearchIndexTool', 'queue_full', 4, 8, 0.1)
+        result = CallToolResult(content=[TextContent(type='text', text=str(error))], isError=True)
+
+        assert classify_result(result) == 'overloaded'
+
+    def test_other_error(self):
+        """Test that other errors are tool errors."""
+        result = CallToolResult(content=[TextContent(type='text', text='boom')], isError=True)
+
+        assert classify_result(result) == ERROR_TOOL
+
+
+class TestRunStage:
+    """Tests of run_stage."""
+
+    @pytest.mark.asyncio
+    async def test_open_loop(self):
+        """Test that calls start at the target rate even when calls are slow."""
+        session = FakeSession(latency=0.2)
+        scenario = Scenario([CallSpec('SearchIndexTool'), CallSpec('ListIndexTool')], [])
+
+        result = await run_stage([session], scenario, Stage(50, 0.4), random.Random(1))
+
+        assert result.scheduled == 20
+        assert result.succeeded == 20
+        # Closed-loop calls would have been made one after the other
+        assert result.max_in_flight >= 9
+        assert result.elapsed < 0.8
+        assert set(result.tool_latency) == {'SearchIndexTool', 'ListIndexTool'}
+        assert saturation_reason(result) is None
+
+    @pytest.mark.asyncio
+    async def test_timeouts_and_drops(self):
+        """Test that slow calls time out and calls beyond max_in_flight are dropped."""
+        session = FakeSession(latency=0.5)
+        scenario = Scenario([CallSpec('SearchIndexTool')], [], timeout=0.1)
+
+        result = await run_stage(
+            [session], scenario, Stage(100, 0.1), random.Random(1), max_in_flight=3
+        )
+
+        assert result.scheduled == 10
+        assert result.errors[ERROR_TIMEOUT] + result.dropped == 10
+        assert result.dropped > 0
+        assert result.error_rate == 1.0
+        assert 'error rate' in saturation_reason(result, min_throughput_ratio=0)
+        # Timed out calls are not cancelled, they complete in the background
+        assert loadgen._late_calls
+        await close_sessions(AsyncExitStack(), grace=1)
+        assert not loadgen._late_calls
+
+    @pytest.mark.asyncio
+    async def test_sessions_round_robin(self):
+        """Test that calls are spread over the sessions."""
+        sessions = [FakeSession(), FakeSession()]
+        scenario = Scenario([CallSpec('ListIndexTool')], [])
+
+        await run_stage(sessions, scenario, Stage(100, 0.1), random.Random(1))
+
+        assert len(sessions[0].calls) == len(sessions[1].calls) == 5
+
+
+class TestSaturation:
+    """Tests of saturation_reason."""
+
+    def make_result(self, rate: float, succeeded: int, elapsed: float, latency: float):
+        """Create the result of a stage whose calls all took latency seconds."""
+        result = StageResult(Stage(rate, 1))
+        result.scheduled = succeeded
+        for _ in range(succeeded):
+            result.record('ListIndexTool', latency, None)
+        result.elapsed = elapsed
+        return result
+
+    def test_throughput_below_rate(self):
+        """Test that a stage whose calls complete too slowly is saturated."""
+        result = self.make_result(100, 100, 3, 0.01)
+
+        assert 'throughput' in saturation_reason(result)
+
+    def test_latency_slo(self):
+        """Test that a stage above the p99 latency objective is saturated."""
+        result = self.make_result(100, 100, 1.2, 0.2)
+
+        assert saturation_reason(result) is None
+        assert 'p99' in saturation_reason(result, slo_p99_ms=100)
+
+    def test_report(self):
+        """Test that the report names the highest sustained rate."""
+        results = [self.make_result(10, 10, 1, 0.01), self.make_result(20, 20, 5, 0.01)]
+        reason = saturation_reason(results[1])
+
+        report = format_report(results, 1, reason)
+
+        assert 'Saturated at 20/s' in report
+        assert 'Highest sustained rate: 10/s' in report
+        json.dumps([result.to_dict() for result in results])
@@ -0,0 +1,222 @@
+# Copyright OpenSearch Contributors
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import pytest
+from aiohttp import web
+from mcp.types import TextContent
+from mcp_server_opensearch import admission, global_state, metrics
+from mcp_server_opensearch.admission import AdmissionConfig, AdmissionController, OverloadedError
+from mcp_server_opensearch.clusters_information import ClusterInfo, cluster_registry
+from mcp_server_opensearch.global_state import set_mode
+from mcp_server_opensearch.metrics import (
+    MetricsRegistry,
+    endpoint_label,
+    render_metrics,
+    track_tool_call,
+)
+from unittest.mock import Mock
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    """Reset the metrics and the state they depend on around each test."""
+    metrics.registry.clear()
+    yield
+    metrics.registry.clear()
+    cluster_registry.clear()
+    admission._admission_controller = None
+    global_state._current_worker_id = None
+    metrics.configure_snapshots(None)
+    set_mode('single')
+
+
+class TestMetricsRegistry:
+    """Tests of the metric types and their rendering."""
+
+    def test_render_exposition_format(self):
+        """Test the text format of counters, gauges and histograms."""
+        registry = MetricsRegistry()
+        calls = registry.counter('calls_total', 'Calls', ('tool',))
+        in_flight = registry.gauge('in_flight', 'In flight')
+        duration = registry.histogram('duration_seconds', 'Duration', ('tool',), (0.1, 1))
+
+        calls.inc('Search"Tool')
+        calls.inc('Search"Tool', amount=2)
+        in_flight.inc()
+        in_flight.dec()
+        for value in (0.05, 0.1, 0.5, 3):
+            duration.observe(value, 'a')
+
+        lines = registry.render(const_labels=[('worker', '2')]).splitlines()
+        assert '# TYPE calls_total counter' in lines
+        assert 'calls_total{worker="2",tool="Search\\"Tool"} 3' in lines
+        assert 'in_flight{worker="2"} 0' in lines
+        assert '# TYPE duration_seconds histogram' in lines
+        assert 'duration_seconds_bucket{worker="2",tool="a",le="0.1"} 2' in lines
+        assert 'duration_seconds_bucket{worker="2",tool="a",le="1"} 3' in lines
+        assert 'duration_seconds_bucket{worker="2",tool="a",le="+Inf"} 4' in lines
+        assert 'duration_seconds_sum{worker="2",tool="a"} 3.65' in lines
+        assert 'duration_seconds_count{worker="2",tool="a"} 4' in lines
+
+    def test_endpoint_label(self):
+        """Test that index names and ids are removed from endpoint labels."""
+        assert endpoint_label('/') == '/'
+        assert endpoint_label('/logs-2025/_search?size=10') == '/*/_search'
+        assert endpoint_label('/_cat/indices/logs-*') == '/_cat/indices/*'
+        assert endpoint_label('/orders/_doc/42') == '/*/_doc/*'
+
+
+class TestTrackToolCall:
+    """Tests of track_tool_call."""
+
+    @pytest.mark.asyncio
+    async def test_outcomes(self):
+        """Test that results, reported errors and exceptions are counted by outcome."""
+        with track_tool_call('SearchIndexTool', {'index': 'logs'}) as call:
+            assert metrics.TOOL_IN_FLIGHT.get('SearchIndexTool') == 1
+            call.set_result([TextContent(type='text', text='x' * 2000)])
+        with track_tool_call('SearchIndexTool', {}) as call:
+            call.set_result([{'type': 'text', 'text': 'Error searching index: boom'}])
+        with pytest.raises(ValueError):
+            with track_tool_call('SearchIndexTool', {}):
+                raise ValueError('invalid arguments')
+        with pytest.raises(OverloadedError):
+            with track_tool_call('SearchIndexTool', {}):
+                raise OverloadedError('cluster', 'default', 'queue_full', 1, 0, 0.0)
+        with pytest.raises(asyncio.CancelledError):
+            with track_tool_call('SearchIndexTool', {}):
+                raise asyncio.CancelledError()
+
+        assert metrics.TOOL_CALLS.get('SearchIndexTool', 'ok') == 1
+        assert metrics.TOOL_CALLS.get('SearchIndexTool', 'error') == 2
+        assert metrics.TOOL_CALLS.get('SearchIndexTool', 'overloaded') == 1
+        assert metrics.TOOL_CALLS.get('SearchIndexTool', 'cancelled') == 1
+        assert metrics.TOOL_IN_FLIGHT.get('SearchIndexTool') == 0
+        assert metrics.TOOL_DURATION.count('SearchIndexTool') == 5
+        assert metrics.TOOL_REQUEST_BYTES.count('SearchIndexTool') == 5
+        text = metrics.registry.render()
+        assert (
+            'opensearch_mcp_tool_response_bytes_bucket{tool="SearchIndexTool",le="4096"} 2' in text
+        )
+
+
+class TestOpenSearchRequestMetrics:
+    """Tests of the metrics of OpenSearch requests."""
+
+    @pytest.mark.asyncio
+    async def test_requests_are_recorded_by_cluster_and_endpoint(self):
+        """Test that the transport records the latency and outcome of every request."""
+        from opensearch.client import get_opensearch_client
+        from opensearchpy.exceptions import NotFoundError
+        from tools.tool_params import baseToolArgs
+
+        async def search(request: web.Request) -> web.Response:
+            return web.json_response({'hits': {'hits': []}})
+
+        async def missing(request: web.Request) -> web.Response:
+            return web.json_response({'error': 'no such index'}, status=404)
+
+        app = web.Application()
+        app.router.add_post('/logs-1/_search', search)
+        app.router.add_get('/missing', missing)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+
+        set_mode('multi')
+        cluster_registry['local'] = ClusterInfo(
+            opensearch_url=f'http://127.0.0.1:{port}', opensearch_no_auth=True
+        )
+        try:
+            async with get_opensearch_client(
+                baseToolArgs(opensearch_cluster_name='local')
+            ) as client:
+                await client.search(index='logs-1', body={'query': {'match_all': {}}})
+                with pytest.raises(NotFoundError):
+                    await client.transport.perform_request('GET', '/missing')
+        finally:
+            await runner.cleanup()
+
+        duration = metrics.OPENSEARCH_REQUEST_DURATION
+        assert duration.count('local', 'POST', '/*/_search', 'ok') == 1
+        assert duration.count('local', 'GET', '/*', '404') == 1
+        assert metrics.CLIENT_POOL_REQUESTS.get('miss') == 1
+
+
+class TestMetricsEndpoint:
+    """Tests of the /metrics endpoint."""
+
+    @pytest.mark.asyncio
+    async def test_handle_metrics(self):
+        """Test the /metrics response with worker labels and scrape-time gauges."""
+        from mcp_server_opensearch.streaming_server import MCPStarletteApp
+
+        admission._admission_controller = AdmissionController(
+            AdmissionConfig(cluster_concurrency=2)
+        )
+        set_mode('multi')
+        cluster_registry['production'] = ClusterInfo(opensearch_url='http://production:9200')
+        async with admission.admit('SearchIndexTool', 'production'):
+            pass
+        global_state.set_worker_id(1)
+        metrics.TOOL_CALLS.inc('SearchIndexTool', 'ok')
+
+        event_store = Mock()
+        event_store.stats.return_value = {
+            'events': 3,
+            'bytes': 512,
+            'stored': 5,
+            'evicted': 2,
+            'replayed': 1,
+        }
+        app_handler = MCPStarletteApp(Mock(), stateless=False)
+        app_handler.event_store = event_store
+        response = await app_handler.handle_metrics(Mock())
+
+        assert response.media_type.startswith('text/plain; version=0.0.4')
+        text = response.body.decode()
+        assert (
+            'opensearch_mcp_tool_calls_total{worker="1",tool="SearchIndexTool",outcome="ok"} 1'
+            in text
+        )
+        assert (
+            'opensearch_mcp_admission_active{worker="1",scope="clusters",name="production"} 0'
+            in text
+        )
+        assert 'opensearch_mcp_sessions_active{worker="1"} 0' in text
+        assert 'opensearch_mcp_event_store_evicted_total{worker="1"} 2' in text
+
+        global_state._current_worker_id = None
+        assert 'worker=' not in render_metrics()
+
+    def test_workers_share_snapshots(self, tmp_path):
+        """Test that a scrape answered by one worker includes the metrics of the others."""
+        metrics.configure_snapshots(str(tmp_path))
+        global_state.set_worker_id(1)
+        metrics.TOOL_CALLS.inc('SearchIndexTool', 'ok', amount=2)
+        metrics.TOOL_DURATION.observe(0.2, 'SearchIndexTool')
+        metrics.write_snapshot()
+        metrics.registry.clear()
+        (tmp_path / 'worker-2.json').write_text('not json')
+
+        global_state.set_worker_id(0)
+        metrics.TOOL_CALLS.inc('SearchIndexTool', 'ok')
+        lines = render_metrics().splitlines()
+
+        assert lines.count('# TYPE opensearch_mcp_tool_calls_total counter') == 1
+        assert (
+            'opensearch_mcp_tool_calls_total{worker="0",tool="SearchIndexTool",outcome="ok"} 1'
+            in lines
+        )
+        assert (
+            'opensearch_mcp_tool_calls_total{worker="1",tool="SearchIndexTool",outcome="ok"} 2'
+            in lines
+        )
+        assert (
+            'opensearch_mcp_tool_duration_seconds_count{worker="1",tool="SearchIndexTool"} 1'
+            in lines
+        )
+        assert not any('worker="2"' in line for line in lines)
@@ -0,0 +1,142 @@
+# Copyright OpenSearch Contributors
+# SPDX-License-Identifier: Apache-2.0
+
+import pstats
+import pytest
+import time
+from mcp.server import Server
+from mcp.types import CallToolRequest, CallToolRequestParams
+from mcp_server_opensearch import global_state, profiling
+from mcp_server_opensearch.profiling import (
+    ToolProfiler,
+    add_tool_profiler,
+    configure_profiling,
+    shutdown_profiling,
+)
+
+
+@pytest.fixture(autouse=True)
+def clean_profiler():
+    """Disable profiling and forget the worker id after each test."""
+    yield
+    profiling._tool_profiler = None
+    global_state._current_worker_id = None
+
+
+def busy_format_response(seconds: float) -> int:
+    """Use the CPU for some seconds."""
+    end = time.monotonic() + seconds
+    total = 0
+    while time.monotonic() < end:
+        total += sum(range(100))
+    return total
+
+
+async def handler(request: CallToolRequest) -> str:
+    """Stand in for the call_tool handler of a server."""
+    busy_format_response(0.05)
+    return 'result'
+
+
+def tool_request(name: str) -> CallToolRequest:
+    """Build a call_tool request of a tool."""
+    return CallToolRequest(
+        method='tools/call', params=CallToolRequestParams(name=name, arguments={})
+    )
+
+
+class TestToolProfiler:
+    """Tests for ToolProfiler."""
+
+    def test_invalid_sample_rate(self, tmp_path):
+        """Test that sample rates outside (0, 1] are rejected."""
+        with pytest.raises(ValueError):
+            ToolProfiler(str(tmp_path), sample_rate=0)
+        with pytest.raises(ValueError):
+            configure_profiling(str(tmp_path), sample_rate=1.5)
+
+    @pytest.mark.asyncio
+    async def test_profiled_calls_are_aggregated_per_tool(self, tmp_path):
+        """Test that stats and collapsed stacks of a tool are written and aggregated."""
+        profiler = ToolProfiler(str(tmp_path), sample_rate=1)
+        profiled = profiler.wrap(handler)
+
+        assert await profiled(tool_request('SearchIndexTool')) == 'result'
+        assert await profiled(tool_request('SearchIndexTool')) == 'result'
+        profiler.close()
+
+        assert profiler.profiled_calls['SearchIndexTool'] == 2
+        stats = pstats.Stats(str(tmp_path / 'SearchIndexTool.pstats'))
+        # Key: (file, line, function), Value: (primitive calls, calls, ...)
+        calls = {func[2]: value[1] for func, value in stats.stats.items()}
+        assert calls['busy_format_response'] == 2
+
+        lines = (tmp_path / 'SearchIndexTool.collapsed').read_text().splitlines()
+        assert lines
+        assert int(lines[0].rsplit(' ', 1)[1]) > 0
+        assert any('busy_format_response' in line for line in lines)
+        assert all(';' in line.rsplit(' ', 1)[0] for line in lines)
+
+    @pytest.mark.asyncio
+    async def test_worker_files(self, tmp_path):
+        """Test that every worker writes its own files."""
+        global_state.set_worker_id(2)
+        profiler = ToolProfiler(str(tmp_path), sample_rate=1)
+        await profiler.wrap(handler)(tool_request('ListIndexTool'))
+        profiler.close()
+
+        assert (tmp_path / 'ListIndexTool.worker-2.pstats').exists()
+        assert (tmp_path / 'ListIndexTool.worker-2.collapsed').exists()
+
+    @pytest.mark.asyncio
+    async def test_files_written_by_writer_thread(self, tmp_path):
+        """Test that the files are written on the flush interval, not after every call."""
+        profiler = ToolProfiler(str(tmp_path), sample_rate=1, flush_interval=0.05)
+        await profiler.wrap(handler)(tool_request('SearchIndexTool'))
+
+        assert not (tmp_path / 'SearchIndexTool.pstats').exists()
+        for _ in range(100):
+            if (tmp_path / 'SearchIndexTool.collapsed').exists():
+                break
+            time.sleep(0.01)
+        profiler.close()
+
+        assert profiler._writer.name == 'tool-profile-writer'
+        assert (tmp_path / 'SearchIndexTool.pstats').exists()
+        assert (tmp_path / 'SearchIndexTool.collapsed').exists()
+
+    @pytest.mark.asyncio
+    async def test_one_call_at_a_time(self, tmp_path):
+        """Test that calls are not profiled while another call is profiled."""
+        profiler = ToolProfiler(str(tmp_path), sample_rate=1)
+        assert profiler.should_profile()
+        with profiler.profile('SearchIndexTool'):
+            assert not profiler.should_profile()
+        assert profiler.should_profile()
+
+
+class TestAddToolProfiler:
+    """Tests for add_tool_profiler."""
+
+    def test_disabled(self):
+        """Test that the handler is not wrapped when profiling is disabled."""
+        server = Server('test')
+        server.request_handlers[CallToolRequest] = handler
+        assert configure_profiling('') is None
+
+        add_tool_profiler(server)
+
+        assert server.request_handlers[CallToolRequest] is handler
+
+    @pytest.mark.asyncio
+    async def test_enabled(self, tmp_path):
+        """Test that the handler of the server is profiled when profiling is enabled."""
+        server = Server('test')
+        server.request_handlers[CallToolRequest] = handler
+        configure_profiling(str(tmp_path / 'profiles'), sample_rate=1)
+
+        add_tool_profiler(server)
+        await server.request_handlers[CallToolRequest](tool_request('SearchIndexTool'))
+        shutdown_profiling()
+
+        assert (tmp_path / 'profiles' / 'SearchIndexTool.pstats').exists()
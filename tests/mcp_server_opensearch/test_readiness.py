@@ -0,0 +1,198 @@
+# Copyright OpenSearch Contributors
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+import pytest
+import time
+from aiohttp import web
+from mcp_server_opensearch import readiness, warmup
+from mcp_server_opensearch.clusters_information import ClusterInfo, cluster_registry
+from mcp_server_opensearch.global_state import set_mode
+from mcp_server_opensearch.readiness import (
+    BREAKER_OPEN,
+    ReadinessProber,
+    configure_readiness,
+)
+from mcp_server_opensearch.warmup import FAILED, READY, SKIPPED, ClusterReadiness
+from semver import Version
+from unittest.mock import AsyncMock, Mock, patch
+
+
+@pytest.fixture(autouse=True)
+def clean_state():
+    """Clear the cluster registry and cached readiness after each test."""
+    yield
+    cluster_registry.clear()
+    warmup.cluster_readiness.clear()
+    readiness._readiness_prober = None
+    set_mode('single')
+
+
+def _probe_results(*rounds):
+    """Fake probe_clusters that returns one round of results per call."""
+    results = [
+        {
+            name: ClusterReadiness(
+                name,
+                status,
+                version=Version.parse('2.19.0') if status == READY else None,
+                error=None if status == READY else 'connection refused',
+                checked_at=time.time(),
+            )
+            for name, status in statuses.items()
+        }
+        for statuses in rounds
+    ]
+    return patch('mcp_server_opensearch.readiness.probe_clusters', side_effect=results)
+
+
+def _body(prober):
+    status_code, body = prober.response()
+    return status_code, json.loads(body)
+
+
+class TestReadinessProber:
+    """Tests for ReadinessProber."""
+
+    @pytest.mark.asyncio
+    async def test_breaker_opens_after_consecutive_failures(self):
+        """Test that single failures are tolerated and the breaker opens at the threshold."""
+        prober = ReadinessProber(failure_threshold=2)
+        assert _body(prober) == (503, {'status': 'starting', 'clusters': {}})
+
+        with _probe_results({'': FAILED}, {'': READY}, {'': FAILED}, {'': FAILED}, {'': READY}):
+            # Not ready until the cluster answered once
+            await prober.probe()
+            assert prober.response()[0] == 503
+
+            await prober.probe()
+            status_code, body = _body(prober)
+            assert status_code == 200
+            assert body['clusters']['default']['version'] == '2.19.0'
+
+            await prober.probe()
+            status_code, body = _body(prober)
+            assert status_code == 200
+            assert body['clusters']['default']['reachable'] is False
+
+            await prober.probe()
+            status_code, body = _body(prober)
+            assert status_code == 503
+            assert body['clusters']['default']['breaker'] == BREAKER_OPEN
+            assert body['clusters']['default']['error'] == 'connection refused'
+
+            await prober.probe()
+            assert _body(prober)[1]['clusters']['default']['breaker'] == 'closed'
+            assert prober.ready
+
+    @pytest.mark.asyncio
+    async def test_require_policy_and_skipped_clusters(self):
+        """Test the all and any policies and that header auth clusters do not count."""
+        set_mode('multi')
+        rounds = [{'a': READY, 'b': FAILED, 'headers': SKIPPED}] * 2
+        strict = ReadinessProber(failure_threshold=1, require='all')
+        lenient = ReadinessProber(failure_threshold=1)
+        with _probe_results(*rounds):
+            await strict.probe()
+            await lenient.probe()
+
+        assert strict.response()[0] == 503
+        status_code, body = _body(lenient)
+        assert status_code == 200
+        assert set(body['clusters']) == {'a', 'b'}
+        assert body['skipped'] == ['headers']
+
+        only_headers = ReadinessProber()
+        with _probe_results({'headers': SKIPPED}):
+            await only_headers.probe()
+        assert only_headers.ready
+
+        with pytest.raises(ValueError):
+            ReadinessProber(require='most')
+
+    @pytest.mark.asyncio
+    async def test_expired_credentials(self, monkeypatch):
+        """Test that the expiry of assumed role credentials is reported and enforced."""
+        from opensearch import client
+
+        arn = 'arn:aws:iam::123456789012:role/reader'
+        monkeypatch.setenv('AWS_IAM_ARN', arn)
+        monkeypatch.setitem(
+            client._assumed_role_credentials, ('', arn, 'us-east-1'), (time.time() + 600, Mock())
+        )
+        prober = ReadinessProber()
+        with _probe_results({'': READY}, {'': READY}):
+            await prober.probe()
+            status_code, body = _body(prober)
+            assert status_code == 200
+            assert 590 <= body['clusters']['default']['credentials_expires_in'] <= 600
+
+            monkeypatch.setitem(
+                client._assumed_role_credentials, ('', arn, 'us-east-1'), (time.time() - 1, Mock())
+            )
+            await prober.probe()
+        assert prober.response()[0] == 503
+
+    @pytest.mark.asyncio
+    async def test_probes_real_cluster(self, monkeypatch):
+        """Test a probe against an HTTP server that answers like OpenSearch."""
+
+        async def info(request: web.Request) -> web.Response:
+            return web.json_response({'version': {'number': '3.1.0'}})
+
+        app = web.Application()
+        app.router.add_get('/', info)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+
+        set_mode('multi')
+        cluster_registry['local'] = ClusterInfo(
+            opensearch_url=f'http://127.0.0.1:{port}', opensearch_no_auth=True
+        )
+        prober = ReadinessProber(timeout=5)
+        try:
+            await prober.probe()
+        finally:
+            await runner.cleanup()
+
+        status_code, body = _body(prober)
+        assert status_code == 200
+        assert body['clusters']['local']['version'] == '3.1.0'
+
+
+class TestReadyEndpoint:
+    """Tests for the /ready endpoint."""
+
+    @pytest.mark.asyncio
+    async def test_ready_returns_cached_probes(self):
+        """Test that /ready answers from the cache and /health stays static."""
+        from mcp_server_opensearch.streaming_server import MCPStarletteApp
+
+        app_handler = MCPStarletteApp(Mock())
+        response = await app_handler.handle_ready(Mock())
+        assert response.status_code == 200
+        assert json.loads(response.body) == {'status': 'ready', 'probing': False}
+
+        prober = configure_readiness(interval=15)
+        with patch(
+            'mcp_server_opensearch.readiness.probe_clusters', new_callable=AsyncMock
+        ) as probe:
+            response = await app_handler.handle_ready(Mock())
+            probe.assert_not_called()
+        assert response.status_code == 503
+        assert json.loads(response.body)['status'] == 'starting'
+
+        with _probe_results({'': READY}):
+            await prober.probe()
+        response = await app_handler.handle_ready(Mock())
+        assert response.status_code == 200
+        assert response.media_type == 'application/json'
+        assert (await app_handler.handle_health(Mock())).body == b'OK'
+
+    def test_configure_readiness_disabled(self):
+        """Test that an interval of 0 disables the prober."""
+        assert configure_readiness(interval=0) is None
+        assert readiness.get_readiness_prober() is None
@@ -0,0 +1,218 @@
+# Copyright OpenSearch Contributors
+# SPDX-License-Identifier: Apache-2.0
+
+import pytest
+import time
+from aiohttp import web
+from mcp.server.lowlevel.server import request_ctx
+from mcp_server_opensearch import sessions
+from mcp_server_opensearch.sessions import (
+    ResponseCache,
+    SessionRegistry,
+    configure_sessions,
+    get_current_session,
+)
+from starlette.requests import Request
+from unittest.mock import AsyncMock, Mock
+
+
+class TestResponseCache:
+    """Tests for ResponseCache."""
+
+    def test_hit_returns_copy(self):
+        """Test that cached responses are returned as copies."""
+        cache = ResponseCache(ttl=10)
+        response = {'hits': {'total': 1}}
+        cache.put('key', response)
+        response['hits']['total'] = 2
+
+        first = cache.get('key')
+        first['hits']['total'] = 3
+
+        assert cache.get('key') == {'hits': {'total': 1}}
+        assert cache.get('missing') is None
+        assert (cache.hits, cache.misses) == (2, 1)
+
+    def test_expiry_and_eviction(self, monkeypatch):
+        """Test that entries expire after the ttl and the oldest entry is evicted."""
+        cache = ResponseCache(ttl=10, max_entries=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+
+        assert cache.get('b') is None
+        assert cache.get('a') == 1
+        assert len(cache) == 2
+
+        now = time.monotonic()
+        monkeypatch.setattr(sessions.time, 'monotonic', lambda: now + 11)
+        assert cache.get('a') is None
+
+    def test_disabled(self):
+        """Test that a ttl of 0, the default, disables the cache."""
+        for cache in (ResponseCache(ttl=0), ResponseCache()):
+            cache.put('key', 'value')
+
+            assert cache.get('key') is None
+
+
+class TestSessionRegistry:
+    """Tests for SessionRegistry."""
+
+    @pytest.mark.asyncio
+    async def test_expire_idle_sessions(self, monkeypatch):
+        """Test that idle sessions are removed and their clients closed."""
+        registry = SessionRegistry(idle_timeout=60)
+        idle = registry.get_or_create('idle')
+        client = Mock(close=AsyncMock())
+        idle.clients['cluster'] = client
+        now = time.monotonic()
+        monkeypatch.setattr(sessions.time, 'monotonic', lambda: now + 61)
+        registry.get_or_create('active')
+
+        expired = await registry.expire_idle()
+
+        assert expired == ['idle']
+        assert list(registry.sessions) == ['active']
+        client.close.assert_awaited_once()
+
+    def test_detach_clients(self):
+        """Test that only the clients of the given clusters are unpinned."""
+        registry = SessionRegistry()
+        first, second = registry.get_or_create('first'), registry.get_or_create('second')
+        first.clients[('logs', ())] = 'logs-1'
+        first.clients[('metrics', ())] = 'metrics-1'
+        second.clients[('logs', (('opensearch_url', 'x'),))] = 'logs-2'
+
+        detached = registry.detach_clients(['logs'])
+
+        assert sorted(detached) == ['logs-1', 'logs-2']
+        assert list(first.clients) == [('metrics', ())]
+        assert not second.clients
+
+    def test_get_current_session(self):
+        """Test that tool calls are mapped to their session by the mcp-session-id header."""
+        request = Request(
+            {'type': 'http', 'method': 'POST', 'headers': [(b'mcp-session-id', b'abc')]}
+        )
+        context = Mock(request=request)
+
+        try:
+            configure_sessions(stateless=True)
+            token = request_ctx.set(context)
+            assert get_current_session() is None
+
+            configure_sessions(stateless=False)
+            session = get_current_session()
+            request_ctx.reset(token)
+        finally:
+            sessions._session_registry = None
+
+        assert session.session_id == 'abc'
+        assert session.preference == 'abc'
+        assert get_current_session() is None
+
+
+class TestPinnedClient:
+    """Tests for the clients pinned to a session."""
+
+    @pytest.mark.asyncio
+    async def test_session_client_reuse_cache_and_preference(self, monkeypatch):
+        """Test that a session reuses its client, caches reads and sets a search preference."""
+        from mcp_server_opensearch.global_state import set_mode
+        from opensearch.client import get_opensearch_client
+        from tools.tool_params import baseToolArgs
+
+        set_mode('single')
+        received = []
+
+        async def handle(request: web.Request) -> web.Response:
+            received.append((request.method, request.path, dict(request.query)))
+            return web.json_response({'hits': {'hits': []}})
+
+        app = web.Application()
+        app.router.add_route('*', '/{tail:.*}', handle)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        monkeypatch.setenv('OPENSEARCH_URL', f'http://127.0.0.1:{port}')
+        monkeypatch.setenv('OPENSEARCH_NO_AUTH', 'true')
+
+        request = Request(
+            {'type': 'http', 'method': 'POST', 'headers': [(b'mcp-session-id', b'session-1')]}
+        )
+        token = request_ctx.set(Mock(request=request))
+        registry = configure_sessions(stateless=False, cache_ttl=10)
+        args = baseToolArgs(opensearch_cluster_name='')
+        try:
+            async with get_opensearch_client(args) as first_client:
+                await first_client.search(index='logs', body={'query': {'match_all': {}}})
+                await first_client.cat.indices(format='json')
+                await first_client.msearch(body=[{'index': 'logs'}, {'query': {'match_all': {}}}])
+            async with get_opensearch_client(args) as second_client:
+                await second_client.search(index='logs', body={'query': {'match_all': {}}})
+                await second_client.cat.indices(format='json')
+                await second_client.msearch(body=[{'index': 'logs'}, {'query': {'match_all': {}}}])
+                await second_client.transport.perform_request('GET', '/_tasks')
+                await second_client.transport.perform_request('GET', '/_tasks')
+            session = registry.sessions['session-1']
+            assert first_client is second_client
+        finally:
+            request_ctx.reset(token)
+            await registry.close()
+            sessions._session_registry = None
+            await runner.cleanup()
+
+        assert received == [
+            ('POST', '/logs/_search', {'preference': 'session-1'}),
+            ('GET', '/_cat/indices', {'format': 'json'}),
+            # msearch has no preference URL parameter, but its response is cached
+            ('POST', '/_msearch', {}),
+            ('GET', '/_tasks', {}),
+            ('GET', '/_tasks', {}),
+        ]
+        assert session.response_cache.hits == 3
+        assert session.clients == {}
+
+    @pytest.mark.asyncio
+    async def test_session_client_renewed_before_credentials_expire(self, monkeypatch):
+        """Test that a pinned client is replaced before its assumed role credentials expire."""
+        from mcp_server_opensearch.global_state import set_mode
+        from opensearch import client as client_module
+        from opensearch.client import get_opensearch_client
+        from tools.tool_params import baseToolArgs
+
+        set_mode('single')
+        expiring, fresh = Mock(close=AsyncMock()), Mock(close=AsyncMock())
+        expiring.transport.credentials_expiry = time.time() + 60
+        fresh.transport.credentials_expiry = time.time() + 3600
+        monkeypatch.setattr(
+            client_module, 'initialize_client', Mock(side_effect=[expiring, fresh])
+        )
+        request = Request(
+            {'type': 'http', 'method': 'POST', 'headers': [(b'mcp-session-id', b'session-1')]}
+        )
+        token = request_ctx.set(Mock(request=request))
+        configure_sessions(stateless=False)
+        args = baseToolArgs(opensearch_cluster_name='')
+        try:
+            async with get_opensearch_client(args) as first_client:
+                pass
+            async with get_opensearch_client(args) as second_client:
+                pass
+            async with get_opensearch_client(args) as third_client:
+                pass
+        finally:
+            request_ctx.reset(token)
+            sessions._session_registry = None
+
+        assert first_client is expiring
+        assert second_client is third_client is fresh
+        # The replaced client is closed when its credentials expire, not right away
+        expiring.close.assert_not_awaited()
+        assert len(client_module._retiring_clients) == 1
+        for task in list(client_module._retiring_clients):
+            task.cancel()
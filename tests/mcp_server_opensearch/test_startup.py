@@ -0,0 +1,179 @@
+# Copyright OpenSearch Contributors
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import pytest
+import time
+from mcp_server_opensearch.startup import (
+    DONE,
+    FAILED,
+    TIMEOUT,
+    StartupStep,
+    run_pipeline,
+    run_startup,
+)
+from semver import Version
+from unittest.mock import ANY, AsyncMock, patch
+
+
+def _sleeper(seconds, value=None, log=None):
+    async def run(**dependencies):
+        if log is not None:
+            log.append(dependencies)
+        await asyncio.sleep(seconds)
+        return value
+
+    return run
+
+
+class TestRunPipeline:
+    """Tests of run_pipeline."""
+
+    @pytest.mark.asyncio
+    async def test_independent_steps_run_concurrently(self):
+        """Test that the pipeline takes as long as the longest chain, not the sum."""
+        received = []
+        steps = [
+            StartupStep('specs', _sleeper(0.2, 'registry')),
+            StartupStep('version', _sleeper(0.2, '2.19.0')),
+            StartupStep('clusters', _sleeper(0.2)),
+            StartupStep(
+                'tools', _sleeper(0.1, 'tools', received), depends_on=('specs', 'version')
+            ),
+        ]
+
+        start = time.monotonic()
+        results = await run_pipeline(steps, timeout=5)
+        elapsed = time.monotonic() - start
+
+        assert elapsed < 0.5
+        assert received == [{'specs': 'registry', 'version': '2.19.0'}]
+        assert results['tools'].value == 'tools'
+        assert all(result.status == DONE for result in results.values())
+        assert results['specs'].duration_ms >= 190
+
+    @pytest.mark.asyncio
+    async def test_deadline_cancels_optional_steps(self):
+        """Test that slow optional steps fall back at the deadline and required ones finish."""
+        received = []
+        steps = [
+            StartupStep('specs', _sleeper(5, 'registry'), optional=True, fallback='static'),
+            StartupStep('probe', _sleeper(0.4), depends_on=('local',), optional=True),
+            StartupStep('local', _sleeper(0.3, 'config')),
+            StartupStep('tools', _sleeper(0, 'tools', received), depends_on=('specs', 'local')),
+        ]
+
+        start = time.monotonic()
+        results = await run_pipeline(steps, timeout=0.2)
+        elapsed = time.monotonic() - start
+
+        assert elapsed < 1
+        assert results['specs'].status == TIMEOUT
+        assert results['specs'].value == 'static'
+        # The required step outlived the deadline, the optional step after it was skipped
+        assert results['local'].status == DONE
+        assert results['probe'].status == TIMEOUT
+        assert received == [{'specs': 'static', 'local': 'config'}]
+
+    @pytest.mark.asyncio
+    async def test_step_failures(self):
+        """Test that optional failures fall back and required failures stop the startup."""
+
+        async def broken(**_):
+            raise ConnectionError('unreachable')
+
+        results = await run_pipeline(
+            [StartupStep('version', broken, optional=True), StartupStep('config', _sleeper(0))]
+        )
+        assert results['version'].status == FAILED
+        assert results['version'].error == 'unreachable'
+        assert results['version'].value is None
+
+        slow = _sleeper(5)
+        with pytest.raises(ConnectionError):
+            await run_pipeline([StartupStep('clusters', broken), StartupStep('specs', slow)])
+
+    @pytest.mark.asyncio
+    async def test_invalid_dependencies(self):
+        """Test that unknown and circular dependencies are rejected."""
+        with pytest.raises(ValueError, match='unknown'):
+            await run_pipeline([StartupStep('tools', _sleeper(0), depends_on=('config',))])
+        with pytest.raises(ValueError, match='circular'):
+            await run_pipeline(
+                [
+                    StartupStep('a', _sleeper(0), depends_on=('b',)),
+                    StartupStep('b', _sleeper(0), depends_on=('a',)),
+                ]
+            )
+
+
+class TestRunStartup:
+    """Tests of run_startup."""
+
+    @pytest.mark.asyncio
+    async def test_single_mode_probes_version_during_spec_fetch(self):
+        """Test that the version probe overlaps the spec fetch and feeds the tool filter."""
+
+        async def slow_specs():
+            await asyncio.sleep(0.3)
+
+        async def slow_version(args):
+            await asyncio.sleep(0.3)
+            return Version.parse('2.19.0')
+
+        with (
+            patch(
+                'mcp_server_opensearch.startup.generate_tools_from_openapi', side_effect=slow_specs
+            ),
+            patch(
+                'mcp_server_opensearch.startup.get_opensearch_version', side_effect=slow_version
+            ),
+            patch(
+                'mcp_server_opensearch.startup.get_installed_plugins',
+                new_callable=AsyncMock,
+                return_value=['opensearch-ml'],
+            ),
+            patch('mcp_server_opensearch.startup.apply_custom_tool_config', return_value={}),
+            patch(
+                'mcp_server_opensearch.startup.get_tools',
+                new_callable=AsyncMock,
+                return_value={'tool': {}},
+            ) as mock_get_tools,
+        ):
+            start = time.monotonic()
+            tools = await run_startup(config_file_path='some/path')
+            elapsed = time.monotonic() - start
+
+        assert tools == {'tool': {}}
+        assert elapsed < 0.55
+        mock_get_tools.assert_awaited_once_with(
+            tool_registry={},
+            config_file_path='some/path',
+            opensearch_version=Version.parse('2.19.0'),
+            installed_plugins=['opensearch-ml'],
+        )
+
+    @pytest.mark.asyncio
+    async def test_multi_mode_skips_version_probe(self):
+        """Test that multi mode loads the clusters and warms them up without a version probe."""
+        with (
+            patch('mcp_server_opensearch.startup.load_clusters_from_yaml') as mock_load_clusters,
+            patch('mcp_server_opensearch.startup.warm_up_clusters') as mock_warm_up,
+            patch('mcp_server_opensearch.startup.generate_tools_from_openapi'),
+            patch('mcp_server_opensearch.startup.get_opensearch_version') as mock_get_version,
+            patch('mcp_server_opensearch.startup.get_installed_plugins') as mock_get_plugins,
+            patch('mcp_server_opensearch.startup.apply_custom_tool_config', return_value={}),
+            patch('mcp_server_opensearch.startup.get_tools', return_value={}) as mock_get_tools,
+        ):
+            await run_startup(mode='multi', config_file_path='clusters.yml', warm_up_timeout=5)
+
+        mock_load_clusters.assert_awaited_once_with('clusters.yml')
+        mock_warm_up.assert_awaited_once_with(5)
+        mock_get_version.assert_not_called()
+        mock_get_plugins.assert_not_called()
+        mock_get_tools.assert_awaited_once_with(
+            tool_registry={},
+            config_file_path='clusters.yml',
+            opensearch_version=ANY,
+            installed_plugins=ANY,
+        )
@@ -42,6 +42,7 @@ def patch_opensearch_version():
     with (
         patch('opensearch.helper.get_opensearch_version', side_effect=mock_get_version),
         patch('opensearch.client.initialize_client', return_value=mock_client),
+        patch.dict('opensearch.helper._looked_up_versions'),
     ):
         yield
 
@@ -54,7 +55,7 @@ def mock_generate_tools():
         return None
 
     with patch(
-        'mcp_server_opensearch.stdio_server.generate_tools_from_openapi',
+        'mcp_server_opensearch.startup.generate_tools_from_openapi',
         side_effect=mock_gen_tools,
     ):
         yield
@@ -73,10 +74,12 @@ def mock_server():
         'serverInfo': {'name': 'test-server', 'version': '1.0'},
     }
 
+    mock_instance.request_handlers = {}
+
     # Make the mock class return our mock instance
     mock.return_value = mock_instance
 
-    with patch('mcp_server_opensearch.stdio_server.Server', mock):
+    with patch('mcp_server_opensearch.stdio_server.ReloadableServer', mock):
         yield mock  # Return the mock class
 
 
@@ -102,7 +105,7 @@ def mock_tool_registry():
         return MOCK_TOOL_REGISTRY
 
     with patch(
-        'mcp_server_opensearch.stdio_server.get_tools',
+        'mcp_server_opensearch.startup.get_tools',
         side_effect=mock_get_tools,
     ):
         yield MOCK_TOOL_REGISTRY
@@ -253,3 +256,25 @@ async def test_tool_execution_error(
     # Test tool execution error
     with pytest.raises(Exception, match='Tool error'):
         await call_tool_handler('test_tool', {})
+
+
+def test_stdio_import_is_lazy():
+    """Test that the stdio server does not load other transports or AWS authentication."""
+    import subprocess
+    import sys
+
+    code = (
+        'import sys, mcp_server_opensearch.stdio_server; '
+        "print(' '.join(sorted(m for m in ('boto3', 'botocore', 'opensearchpy', "
+        "'mcp_server_opensearch.streaming_server') if m in sys.modules)))"
+    )
+    src = os.path.join(os.path.dirname(__file__), '..', '..', 'src')
+    result = subprocess.run(
+        [sys.executable, '-c', code],
+        capture_output=True,
+        text=True,
+        env={**os.environ, 'PYTHONPATH': os.path.abspath(src)},
+        check=True,
+    )
+
+    assert result.stdout.strip() == ''
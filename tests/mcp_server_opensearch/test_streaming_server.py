@@ -1,6 +1,7 @@
 # Copyright OpenSearch Contributors
 # SPDX-License-Identifier: Apache-2.0
 
+import asyncio
 import pytest
 import pytest_asyncio
 from mcp.types import TextContent
@@ -41,10 +42,10 @@ class TestMCPServer:
         }
 
     @pytest.mark.asyncio
-    @patch('mcp_server_opensearch.streaming_server.apply_custom_tool_config')
-    @patch('mcp_server_opensearch.streaming_server.get_tools')
-    @patch('mcp_server_opensearch.streaming_server.generate_tools_from_openapi')
-    @patch('mcp_server_opensearch.streaming_server.load_clusters_from_yaml')
+    @patch('mcp_server_opensearch.startup.apply_custom_tool_config')
+    @patch('mcp_server_opensearch.startup.get_tools')
+    @patch('mcp_server_opensearch.startup.generate_tools_from_openapi')
+    @patch('mcp_server_opensearch.startup.load_clusters_from_yaml')
     async def test_create_mcp_server(
         self,
         mock_load_clusters,
@@ -73,12 +74,14 @@ class TestMCPServer:
         mock_get_tools.assert_called_once_with(
             tool_registry=mock_tool_registry,
             config_file_path='some/path',
+            opensearch_version=ANY,
+            installed_plugins=ANY,
         )
 
     @pytest.mark.asyncio
-    @patch('mcp_server_opensearch.streaming_server.get_tools')
-    @patch('mcp_server_opensearch.streaming_server.generate_tools_from_openapi')
-    @patch('mcp_server_opensearch.streaming_server.load_clusters_from_yaml')
+    @patch('mcp_server_opensearch.startup.get_tools')
+    @patch('mcp_server_opensearch.startup.generate_tools_from_openapi')
+    @patch('mcp_server_opensearch.startup.load_clusters_from_yaml')
     async def test_list_tools(
         self, mock_load_clusters, mock_generate_tools, mock_get_tools, mock_tool_registry
     ):
@@ -111,9 +114,9 @@ class TestMCPServer:
         assert tools[0].inputSchema == {'type': 'object'}
 
     @pytest.mark.asyncio
-    @patch('mcp_server_opensearch.streaming_server.get_tools')
-    @patch('mcp_server_opensearch.streaming_server.generate_tools_from_openapi')
-    @patch('mcp_server_opensearch.streaming_server.load_clusters_from_yaml')
+    @patch('mcp_server_opensearch.startup.get_tools')
+    @patch('mcp_server_opensearch.startup.generate_tools_from_openapi')
+    @patch('mcp_server_opensearch.startup.load_clusters_from_yaml')
     async def test_call_tool(
         self, mock_load_clusters, mock_generate_tools, mock_get_tools, mock_tool_registry
     ):
@@ -147,17 +150,17 @@ class TestMCPStarletteApp:
         # Mock dependencies
         with (
             patch(
-                'mcp_server_opensearch.streaming_server.get_tools',
+                'mcp_server_opensearch.startup.get_tools',
                 new_callable=AsyncMock,
                 return_value={},
             ),
             patch(
-                'mcp_server_opensearch.streaming_server.generate_tools_from_openapi',
+                'mcp_server_opensearch.startup.generate_tools_from_openapi',
                 new_callable=AsyncMock,
                 return_value=None,
             ),
             patch(
-                'mcp_server_opensearch.streaming_server.load_clusters_from_yaml',
+                'mcp_server_opensearch.startup.load_clusters_from_yaml',
                 new_callable=AsyncMock,
                 return_value=None,
             ),
@@ -168,13 +171,17 @@ class TestMCPStarletteApp:
     def test_create_app(self, app_handler):
         """Test Starlette application creation and configuration."""
         app = app_handler.create_app()
-        assert len(app.routes) == 5
+        assert len(app.routes) == 9
 
         # Check routes
         assert app.routes[0].path == '/sse'
         assert app.routes[1].path == '/health'
-        assert app.routes[2].path == '/messages'
-        assert app.routes[3].path == '/mcp'
+        assert app.routes[2].path == '/ready'
+        assert app.routes[3].path == '/admission'
+        assert app.routes[4].path == '/metrics'
+        assert app.routes[5].path == '/capabilities'
+        assert app.routes[6].path == '/messages'
+        assert app.routes[7].path == '/mcp'
 
     @pytest.mark.asyncio
     async def test_handle_sse(self, app_handler):
@@ -227,11 +234,9 @@ async def test_serve():
     with (
         patch('uvicorn.Server', return_value=mock_server) as mock_server_class,
         patch('uvicorn.Config', return_value=mock_config) as mock_config_class,
-        patch('mcp_server_opensearch.streaming_server.get_tools', return_value={}),
-        patch(
-            'mcp_server_opensearch.streaming_server.generate_tools_from_openapi', return_value=None
-        ),
-        patch('mcp_server_opensearch.streaming_server.load_clusters_from_yaml', return_value=None),
+        patch('mcp_server_opensearch.startup.get_tools', return_value={}),
+        patch('mcp_server_opensearch.startup.generate_tools_from_openapi', return_value=None),
+        patch('mcp_server_opensearch.startup.load_clusters_from_yaml', return_value=None),
     ):
         await serve(host='localhost', port=8000)
 
@@ -244,3 +249,113 @@ async def test_serve():
         # Verify server started
         mock_server_class.assert_called_once_with(mock_config)
         mock_server.serve.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_handle_health_worker_headers():
+    """Test that the health endpoint identifies the worker process."""
+    import os
+    from mcp_server_opensearch import global_state
+    from mcp_server_opensearch.streaming_server import MCPStarletteApp, build_mcp_server
+
+    app_handler = MCPStarletteApp(build_mcp_server({}))
+
+    response = await app_handler.handle_health(Mock())
+    assert response.body == b'OK'
+    assert 'x-worker-id' not in response.headers
+
+    global_state.set_worker_id(3)
+    try:
+        response = await app_handler.handle_health(Mock())
+    finally:
+        global_state._current_worker_id = None
+
+    assert response.status_code == 200
+    assert response.body == b'OK'
+    assert response.headers['x-worker-id'] == '3'
+    assert response.headers['x-worker-pid'] == str(os.getpid())
+
+
+def test_serve_workers(tmp_path):
+    """Test that the startup snapshot is built once and shared with forked workers."""
+    import os
+    from mcp_server_opensearch.startup import DEFAULT_STARTUP_TIMEOUT
+    from mcp_server_opensearch.streaming_server import serve_workers
+
+    enabled_tools = {'test-tool': {'description': 'Test tool'}}
+
+    def fake_run_worker(worker_id, tools, sock, stateless, metrics_dir, profile_dir, rate):
+        # Runs in the forked child: record what the worker inherited
+        (tmp_path / f'worker-{worker_id}').write_text(
+            f'{",".join(tools)}|{sock.getsockname()[1]}|{stateless}|{metrics_dir}|{profile_dir}|{rate}'
+        )
+
+    with (
+        patch(
+            'mcp_server_opensearch.streaming_server.load_enabled_tools',
+            new_callable=AsyncMock,
+            return_value=enabled_tools,
+        ) as mock_load_enabled_tools,
+        patch('mcp_server_opensearch.streaming_server._run_worker', side_effect=fake_run_worker),
+    ):
+        serve_workers(
+            host='127.0.0.1',
+            port=0,
+            workers=3,
+            config_file_path='some/path',
+            profile_tools='profiles',
+            profile_tools_rate=0.5,
+        )
+
+    mock_load_enabled_tools.assert_awaited_once_with(
+        'single', '', 'some/path', None, None, DEFAULT_STARTUP_TIMEOUT
+    )
+    results = sorted(path.name for path in tmp_path.iterdir())
+    assert results == ['worker-0', 'worker-1', 'worker-2']
+    ports, metrics_dirs = set(), set()
+    for path in tmp_path.iterdir():
+        tools, port, stateless, metrics_dir, profile_dir, rate = path.read_text().split('|')
+        assert tools == 'test-tool'
+        assert stateless == 'True'
+        assert (profile_dir, rate) == ('profiles', '0.5')
+        ports.add(port)
+        metrics_dirs.add(metrics_dir)
+    # All workers share the same listening socket and metrics directory
+    assert len(ports) == 1 and ports != {'0'}
+    assert len(metrics_dirs) == 1
+    assert not os.path.exists(metrics_dirs.pop())
+
+
+def test_session_transports_without_sdk_attribute():
+    """Test that session managers without the private SDK attribute are handled."""
+    from mcp_server_opensearch.streaming_server import _session_transports
+
+    assert _session_transports(Mock(spec=[])) is None
+    assert _session_transports(Mock(_server_instances={'a': 1})) == {'a': 1}
+
+
+@pytest.mark.asyncio
+async def test_stateful_app_expires_idle_sessions():
+    """Test that idle stateful sessions are terminated and their state is dropped."""
+    from mcp_server_opensearch import sessions
+    from mcp_server_opensearch.streaming_server import MCPStarletteApp, build_mcp_server
+
+    app_handler = MCPStarletteApp(build_mcp_server({}), stateless=False, session_idle_timeout=0.01)
+    try:
+        transport = Mock(terminate=AsyncMock())
+        app_handler.session_manager._server_instances['idle-session'] = transport
+
+        with patch(
+            'mcp_server_opensearch.streaming_server.asyncio.sleep', new_callable=AsyncMock
+        ) as mock_sleep:
+            # Register the session on the first pass and expire it on the second
+            mock_sleep.side_effect = [None, None, asyncio.CancelledError()]
+            app_handler.session_registry.get_or_create('idle-session').last_active -= 1
+            with pytest.raises(asyncio.CancelledError):
+                await app_handler._expire_idle_sessions()
+
+        transport.terminate.assert_awaited_once()
+        assert 'idle-session' not in app_handler.session_manager._server_instances
+        assert app_handler.session_registry.sessions == {}
+    finally:
+        sessions._session_registry = None
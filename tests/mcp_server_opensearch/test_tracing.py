@@ -0,0 +1,137 @@
+# Copyright OpenSearch Contributors
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+import pytest
+from aiohttp import web
+from mcp.types import CallToolRequest, CallToolRequestParams
+from mcp_server_opensearch import tracing
+from mcp_server_opensearch.clusters_information import ClusterInfo, cluster_registry
+from mcp_server_opensearch.global_state import set_mode
+from mcp_server_opensearch.tracing import (
+    ATTR_CLUSTER,
+    ATTR_ENDPOINT,
+    ATTR_TOOL,
+    configure_tracing,
+    shutdown_tracing,
+)
+
+
+@pytest.fixture(autouse=True)
+def clean_tracing():
+    """Stop tracing and reset the clusters after each test."""
+    yield
+    shutdown_tracing()
+    cluster_registry.clear()
+    set_mode('single')
+
+
+def read_spans(path) -> dict:
+    """Read the spans of a trace file by name."""
+    spans = [json.loads(line) for line in path.read_text().splitlines() if line.strip()]
+    return {span['name']: span for span in spans}
+
+
+class TestConfigureTracing:
+    """Tests of configure_tracing."""
+
+    def test_disabled_by_default(self):
+        """Test that the helpers do nothing when tracing is disabled."""
+        assert not tracing.is_tracing_enabled()
+        with tracing.tool_call_span('SearchIndexTool') as call_span:
+            tracing.set_call_cluster(call_span, 'production')
+            with tracing.span('validate_args_for_mode') as current:
+                current.set_attribute(ATTR_TOOL, 'SearchIndexTool')
+            with tracing.trace_response_formatting():
+                tracing.mark_response_received()
+
+    def test_invalid_arguments(self):
+        """Test that an unknown exporter or a missing file path are rejected."""
+        with pytest.raises(ValueError, match='Unknown tracing exporter'):
+            configure_tracing('zipkin')
+        with pytest.raises(ValueError, match='file path'):
+            configure_tracing('file')
+        assert not tracing.is_tracing_enabled()
+
+    def test_file_exporter(self, tmp_path):
+        """Test that spans are written as JSON lines and errors are recorded."""
+        pytest.importorskip('opentelemetry.sdk')
+        path = tmp_path / 'spans.jsonl'
+        configure_tracing('file', str(path))
+        assert tracing.is_tracing_enabled()
+
+        with pytest.raises(RuntimeError):
+            with tracing.tool_call_span('SearchIndexTool'):
+                raise RuntimeError('boom')
+        shutdown_tracing()
+
+        span = read_spans(path)['call_tool']
+        assert span['attributes'][ATTR_TOOL] == 'SearchIndexTool'
+        assert span['status']['status_code'] == 'ERROR'
+        assert not tracing.is_tracing_enabled()
+
+
+class TestToolCallTracing:
+    """Tests of the spans of tool calls."""
+
+    @pytest.mark.asyncio
+    async def test_call_tool_spans(self, tmp_path):
+        """Test the spans of a tool call from the server handler to the OpenSearch request."""
+        pytest.importorskip('opentelemetry.sdk')
+        from mcp_server_opensearch.streaming_server import build_mcp_server
+        from tools.tools import TOOL_REGISTRY
+
+        async def search(request: web.Request) -> web.Response:
+            return web.json_response({'took': 2, 'hits': {'hits': []}})
+
+        app = web.Application()
+        app.router.add_post('/logs-1/_search', search)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+
+        set_mode('multi')
+        cluster_registry['local'] = ClusterInfo(
+            opensearch_url=f'http://127.0.0.1:{port}', opensearch_no_auth=True
+        )
+        path = tmp_path / 'spans.jsonl'
+        configure_tracing('file', str(path))
+
+        server = build_mcp_server({'SearchIndexTool': TOOL_REGISTRY['SearchIndexTool']})
+        request = CallToolRequest(
+            method='tools/call',
+            params=CallToolRequestParams(
+                name='SearchIndexTool',
+                arguments={
+                    'opensearch_cluster_name': 'local',
+                    'index': 'logs-1',
+                    'query': {'query': {'match_all': {}}},
+                },
+            ),
+        )
+        try:
+            result = await server.request_handlers[CallToolRequest](request)
+        finally:
+            await runner.cleanup()
+        shutdown_tracing()
+
+        assert not result.root.isError
+        spans = read_spans(path)
+        assert set(spans) >= {
+            'call_tool',
+            'validate_args_for_mode',
+            'get_opensearch_client',
+            'perform_request',
+            'format_response',
+        }
+        call_span = spans['call_tool']
+        for name, span in spans.items():
+            assert span['context']['trace_id'] == call_span['context']['trace_id']
+            assert span['attributes'][ATTR_TOOL] == 'SearchIndexTool'
+            if name not in ('call_tool', 'validate_args_for_mode'):
+                assert span['parent_id'] == call_span['context']['span_id']
+                assert span['attributes'][ATTR_CLUSTER] == 'local'
+        assert call_span['attributes'][ATTR_CLUSTER] == 'local'
+        assert spans['perform_request']['attributes'][ATTR_ENDPOINT] == '/*/_search'
@@ -0,0 +1,129 @@
+# Copyright OpenSearch Contributors
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import pytest
+import time
+from aiohttp import web
+from mcp_server_opensearch import warmup
+from mcp_server_opensearch.clusters_information import ClusterInfo, cluster_registry
+from mcp_server_opensearch.global_state import set_mode
+from mcp_server_opensearch.warmup import get_warm_version, warm_up_clusters
+from semver import Version
+from unittest.mock import patch
+
+
+@pytest.fixture(autouse=True)
+def clean_state():
+    """Reset the clusters and their readiness after each test."""
+    yield
+    cluster_registry.clear()
+    warmup.cluster_readiness.clear()
+    set_mode('single')
+
+
+async def _start_server(handler):
+    app = web.Application()
+    app.router.add_get('/', handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    return runner, f'http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}'
+
+
+class TestWarmUpClusters:
+    """Tests of warm_up_clusters."""
+
+    @pytest.mark.asyncio
+    async def test_multi_mode_readiness(self):
+        """Test that clusters are warmed up concurrently and failures are recorded."""
+
+        async def info(request: web.Request) -> web.Response:
+            await asyncio.sleep(0.1)
+            return web.json_response({'version': {'number': '2.19.0'}})
+
+        async def hanging(request: web.Request) -> web.Response:
+            await asyncio.sleep(1)
+            return web.json_response({})
+
+        fast_runner, fast_url = await _start_server(info)
+        slow_runner, slow_url = await _start_server(hanging)
+        set_mode('multi')
+        for name in ('first', 'second'):
+            cluster_registry[name] = ClusterInfo(opensearch_url=fast_url, opensearch_no_auth=True)
+        cluster_registry['slow'] = ClusterInfo(opensearch_url=slow_url, opensearch_no_auth=True)
+        cluster_registry['broken'] = ClusterInfo(opensearch_url='not a url')
+        cluster_registry['headers'] = ClusterInfo(
+            opensearch_url=fast_url, opensearch_header_auth=True
+        )
+
+        # Load the client modules first, so their import is not part of the timing
+        import opensearch.client  # noqa: F401
+
+        try:
+            start = time.monotonic()
+            readiness = await warm_up_clusters(timeout=0.5)
+            elapsed = time.monotonic() - start
+        finally:
+            await fast_runner.cleanup()
+            await slow_runner.cleanup()
+
+        assert {name: state.status for name, state in readiness.items()} == {
+            'first': 'ready',
+            'second': 'ready',
+            'slow': 'timeout',
+            'broken': 'failed',
+            'headers': 'skipped',
+        }
+        assert readiness['first'].version == Version.parse('2.19.0')
+        assert 'Invalid OpenSearch URL' in readiness['broken'].error
+        # The clusters were contacted at the same time and the deadline was kept
+        assert elapsed < 1
+        assert readiness['first'].to_dict()['version'] == '2.19.0'
+
+    @pytest.mark.asyncio
+    async def test_version_is_reused_by_tool_calls(self, monkeypatch):
+        """Test that tool calls reuse the version found by the warm-up while it is fresh."""
+        from opensearch.helper import get_opensearch_version
+        from tools.tool_params import baseToolArgs
+
+        async def info(request: web.Request) -> web.Response:
+            return web.json_response({'version': {'number': '3.0.0'}})
+
+        runner, url = await _start_server(info)
+        monkeypatch.setenv('OPENSEARCH_URL', url)
+        monkeypatch.setenv('OPENSEARCH_NO_AUTH', 'true')
+        try:
+            readiness = await warm_up_clusters(timeout=5)
+        finally:
+            await runner.cleanup()
+
+        assert readiness[''].ready
+        with patch('opensearch.client.get_opensearch_client') as mock_get_client:
+            version = await get_opensearch_version(baseToolArgs(opensearch_cluster_name=''))
+        assert version == Version.parse('3.0.0')
+        mock_get_client.assert_not_called()
+
+        now = time.time()
+        monkeypatch.setattr(warmup.time, 'time', lambda: now + warmup.VERSION_TTL + 1)
+        assert get_warm_version('') is None
+
+    @pytest.mark.asyncio
+    async def test_cluster_settings_read_before_thread(self, monkeypatch):
+        """Test that the client thread uses the settings read before a reload swaps them."""
+
+        async def info(request: web.Request) -> web.Response:
+            return web.json_response({'version': {'number': '2.19.0'}})
+
+        runner, url = await _start_server(info)
+        set_mode('multi')
+        cluster_registry['logs'] = ClusterInfo(opensearch_url=url, opensearch_no_auth=True)
+        # A reload clears the registry before it fills it again
+        monkeypatch.setattr('opensearch.client.get_cluster', lambda name: None)
+        try:
+            readiness = await warm_up_clusters(timeout=5)
+        finally:
+            await runner.cleanup()
+
+        assert readiness['logs'].ready
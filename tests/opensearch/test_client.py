@@ -1,11 +1,21 @@
 # Copyright OpenSearch Contributors
 # SPDX-License-Identifier: Apache-2.0
 
+import anyio
+import asyncio
 import boto3
 import os
 import pytest
-from opensearch.client import initialize_client, ConfigurationError, AuthenticationError
-from opensearchpy import AsyncOpenSearch, AsyncHttpConnection, AWSV4SignerAsyncAuth
+from aiohttp import web
+from opensearch.client import (
+    DEFAULT_SERIALIZER,
+    get_opensearch_client,
+    initialize_client,
+    ConfigurationError,
+    AuthenticationError,
+)
+from opensearch.transport import ToolCallConnection, ToolCallTransport
+from opensearchpy import AsyncOpenSearch, AWSV4SignerAsyncAuth
 from tools.tool_params import baseToolArgs
 from unittest.mock import Mock, patch
 
@@ -95,8 +105,10 @@ class TestOpenSearchClient:
             hosts=['https://test-opensearch-domain.com'],
             use_ssl=True,
             verify_certs=True,
-            connection_class=AsyncHttpConnection,
+            connection_class=ToolCallConnection,
             timeout=30,
+            serializer=DEFAULT_SERIALIZER,
+            transport_class=ToolCallTransport,
             http_auth=('test-user', 'test-password'),
         )
 
@@ -137,9 +149,70 @@ class TestOpenSearchClient:
         assert call_kwargs['hosts'] == ['https://test-opensearch-domain.com']
         assert call_kwargs['use_ssl'] is True
         assert call_kwargs['verify_certs'] is True
-        assert call_kwargs['connection_class'] == AsyncHttpConnection
+        assert call_kwargs['connection_class'] == ToolCallConnection
         assert isinstance(call_kwargs['http_auth'], AWSV4SignerAsyncAuth)
 
+    @patch('opensearch.client.AsyncOpenSearch')
+    @patch('opensearch.client.get_aws_region_single_mode')
+    def test_initialize_client_basic_auth_skips_aws_lookup(self, mock_get_region, mock_opensearch):
+        """Test that basic authentication does not resolve an AWS region or session."""
+        os.environ['OPENSEARCH_URL'] = 'https://test-opensearch-domain.com'
+        os.environ['OPENSEARCH_USERNAME'] = 'test-user'
+        os.environ['OPENSEARCH_PASSWORD'] = 'test-password'
+
+        with patch('opensearch.client._create_boto3_session') as mock_create_session:
+            initialize_client(baseToolArgs(opensearch_cluster_name=''))
+
+        mock_get_region.assert_not_called()
+        mock_create_session.assert_not_called()
+        assert mock_opensearch.call_args[1]['http_auth'] == ('test-user', 'test-password')
+
+    @patch('opensearch.client.AsyncOpenSearch')
+    @patch('opensearch.client.boto3.Session')
+    def test_initialize_client_iam_role_credentials_are_reused(
+        self, mock_session, mock_opensearch
+    ):
+        """Test that assumed role credentials are reused until shortly before they expire."""
+        from datetime import datetime, timedelta, timezone
+        from opensearch import client as client_module
+
+        os.environ['AWS_REGION'] = 'us-west-2'
+        os.environ['OPENSEARCH_URL'] = 'https://test-opensearch-domain.com'
+        os.environ['AWS_IAM_ARN'] = 'arn:aws:iam::123456789012:role/CachedRole'
+        mock_sts = mock_session.return_value.client.return_value
+        mock_sts.assume_role.return_value = {
+            'Credentials': {
+                'AccessKeyId': 'role-access-key',
+                'SecretAccessKey': 'role-secret-key',
+                'SessionToken': 'role-token',
+                'Expiration': datetime.now(timezone.utc) + timedelta(hours=1),
+            }
+        }
+
+        try:
+            initialize_client(baseToolArgs(opensearch_cluster_name=''))
+            initialize_client(baseToolArgs(opensearch_cluster_name=''))
+            assert mock_sts.assume_role.call_count == 1
+
+            # Credentials close to expiry are renewed
+            mock_sts.assume_role.return_value['Credentials']['Expiration'] = datetime.now(
+                timezone.utc
+            ) + timedelta(seconds=60)
+            client_module._assumed_role_credentials.clear()
+            initialize_client(baseToolArgs(opensearch_cluster_name=''))
+            initialize_client(baseToolArgs(opensearch_cluster_name=''))
+            assert mock_sts.assume_role.call_count == 3
+        finally:
+            client_module._assumed_role_credentials.clear()
+            del os.environ['AWS_IAM_ARN']
+
+        call_kwargs = mock_opensearch.call_args[1]
+        assert call_kwargs['http_auth'].credentials.access_key == 'role-access-key'
+        # The client knows when its credentials expire, so sessions can renew it
+        assert mock_opensearch.return_value.transport.credentials_expiry == (
+            mock_sts.assume_role.return_value['Credentials']['Expiration'].timestamp()
+        )
+
     @patch('opensearch.client.AsyncOpenSearch')
     @patch('opensearch.client.boto3.Session')
     def test_initialize_client_aws_auth_error(self, mock_session, mock_opensearch):
@@ -201,8 +274,10 @@ class TestOpenSearchClient:
             hosts=['https://test-opensearch-domain.com'],
             use_ssl=True,
             verify_certs=True,
-            connection_class=AsyncHttpConnection,
+            connection_class=ToolCallConnection,
             timeout=30,
+            serializer=DEFAULT_SERIALIZER,
+            transport_class=ToolCallTransport,
         )
 
     @patch('opensearch.client._initialize_client_single_mode')
@@ -270,7 +345,7 @@ class TestOpenSearchClient:
         assert call_kwargs['hosts'] == ['http://localhost:9200']
         assert call_kwargs['use_ssl'] is False  # http:// URL
         assert call_kwargs['verify_certs'] is True
-        assert call_kwargs['connection_class'] == AsyncHttpConnection
+        assert call_kwargs['connection_class'] == ToolCallConnection
         # Should not have http_auth when no-auth is True
         assert 'http_auth' not in call_kwargs
 
@@ -534,3 +609,84 @@ class TestOpenSearchClientContextManager:
 
         # Verify all three clients were created
         assert mock_opensearch.call_count == 3
+
+
+class TestCancellation:
+    """Tests for cancelling in-flight requests when a tool call is cancelled."""
+
+    @pytest.mark.asyncio
+    async def test_cancel_aborts_request_and_server_tasks(self, monkeypatch):
+        """Test that cancelling a tool call aborts the request and cancels its task."""
+        from mcp_server_opensearch.global_state import set_mode
+
+        set_mode('single')
+        search_started = asyncio.Event()
+        search_aborted = asyncio.Event()
+        received = {'cancelled': []}
+
+        async def search(request: web.Request) -> web.Response:
+            received['opaque_id'] = request.headers.get('X-Opaque-Id')
+            search_started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                search_aborted.set()
+                raise
+            return web.json_response({'hits': {'hits': []}})
+
+        async def list_tasks(request: web.Request) -> web.Response:
+            def task(opaque_id, **extra):
+                return {'cancellable': True, 'headers': {'X-Opaque-Id': opaque_id}, **extra}
+
+            return web.json_response(
+                {
+                    'nodes': {
+                        'node1': {
+                            'tasks': {
+                                'node1:1': task(received['opaque_id']),
+                                'node1:2': task(received['opaque_id'], parent_task_id='node1:1'),
+                                'node1:3': task('another-call'),
+                            }
+                        }
+                    }
+                }
+            )
+
+        async def cancel_task(request: web.Request) -> web.Response:
+            received['cancelled'].append(request.match_info['task_id'])
+            return web.json_response({'nodes': {}})
+
+        app = web.Application()
+        app.router.add_post('/test-index/_search', search)
+        app.router.add_get('/_tasks', list_tasks)
+        app.router.add_post('/_tasks/{task_id}/_cancel', cancel_task)
+        # Cancel handlers when the client disconnects, to observe the aborted request
+        runner = web.AppRunner(app, handler_cancellation=True)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        monkeypatch.setenv('OPENSEARCH_URL', f'http://127.0.0.1:{port}')
+        monkeypatch.setenv('OPENSEARCH_NO_AUTH', 'true')
+
+        try:
+            # MCP cancels the tool call through the cancel scope of the request
+            with anyio.CancelScope() as scope:
+                async with get_opensearch_client(
+                    baseToolArgs(opensearch_cluster_name='')
+                ) as client:
+
+                    async def cancel_when_started():
+                        await search_started.wait()
+                        scope.cancel()
+
+                    watcher = asyncio.create_task(cancel_when_started())
+                    await client.search(index='test-index', body={'query': {'match_all': {}}})
+            await watcher
+            await asyncio.wait_for(search_aborted.wait(), 5)
+        finally:
+            await runner.cleanup()
+
+        assert scope.cancelled_caught
+        assert received['opaque_id'].startswith('opensearch-mcp-')
+        assert received['cancelled'] == ['node1:1']
@@ -0,0 +1,174 @@
+# Copyright OpenSearch Contributors
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import pytest
+from aiohttp import web
+from opensearch.deadline import (
+    DeadlineExceededError,
+    apply_deadline,
+    get_remaining_time,
+    tool_deadline,
+)
+from opensearch.transport import ToolCallTransport
+from opensearchpy import AsyncHttpConnection, AsyncOpenSearch
+from opensearchpy.exceptions import ConnectionTimeout
+from semver import Version
+from unittest.mock import patch
+
+
+VERSION = Version.parse('2.19.0')
+
+
+def _millis(value: str) -> int:
+    assert value.endswith('ms')
+    return int(value[:-2])
+
+
+class TestApplyDeadline:
+    """Tests of apply_deadline."""
+
+    def test_without_deadline(self):
+        """Test that requests are left unchanged without a deadline."""
+        params = {'size': 10}
+
+        assert apply_deadline('POST', '/my-index/_search', params, None, None) == (params, None)
+        assert get_remaining_time() is None
+
+    def test_search(self):
+        """Test that searches get the remaining time as HTTP and server-side timeouts."""
+        with tool_deadline(10):
+            params, timeout = apply_deadline(
+                'POST', '/my-index/_search', {'size': 10}, version=VERSION
+            )
+
+        assert 9 < timeout <= 10
+        assert params['size'] == 10
+        assert 8000 < _millis(params['timeout']) <= 9000
+        assert params['cancel_after_time_interval'] == params['timeout']
+
+    def test_search_keeps_explicit_timeouts(self):
+        """Test that explicit timeouts shorter than the deadline are kept."""
+        with tool_deadline(10):
+            params, timeout = apply_deadline(
+                'POST',
+                '/_search',
+                {'timeout': '1s', 'request_timeout': 2},
+                {'query': {'match_all': {}}},
+            )
+            body_timeout_params, _ = apply_deadline(
+                'POST', '/_search', None, {'timeout': '1s'}, version=VERSION
+            )
+
+        assert timeout == 2
+        assert params['timeout'] == '1s'
+        assert 'request_timeout' not in params
+        # A timeout in the search body is not overridden by the query parameter
+        assert 'timeout' not in body_timeout_params
+        assert 'cancel_after_time_interval' in body_timeout_params
+
+    def test_cat_and_other_apis(self):
+        """Test that cluster_manager_timeout is only added where it is supported."""
+        with tool_deadline(10):
+            cat_params, _ = apply_deadline(
+                'GET', '/_cat/indices/my-index', {'format': 'json'}, version=VERSION
+            )
+            count_params, _ = apply_deadline(
+                'GET', '/_cat/count', {'format': 'json'}, version=VERSION
+            )
+            hot_threads_params, timeout = apply_deadline(
+                'GET', '/_nodes/hot_threads', version=VERSION
+            )
+
+        assert 'cluster_manager_timeout' in cat_params
+        assert 'cluster_manager_timeout' not in count_params
+        assert hot_threads_params == {}
+        assert 9 < timeout <= 10
+
+    def test_version_gating(self):
+        """Test that server-side parameters are only added where the version supports them."""
+        with tool_deadline(10):
+            unknown_search, _ = apply_deadline('POST', '/_search')
+            unknown_cat, _ = apply_deadline('GET', '/_cat/indices')
+            old_search, _ = apply_deadline('POST', '/_msearch', version=Version.parse('1.1.0'))
+            new_search, _ = apply_deadline('POST', '/_msearch', version=Version.parse('1.2.0'))
+            old_cat, _ = apply_deadline('GET', '/_cat/shards', version=Version.parse('1.3.0'))
+            explicit_cat, _ = apply_deadline(
+                'GET', '/_cat/shards', {'master_timeout': '1s'}, version=VERSION
+            )
+
+        # Without a known version only the search timeout is sent
+        assert list(unknown_search) == ['timeout']
+        assert unknown_cat == {}
+        assert old_search == {}
+        assert 'cancel_after_time_interval' in new_search
+        assert list(old_cat) == ['master_timeout']
+        assert explicit_cat == {'master_timeout': '1s'}
+
+    def test_nested_deadline_does_not_extend(self):
+        """Test that an inner deadline cannot outlive the outer one."""
+        with tool_deadline(1):
+            with tool_deadline(60):
+                assert get_remaining_time() <= 1
+        assert get_remaining_time() is None
+
+    @pytest.mark.asyncio
+    async def test_deadline_exceeded(self):
+        """Test that no request is sent after the deadline."""
+        with tool_deadline(0.01):
+            await asyncio.sleep(0.02)
+            with pytest.raises(DeadlineExceededError):
+                apply_deadline('GET', '/_cat/indices')
+
+
+class TestToolCallTransportDeadline:
+    """Tests of the deadline applied by ToolCallTransport."""
+
+    @pytest.mark.asyncio
+    async def test_sub_requests_share_deadline(self):
+        """Test that sub-requests of one tool call are deducted from the same budget."""
+        received = []
+
+        async def search(request: web.Request) -> web.Response:
+            received.append(dict(request.query))
+            await asyncio.sleep(0.2)
+            return web.json_response({'hits': {'hits': []}})
+
+        async def slow_indices(request: web.Request) -> web.Response:
+            await asyncio.sleep(2)
+            return web.json_response([])
+
+        app = web.Application()
+        app.router.add_post('/my-index/_search', search)
+        app.router.add_get('/_cat/indices', slow_indices)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        client = AsyncOpenSearch(
+            hosts=[f'http://127.0.0.1:{port}'],
+            connection_class=AsyncHttpConnection,
+            transport_class=ToolCallTransport,
+            max_retries=0,
+        )
+        client.transport.version_key = ''
+
+        try:
+            with (
+                tool_deadline(1),
+                patch.dict('opensearch.helper._looked_up_versions', {'': VERSION}),
+            ):
+                await client.search(index='my-index', body={'query': {'match_all': {}}})
+                await client.search(index='my-index', body={'query': {'match_all': {}}})
+                with pytest.raises(ConnectionTimeout):
+                    await client.cat.indices(format='json')
+        finally:
+            await client.close()
+            await runner.cleanup()
+
+        first, second = (_millis(query['timeout']) for query in received)
+        assert first <= 900
+        # 0.2s of the budget were spent on the first search
+        assert second <= first - 150
+        assert received[1]['cancel_after_time_interval'] == received[1]['timeout']
@@ -237,7 +237,11 @@ class TestOpenSearchHelper:
     @pytest.mark.asyncio
     @patch('opensearch.client.get_opensearch_client')
     async def test_get_opensearch_version(self, mock_get_client):
-        from opensearch.helper import get_opensearch_version
+        from opensearch.helper import (
+            forget_opensearch_versions,
+            get_known_opensearch_version,
+            get_opensearch_version,
+        )
 
         # Setup mock response
         mock_response = {'version': {'number': '2.11.1'}}
@@ -256,6 +260,10 @@ class TestOpenSearchHelper:
         assert str(result) == '2.11.1'
         mock_get_client.assert_called_once_with(args)
         mock_client.info.assert_called_once_with()
+        # The looked up version is known until the cluster configuration changes
+        assert str(get_known_opensearch_version('')) == '2.11.1'
+        forget_opensearch_versions([''])
+        assert get_known_opensearch_version('') is None
 
     @pytest.mark.asyncio
     @patch('opensearch.client.get_opensearch_client')
@@ -518,26 +526,4 @@ class TestOpenSearchHelper:
         assert "count" in result
         assert "0" in result
 
-    def test_normalize_scientific_notation(self):
-        import importlib.util
-        import os
-        spec = importlib.util.spec_from_file_location("helper", os.path.join(os.path.dirname(__file__),
-                                                                             '../../src/opensearch/helper.py'))
-        helper = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(helper)
-        normalize_scientific_notation = helper.normalize_scientific_notation
-        query_dsl = {
-            "query": {
-                "range": {
-                    "timestamp": {
-                        "gte": 1732693003E+3,
-                        "lte": 173.5
-                    }
-                }
-            }
-        }
-        result = normalize_scientific_notation(query_dsl)
-        assert "1732693003000" in json.dumps(result)
-        assert "173.5" in json.dumps(result)
-
        
\ No newline at end of file
@@ -0,0 +1,190 @@
+# Copyright OpenSearch Contributors
+# SPDX-License-Identifier: Apache-2.0
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from opensearch.response_stream import iter_response_text, read_raw_response
+from opensearch.transport import ToolCallConnection, ToolCallTransport
+from opensearchpy import AsyncOpenSearch
+from opensearchpy.exceptions import NotFoundError
+
+
+CAT_BODY = b'index shard prirep segment\n' + b'my-index 0 p _0\n' * 10_000
+HOT_THREADS_BODY = ('::: {node-ü}\n' + '   100.0% cpu usage by thread\n' * 200).encode()
+
+
+def _client(url: str, **kwargs) -> AsyncOpenSearch:
+    return AsyncOpenSearch(
+        hosts=[url],
+        connection_class=ToolCallConnection,
+        transport_class=ToolCallTransport,
+        **kwargs,
+    )
+
+
+@pytest_asyncio.fixture
+async def opensearch_url():
+    """Serve a minimal OpenSearch stand-in on a local port."""
+    received = {}
+
+    async def cat_segments(request: web.Request) -> web.Response:
+        received['query'] = dict(request.query)
+        received['authorization'] = request.headers.get('authorization')
+        return web.Response(body=CAT_BODY, content_type='text/plain')
+
+    async def search(request: web.Request) -> web.Response:
+        received['body'] = await request.text()
+        return web.Response(text='{"took":1,"hits":{"hits":[]}}', content_type='application/json')
+
+    async def hot_threads(request: web.Request) -> web.StreamResponse:
+        response = web.StreamResponse(headers={'content-type': 'text/plain; charset=UTF-8'})
+        await response.prepare(request)
+        # Send the body in odd-sized pieces that split multi-byte characters
+        for start in range(0, len(HOT_THREADS_BODY), 7):
+            await response.write(HOT_THREADS_BODY[start : start + 7])
+        await response.write_eof()
+        return response
+
+    async def missing(request: web.Request) -> web.Response:
+        return web.json_response({'error': 'index_not_found_exception'}, status=404)
+
+    app = web.Application()
+    app.router.add_get('/_cat/segments', cat_segments)
+    app.router.add_post('/_search', search)
+    app.router.add_get('/_nodes/hot_threads', hot_threads)
+    app.router.add_get('/missing/_search', missing)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    try:
+        yield f'http://127.0.0.1:{port}', received
+    finally:
+        await runner.cleanup()
+
+
+class TestReadRawResponse:
+    """Tests for read_raw_response."""
+
+    @pytest.mark.asyncio
+    async def test_read_full_body(self, opensearch_url):
+        """Test that the body is returned as text without parsing."""
+        url, received = opensearch_url
+        client = _client(url, http_auth=('user', 'pass'))
+        try:
+            text, truncated = await read_raw_response(
+                client, 'GET', '/_cat/segments', params={'v': 'true'}
+            )
+        finally:
+            await client.close()
+
+        assert text == CAT_BODY.decode()
+        assert truncated is False
+        assert received['query'] == {'v': 'true'}
+        assert received['authorization'].startswith('Basic ')
+
+    @pytest.mark.asyncio
+    async def test_read_with_max_bytes(self, opensearch_url):
+        """Test that reading stops at max_bytes and reports truncation."""
+        url, _ = opensearch_url
+        client = _client(url)
+        try:
+            text, truncated = await read_raw_response(
+                client, 'GET', '/_cat/segments', max_bytes=100
+            )
+        finally:
+            await client.close()
+
+        assert text == CAT_BODY[:100].decode()
+        assert truncated is True
+
+    @pytest.mark.asyncio
+    async def test_read_with_body(self, opensearch_url):
+        """Test that the request body is serialized with the client serializer."""
+        url, received = opensearch_url
+        client = _client(url)
+        try:
+            text, truncated = await read_raw_response(
+                client, 'POST', '/_search', body={'query': {'match_all': {}}}
+            )
+        finally:
+            await client.close()
+
+        assert text == '{"took":1,"hits":{"hits":[]}}'
+        assert truncated is False
+        assert received['body'] == '{"query":{"match_all":{}}}'
+
+    @pytest.mark.asyncio
+    async def test_read_error_status(self, opensearch_url):
+        """Test that non-2xx responses raise the matching TransportError."""
+        url, _ = opensearch_url
+        client = _client(url)
+        try:
+            with pytest.raises(NotFoundError):
+                await read_raw_response(client, 'GET', '/missing/_search')
+        finally:
+            await client.close()
+
+
+class TestIterResponseText:
+    """Tests for iter_response_text."""
+
+    @pytest.mark.asyncio
+    async def test_iter_line_aligned_chunks(self, opensearch_url):
+        """Test that chunks are decoded incrementally and end on line boundaries."""
+        url, _ = opensearch_url
+        client = _client(url)
+        try:
+            chunks = [
+                chunk
+                async for chunk in iter_response_text(
+                    client, 'GET', '/_nodes/hot_threads', chunk_size=256
+                )
+            ]
+        finally:
+            await client.close()
+
+        assert ''.join(chunks) == HOT_THREADS_BODY.decode()
+        assert len(chunks) > 1
+        assert all(chunk.endswith('\n') for chunk in chunks)
+        assert all(len(chunk) < 2 * 256 for chunk in chunks)
+
+    @pytest.mark.asyncio
+    async def test_iter_error_status(self, opensearch_url):
+        """Test that non-2xx responses raise before any chunk is yielded."""
+        url, _ = opensearch_url
+        client = _client(url)
+        try:
+            with pytest.raises(NotFoundError):
+                async for _ in iter_response_text(client, 'GET', '/missing/_search'):
+                    pass
+        finally:
+            await client.close()
+
+
+class TestTransportPath:
+    """Tests that unparsed responses go through the tool call transport."""
+
+    @pytest.mark.asyncio
+    async def test_requests_are_measured(self, opensearch_url):
+        """Test that raw and streamed requests are recorded like other requests."""
+        from mcp_server_opensearch import metrics
+
+        url, _ = opensearch_url
+        metrics.registry.clear()
+        client = _client(url)
+        try:
+            await read_raw_response(client, 'GET', '/_cat/segments')
+            chunks = iter_response_text(client, 'GET', '/_nodes/hot_threads', chunk_size=256)
+            await chunks.__anext__()
+            # Stop reading after the first chunk
+            await chunks.aclose()
+        finally:
+            await client.close()
+
+        duration = metrics.OPENSEARCH_REQUEST_DURATION
+        assert duration.count('default', 'GET', '/_cat/segments', 'ok') == 1
+        assert duration.count('default', 'GET', '/_nodes/*', 'cancelled') == 1
+        metrics.registry.clear()
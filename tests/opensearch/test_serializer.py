@@ -0,0 +1,66 @@
+# Copyright OpenSearch Contributors
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+import pytest
+from opensearch.serializer import PlainFloatJSONSerializer, plain_float_str
+from opensearchpy.exceptions import SerializationError
+
+
+class TestPlainFloatJSONSerializer:
+    """Tests of PlainFloatJSONSerializer."""
+
+    def setup_method(self):
+        """Setup that runs before each test method."""
+        self.serializer = PlainFloatJSONSerializer()
+
+    def test_plain_float_str(self):
+        """Test float rendering without scientific notation."""
+        assert plain_float_str(1732693003e3) == '1732693003000'
+        assert plain_float_str(173.5) == '173.5'
+        assert plain_float_str(1e20) == '100000000000000000000'
+        assert plain_float_str(1e-7) == '0.0000001'
+        assert plain_float_str(-2.5e-5) == '-0.000025'
+        assert plain_float_str(-0.0) == '0'
+        assert plain_float_str(float('nan')) == 'null'
+        assert plain_float_str(float('inf')) == 'null'
+
+    def test_dumps_normalizes_floats(self):
+        """Test that floats in nested bodies are written in plain notation."""
+        body = {
+            'query': {'range': {'timestamp': {'gte': 1732693003e3, 'lte': 173.5}}},
+            'script': {'params': {'weights': [1e-7, 2.0, 3]}},
+        }
+
+        result = self.serializer.dumps(body)
+
+        assert result == (
+            '{"query":{"range":{"timestamp":{"gte":1732693003000,"lte":173.5}}},'
+            '"script":{"params":{"weights":[0.0000001,2,3]}}}'
+        )
+
+    def test_dumps_without_floats_matches_default(self):
+        """Test that bodies without floats are encoded like the default serializer."""
+        body = {'query': {'terms': {'tag': ['a', 'b', 'ü']}}, 'size': 10, 'flag': True}
+
+        result = self.serializer.dumps(body)
+
+        assert result == json.dumps(body, ensure_ascii=False, separators=(',', ':'))
+
+    def test_dumps_does_not_modify_body(self):
+        """Test that the request body is left untouched."""
+        body = {'range': {'gte': 1e17}}
+
+        self.serializer.dumps(body)
+
+        assert body == {'range': {'gte': 1e17}}
+        assert isinstance(body['range']['gte'], float)
+
+    def test_dumps_string_passthrough(self):
+        """Test that string bodies are sent as-is."""
+        assert self.serializer.dumps('{"gte": 1e+20}') == '{"gte": 1e+20}'
+
+    def test_dumps_unserializable(self):
+        """Test that unserializable values raise SerializationError."""
+        with pytest.raises(SerializationError):
+            self.serializer.dumps({'value': 1.5, 'other': object()})
@@ -662,3 +662,19 @@ def test_yaml_args_description_must_be_string():
         assert 'must be a string' in str(e)
 
     os.remove(config_path)
+
+
+def test_call_timeout_from_yaml_and_cli():
+    """Test that a per-tool call_timeout can be set in the config file or on the CLI."""
+    config_path = 'test_temp_config.yml'
+    with open(config_path, 'w') as f:
+        yaml.dump({'tools': {'SearchIndexTool': {'call_timeout': 20}}}, f)
+
+    yaml_registry = apply_custom_tool_config(copy.deepcopy(MOCK_TOOL_REGISTRY), config_path, {})
+    os.remove(config_path)
+    cli_registry = apply_custom_tool_config(
+        copy.deepcopy(MOCK_TOOL_REGISTRY), '', {'tool.SearchIndexTool.call_timeout': '7.5'}
+    )
+
+    assert yaml_registry['SearchIndexTool']['call_timeout'] == 20
+    assert cli_registry['SearchIndexTool']['call_timeout'] == 7.5
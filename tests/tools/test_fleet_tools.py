@@ -0,0 +1,259 @@
+# Copyright OpenSearch Contributors
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from mcp_server_opensearch import admission
+from mcp_server_opensearch.admission import AdmissionConfig, AdmissionController
+from mcp_server_opensearch.clusters_information import ClusterInfo, cluster_registry
+from mcp_server_opensearch.global_state import set_mode
+from opensearch.fanout import fan_out
+from tools.fleet_tools import (
+    FleetAllocationArgs,
+    FleetHealthArgs,
+    FleetNodeStatsArgs,
+    fleet_allocation_tool,
+    fleet_health_tool,
+    fleet_node_stats_tool,
+    select_clusters,
+    summarize_allocation,
+    summarize_nodes_stats,
+)
+
+
+ALLOCATION = [
+    {'shards': '10', 'disk.percent': '91', 'node': 'node-1'},
+    {'shards': '12', 'disk.percent': '40', 'node': 'node-2'},
+    {'shards': '3', 'disk.percent': None, 'node': 'UNASSIGNED'},
+]
+
+NODES_STATS = {
+    'nodes': {
+        'a1': {
+            'name': 'node-1',
+            'jvm': {'mem': {'heap_used_percent': 92}},
+            'os': {'cpu': {'percent': 20, 'load_average': {'1m': 1.5}}},
+            'fs': {'total': {'total_in_bytes': 100, 'available_in_bytes': 60}},
+        },
+        'b2': {
+            'name': 'node-2',
+            'jvm': {'mem': {'heap_used_percent': 40}},
+            'os': {'cpu': {'percent': 95, 'load_average': {'1m': 3.0}}},
+            'fs': {'total': {'total_in_bytes': 100, 'available_in_bytes': 50}},
+        },
+    }
+}
+
+
+async def start_cluster(status: str, delay: float = 0.0):
+    """Start a fake cluster that answers the fleet tool requests."""
+
+    async def health(request: web.Request) -> web.Response:
+        await asyncio.sleep(delay)
+        return web.json_response(
+            {
+                'status': status,
+                'number_of_nodes': 3,
+                'number_of_data_nodes': 2,
+                'active_shards': 20,
+                'unassigned_shards': 0 if status == 'green' else 4,
+                'relocating_shards': 0,
+                'initializing_shards': 0,
+                'number_of_pending_tasks': 0,
+            }
+        )
+
+    async def allocation(request: web.Request) -> web.Response:
+        return web.json_response(ALLOCATION)
+
+    async def nodes_stats(request: web.Request) -> web.Response:
+        return web.json_response(NODES_STATS)
+
+    app = web.Application()
+    app.router.add_get('/_cluster/health', health)
+    app.router.add_get('/_cat/allocation', allocation)
+    app.router.add_get('/_nodes/stats/{metric}', nodes_stats)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    return runner, f'http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}'
+
+
+@pytest_asyncio.fixture
+async def fleet():
+    """Register a green, a yellow, a slow and an unreachable cluster."""
+    set_mode('multi')
+    runners = []
+    for name, status, delay, groups in (
+        ('green-1', 'green', 0, ['prod']),
+        ('yellow-1', 'yellow', 0, ['prod', 'eu']),
+        ('slow-1', 'green', 2, None),
+    ):
+        runner, url = await start_cluster(status, delay)
+        runners.append(runner)
+        cluster_registry[name] = ClusterInfo(
+            opensearch_url=url, opensearch_no_auth=True, groups=groups
+        )
+    cluster_registry['down-1'] = ClusterInfo(
+        opensearch_url='http://127.0.0.1:1', opensearch_no_auth=True, timeout=1
+    )
+    yield
+    cluster_registry.clear()
+    set_mode('single')
+    for runner in runners:
+        await runner.cleanup()
+
+
+class TestSelectClusters:
+    """Tests for select_clusters."""
+
+    def test_selection(self):
+        """Test selecting clusters by name and group."""
+        set_mode('multi')
+        cluster_registry['b'] = ClusterInfo(opensearch_url='http://b', groups=['prod'])
+        cluster_registry['a'] = ClusterInfo(opensearch_url='http://a')
+        try:
+            assert select_clusters(FleetHealthArgs()) == ['a', 'b']
+            assert select_clusters(FleetHealthArgs(clusters=['b'])) == ['b']
+            assert select_clusters(FleetHealthArgs(group='prod')) == ['b']
+            with pytest.raises(ValueError, match='Unknown clusters: c'):
+                select_clusters(FleetHealthArgs(clusters=['c']))
+            with pytest.raises(ValueError, match='No configured cluster is in group dev'):
+                select_clusters(FleetHealthArgs(group='dev'))
+        finally:
+            cluster_registry.clear()
+            set_mode('single')
+
+    def test_single_mode(self):
+        """Test that single mode queries its one cluster."""
+        set_mode('single')
+        assert select_clusters(FleetHealthArgs()) == ['']
+
+
+class TestSummaries:
+    """Tests for the summaries of the cluster responses."""
+
+    def test_allocation(self):
+        """Test that the allocation summary finds the fullest node and unassigned shards."""
+        summary = summarize_allocation(ALLOCATION, disk_threshold=85)
+
+        assert summary == {
+            'nodes': 2,
+            'shards': 22,
+            'unassigned': 3,
+            'max_disk_percent': 91.0,
+            'fullest_node': 'node-1',
+            'nodes_over_threshold': 1,
+        }
+
+    def test_nodes_stats(self):
+        """Test that nodes above any threshold are reported."""
+        summary = summarize_nodes_stats(
+            NODES_STATS, heap_threshold=85, cpu_threshold=90, disk_threshold=85
+        )
+
+        assert summary['max_heap_percent'] == 92
+        assert summary['max_cpu_percent'] == 95
+        assert summary['max_disk_percent'] == 50
+        assert summary['max_load_1m'] == 3.0
+        assert summary['hot_nodes'] == 'node-1,node-2'
+
+
+class TestFleetTools:
+    """Tests for the fleet tools against fake clusters."""
+
+    @pytest.mark.asyncio
+    async def test_health(self, fleet):
+        """Test that every cluster gets a row, with errors for unreachable clusters."""
+        result = await fleet_health_tool(FleetHealthArgs(cluster_timeout=1))
+        text = result[0]['text']
+        lines = text.splitlines()
+
+        assert lines[0] == 'Cluster health of 4 clusters: 1 with problems, 2 not reachable'
+        assert lines[1].startswith('cluster | status | nodes')
+        rows = {line.split(' | ')[0]: line.split(' | ') for line in lines[2:]}
+        assert set(rows) == {'down-1', 'green-1', 'slow-1', 'yellow-1'}
+        assert rows['green-1'][1] == 'green' and rows['green-1'][-1] == '-'
+        assert rows['yellow-1'][1] == 'yellow'
+        assert rows['slow-1'][-1] == 'no answer within 1.0s'
+        assert rows['down-1'][1] == '-' and rows['down-1'][-1] != '-'
+
+    @pytest.mark.asyncio
+    async def test_problems_only_and_group(self, fleet):
+        """Test that only clusters with problems of the group are listed."""
+        result = await fleet_health_tool(FleetHealthArgs(group='prod', problems_only=True))
+        lines = result[0]['text'].splitlines()
+
+        assert lines[0] == 'Cluster health of 2 clusters: 1 with problems, 0 not reachable'
+        assert [line.split(' | ')[0] for line in lines[2:]] == ['yellow-1']
+
+    @pytest.mark.asyncio
+    async def test_allocation_and_node_stats(self, fleet):
+        """Test the allocation and node statistics tables."""
+        allocation = await fleet_allocation_tool(FleetAllocationArgs(clusters=['green-1']))
+        node_stats = await fleet_node_stats_tool(
+            FleetNodeStatsArgs(clusters=['green-1'], heap_threshold=95, cpu_threshold=99)
+        )
+
+        allocation_row = allocation[0]['text'].splitlines()[2].split(' | ')
+        assert allocation_row[:7] == ['green-1', '2', '22', '3', '91.0', 'node-1', '1']
+        node_row = node_stats[0]['text'].splitlines()[2].split(' | ')
+        assert node_row[:7] == ['green-1', '2', '92', '95', '50.0', '3.0', '-']
+        assert '0 with problems' in node_stats[0]['text']
+
+    @pytest.mark.asyncio
+    async def test_unknown_cluster(self, fleet):
+        """Test that an unknown cluster name is reported as an error."""
+        result = await fleet_health_tool(FleetHealthArgs(clusters=['missing']))
+
+        assert result[0]['text'] == 'Error getting cluster health: Unknown clusters: missing'
+
+    @pytest.mark.asyncio
+    async def test_admission_per_cluster(self, fleet):
+        """Test that every cluster request is admitted through the limit of its cluster."""
+        controller = AdmissionController(
+            AdmissionConfig(cluster_concurrency=1, queue_size=0, queue_timeout=0)
+        )
+        admission._admission_controller = controller
+        try:
+            # A call running on green-1 uses up its only permit
+            async with controller.admit('SearchIndexTool', 'green-1'):
+                result = await fleet_health_tool(
+                    FleetHealthArgs(opensearch_cluster_name='', clusters=['green-1', 'yellow-1'])
+                )
+        finally:
+            admission._admission_controller = None
+
+        rows = {
+            line.split(' | ')[0]: line.split(' | ') for line in result[0]['text'].splitlines()[2:]
+        }
+        assert 'queue_full' in rows['green-1'][-1]
+        assert rows['yellow-1'][1] == 'yellow'
+        stats = controller.stats()['clusters']
+        assert stats['yellow-1']['admitted'] == 1
+        # The fleet call itself holds no cluster permit
+        assert set(stats) == {'green-1', 'yellow-1'}
+
+    @pytest.mark.asyncio
+    async def test_concurrency_cap(self):
+        """Test that at most max_concurrency clusters are queried at the same time."""
+        running = peak = 0
+
+        async def fetch(args):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return {'status': 'green'}
+
+        results = await fan_out(
+            [f'c{i}' for i in range(10)], fetch, dict, max_concurrency=3, cluster_timeout=1
+        )
+
+        assert peak == 3
+        assert [result.cluster for result in results] == [f'c{i}' for i in range(10)]
+        assert all(result.error is None for result in results)
@@ -7,6 +7,7 @@ import asyncio
 import sys
 import os
 import pytest
+from unittest.mock import AsyncMock, Mock, patch
 
 # Add the src directory to the path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
@@ -101,6 +102,42 @@ async def test_generic_tool():
         print()
 
 
+@pytest.mark.asyncio
+async def test_generic_tool_raw_mode():
+    """Test that raw mode forwards the unparsed body and reports truncation."""
+    mock_client = Mock()
+    mock_client.transport.perform_request = AsyncMock()
+    mock_client.close = AsyncMock()
+
+    with (
+        patch('opensearch.client.initialize_client', return_value=mock_client),
+        patch(
+            'tools.generic_api_tool.read_raw_response',
+            new=AsyncMock(return_value=('index shard\nmy-index 0\n', True)),
+        ) as mock_read_raw,
+    ):
+        args = GenericOpenSearchApiArgs(
+            opensearch_cluster_name='',
+            path='/_cat/shards',
+            method='GET',
+            query_params={'v': True},
+            raw=True,
+            max_bytes=20,
+        )
+        result = await generic_opensearch_api_tool(args)
+
+    text = result[0]['text']
+    assert text.startswith(
+        "OpenSearch API Response (GET /_cat/shards) with query params: {'v': True}:\n"
+    )
+    assert 'index shard\nmy-index 0\n' in text
+    assert text.endswith('[Response truncated after 20 bytes (max_bytes)]')
+    mock_read_raw.assert_awaited_once_with(
+        mock_client, max_bytes=20, method='GET', url='/_cat/shards?v=True'
+    )
+    mock_client.transport.perform_request.assert_not_called()
+
+
 if __name__ == '__main__':
     print('Testing GenericOpenSearchApiTool...')
     print('Note: This test requires a running OpenSearch instance and proper configuration.')
@@ -13,7 +13,7 @@ class TestSkillsTools:
         """Setup that runs before each test method."""
         # Create a properly configured mock client
         self.mock_client = Mock()
-        
+
         # Configure mock client methods to return proper data structures
         # Use AsyncMock for async methods
         self.mock_client.transport.perform_request = AsyncMock(return_value={})
@@ -58,23 +58,22 @@ class TestSkillsTools:
     async def test_call_opensearch_tool_success(self):
         """Test call_opensearch_tool successful execution."""
         # Setup
-        mock_response = {
-            'status': 'success',
-            'result': {'analysis': 'data distribution complete'}
-        }
+        mock_response = {'status': 'success', 'result': {'analysis': 'data distribution complete'}}
         self.mock_client.transport.perform_request.return_value = mock_response
-        
+
         args = self.DataDistributionToolArgs(
             index='test-index',
             selectionTimeRangeStart='2023-01-01T00:00:00Z',
             selectionTimeRangeEnd='2023-01-02T00:00:00Z',
             timeField='@timestamp',
-            opensearch_cluster_name=''
+            opensearch_cluster_name='',
         )
-        
+
         # Execute
-        result = await self._call_opensearch_tool('DataDistributionTool', {'index': 'test-index'}, args)
-        
+        result = await self._call_opensearch_tool(
+            'DataDistributionTool', {'index': 'test-index'}, args
+        )
+
         # Assert
         assert len(result) == 1
         assert result[0]['type'] == 'text'
@@ -83,7 +82,7 @@ class TestSkillsTools:
         self.mock_client.transport.perform_request.assert_called_once_with(
             'POST',
             '/_plugins/_ml/tools/_execute/DataDistributionTool',
-            body={'parameters': {'index': 'test-index'}}
+            body={'parameters': {'index': 'test-index'}},
         )
 
     @pytest.mark.asyncio
@@ -91,61 +90,110 @@ class TestSkillsTools:
         """Test call_opensearch_tool exception handling."""
         # Setup
         self.mock_client.transport.perform_request.side_effect = Exception('Test error')
-        
+
         args = self.DataDistributionToolArgs(
             index='test-index',
             selectionTimeRangeStart='2023-01-01T00:00:00Z',
             selectionTimeRangeEnd='2023-01-02T00:00:00Z',
             timeField='@timestamp',
-            opensearch_cluster_name=''
+            opensearch_cluster_name='',
         )
-        
+
         # Execute
-        result = await self._call_opensearch_tool('DataDistributionTool', {'index': 'test-index'}, args)
-        
+        result = await self._call_opensearch_tool(
+            'DataDistributionTool', {'index': 'test-index'}, args
+        )
+
         # Assert
         assert len(result) == 1
         assert result[0]['type'] == 'text'
         assert 'Error executing DataDistributionTool: Test error' in result[0]['text']
 
+    @pytest.mark.asyncio
+    async def test_call_opensearch_tool_without_ml_plugin(self):
+        """Test that call_opensearch_tool fails locally without the ML Commons plugin."""
+        from mcp_server_opensearch import capabilities
+
+        self.mock_client.cat.plugins = AsyncMock(return_value=[])
+        args = self.DataDistributionToolArgs(
+            index='test-index',
+            selectionTimeRangeStart='2023-01-01T00:00:00Z',
+            selectionTimeRangeEnd='2023-01-02T00:00:00Z',
+            timeField='@timestamp',
+            opensearch_cluster_name='',
+        )
+        try:
+            result = await self._call_opensearch_tool(
+                'DataDistributionTool', {'index': 'test-index'}, args
+            )
+        finally:
+            capabilities._installed_plugins.clear()
+
+        assert 'requires the OpenSearch plugin opensearch-ml' in result[0]['text']
+        self.mock_client.transport.perform_request.assert_not_called()
+        # No version lookup is added to the call
+        self.mock_client.info.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_call_opensearch_tool_cached_version_too_old(self):
+        """Test that a cached version below the minimum rejects the call locally."""
+        from semver import Version
+
+        args = self.DataDistributionToolArgs(
+            index='test-index',
+            selectionTimeRangeStart='2023-01-01T00:00:00Z',
+            selectionTimeRangeEnd='2023-01-02T00:00:00Z',
+            timeField='@timestamp',
+            opensearch_cluster_name='',
+        )
+        with patch(
+            'tools.tools.get_cached_opensearch_version', return_value=Version.parse('2.19.0')
+        ):
+            result = await self._call_opensearch_tool(
+                'DataDistributionTool', {'index': 'test-index'}, args
+            )
+
+        assert 'is not supported for this OpenSearch version' in result[0]['text']
+        self.mock_client.transport.perform_request.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_data_distribution_tool_minimal_params(self):
         """Test data_distribution_tool with minimal required parameters."""
         # Setup
         mock_response = {
             'status': 'success',
-            'result': {'field_distributions': {'field1': {'count': 100}}}
+            'result': {'field_distributions': {'field1': {'count': 100}}},
         }
         self.mock_client.transport.perform_request.return_value = mock_response
-        
+
         args = self.DataDistributionToolArgs(
             index='test-index',
             selectionTimeRangeStart='2023-01-01T00:00:00Z',
             selectionTimeRangeEnd='2023-01-02T00:00:00Z',
             timeField='@timestamp',
-            opensearch_cluster_name=''
+            opensearch_cluster_name='',
         )
-        
+
         # Execute
         result = await self._data_distribution_tool(args)
-        
+
         # Assert
         assert len(result) == 1
         assert result[0]['type'] == 'text'
         assert 'DataDistributionTool result:' in result[0]['text']
-        
+
         # Verify the correct parameters were passed
         expected_params = {
             'index': 'test-index',
             'timeField': '@timestamp',
             'selectionTimeRangeStart': '2023-01-01T00:00:00Z',
             'selectionTimeRangeEnd': '2023-01-02T00:00:00Z',
-            'size': 1000
+            'size': 1000,
         }
         self.mock_client.transport.perform_request.assert_called_once_with(
             'POST',
             '/_plugins/_ml/tools/_execute/DataDistributionTool',
-            body={'parameters': expected_params}
+            body={'parameters': expected_params},
         )
 
     @pytest.mark.asyncio
@@ -154,7 +202,7 @@ class TestSkillsTools:
         # Setup
         mock_response = {'status': 'success', 'result': {}}
         self.mock_client.transport.perform_request.return_value = mock_response
-        
+
         args = self.DataDistributionToolArgs(
             index='test-index',
             selectionTimeRangeStart='2023-01-01T00:00:00Z',
@@ -163,12 +211,12 @@ class TestSkillsTools:
             baselineTimeRangeStart='2022-12-01T00:00:00Z',
             baselineTimeRangeEnd='2022-12-02T00:00:00Z',
             size=500,
-            opensearch_cluster_name=''
+            opensearch_cluster_name='',
         )
-        
+
         # Execute
         result = await self._data_distribution_tool(args)
-        
+
         # Assert
         expected_params = {
             'index': 'test-index',
@@ -177,12 +225,12 @@ class TestSkillsTools:
             'selectionTimeRangeEnd': '2023-01-02T00:00:00Z',
             'size': 500,
             'baselineTimeRangeStart': '2022-12-01T00:00:00Z',
-            'baselineTimeRangeEnd': '2022-12-02T00:00:00Z'
+            'baselineTimeRangeEnd': '2022-12-02T00:00:00Z',
         }
         self.mock_client.transport.perform_request.assert_called_once_with(
             'POST',
             '/_plugins/_ml/tools/_execute/DataDistributionTool',
-            body={'parameters': expected_params}
+            body={'parameters': expected_params},
         )
 
     @pytest.mark.asyncio
@@ -191,38 +239,38 @@ class TestSkillsTools:
         # Setup
         mock_response = {
             'status': 'success',
-            'result': {'patterns': [{'pattern': 'ERROR', 'count': 10}]}
+            'result': {'patterns': [{'pattern': 'ERROR', 'count': 10}]},
         }
         self.mock_client.transport.perform_request.return_value = mock_response
-        
+
         args = self.LogPatternAnalysisToolArgs(
             index='logs-index',
             logFieldName='message',
             selectionTimeRangeStart='2023-01-01T00:00:00Z',
             selectionTimeRangeEnd='2023-01-02T00:00:00Z',
             timeField='@timestamp',
-            opensearch_cluster_name=''
+            opensearch_cluster_name='',
         )
-        
+
         # Execute
         result = await self._log_pattern_analysis_tool(args)
-        
+
         # Assert
         assert len(result) == 1
         assert result[0]['type'] == 'text'
         assert 'LogPatternAnalysisTool result:' in result[0]['text']
-        
+
         expected_params = {
             'index': 'logs-index',
             'timeField': '@timestamp',
             'logFieldName': 'message',
             'selectionTimeRangeStart': '2023-01-01T00:00:00Z',
-            'selectionTimeRangeEnd': '2023-01-02T00:00:00Z'
+            'selectionTimeRangeEnd': '2023-01-02T00:00:00Z',
         }
         self.mock_client.transport.perform_request.assert_called_once_with(
             'POST',
             '/_plugins/_ml/tools/_execute/LogPatternAnalysisTool',
-            body={'parameters': expected_params}
+            body={'parameters': expected_params},
         )
 
     @pytest.mark.asyncio
@@ -231,7 +279,7 @@ class TestSkillsTools:
         # Setup
         mock_response = {'status': 'success', 'result': {}}
         self.mock_client.transport.perform_request.return_value = mock_response
-        
+
         args = self.LogPatternAnalysisToolArgs(
             index='logs-index',
             logFieldName='message',
@@ -241,12 +289,12 @@ class TestSkillsTools:
             traceFieldName='trace_id',
             baseTimeRangeStart='2022-12-01T00:00:00Z',
             baseTimeRangeEnd='2022-12-02T00:00:00Z',
-            opensearch_cluster_name=''
+            opensearch_cluster_name='',
         )
-        
+
         # Execute
         result = await self._log_pattern_analysis_tool(args)
-        
+
         # Assert
         expected_params = {
             'index': 'logs-index',
@@ -256,12 +304,12 @@ class TestSkillsTools:
             'selectionTimeRangeEnd': '2023-01-02T00:00:00Z',
             'traceFieldName': 'trace_id',
             'baseTimeRangeStart': '2022-12-01T00:00:00Z',
-            'baseTimeRangeEnd': '2022-12-02T00:00:00Z'
+            'baseTimeRangeEnd': '2022-12-02T00:00:00Z',
         }
         self.mock_client.transport.perform_request.assert_called_once_with(
             'POST',
             '/_plugins/_ml/tools/_execute/LogPatternAnalysisTool',
-            body={'parameters': expected_params}
+            body={'parameters': expected_params},
         )
 
     def test_skills_tools_registry(self):
@@ -289,7 +337,7 @@ class TestSkillsTools:
             selectionTimeRangeStart='2023-01-01T00:00:00Z',
             selectionTimeRangeEnd='2023-01-02T00:00:00Z',
             timeField='@timestamp',
-            opensearch_cluster_name=''
+            opensearch_cluster_name='',
         )
         assert args.index == 'test-index'
         assert args.timeField == '@timestamp'
@@ -302,7 +350,7 @@ class TestSkillsTools:
             selectionTimeRangeEnd='2023-01-02T00:00:00Z',
             timeField='@timestamp',
             size=500,
-            opensearch_cluster_name=''
+            opensearch_cluster_name='',
         )
         assert args_custom.size == 500
 
@@ -315,7 +363,7 @@ class TestSkillsTools:
             selectionTimeRangeStart='2023-01-01T00:00:00Z',
             selectionTimeRangeEnd='2023-01-02T00:00:00Z',
             timeField='@timestamp',
-            opensearch_cluster_name=''
+            opensearch_cluster_name='',
         )
         assert args.index == 'logs-index'
         assert args.logFieldName == 'message'
@@ -332,7 +380,7 @@ class TestSkillsTools:
             traceFieldName='trace_id',
             baseTimeRangeStart='2022-12-01T00:00:00Z',
             baseTimeRangeEnd='2022-12-02T00:00:00Z',
-            opensearch_cluster_name=''
+            opensearch_cluster_name='',
         )
         assert args_full.traceFieldName == 'trace_id'
         assert args_full.baseTimeRangeStart == '2022-12-01T00:00:00Z'
@@ -343,6 +391,6 @@ class TestSkillsTools:
         with pytest.raises(ValueError):
             self.DataDistributionToolArgs(opensearch_cluster_name='')  # Missing required fields
 
-        # Test LogPatternAnalysisToolArgs - should fail without required fields  
+        # Test LogPatternAnalysisToolArgs - should fail without required fields
         with pytest.raises(ValueError):
-            self.LogPatternAnalysisToolArgs(opensearch_cluster_name='')  # Missing required fields
\ No newline at end of file
+            self.LogPatternAnalysisToolArgs(opensearch_cluster_name='')  # Missing required fields
@@ -0,0 +1,74 @@
+# Copyright OpenSearch Contributors
+# SPDX-License-Identifier: Apache-2.0
+
+import pytest
+from mcp.types import RequestParams
+from tools.streaming import stream_text_content
+from unittest.mock import AsyncMock, Mock, patch
+
+
+async def _chunks(*items):
+    for item in items:
+        yield item
+
+
+class TestStreamTextContent:
+    """Tests for stream_text_content."""
+
+    @pytest.mark.asyncio
+    async def test_chunked_content_without_progress_token(self):
+        """Test that the chunks are joined into the result outside of a progress request."""
+        result = await stream_text_content(_chunks('a\nb\n', 'c\n'), 'Response')
+
+        assert result == [{'type': 'text', 'text': 'Response:\na\nb\nc\n'}]
+
+    @pytest.mark.asyncio
+    async def test_truncated_after_max_bytes(self):
+        """Test that the response is cut off in bytes and no longer read after max_bytes."""
+        read = []
+
+        async def chunks():
+            for item in ('abc\n', 'dé\n', 'ghi\n'):
+                read.append(item)
+                yield item
+
+        result = await stream_text_content(chunks(), 'Response', max_bytes=6)
+
+        # é takes two bytes, so only 'd' of the second chunk fits
+        assert result == [
+            {
+                'type': 'text',
+                'text': 'Response:\nabc\nd\n[Response truncated after 6 bytes (max_bytes)]',
+            }
+        ]
+        assert read == ['abc\n', 'dé\n']
+
+    @pytest.mark.asyncio
+    async def test_progress_notifications_with_progress_token(self):
+        """Test that chunks are mirrored as progress notifications when a token is given."""
+        context = Mock()
+        context.meta = RequestParams.Meta(progressToken='token-1')
+        context.request_id = 7
+        context.session.send_progress_notification = AsyncMock()
+
+        with patch('tools.streaming.request_ctx') as mock_request_ctx:
+            mock_request_ctx.get.return_value = context
+            result = await stream_text_content(_chunks('a\nb\n', 'c\n'), 'Response')
+
+        # The result holds the content too, as clients may not show progress messages
+        assert result == [{'type': 'text', 'text': 'Response:\na\nb\nc\n'}]
+        calls = context.session.send_progress_notification.await_args_list
+        assert [call.kwargs for call in calls] == [
+            {
+                'progress_token': 'token-1',
+                'progress': 4,
+                'message': 'a\nb\n',
+                'related_request_id': 7,
+            },
+            {
+                'progress_token': 'token-1',
+                'progress': 6,
+                'message': 'c\n',
+                'related_request_id': 7,
+            },
+        ]
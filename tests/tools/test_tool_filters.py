@@ -1,7 +1,7 @@
 import pytest
 from semver import Version
 from unittest.mock import patch, MagicMock
-from tools.utils import is_tool_compatible
+from tools.utils import is_tool_compatible, missing_plugins
 from tools.tool_filter import get_tools, process_tool_filter
 from tools.tool_params import baseToolArgs
 import copy
@@ -24,6 +24,7 @@ MOCK_TOOL_REGISTRY = {
             'type': 'object',
             'properties': {
                 'opensearch_cluster_name': {'type': 'string'},
+                'call_timeout': {'type': 'number'},
                 'query': {'type': 'object'},
             },
         },
@@ -45,6 +46,7 @@ MOCK_TOOL_REGISTRY = {
         'function': MagicMock(),
         'args_model': MagicMock(),
         'min_version': '3.3.0',
+        'required_plugins': ['opensearch-ml'],
         'http_methods': 'POST',
     },
     'LogPatternAnalysisTool': {
@@ -60,6 +62,7 @@ MOCK_TOOL_REGISTRY = {
         'function': MagicMock(),
         'args_model': MagicMock(),
         'min_version': '3.3.0',
+        'required_plugins': ['opensearch-ml'],
         'http_methods': 'POST',
     },
 }
@@ -106,6 +109,24 @@ class TestIsToolCompatible:
             is_tool_compatible(Version.parse('1.0.0'), {'max_version': 'not_a_version'})
 
 
+class TestMissingPlugins:
+    """Test cases for the missing_plugins function."""
+
+    def test_missing_plugin(self):
+        """Test that required plugins absent from the cluster are reported."""
+        tool_info = {'required_plugins': ['opensearch-ml']}
+        assert missing_plugins(['query-insights'], tool_info) == ['opensearch-ml']
+        assert missing_plugins(['opensearch-ml', 'query-insights'], tool_info) == []
+
+    def test_unknown_plugins_never_block(self):
+        """Test that a tool is not blocked when the plugins could not be looked up."""
+        assert missing_plugins(None, {'required_plugins': ['opensearch-ml']}) == []
+
+    def test_tool_without_required_plugins(self):
+        """Test that a tool without required plugins is never blocked."""
+        assert missing_plugins([], {'min_version': '1.0.0'}) == []
+
+
 class TestGetTools:
     """Test cases for the get_tools function."""
 
@@ -242,6 +263,8 @@ class TestGetTools:
                 'opensearch_cluster_name'
                 not in result['SearchIndexTool']['input_schema']['properties']
             )
+            # The call deadline stays available to clients in single mode
+            assert 'call_timeout' in result['SearchIndexTool']['input_schema']['properties']
 
     @pytest.mark.asyncio
     async def test_get_tools_skills_tools_version_filtering(self, mock_tool_registry, mock_patches):
@@ -288,6 +311,20 @@ class TestGetTools:
             assert 'ListIndexTool' in result
             assert 'SearchIndexTool' in result
 
+    @pytest.mark.asyncio
+    async def test_get_tools_hides_tools_without_plugin(self, mock_tool_registry, mock_patches):
+        """Test that tools whose plugin is not installed are not listed."""
+        mock_get_version, mock_is_compatible = mock_patches
+        mock_get_version.return_value = Version.parse('3.5.0')
+        mock_is_compatible.return_value = True
+
+        with patch('tools.tool_filter.TOOL_REGISTRY', mock_tool_registry):
+            result = await get_tools(mock_tool_registry, installed_plugins=['query-insights'])
+
+            assert 'DataDistributionTool' not in result
+            assert 'LogPatternAnalysisTool' not in result
+            assert 'ListIndexTool' in result
+
     @pytest.mark.asyncio
     async def test_get_tools_logs_version_info(self, mock_tool_registry, mock_patches, caplog):
         """Test that get_tools logs version information in single mode."""
@@ -289,3 +289,26 @@ class TestToolGenerator:
                     assert 'input_schema' in result['ClusterHealthTool']
                     assert 'function' in result['ClusterHealthTool']
                     assert 'args_model' in result['ClusterHealthTool']
+
+    @pytest.mark.asyncio
+    async def test_generate_tools_fetches_specs_concurrently(self):
+        """Test that the spec files are fetched at the same time and a failure is isolated."""
+        import asyncio
+        import time
+
+        async def fetch(file_name):
+            await asyncio.sleep(0.2)
+            if file_name == '_core.yaml':
+                raise ConnectionError('unreachable')
+            return self.mock_spec
+
+        with (
+            patch('tools.tool_generator.fetch_github_spec', side_effect=fetch),
+            patch.dict('tools.tool_generator.TOOL_REGISTRY', clear=True),
+        ):
+            start = time.monotonic()
+            result = await self.generate_tools_from_openapi()
+            elapsed = time.monotonic() - start
+
+            assert {'ClusterHealthTool', 'CountTool'} <= set(result)
+        assert elapsed < 0.2 * len(self.SPEC_FILES)
@@ -109,7 +109,10 @@ class TestTools:
 
     def teardown_method(self):
         """Cleanup after each test method."""
+        from opensearch.helper import _looked_up_versions
+
         self.init_client_patcher.stop()
+        _looked_up_versions.clear()
 
     @pytest.mark.asyncio
     async def test_list_indices_tool_default_full(self):
@@ -835,6 +838,29 @@ class TestTools:
             method='GET', url='/_insights/top_queries'
         )
 
+    @pytest.mark.asyncio
+    async def test_get_query_insights_tool_without_plugin(self):
+        """Test that get_query_insights_tool fails locally without the plugin."""
+        from mcp_server_opensearch import capabilities
+
+        self.mock_client.cat.plugins = AsyncMock(
+            return_value=[{'name': 'node-1', 'component': 'opensearch-ml'}]
+        )
+        args = self.GetQueryInsightsArgs(opensearch_cluster_name='')
+        try:
+            result = await self._get_query_insights_tool(args)
+            await self._get_query_insights_tool(args)
+        finally:
+            capabilities._installed_plugins.clear()
+
+        assert result[0]['text'] == (
+            "Error getting query insights: Tool 'GetQueryInsightsTool' requires the "
+            'OpenSearch plugin query-insights, which is not installed on this cluster.'
+        )
+        self.mock_client.transport.perform_request.assert_not_called()
+        # The plugins are looked up once per cluster
+        self.mock_client.cat.plugins.assert_awaited_once_with(format='json')
+
     @pytest.mark.asyncio
     async def test_get_nodes_hot_threads_tool(self):
         """Test get_nodes_hot_threads_tool successful."""